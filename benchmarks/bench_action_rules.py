@@ -0,0 +1,619 @@
+"""
+Vergleich der Aktionsregeln: alter Pfad (Regeln pro Zyklus aus if-Ketten, Konfliktauflösung über
+Message-Keywords) gegen OGBActionRuleEngine (kompilierte Tabelle, Konflikte über Priorität).
+
+Aufruf aus dem Repo-Root:
+    python benchmarks/bench_action_rules.py [--cycles N]
+
+Für jeden Raumzustand eines festen Rasters (Abweichungen, Temperaturband, CO2, Licht) werden beide Pfade
+mit derselben Basis-ActionMap ausgewertet. Ausgegeben werden die Kosten pro Zyklus und alle Zustände,
+in denen sich die aufgelösten Aktionen unterscheiden (erwartet: nur durch die entfallene Keyword-Präferenz).
+"""
+import argparse
+import dataclasses
+import itertools
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components" / "opengrowbox"))
+
+from OGBController.OGBActionRules import OGBActionRuleEngine  # noqa: E402
+from OGBController.OGBCapabilityRegistry import OGBCapabilityRegistry  # noqa: E402
+from OGBController.OGBDataClasses.OGBData import OGBConf  # noqa: E402
+from OGBController.OGBDataClasses.OGBPublications import OGBActionPublication  # noqa: E402
+from OGBController.OGBDataClasses.OGBSections import TentData  # noqa: E402
+
+_LOGGER = logging.getLogger(__name__)
+
+ROOM = "BenchTent"
+DEVICES = (
+    ("heater1", "heater"), ("cooler1", "cooler"), ("humidifier1", "humidifier"),
+    ("dehumidifier1", "dehumidifier"), ("exhaust1", "exhaust"), ("intake1", "intake"),
+    ("ventilation1", "ventilation"), ("light1", "light"), ("co2_1", "co2"),
+)
+
+
+class BenchDataStore:
+    """Minimaler DataStore (get/set/getDeep/on) für die Regelpfade"""
+
+    def __init__(self):
+        self.data = {
+            "DeviceProfiles": OGBConf(hass=None).DeviceProfiles,
+            "tentData": TentData(),
+            "controlOptions": {"co2Control": True},
+            "controlOptionData": {"co2ppm": {"current": 800, "minPPM": 400, "maxPPM": 1500}},
+            "vpd": {"current": 1.1, "perfection": 1.2},
+        }
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value
+
+    def getDeep(self, path):
+        value = self.data
+        for key in path.split("."):
+            value = value[key] if value is not None else None
+        return value
+
+    def on(self, key, callback):
+        pass
+
+
+class LegacyActionRules:
+    """Unveränderte Kopie der bis zur Regel-Tabelle genutzten OGBActionManager-Methoden"""
+
+    def __init__(self, room, dataStore):
+        self.room = room
+        self.dataStore = dataStore
+
+    def _determineVPDStatus(self, tempDeviation, humDeviation, tentData):
+        """Bestimmt den primären VPD-Status basierend auf Abweichungen und kritischen Werten"""
+        
+        # Notfälle haben Priorität
+        if tentData["temperature"] > tentData["maxTemp"]:
+            return "critical_hot"
+        elif tentData["temperature"] < tentData["minTemp"]:
+            return "critical_cold"
+        elif tentData["dewpoint"] >= tentData["temperature"]:
+            return "dewpoint_risk"
+        elif tentData["humidity"] > tentData["maxHumidity"]:
+            return "humidity_risk"
+        
+        # Kombinierte Bewertung
+        if tempDeviation > 0 and humDeviation > 0:
+            return "hot_humid"
+        elif tempDeviation > 0 and humDeviation < 0:
+            return "hot_dry"
+        elif tempDeviation < 0 and humDeviation > 0:
+            return "cold_humid"
+        elif tempDeviation < 0 and humDeviation < 0:
+            return "cold_dry"
+        elif abs(tempDeviation) > abs(humDeviation):
+            return "too_hot" if tempDeviation > 0 else "too_cold"
+        elif abs(humDeviation) > 0:
+            return "too_humid" if humDeviation > 0 else "too_dry"
+        else:
+            # VPD-Fallback
+            currentVPD = self.dataStore.getDeep("vpd.current")
+            perfectionVPD = self.dataStore.getDeep("vpd.perfection")
+            return "vpd_low" if currentVPD < perfectionVPD else "vpd_high"
+
+    def _enhanceActionMap(self, baseActionMap, tempDeviation, humDeviation, tentData, caps, vpdLightControl, islightON, optimalDevices):
+        """Erweitert die ActionMap intelligent basierend auf Bedingungen"""
+        
+        enhancedMap = list(baseActionMap)  # Kopiere ursprüngliche Actions
+        
+        # Aktionen basierend auf Abweichungen hinzufügen
+        if tempDeviation > 0 or humDeviation > 0:
+            enhancedMap.extend(self._getDeviationActions(tempDeviation, humDeviation, caps, vpdLightControl))
+        
+        # Notfallmaßnahmen hinzufügen
+        enhancedMap.extend(self._getEmergencyActions(tentData, caps, vpdLightControl))
+        
+        # CO2-Management hinzufügen
+        enhancedMap.extend(self._getCO2Actions(caps, islightON))
+        
+        # Priorisiere Actions für optimale Geräte
+        return self._prioritizeOptimalDevices(enhancedMap, optimalDevices, caps)
+
+    def _getDeviationActions(self, tempDeviation, humDeviation, caps, vpdLightControl):
+        """Erstellt Actions basierend auf Temperatur- und Humdiditysabweichungen mit Pufferzonen"""
+       
+        actions = []
+       
+        # Temperature buffer zones (in degrees)
+        HEATER_BUFFER = 2.0 # Don't use heater within 2°C of maxTemp
+        COOLER_BUFFER = 2.0 # Don't use cooler within 2°C of minTemp
+       
+        # Get current temperature and limits
+        tentData = self.dataStore.get("tentData")
+        current_temp = tentData["temperature"]
+        max_temp = tentData["maxTemp"]
+        min_temp = tentData["minTemp"]
+       
+        # Calculate buffer zones
+        heater_cutoff_temp = max_temp - HEATER_BUFFER
+        cooler_cutoff_temp = min_temp + COOLER_BUFFER
+       
+        if tempDeviation > 0 and humDeviation > 0:
+            # High Temperature + High Humidity
+            actionMessage = f"High Temperature + High Humidity in {self.room}"
+            if caps.get("canDehumidify", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canDehumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
+            if caps.get("canExhaust", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canExhaust", action="Increase", Name=self.room, message=actionMessage, priority=""))
+            if caps.get("canVentilate", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canVentilate", action="Increase", Name=self.room, message=actionMessage, priority=""))
+           
+            # Only use cooler if temperature is above buffer zone
+            if caps.get("canCool", {}).get("state", False) and current_temp > cooler_cutoff_temp:
+                actions.append(OGBActionPublication(capability="canCool", action="Increase", Name=self.room, message=actionMessage, priority=""))
+            else:
+                _LOGGER.debug(f"{self.room}: Cooler skipped - current temp {current_temp}°C within buffer of min temp {min_temp}°C")
+           
+            # NEW: Explicitly reduce heat in high-temp cases to conflict with any base heat Increase
+            if caps.get("canHeat", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canHeat", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
+               
+        elif tempDeviation > 0 and humDeviation < 0:
+            # High Temperature + Low Humidity
+            actionMessage = f"High Temperature + Low Humidity in {self.room}"
+            if caps.get("canHumidify", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canHumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
+           
+            # Only use cooler if temperature is above buffer zone
+            if caps.get("canCool", {}).get("state", False) and current_temp > cooler_cutoff_temp:
+                actions.append(OGBActionPublication(capability="canCool", action="Increase", Name=self.room, message=actionMessage, priority=""))
+            else:
+                _LOGGER.debug(f"{self.room}: Cooler skipped - current temp {current_temp}°C within buffer of min temp {min_temp}°C")
+               
+            if vpdLightControl and caps.get("canLight", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canLight", action="Reduce", Name=self.room, message=actionMessage, priority=""))
+           
+            # NEW: Explicitly reduce heat in high-temp cases to conflict with any base heat Increase
+            if caps.get("canHeat", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canHeat", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
+               
+        elif tempDeviation < 0 and humDeviation > 0:
+            # Low Temperature + High Humidity
+            actionMessage = f"Low Temperature + High Humidity in {self.room}"
+            if caps.get("canDehumidify", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canDehumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
+           
+            # Only use heater if temperature is below buffer zone
+            if caps.get("canHeat", {}).get("state", False) and current_temp < heater_cutoff_temp:
+                actions.append(OGBActionPublication(capability="canHeat", action="Increase", Name=self.room, message=actionMessage, priority=""))
+            else:
+                _LOGGER.debug(f"{self.room}: Heater skipped - current temp {current_temp}°C within buffer of max temp {max_temp}°C")
+               
+            if caps.get("canExhaust", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canExhaust", action="Increase", Name=self.room, message=actionMessage, priority=""))
+           
+            # NEW: Explicitly reduce cooling in low-temp cases to avoid worsening
+            if caps.get("canCool", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canCool", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
+               
+        elif tempDeviation < 0 and humDeviation < 0:
+            # Low Temperature + Low Humidity
+            actionMessage = f"Low Temperature + Low Humidity in {self.room}"
+            if caps.get("canHumidify", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canHumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
+           
+            # Only use heater if temperature is below buffer zone
+            if caps.get("canHeat", {}).get("state", False) and current_temp < heater_cutoff_temp:
+                actions.append(OGBActionPublication(capability="canHeat", action="Increase", Name=self.room, message=actionMessage, priority=""))
+            else:
+                _LOGGER.debug(f"{self.room}: Heater skipped - current temp {current_temp}°C within buffer of max temp {max_temp}°C")
+               
+            if vpdLightControl and caps.get("canLight", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canLight", action="Increase", Name=self.room, message=actionMessage, priority=""))
+           
+            # NEW: Explicitly reduce cooling in low-temp cases to avoid worsening
+            if caps.get("canCool", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canCool", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
+       
+        return actions
+
+    def _getEmergencyActions(self, tentData, caps, vpdLightControl):
+        """Erstellt Notfall-Actions für kritische Situationen mit Pufferzonen"""
+       
+        actions = []
+       
+        # Emergency overrides buffer zones
+        HEATER_BUFFER = 2.0
+        COOLER_BUFFER = 2.0
+       
+        current_temp = tentData["temperature"]
+        max_temp = tentData["maxTemp"]
+        min_temp = tentData["minTemp"]
+       
+        heater_cutoff_temp = max_temp - HEATER_BUFFER
+        cooler_cutoff_temp = min_temp + COOLER_BUFFER
+       
+        if tentData["temperature"] > tentData["maxTemp"]:
+            actionMessage = f"Critical Over-Temp in {self.room}! Emergency Action activated."
+            _LOGGER.warning(actionMessage)
+           
+            # Emergency: always use cooler regardless of buffer
+            if caps.get("canCool", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canCool", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+            if caps.get("canExhaust", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canExhaust", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+            if caps.get("canVentilate", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canVentilate", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+           
+            # Reduce heat sources - but respect buffer for heater reduction
+            if caps.get("canHeat", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canHeat", action="Reduce",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+            if vpdLightControl and caps.get("canLight", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canLight", action="Reduce",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+       
+        elif tentData["temperature"] < tentData["minTemp"]:
+            actionMessage = f"Critical Under-Temp in {self.room}! Emergency Action activated."
+            _LOGGER.warning(actionMessage)
+           
+            # Emergency: always use heater regardless of buffer
+            if caps.get("canHeat", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canHeat", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+            if caps.get("canExhaust", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canExhaust", action="Reduce",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+            if vpdLightControl and caps.get("canLight", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canLight", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+           
+            # NEW: Explicitly reduce cooler in critical low-temp
+            if caps.get("canCool", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canCool", action="Reduce",
+                                                Name=self.room, message=actionMessage, priority="emergency"))
+       
+        # Additional check for temperatures approaching buffer zones
+        elif current_temp > heater_cutoff_temp and current_temp <= max_temp:
+            # Within buffer zone - use alternative cooling methods
+            actionMessage = f"Temperature {current_temp}°C approaching max {max_temp}°C - using buffer zone cooling in {self.room}"
+            _LOGGER.info(actionMessage)
+           
+            if caps.get("canExhaust", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canExhaust", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="high"))
+            if caps.get("canVentilate", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canVentilate", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="high"))
+            # Skip cooler in buffer zone unless emergency
+           
+            # NEW: Explicitly reduce heat in buffer zone to conflict with any base heat Increase
+            if caps.get("canHeat", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canHeat", action="Reduce",
+                                                Name=self.room, message=actionMessage, priority="high"))
+       
+        elif current_temp < cooler_cutoff_temp and current_temp >= min_temp:
+            # Within buffer zone - use alternative heating methods
+            actionMessage = f"Temperature {current_temp}°C approaching min {min_temp}°C - using buffer zone heating in {self.room}"
+            _LOGGER.info(actionMessage)
+           
+            if caps.get("canExhaust", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canExhaust", action="Reduce",
+                                                Name=self.room, message=actionMessage, priority="high"))
+            if vpdLightControl and caps.get("canLight", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canLight", action="Increase",
+                                                Name=self.room, message=actionMessage, priority="high"))
+            # Skip heater in buffer zone unless emergency
+           
+            # NEW: Explicitly reduce cooler in buffer zone to avoid worsening
+            if caps.get("canCool", {}).get("state", False):
+                actions.append(OGBActionPublication(capability="canCool", action="Reduce",
+                                                Name=self.room, message=actionMessage, priority="high"))
+       
+        return actions
+    
+    def _getCO2Actions(self, caps, islightON):
+        """Erstellt CO2-Management Actions"""
+        
+        actions = []
+        co2Control = self.dataStore.getDeep("controlOptions.co2Control")
+        
+        if co2Control and islightON:
+            co2Level = int(self.dataStore.getDeep("controlOptionData.co2ppm.current"))
+            try:
+                co2LevelMin = int(float(self.dataStore.getDeep("controlOptionData.co2ppm.minPPM")))        
+                co2LevelMax = int(float(self.dataStore.getDeep("controlOptionData.co2ppm.maxPPM")))
+            except (ValueError, TypeError):
+                co2LevelMin = 400
+                co2LevelMax = 1500
+                
+            if co2Level < co2LevelMin:
+                actionMessage = f"CO₂-Level zu niedrig in {self.room}, CO₂-Zufuhr erhöht."
+                if caps.get("canCO2", {}).get("state", False):
+                    actions.append(OGBActionPublication(capability="canCO2", action="Increase", Name=self.room, message=actionMessage, priority=""))
+                if caps.get("canExhaust", {}).get("state", False):
+                    actions.append(OGBActionPublication(capability="canExhaust", action="Reduce", Name=self.room, message=actionMessage, priority=""))
+                    
+            elif co2Level > co2LevelMax:
+                actionMessage = f"CO₂-Level zu hoch in {self.room}, Abluft erhöht."
+                if caps.get("canCO2", {}).get("state", False):
+                    actions.append(OGBActionPublication(capability="canCO2", action="Reduce", Name=self.room, message=actionMessage, priority=""))
+                if caps.get("canExhaust", {}).get("state", False):
+                    actions.append(OGBActionPublication(capability="canExhaust", action="Increase", Name=self.room, message=actionMessage, priority=""))
+        
+        return actions
+
+    def _prioritizeOptimalDevices(self, actionMap, optimalDevices, caps):
+        """Priorisiert Actions für optimale Geräte, behält aber alle bei"""
+        
+        if not optimalDevices:
+            return actionMap  # Keine Optimierung möglich
+        
+        # Create new action list with updated priorities
+        prioritizedActions = []
+        
+        for action in actionMap:
+            capability = action.capability
+            capDevices = caps.get(capability, {}).get("devEntities", [])
+            
+            # Prüfe ob diese capability optimale Geräte hat
+            hasOptimalDevice = any(device in optimalDevices for device in capDevices)
+            
+            # Use dataclasses.replace to create a new instance with updated priority
+            prioritizedAction = dataclasses.replace(
+                action,
+                priority="high" if hasOptimalDevice else "normal"
+            )
+            prioritizedActions.append(prioritizedAction)
+        
+        return prioritizedActions
+
+    def _resolveActionConflicts(self, actionMap):
+        """Löst nur direkte Konflikte auf, behält aber multiple Actions pro Capability"""
+        
+        # Gruppiere nach capability UND action
+        actionGroups = {}
+        for action in actionMap:
+            key = f"{action.capability}_{action.action}"
+            if key not in actionGroups:
+                actionGroups[key] = []
+            actionGroups[key].append(action)
+        
+        finalActions = []
+        
+        # Für jede Gruppe, wähle die beste Action (falls mehrere identische)
+        for key, actions in actionGroups.items():
+            if len(actions) == 1:
+                finalActions.append(actions[0])
+            else:
+                # Bei identischen Actions, wähle die mit der wichtigsten Message
+                priorityKeywords = ["Critical", "Notfall", "Dewpoint", "CO₂"]
+                
+                bestAction = actions[0]
+                for action in actions:
+                    if any(keyword in action.message for keyword in priorityKeywords):
+                        bestAction = action
+                        break
+                    elif hasattr(action, 'priority') and action.priority == "high":
+                        bestAction = action
+                
+                finalActions.append(bestAction)
+        
+        # Prüfe auf direkte Konflikte (Increase vs Reduce für gleiche Capability)
+        return self._resolveIncreaseReduceConflicts(finalActions)
+
+    # Enhanced conflict resolution with emergency priority
+    def _resolveIncreaseReduceConflicts(self, actions):
+        """Löst Increase/Reduce Konflikte für gleiche Capability auf"""
+        
+        capabilityActions = {}
+        for action in actions:
+            cap = action.capability
+            if cap not in capabilityActions:
+                capabilityActions[cap] = []
+            capabilityActions[cap].append(action)
+        
+        resolvedActions = []
+        
+        for capability, capActions in capabilityActions.items():
+            if len(capActions) <= 1:
+                resolvedActions.extend(capActions)
+                continue
+                
+            # Check for emergency priority first
+            emergencyActions = [a for a in capActions if getattr(a, 'priority', '') == 'emergency']
+            if emergencyActions:
+                resolvedActions.append(emergencyActions[0])
+                continue
+                
+            # Existing conflict resolution logic...
+            increases = [a for a in capActions if a.action == "Increase"]
+            reduces = [a for a in capActions if a.action == "Reduce"]
+            
+            if increases and reduces:
+                # Existing priority logic with emergency keywords
+                emergencyKeywordActions = [a for a in capActions if any(kw in a.message for kw in ["Critical", "Notfall", "Dewpoint"])]
+                
+                if emergencyKeywordActions:
+                    resolvedActions.append(emergencyKeywordActions[0])
+                else:
+                    # Original logic continues...
+                    highPriorityActions = [a for a in capActions if hasattr(a, 'priority') and a.priority == "high"]
+                    if highPriorityActions:
+                        resolvedActions.append(highPriorityActions[0])
+                    else:
+                        if increases:
+                            resolvedActions.append(increases[0])
+                        else:
+                            resolvedActions.append(reduces[0])
+            else:
+                resolvedActions.extend(capActions)
+        
+        return resolvedActions
+    
+    def getRoomCaps(self, vpdStatus: str):
+        """Erweiterte Version die auch spezielle VPD-Stati behandelt"""
+        
+        available_capabilities = self.dataStore.get("capabilities")
+        device_profiles = self.dataStore.get("DeviceProfiles")
+        result = []
+
+        # Mapping für erweiterte VPD-Stati
+        statusMapping = {
+            "too_hot": "too_high",
+            "too_cold": "too_low", 
+            "too_humid": "too_high",
+            "too_dry": "too_low",
+            "critical_hot": "too_high",
+            "critical_cold": "too_low",
+            "dewpoint_risk": "too_high",
+            "humidity_risk": "too_high",
+            "hot_humid": "too_high",
+            "hot_dry": "too_high",
+            "cold_humid": "too_low",
+            "cold_dry": "too_low",
+            "vpd_high": "too_high",
+            "vpd_low": "too_low"
+        }
+        
+        mappedStatus = statusMapping.get(vpdStatus, "too_high")
+
+        for dev_name, profile in device_profiles.items():
+            cap_key = profile.get("cap")
+            if not cap_key:
+                continue
+
+            cap_info = available_capabilities.get(cap_key)
+            if not cap_info or cap_info["count"] == 0:
+                continue
+
+            if mappedStatus == "too_high":
+                if (
+                    (profile["type"] == "humidity" and profile["direction"] == "reduce") or
+                    (profile["type"] == "temperature" and profile["direction"] == "reduce") or
+                    (profile["type"] == "both" and profile["direction"] == "reduce")
+                ):
+                    result.extend(cap_info["devEntities"])
+
+            elif mappedStatus == "too_low":
+                if (
+                    (profile["type"] == "humidity" and profile["direction"] == "increase") or
+                    (profile["type"] == "temperature" and profile["direction"] == "increase") or
+                    (profile["type"] == "both" and profile["direction"] == "increase")
+                ):
+                    result.extend(cap_info["devEntities"])
+
+        return list(set(result))
+
+
+def baseActionMap(capabilities):
+    """Basis-Aktionen wie in increase_vpd (ohne Licht)"""
+    plan = (("canExhaust", "Increase"), ("canIntake", "Reduce"), ("canVentilate", "Increase"),
+            ("canHumidify", "Reduce"), ("canDehumidify", "Increase"), ("canHeat", "Increase"),
+            ("canCool", "Reduce"), ("canCO2", "Increase"))
+    return [
+        OGBActionPublication(capability=cap, action=action, Name=ROOM, message="VPD-Increase Action", priority="")
+        for cap, action in plan if capabilities[cap]["state"]
+    ]
+
+
+def roomStates():
+    """Raster aus Abweichungen, Temperaturband, CO2-Level, Licht und vpdLightControl"""
+    temperatures = (17.0, 20.5, 25.0, 28.5, 31.0)   # under, lower_buffer, normal, upper_buffer, over (min 20, max 30)
+    deviations = (-1.5, 0.0, 1.5)
+    co2Levels = (300, 800, 1800)
+    for temp, tempDev, humDev, co2, lightOn, vpdLight in itertools.product(
+        temperatures, deviations, deviations, co2Levels, (True, False), (True, False)
+    ):
+        yield {"temperature": temp, "tempDeviation": tempDev, "humDeviation": humDev,
+               "co2": co2, "islightON": lightOn, "vpdLightControl": vpdLight}
+
+
+def key(actions):
+    return sorted((a.capability, a.action, a.priority, a.message) for a in actions)
+
+
+def difference(legacyActions, engineActions):
+    """
+    Ursache einer Abweichung: "priority" = gleiche Aktionen und Messages, nur die Priorität weicht ab
+    (Notfall-Priorität überlebt die Optimal-Geräte-Priorisierung); "message" = gleiche Aktionen, aber eine
+    andere Duplikat-Message gewinnt (entfallene Keyword-Präferenz); sonst "other".
+    """
+    if sorted(k[:2] + k[3:] for k in key(legacyActions)) == sorted(k[:2] + k[3:] for k in key(engineActions)):
+        return "priority"
+    if sorted(k[:2] for k in key(legacyActions)) == sorted(k[:2] for k in key(engineActions)):
+        return "message"
+    return "other"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=200, help="Wiederholungen pro Raumzustand")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    dataStore = BenchDataStore()
+    registry = OGBCapabilityRegistry(ROOM, dataStore)
+    for name, deviceType in DEVICES:
+        registry.addDevice(name, deviceType)
+    legacy = LegacyActionRules(ROOM, dataStore)
+    engine = OGBActionRuleEngine(ROOM, dataStore, registry)
+    caps = dataStore.get("capabilities")
+    base = baseActionMap(caps)
+
+    tentData = dataStore.get("tentData")
+    tentData.update({"humidity": 60.0, "dewpoint": 15.0, "maxTemp": 30.0, "minTemp": 20.0,
+                     "maxHumidity": 70.0, "minHumidity": 40.0})
+
+    legacyTime = engineTime = 0.0
+    states = 0
+    differing = {"priority": 0, "message": 0, "other": 0}
+    examples = {}
+    for state in roomStates():
+        tentData.temperature = state["temperature"]
+        dataStore.data["controlOptionData"]["co2ppm"]["current"] = state["co2"]
+        tempDev, humDev = state["tempDeviation"], state["humDeviation"]
+        vpdLight, lightOn = state["vpdLightControl"], state["islightON"]
+        vpdStatus = legacy._determineVPDStatus(tempDev, humDev, tentData)
+
+        start = time.perf_counter()
+        for _ in range(args.cycles):
+            optimalDevices = legacy.getRoomCaps(vpdStatus)
+            enhanced = legacy._enhanceActionMap(base, tempDev, humDev, tentData, caps, vpdLight, lightOn, optimalDevices)
+            legacyActions = legacy._resolveActionConflicts(enhanced)
+        legacyTime += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.cycles):
+            enhanced, _fired = engine.evaluate(base, tempDev, humDev, vpdStatus, vpdLight, lightOn)
+            engineActions = engine.resolveConflicts(enhanced)
+        engineTime += time.perf_counter() - start
+
+        states += 1
+        if key(legacyActions) != key(engineActions):
+            cause = difference(legacyActions, engineActions)
+            differing[cause] += 1
+            if cause not in examples:
+                examples[cause] = (state, sorted(set(key(legacyActions)) - set(key(engineActions))),
+                                   sorted(set(key(engineActions)) - set(key(legacyActions))))
+
+    cycles = states * args.cycles
+    print(f"Python {sys.version.split()[0]}, {states} room states x {args.cycles} cycles, {len(DEVICES)} devices")
+    print(f"legacy: {legacyTime / cycles * 1e6:8.1f} us/cycle")
+    print(f"engine: {engineTime / cycles * 1e6:8.1f} us/cycle  (table {engine.getStats()['tableSize']} states, "
+          f"{engine.getStats()['compiles']} compile)")
+    print(f"identical resolved action sets: {states - sum(differing.values())}/{states}")
+    for cause, count in differing.items():
+        print(f"differing by {cause}: {count}")
+    for cause, (state, legacyOnly, engineOnly) in examples.items():
+        print(f"example ({cause}): {state}")
+        print(f"    legacy only: {legacyOnly}")
+        print(f"    engine only: {engineOnly}")
+
+
+if __name__ == "__main__":
+    main()
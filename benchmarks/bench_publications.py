@@ -0,0 +1,150 @@
+"""
+Allokationen der Publications pro Regelzyklus: alte, nicht geslottete Dataclasses mit asdict gegen die
+geslotteten OGBPublications mit publication_dict und geteilten Instanzen (ModeRun, feste VPD-Aktionen).
+
+Aufruf aus dem Repo-Root:
+    python benchmarks/bench_publications.py [--cycles N]
+
+Ein Zyklus: ein State-Event, eine VPD-Publication, ein Mode-Run, eine Weight-Publication und 8 Aktionen,
+jeweils in Dictionaries für HA-Bus und Client-Feed umgewandelt (vorher asdict, jetzt publication_dict).
+Die Ergebnisse aller Zyklen bleiben referenziert (wie bei Listenern, die Events halten), gemessen wird
+mit tracemalloc.
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "custom_components" / "opengrowbox"))
+
+from OGBController.OGBDataClasses import OGBPublications as current  # noqa: E402
+
+ROOM = "BenchTent"
+ACTIONS = (
+    ("canExhaust", "Increase"), ("canIntake", "Reduce"), ("canVentilate", "Increase"), ("canHumidify", "Reduce"),
+    ("canDehumidify", "Increase"), ("canHeat", "Increase"), ("canCool", "Reduce"), ("canCO2", "Increase"),
+)
+
+
+# Unveränderte Definitionen vor den geslotteten Publications
+@dataclass(frozen=True)
+class LegacyEventPublication:
+    Name: str
+    oldState: tuple[Union[float, str]] = field(default_factory=list)
+    newState: tuple[Union[float, str]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class LegacyModeRunPublication:
+    currentMode: str
+
+
+@dataclass(frozen=True)
+class LegacyVPDPublication:
+    Name: str
+    VPD: Optional[float] = None
+    AvgTemp: Optional[float] = None
+    AvgHum: Optional[float] = None
+    AvgDew: Optional[float] = None
+    Timestamp: str = field(default_factory=lambda: datetime.now().strftime("%d.%m.%Y %H:%M:%S"))
+
+
+@dataclass(frozen=True)
+class LegacyActionPublication:
+    Name: str
+    message: str
+    capability: str
+    action: str
+    priority: str
+
+
+@dataclass(frozen=True)
+class LegacyWeightPublication:
+    Name: str
+    message: str
+    tempDeviation: float
+    humDeviation: float
+    tempWeight: float
+    humWeight: float
+
+
+def legacy_serialize(data):
+    """Alte Umwandlung (OGBClientFeed._serialize): asdict für Dataclasses und Listen davon"""
+    if is_dataclass(data):
+        return asdict(data)
+    if isinstance(data, list):
+        return [asdict(item) if is_dataclass(item) else item for item in data]
+    return data
+
+
+def legacy_cycle(i):
+    temp = 24.0 + (i % 10) / 10
+    event = LegacyEventPublication(Name="sensor.bench_temperature", oldState=[temp - 0.1], newState=[temp])
+    vpd = LegacyVPDPublication(Name=ROOM, VPD=1.1, AvgTemp=temp, AvgHum=60.0, AvgDew=15.8)
+    modeRun = LegacyModeRunPublication(currentMode="VPD Perfection")
+    weight = LegacyWeightPublication(Name=ROOM, message="Temp To High: Deviation 0.5", tempDeviation=0.5,
+                                     humDeviation=0.0, tempWeight=1.0, humWeight=1.0)
+    actions = [LegacyActionPublication(Name=ROOM, message="VPD-Increase Action", capability=cap, action=action, priority="")
+               for cap, action in ACTIONS]
+    return [legacy_serialize(item) for item in (event, vpd, modeRun, weight, actions)]
+
+
+def current_cycle(i):
+    temp = 24.0 + (i % 10) / 10
+    event = current.OGBEventPublication(Name="sensor.bench_temperature", oldState=[temp - 0.1], newState=[temp])
+    vpd = current.OGBVPDPublication(Name=ROOM, VPD=1.1, AvgTemp=temp, AvgHum=60.0, AvgDew=15.8)
+    modeRun = current.OGBModeRunPublication.of("VPD Perfection")
+    weight = current.OGBWeightPublication(Name=ROOM, message="Temp To High: Deviation 0.5", tempDeviation=0.5,
+                                          humDeviation=0.0, tempWeight=1.0, humWeight=1.0)
+    actions = [current.OGBActionPublication.of(ROOM, cap, action, "VPD-Increase Action") for cap, action in ACTIONS]
+    return [current.publication_dict(item) for item in (event, vpd, modeRun, weight, actions)]
+
+
+def measure(cycle, cycles):
+    cycle(0)  # Caches (lru_cache, Feldnamen) vorab füllen
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(cycles):
+        kept.append(cycle(i))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "lineno")
+    blocks = sum(stat.count_diff for stat in stats) / cycles
+    size = sum(stat.size_diff for stat in stats) / cycles
+
+    start = time.perf_counter()
+    for i in range(cycles):
+        cycle(i)
+    elapsed = (time.perf_counter() - start) / cycles
+    return blocks, size, elapsed
+
+
+def instance_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]}, {args.cycles} cycles")
+    for label, cycle in (("before", legacy_cycle), ("after", current_cycle)):
+        blocks, size, elapsed = measure(cycle, args.cycles)
+        print(f"{label:6}: {blocks:5.1f} allocated blocks/cycle, {size:6.0f} B, {elapsed * 1e6:6.1f} us")
+
+    legacyVpd = LegacyVPDPublication(Name=ROOM, VPD=1.1, AvgTemp=24.0, AvgHum=60.0, AvgDew=15.8)
+    currentVpd = current.OGBVPDPublication(Name=ROOM, VPD=1.1, AvgTemp=24.0, AvgHum=60.0, AvgDew=15.8)
+    print(f"VPD publication instance: {instance_size(legacyVpd)} B -> {instance_size(currentVpd)} B")
+
+
+if __name__ == "__main__":
+    main()
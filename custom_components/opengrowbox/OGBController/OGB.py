@@ -3,11 +3,11 @@ import logging
 import asyncio
 from datetime import datetime
 import aiohttp
-from .utils.calcs import calculate_avg_value,calculate_dew_point,calculate_current_vpd,calculate_perfect_vpd,calc_light_to_ppfd_dli
-from .utils.sensorUpdater import update_sensor_via_service,_update_specific_sensor,_update_specific_number
-from .utils.lightTimeHelpers import hours_between
+from .utils.calcs import calculate_avg_value,calculate_dew_point,calculate_current_vpd,calculate_perfect_vpd
+from .utils.sensorUpdater import update_sensor_via_service,_update_specific_sensor,_update_specific_number,update_sensors_batch,update_options_batch
+from .utils.ogbLogging import OGBStructuredLogger, dumpDecisions
 
-from .OGBDataClasses.OGBPublications import OGBInitData,OGBEventPublication,OGBVPDPublication,OGBDLIPublication,OGBPPFDPublication,OGBModePublication,OGBModeRunPublication,OGBCO2Publication,OGBMoisturePublication,OGBWaterPublication,OGBSoilPublication
+from .OGBDataClasses.OGBPublications import OGBInitData,OGBEventPublication,OGBVPDPublication,OGBModePublication,OGBModeRunPublication,OGBCO2Publication,OGBMoisturePublication,OGBWaterPublication,OGBSoilPublication
 
 # OGB IMPORTS
 from .OGBDataClasses.OGBData import OGBConf
@@ -22,6 +22,15 @@ from .OGBPremManager import OGBPremManager
 from .OGBFeedManager import OGBFeedManager
 from .OGBDSManager import OGBDSManager
 from .OGBClientManager import OGBClientManager
+from .OGBClientFeed import OGBClientFeed
+from .OGBPhotoperiod import OGBPhotoperiodManager
+from .OGBDLIIntegrator import OGBDLIIntegrator
+from .OGBSensorConditioner import OGBSensorConditioner
+from .OGBSharedBus import get_shared_bus
+from .OGBEntityClassifier import OGBEntityClassifier
+from .OGBControlLoop import OGBControlLoop
+from .OGBCycleProfiler import OGBCycleProfiler
+from .OGBDiagnostics import OGBDiagnosticsExporter, DEBUG_SECTIONS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +39,7 @@ class OpenGrowBox:
         self.name = "OGB Main Controller"
         self.hass = hass
         self.room = room
+        self.ogbLog = OGBStructuredLogger(_LOGGER, self.room)
 
 
         self.ogbConfig = OGBConf(hass=self.hass,room=self.room)
@@ -37,6 +47,8 @@ class OpenGrowBox:
 
         # Init EventManager
         self.eventManager = OGBEventManager(self.hass, self.dataStore)
+        self.clientFeed = OGBClientFeed(self.hass, self.room)
+        self.eventManager.attachClientFeed(self.clientFeed)
 
         # Registry Listener für HA Events
         self.registryListener = OGBRegistryEvenListener(self.hass, self.dataStore, self.eventManager, self.room)
@@ -45,26 +57,46 @@ class OpenGrowBox:
         self.dataStoreManager = OGBDSManager(self.hass, self.dataStore, self.eventManager,self.room,self.registryListener)
         self.deviceManager = OGBDeviceManager(self.hass, self.dataStore, self.eventManager,self.room,self.registryListener)
         self.modeManager = OGBModeManager(self.hass,self.dataStore, self.eventManager, self.room)
-        self.actionManager = OGBActionManager(self.hass, self.dataStore, self.eventManager,self.room)
+        self.actionManager = OGBActionManager(self.hass, self.dataStore, self.eventManager,self.room,self.deviceManager.capRegistry)
         self.feedManager = OGBFeedManager(self.hass, self.dataStore, self.eventManager,self.room)
         self.clientManager = OGBClientManager(self.hass, self.dataStore, self.eventManager,self.room)
+        self.photoperiodManager = OGBPhotoperiodManager(self.hass, self.dataStore, self.eventManager,self.room)
+        self.sensorConditioner = OGBSensorConditioner(self.dataStore, self.room, self.hass.states.get)
+        self.dliIntegrator = OGBDLIIntegrator(self.hass, self.dataStore, self.eventManager,self.room,self.photoperiodManager)
          
         # Init Prem Manager
         self.premiumManager = OGBPremManager(self.hass, self.dataStore, self.eventManager,self.room)
+
+        # Diagnose-Export (HA-Diagnostics-Download und Debug-Logs)
+        self.diagnostics = OGBDiagnosticsExporter(self.dataStore, self.room)
+
+        # Entity-Rollen (einmal klassifiziert) und Dispatch-Tabellen
+        self.entityRoles = OGBEntityClassifier(self.room)
+        self.roomHandlers = self._buildRoomHandlers()
+        self.settingActions = None
+        self._registryUnsub = self.hass.bus.async_listen("entity_registry_updated", self._reclassifyEntity)
         
+        # Regelzyklus: höchstens einer pro Raum, Trigger während eines Laufs ergeben einen Nachlauf
+        self.profiler = OGBCycleProfiler(self.room)
+        self.eventManager.attachProfiler(self.profiler)
+        self.controlLoop = OGBControlLoop(self.room, self._runControlCycle, self.profiler)
+
         #Events Register
         self.eventManager.on("RoomUpdate", self.handleRoomUpdate)
-        self.eventManager.on("VPDCreation", self.handleNewVPD)
-        
-        #LightSheduleUpdate
-        #self.eventManager.on("LightSheduleUpdate", self.lightSheduleUpdate)
+        self.eventManager.on("VPDCreation", self.controlLoop.trigger)
         
         # Plant Times
         self.eventManager.on("PlantTimeChange",self._autoUpdatePlantStages)
+
+        # Decision Log
+        self.eventManager.on("DumpDecisions",self._dumpDecisions)
        
-        # Ambient & Outsite   
-        self.hass.bus.async_listen("AmbientData",self._handle_ambient_data)   
-        self.hass.bus.async_listen("OutsiteData",self._handle_outsite_data)
+        # Ambient & Outsite über den gemeinsamen Bus aller Räume
+        self.sharedBus = get_shared_bus(self.hass)
+        self._busUnsubscribers = []
+        if self.room.lower() != "ambient":
+            self._busUnsubscribers.append(self.sharedBus.subscribe("ambient", self._handle_ambient_data))
+            self._busUnsubscribers.append(self.sharedBus.subscribe("outside", self._handle_outsite_data))
                
     def __str__(self):
         return (f"{self.name}' Running")
@@ -85,6 +117,9 @@ class OpenGrowBox:
         await self.eventManager.emit("HydroModeRetrieveChange",Init)
         await self.eventManager.emit("PlantTimeChange",Init)
         await self._get_vpd_onStart(Init)
+        await self.photoperiodManager.start()
+        self.dliIntegrator.start()
+        await self._applySharedSnapshots()
 
         _LOGGER.info(f"OpenGrowBox for {self.room} started successfully State:{self.dataStore}")
         
@@ -101,24 +136,17 @@ class OpenGrowBox:
         temperatures = []
         humidities = []
 
-        for device in workdataDevices:
+        # Gleiche Rollen wie im Hot-Path: nur Luft-/Pflanzen-Sensoren, keine Wasser-/Bodentemperatur oder Sollwerte
+        climateTargets = {"temperature": temperatures, "humidity": humidities}
+        for device in workdataDevices or []:
             for entity in device.get("entities", []):
                 entity_id = entity.get("entity_id", "")
-                value = entity.get("value")
-
-                # Temperature
-                if "temperature" in entity_id:
-                    try:
-                        temperatures.append(entity)
-                    except (ValueError, TypeError):
-                        pass
-
-                # Humidity
-                if "humidity" in entity_id:
-                    try:
-                        humidities.append(entity)
-                    except (ValueError, TypeError):
-                        pass
+                if not entity_id:
+                    continue
+                role = self.entityRoles.get(entity_id)
+                if role.ignored or role.isSetting or role.medium not in ("air", "plant") or role.kind not in climateTargets:
+                    continue
+                climateTargets[role.kind].append(entity)
 
         _LOGGER.debug(f"INT DATA TEMP/HUM {self.room} --- T:{temperatures} --- H:{humidities}")     
         # Temperatur- und Feuchtigkeitsdaten laden
@@ -134,6 +162,7 @@ class OpenGrowBox:
 
         lastVpd = self.dataStore.getDeep("vpd.current")
         currentVPD = calculate_current_vpd(avgTemp, avgHum, leafTempOffset)        
+        self.ogbLog.decision("vpd.calc", sensors=len(temperatures), avgTemp=avgTemp, avgHum=avgHum, avgDew=avgDew, vpd=currentVPD, lastVpd=lastVpd)
         
         if currentVPD == 0.0 or 0:
             _LOGGER.error(f"VPD 0.0 FOUND {self.room}")
@@ -154,10 +183,10 @@ class OpenGrowBox:
                 _LOGGER.debug(f"New-VPD: {vpdPub} newStoreVPD:{currentVPD}, lastStoreVPD:{lastVpd}")
 
                 tentMode = self.dataStore.get("tentMode")
-                runMode = OGBModeRunPublication(currentMode=tentMode)               
+                runMode = OGBModeRunPublication.of(tentMode)               
                 
                 if self.room.lower() == "ambient":
-                    await self.eventManager.emit("AmbientData",vpdPub,haEvent=True)
+                    await self._publish_ambient(vpdPub)
                     await self.get_weather_data()
                     return
 
@@ -174,170 +203,159 @@ class OpenGrowBox:
                 await update_sensor_via_service(self.room,vpdPub,self.hass)
                 await self.eventManager.emit("DataRelease",vpdPub)
 
+    def _buildRoomHandlers(self):
+        """
+        Zuordnung (Medium, Messgröße) → Handler. Luft und Pflanze teilen sich die Klima-Handler,
+        Wasser und Boden haben eigene Ziele im DataStore.
+        """
+        handlers = {
+            ("water", "ec"): self._update_hydro_value,
+            ("water", "tds"): self._update_hydro_value,
+            ("water", "ph"): self._update_hydro_value,
+            ("water", "oxidation"): self._update_hydro_value,
+            ("water", "salinity"): self._update_hydro_value,
+            ("water", "temperature"): self._update_hydro_value,
+            ("soil", "ec"): self._update_soil_value,
+            ("soil", "ph"): self._update_soil_value,
+            ("soil", "moisture"): self._update_soil_value,
+            ("soil", "humidity"): self._update_soil_value,
+        }
+        for medium in ("air", "plant"):
+            handlers[(medium, "temperature")] = self._update_air_temperature
+            handlers[(medium, "humidity")] = self._update_air_humidity
+            handlers[(medium, "moisture")] = self._update_moisture
+            handlers[(medium, "light")] = self._update_light_sample
+            handlers[(medium, "co2")] = self._update_co2_level
+        return handlers
+
     async def handleRoomUpdate(self, entity):
         """
-        Update WorkData für Temperatur oder Feuchtigkeit basierend to einer Entität.
-        Ignoriere Entitäten, die 'ogb_' im Namen enthalten.
+        Update WorkData anhand der vorberechneten Rolle der Entität (ein Lookup statt Namens-Suche).
+        Entitäten mit 'ogb_' im Namen gehen an den Settings-Manager.
         """
-        await self.lightSheduleUpdate(entity)
-        # Entitäten mit 'ogb_' im Namen überspringen
-        if "ogb_" in entity.Name:
+        role = self.entityRoles.get(entity.Name)
+        if role.ignored:
+            return
+        if role.isSetting:
             await self.manager(entity)
             return
 
-
-        _LOGGER.debug(f"{self.room} OGB-Manager: Incomming Event {entity}")
-        temps = self.dataStore.getDeep("workData.temperature")
-        hums = self.dataStore.getDeep("workData.humidity")
-
-        vpd = self.dataStore.getDeep("vpd.current")
-        needs = ("temperature", "humidity","moisture","carbondioxide","water","wasser","plant","pflanzen","soil")
-        
-        if any(need in entity.Name for need in needs):
-
-
-            if "_temperature" in entity.Name:
-                # Update Temperaturdaten
-                temps = self._update_work_data_array(temps, entity)
-                self.dataStore.setDeep("workData.temperature", temps)
-                VPDPub = OGBVPDPublication(Name="TempUpdate",VPD=vpd,AvgDew=None,AvgHum=None,AvgTemp=None)
-                await self.eventManager.emit("VPDCreation",VPDPub)
-                _LOGGER.info(f"{self.room} OGB-Manager: Temperaturdaten aktualisiert {temps}")
-                return
-
-            elif "_humidity" in entity.Name:
-                # Update Feuchtigkeitsdaten
-                hums = self._update_work_data_array(hums, entity)
-                self.dataStore.setDeep("workData.humidity", hums)
-                VPDPub = OGBVPDPublication(Name="HumUpdate",VPD=vpd,AvgDew=None,AvgHum=None,AvgTemp=None)
-                await self.eventManager.emit("VPDCreation",VPDPub)
-                _LOGGER.info(f"{self.room} OGB-Manager: Feuchtigkeitsdaten aktualisiert {hums}")
-                return
-
-            elif "water" in entity.Name or "wasser" in entity.Name:
-                updated = False
-
-                if "_ec" in entity.Name:
-                    self.dataStore.setDeep("Hydro.ec_current", entity.newState[0])
-                    updated = True
-                elif "_tds" in entity.Name:
-                    self.dataStore.setDeep("Hydro.tds_current", entity.newState[0])
-                    updated = True
-                elif "_ph" in entity.Name:
-                    self.dataStore.setDeep("Hydro.ph_current", entity.newState[0])
-                    updated = True
-                elif "_oxidation" in entity.Name:
-                    self.dataStore.setDeep("Hydro.oxi_current", entity.newState[0])
-                    updated = True
-                elif "_salinity" in entity.Name:
-                    self.dataStore.setDeep("Hydro.sal_current", entity.newState[0])
-                    updated = True
-                elif "_temp" in entity.Name:
-                    self.dataStore.setDeep("Hydro.WaterTEMP", entity.newState[0])
-                    updated = True
-
-                if updated:
-                    ec_current = self.dataStore.getDeep("Hydro.ec_current")
-                    tds_current = self.dataStore.getDeep("Hydro.tds_current")
-                    ph_current = self.dataStore.getDeep("Hydro.ph_current")
-                    oxi_current = self.dataStore.getDeep("Hydro.oxi_current")
-                    sal_current = self.dataStore.getDeep("Hydro.sal_current")
-                    temp_current = self.dataStore.getDeep("Hydro.WaterTEMP")
-
-                    hydroPublication = OGBWaterPublication(
-                        Name="HydroUpdate",
-                        ecCurrent=ec_current,
-                        tdsCurrent=tds_current,
-                        phCurrent=ph_current,
-                        oxiCurrent=oxi_current,
-                        salCurrent=sal_current,
-                        waterTemp=temp_current
-                    )
-                    await self.eventManager.emit("CheckForFeed", hydroPublication)
-                    _LOGGER.info(f"{self.room} OGB-Manager: Hydro Daten aktualisiert EC:{ec_current}, TDS:{tds_current}, pH:{ph_current}, OXI:{oxi_current}, SAL:{sal_current}, TEMP:{temp_current}")
-                    return
-                
-            elif "soil" in entity.Name or "boden" in entity.Name:
-                updated = False
-
-                if "_conductivity" in entity.Name:
-                    self.dataStore.setDeep("Soil.ec_current", entity.newState[0])
-                    updated = True
-                elif "_ph" in entity.Name:
-                    self.dataStore.setDeep("Soil.ph_current", entity.newState[0])
-                    updated = True
-                elif "_moisture" in entity.Name:
-                    self.dataStore.setDeep("Soil.moist_current", entity.newState[0])
-                    updated = True
-
-
-                if updated:
-                    ec_current = self.dataStore.getDeep("Soil.ec_current")
-                    ph_current = self.dataStore.getDeep("Soil.ph_current")
-                    moist_current = self.dataStore.getDeep("Soil.moist_curren")
-
-
-                    soilPublication = OGBSoilPublication(
-                        Name="SoilUpdate",
-                        ecCurrent=ec_current,
-                        moistCurrent=moist_current,
-                        phCurrent=ph_current,
-
-                    )
-                    await self.eventManager.emit("CheckForFeed-Soil", soilPublication)
-                    return
-
-            elif "_moisture" in entity.Name:
-                # Update Feuchtigkeitsdaten
-                moists = self.dataStore.getDeep("workData.moisture")
-                moistures = self._update_work_data_array(moists, entity)
-                MOISTPub = OGBMoisturePublication(Name="MoistureUpdate",MoistureValues=moistures)
-                await self.eventManager.emit("MoistureUpdate",MOISTPub)
-                self.dataStore.setDeep("workData.moisture", moistures)
-                return
-                
-            elif "_lumen" in entity.Name or "_lux" in entity.Name or "_illuminance" in entity.Name:
-                if "_lumen" in entity.Name:
-                    unit = "lumen"
-                else:
-                    unit = "lux"
-                growSpace = self.dataStore.get("growAreaM2")
-                lightStart = self.dataStore.getDeep("isPlantDay.lightOnTime")
-                lightStop = self.dataStore.getDeep("isPlantDay.lightOffTime")
-                lightDuration = hours_between(lightStart, lightStop)
-
-                ppfd, dli = calc_light_to_ppfd_dli(entity.newState[0], unit, lightDuration, growSpace)
-
-                self.dataStore.setDeep("tentData.DLI", dli)
-                self.dataStore.setDeep("tentData.PPFD", ppfd)
-
-                await _update_specific_sensor("ogb_ppfd_", self.room, ppfd, self.hass)
-                await _update_specific_sensor("ogb_dli_", self.room, dli, self.hass)
-                
-                self.dataStore.setDeep("Light.DLICurrent",dli)
-                self.dataStore.setDeep("Light.PPFDCurrent",ppfd)
-                
-                DLIPub = OGBDLIPublication(Name="DLIUpdate", DLI=dli)
-                await self.eventManager.emit("MoistureUpdate", DLIPub)
-
-                PPFDPub = OGBPPFDPublication(Name="DLIUpdate", PPFD=ppfd)
-                await self.eventManager.emit("PPFDUpdate", PPFDPub)
-
-                return
-
-            elif "_co2" in entity.Name or "_carbondioxide" in entity.Name:
-                self.dataStore.setDeep("tentData.co2Level", entity.newState[0])
-                self.dataStore.setDeep("controlOptionData.co2ppm.current", entity.newState[0])
-
-                minPPM = self.dataStore.getDeep("controlOptionData.co2ppm.minPPM")
-                maxPPM = self.dataStore.getDeep("controlOptionData.co2ppm.maxPPM")
-                targetPPM = self.dataStore.getDeep("controlOptionData.co2ppm.target")
-                currentPPM = self.dataStore.getDeep("controlOptionData.co2ppm.current")
-
-                co2Publication = OGBCO2Publication(Name="CO2", co2Current=currentPPM, co2Target=targetPPM, minCO2=minPPM, maxCO2=maxPPM)
-                await self.eventManager.emit("NewCO2Publication", co2Publication)
-                _LOGGER.info(f"{self.room} OGB-Manager: CO2 Daten aktualisiert {currentPPM}")
-                return
+        handler = self.roomHandlers.get((role.medium, role.kind))
+        if handler is None:
+            return
+        _LOGGER.debug(f"{self.room} OGB-Manager: Incomming Event {entity} as {role.medium}/{role.kind}")
+        with self.profiler.intake():
+            await handler(entity, role)
+
+    async def _update_air_temperature(self, entity, role):
+        value = self.sensorConditioner.condition(entity.Name, "temperature", entity.newState[0])
+        if value is None:
+            # Ausreißer oder Änderung unter der Auflösung: kein neuer Regelzyklus
+            return
+        # Update Temperaturdaten
+        temps = self._update_work_data_array(self.dataStore.getDeep("workData.temperature"), entity, value)
+        self.dataStore.setDeep("workData.temperature", temps)
+        VPDPub = OGBVPDPublication(Name="TempUpdate",VPD=self.dataStore.getDeep("vpd.current"),AvgDew=None,AvgHum=None,AvgTemp=None)
+        await self.eventManager.emit("VPDCreation",VPDPub)
+        _LOGGER.info(f"{self.room} OGB-Manager: Temperaturdaten aktualisiert {temps}")
+
+    async def _update_air_humidity(self, entity, role):
+        value = self.sensorConditioner.condition(entity.Name, "humidity", entity.newState[0])
+        if value is None:
+            return
+        # Update Feuchtigkeitsdaten
+        hums = self._update_work_data_array(self.dataStore.getDeep("workData.humidity"), entity, value)
+        self.dataStore.setDeep("workData.humidity", hums)
+        VPDPub = OGBVPDPublication(Name="HumUpdate",VPD=self.dataStore.getDeep("vpd.current"),AvgDew=None,AvgHum=None,AvgTemp=None)
+        await self.eventManager.emit("VPDCreation",VPDPub)
+        _LOGGER.info(f"{self.room} OGB-Manager: Feuchtigkeitsdaten aktualisiert {hums}")
+
+    async def _update_hydro_value(self, entity, role):
+        hydroKeys = {
+            "ec": "Hydro.ec_current",
+            "tds": "Hydro.tds_current",
+            "ph": "Hydro.ph_current",
+            "oxidation": "Hydro.oxi_current",
+            "salinity": "Hydro.sal_current",
+            "temperature": "Hydro.WaterTEMP",
+        }
+        self.dataStore.setDeep(hydroKeys[role.kind], entity.newState[0])
+
+        ec_current = self.dataStore.getDeep("Hydro.ec_current")
+        tds_current = self.dataStore.getDeep("Hydro.tds_current")
+        ph_current = self.dataStore.getDeep("Hydro.ph_current")
+        oxi_current = self.dataStore.getDeep("Hydro.oxi_current")
+        sal_current = self.dataStore.getDeep("Hydro.sal_current")
+        temp_current = self.dataStore.getDeep("Hydro.WaterTEMP")
+
+        hydroPublication = OGBWaterPublication(
+            Name="HydroUpdate",
+            ecCurrent=ec_current,
+            tdsCurrent=tds_current,
+            phCurrent=ph_current,
+            oxiCurrent=oxi_current,
+            salCurrent=sal_current,
+            waterTemp=temp_current
+        )
+        await self.eventManager.emit("CheckForFeed", hydroPublication)
+        _LOGGER.info(f"{self.room} OGB-Manager: Hydro Daten aktualisiert EC:{ec_current}, TDS:{tds_current}, pH:{ph_current}, OXI:{oxi_current}, SAL:{sal_current}, TEMP:{temp_current}")
+
+    async def _update_soil_value(self, entity, role):
+        soilKeys = {
+            "ec": "Soil.ec_current",
+            "ph": "Soil.ph_current",
+            "moisture": "Soil.moist_current",
+            # Bodenfeuchte-Sensoren melden sich oft als *_soil_humidity
+            "humidity": "Soil.moist_current",
+        }
+        self.dataStore.setDeep(soilKeys[role.kind], entity.newState[0])
+
+        soilPublication = OGBSoilPublication(
+            Name="SoilUpdate",
+            ecCurrent=self.dataStore.getDeep("Soil.ec_current"),
+            moistCurrent=self.dataStore.getDeep("Soil.moist_current"),
+            phCurrent=self.dataStore.getDeep("Soil.ph_current"),
+        )
+        await self.eventManager.emit("CheckForFeed-Soil", soilPublication)
+
+    async def _update_moisture(self, entity, role):
+        # Update Feuchtigkeitsdaten
+        moists = self.dataStore.getDeep("workData.moisture")
+        moistures = self._update_work_data_array(moists, entity)
+        MOISTPub = OGBMoisturePublication(Name="MoistureUpdate",MoistureValues=moistures)
+        await self.eventManager.emit("MoistureUpdate",MOISTPub)
+        self.dataStore.setDeep("workData.moisture", moistures)
+
+    async def _update_light_sample(self, entity, role):
+        await self.dliIntegrator.addSample(entity.newState[0], role.unit)
+
+    async def _update_co2_level(self, entity, role):
+        self.dataStore.setDeep("tentData.co2Level", entity.newState[0])
+        self.dataStore.setDeep("controlOptionData.co2ppm.current", entity.newState[0])
+
+        minPPM = self.dataStore.getDeep("controlOptionData.co2ppm.minPPM")
+        maxPPM = self.dataStore.getDeep("controlOptionData.co2ppm.maxPPM")
+        targetPPM = self.dataStore.getDeep("controlOptionData.co2ppm.target")
+        currentPPM = self.dataStore.getDeep("controlOptionData.co2ppm.current")
+
+        co2Publication = OGBCO2Publication(Name="CO2", co2Current=currentPPM, co2Target=targetPPM, minCO2=minPPM, maxCO2=maxPPM)
+        await self.eventManager.emit("NewCO2Publication", co2Publication)
+        _LOGGER.info(f"{self.room} OGB-Manager: CO2 Daten aktualisiert {currentPPM}")
+
+    async def _reclassifyEntity(self, event):
+        """Registry-Änderung (Labels, Umbenennung, Entfernen): Rolle der Entität neu berechnen"""
+        entity_id = event.data.get("entity_id")
+        old_entity_id = event.data.get("old_entity_id")
+        if old_entity_id:
+            self.entityRoles.invalidate(old_entity_id)
+        if not entity_id:
+            return
+        if event.data.get("action") == "remove":
+            self.entityRoles.invalidate(entity_id)
+            return
+        labels = self.registryListener.get_entity_label_names(entity_id)
+        role = self.entityRoles.classify(entity_id, labels)
+        _LOGGER.debug(f"{self.room}: Reclassified {entity_id} as {role.medium}/{role.kind}")
 
     async def managerInit(self,ogbEntity):
         for entity in ogbEntity['entities']:
@@ -346,16 +364,9 @@ class OpenGrowBox:
             entityPublication = OGBInitData(Name=entity_id,newState=[value])
             await self.manager(entityPublication) 
      
-    async def manager(self, data):
-        """
-        Verwalte Aktionen basierend to den eingehenden Daten mit einer Mapping-Strategie.
-        """
-
-        # Entferne Präfixe vor dem ersten Punkt
-        entity_key = data.Name.split(".", 1)[-1].lower()
-
-        # Mapping from Namen zu Funktionen
-        actions = {
+    def _buildSettingActions(self):
+        """Mapping from OGB-Entitätsnamen zu Funktionen, einmal pro Raum aufgebaut"""
+        return {
             # Basics
             f"ogb_maincontrol_{self.room.lower()}": self._update_control_option,
             f"ogb_notifications_{self.room.lower()}": self._update_notify_option,
@@ -366,6 +377,7 @@ class OpenGrowBox:
             f"ogb_leaftemp_offset_{self.room.lower()}": self._update_leafTemp_offset,
             f"ogb_vpdtarget_{self.room.lower()}": self._update_vpd_Target,                          
             f"ogb_vpd_devicedampening_{self.room.lower()}": self._update_vpd_DeviceDampening,                          
+            f"ogb_cyclebudget_{self.room.lower()}": self._update_cycle_budget,
 
             
             # LightTimes
@@ -466,13 +478,31 @@ class OpenGrowBox:
 
         }
 
+    async def manager(self, data):
+        """
+        Verwalte Aktionen basierend to den eingehenden Daten mit einer Mapping-Strategie.
+        """
+
+        # Entferne Präfixe vor dem ersten Punkt
+        entity_key = data.Name.split(".", 1)[-1].lower()
+
+        if self.settingActions is None:
+            self.settingActions = self._buildSettingActions()
+
         # Überprüfe, ob der Schlüssel in der Mapping-Tabelle vorhanden ist
-        action = actions.get(entity_key)
+        action = self.settingActions.get(entity_key)
         if action:
             await action(data)  # Rufe die zugehörige Aktion mit `data` to
         else:
             _LOGGER.info(f"OGB-Manager {self.room}: Keine Aktion für {entity_key} gefunden.")
  
+    async def _runControlCycle(self, data):
+        """Ein Zyklus des Control-Loops; Zykluszeiten gehen gedrosselt an die Diagnose-Sensoren"""
+        with self.profiler.stage("vpd"):
+            await self.handleNewVPD(data)
+        if self.profiler.publishDue():
+            update_sensors_batch(self.profiler.sensorValues(), self.room, self.hass)
+
     ## VPD Sensor Update
     async def handleNewVPD(self, data):
 
@@ -485,12 +515,12 @@ class OpenGrowBox:
         hums = self.dataStore.getDeep("workData.humidity")
         leafTempOffset = self.dataStore.getDeep("tentData.leafTempOffset")
         
-        logging.warning(f" {self.room} Current WorkData-Array TEMP:{temps} : HUMS: {hums}")
+        self.ogbLog.debug("vpd.workdata", "Current WorkData-Array TEMP:%s : HUMS:%s", temps, hums)
         
-        # Durchschnittswerte asynchron berechnen
-        avgTemp = calculate_avg_value(temps)
+        # Durchschnittswerte asynchron berechnen (veraltete Sensoren ausgenommen)
+        avgTemp = calculate_avg_value(self.sensorConditioner.fresh(temps))
         self.dataStore.setDeep("tentData.temperature", avgTemp)
-        avgHum = calculate_avg_value(hums)
+        avgHum = calculate_avg_value(self.sensorConditioner.fresh(hums))
         self.dataStore.setDeep("tentData.humidity", avgHum)
 
         # Taupunkt asynchron berechnen
@@ -499,6 +529,7 @@ class OpenGrowBox:
 
         lastVpd = self.dataStore.getDeep("vpd.current")
         currentVPD = calculate_current_vpd(avgTemp, avgHum, leafTempOffset)        
+        self.ogbLog.decision("vpd.calc", sensors=len(temps or []), avgTemp=avgTemp, avgHum=avgHum, avgDew=avgDew, vpd=currentVPD, lastVpd=lastVpd)
         
         if isinstance(data, OGBInitData):
             #_LOGGER.info(f"OGBInitData erkannt: {data}")
@@ -511,15 +542,16 @@ class OpenGrowBox:
                 await update_sensor_via_service(self.room,vpdPub,self.hass)
                 _LOGGER.debug(f"New-VPD: {vpdPub} newStoreVPD:{currentVPD}, lastStoreVPD:{lastVpd}")
                 tentMode = self.dataStore.get("tentMode")
-                runMode = OGBModeRunPublication(currentMode=tentMode)               
+                runMode = OGBModeRunPublication.of(tentMode)               
                 
                 if self.room.lower() == "ambient":
                     _LOGGER.debug(f"New-Ambient-VPD: {vpdPub} newStoreVPD:{currentVPD}, lastStoreVPD:{lastVpd}")
-                    await self.eventManager.emit("AmbientData",vpdPub,haEvent=True)
+                    await self._publish_ambient(vpdPub)
                     await self.get_weather_data()
                     return
                 
-                await self.eventManager.emit("selectActionMode",runMode)
+                # Modus und Aktionen gehören zum Zyklus: abwarten statt eigener Task
+                await self.eventManager.emit_and_wait("selectActionMode",runMode)
                 await self.eventManager.emit("DataRelease",vpdPub,haEvent=True)           
                 await self.eventManager.emit("LogForClient",vpdPub,haEvent=True)
                
@@ -552,6 +584,7 @@ class OpenGrowBox:
                         humidity = current.get('relative_humidity_2m', 60)
                         
                         _LOGGER.debug(f"{self.room} Open-Meteo: {temperature}°C, {humidity}%")
+                        await self.sharedBus.publish("outside", {"temperature": temperature, "humidity": humidity}, source=self.room)
                         await self.eventManager.emit("OutsiteData",{"temperature":temperature,"humidity":humidity},haEvent=True)
                     else:
                         _LOGGER.error(f"Open-Meteo API Error: {response.status}")
@@ -564,55 +597,66 @@ class OpenGrowBox:
             _LOGGER.error(f"Fetch Error Open-Meteo: {e}")
             return 20.0, 60.0
     
-    async def _handle_ambient_data(self, event):
+    async def _publish_ambient(self, vpdPub):
+        """Ambient-Raum: Werte für alle Räume auf den gemeinsamen Bus legen (HA-Event bleibt für Automationen)"""
+        await self.sharedBus.publish("ambient", {"temperature": vpdPub.AvgTemp, "humidity": vpdPub.AvgHum}, source=self.room)
+        await self.eventManager.emit("AmbientData",vpdPub,haEvent=True)
+
+    def detachSharedBus(self):
+        """Vom gemeinsamen Bus und vom Registry-Listener abmelden (beim Entladen des Raums)"""
+        for unsubscribe in self._busUnsubscribers:
+            unsubscribe()
+        self._busUnsubscribers.clear()
+        if self._registryUnsub:
+            self._registryUnsub()
+            self._registryUnsub = None
+
+    @staticmethod
+    def _sharedDewPoint(temp, hum):
+        if not isinstance(hum, (int, float)) or hum <= 0:
+            return "unavailable"
+        return calculate_dew_point(temp, hum)
+
+    async def _applySharedSnapshots(self):
+        """Beim Start die letzten bekannten Ambient-/Außenwerte direkt vom Bus übernehmen"""
         if self.room.lower() == "ambient":
             return
+        for topic, handler in (("ambient", self._handle_ambient_data), ("outside", self._handle_outsite_data)):
+            snapshot = self.sharedBus.latest(topic)
+            if snapshot:
+                await handler(topic, snapshot)
 
-        logging.debug(f"Received Ambient Data {self.room}")
-
-        payload = event.data
-
-        temp = payload.get("AvgTemp")
-        hum = payload.get("AvgHum")
+    async def _handle_ambient_data(self, topic, snapshot):
+        _LOGGER.debug(f"Received Ambient Data {self.room}")
+        temp = snapshot["values"].get("temperature")
+        hum = snapshot["values"].get("humidity")
 
         self.dataStore.setDeep("tentData.AmbientTemp", temp)
         self.dataStore.setDeep("tentData.AmbientHum", hum)
 
-        await _update_specific_sensor("ogb_ambienttemperature_", self.room, temp, self.hass)
-        await _update_specific_sensor("ogb_ambienthumidity_", self.room, hum, self.hass)
-
-    async def _handle_outsite_data(self, event):
-        if self.room.lower() == "ambient":
-            return
-
-        logging.debug(f"Received Outsite Data {self.room} - {event}")
-
-        payload = event.data
+        update_sensors_batch({
+            "ogb_ambienttemperature_": temp,
+            "ogb_ambienthumidity_": hum,
+            "ogb_ambientdewpoint_": self._sharedDewPoint(temp, hum),
+        }, self.room, self.hass)
 
-        temp = payload.get("temperature")
-        hum = payload.get("humidity")
+    async def _handle_outsite_data(self, topic, snapshot):
+        _LOGGER.debug(f"Received Outsite Data {self.room} - {snapshot}")
+        temp = snapshot["values"].get("temperature")
+        hum = snapshot["values"].get("humidity")
 
         self.dataStore.setDeep("tentData.OutsiteTemp", temp)
         self.dataStore.setDeep("tentData.OutsiteHum", hum)
 
-        await _update_specific_sensor("ogb_outsitetemperature_", self.room, temp, self.hass)
-        await _update_specific_sensor("ogb_outsitehumidity_", self.room, hum, self.hass)
-
-    async def lightSheduleUpdate(self,data):
-        lightbyOGBControl = self.dataStore.getDeep("controlOptions.lightbyOGBControl")
-        if lightbyOGBControl == False: return
-        
-        lightChange = await self.update_light_state()
-
-        if lightChange == None: return
-        self.dataStore.setDeep("isPlantDay.islightON",lightChange)
-        _LOGGER.info(f"{self.name}: Lichtstatus geprüft und aktualisiert für {self.room} Lichstatus ist {lightChange}")
+        update_sensors_batch({
+            "ogb_outsitetemperature_": temp,
+            "ogb_outsitehumidity_": hum,
+            "ogb_outsitedewpoint_": self._sharedDewPoint(temp, hum),
+        }, self.room, self.hass)
 
-        await self.eventManager.emit("toggleLight",lightChange)
-            
     async def update_minMax_Sensors(self):
         """
-        Update Werte aller relevanten number-Entities über den Home Assistant Service `number.set_value`.
+        Update Werte aller relevanten number-Entities über den Raum-Snapshot des Coordinators.
         Ungültige Werte (None, "unknown", "unbekannt") werden übersprungen.
         """
         entities = {
@@ -637,24 +681,16 @@ class OpenGrowBox:
 
         _LOGGER.info(f"Setting defaults for stage '{currentPlantStage}': {PlantStageValues}")
 
-        async def set_value(entity_id, value):
+        # Alle Entities in einem Snapshot-Update aktualisieren
+        updates = {}
+        for key, entity_id in entities.items():
+            value = values.get(key)
             if value in (None, "unknown", "unbekannt"):
                 _LOGGER.warning(f"Skipping update for {entity_id} because value is invalid: {value}")
-                return
-            await self.hass.services.async_call(
-                domain="number",
-                service="set_value",
-                service_data={
-                    "entity_id": entity_id,
-                    "value": value
-                },
-                blocking=True
-            )
-            _LOGGER.info(f"Updated {entity_id} to {value}")
-
-        # Alle Entities aktualisieren
-        for key, entity_id in entities.items():
-            await set_value(entity_id, values.get(key))
+                continue
+            updates[entity_id] = value
+        await update_options_batch(updates, self.room, self.hass)
+        _LOGGER.info(f"Updated {updates}")
 
     # Helpers
     def _stringToBool(self,stringToBool):
@@ -663,22 +699,24 @@ class OpenGrowBox:
         if stringToBool == "NO":
             return False
 
-    def _update_work_data_array(self, data_array, entity):
+    def _update_work_data_array(self, data_array, entity, value=None):
         """
         Aktualisiert alle passenden Einträge im WorkData-Array basierend to der übergebenen Entität.
         """
         _LOGGER.info(f"{self.room}: Checking Update-ITEM: {entity} in {data_array}")  
+        if value is None:
+            value = entity.newState[0]
         found = False
         for item in data_array:
             if item["entity_id"] == entity.Name:
-                item["value"] = entity.newState[0]
+                item["value"] = value
                 found = True
                 _LOGGER.info(f"{self.room}:Update-ITEM Found: {entity} → {item['value']}")
         
         if not found:
             data_array.append({
                 "entity_id": entity.Name,
-                "value": entity.newState[0]
+                "value": value
             })
             _LOGGER.info(f"{self.room}:Update-ITEM NOT Found: {entity} → hinzugefügt")
         
@@ -715,9 +753,11 @@ class OpenGrowBox:
             perfectVPD = perfections["perfection"]
             perfectVPDMin = perfections["perfect_min"]
             perfectVPDMax = perfections["perfect_max"]          
-            await _update_specific_sensor("ogb_current_vpd_target_",self.room,perfectVPD,self.hass)
-            await _update_specific_sensor("ogb_current_vpd_target_min_",self.room,perfectVPDMin,self.hass)
-            await _update_specific_sensor("ogb_current_vpd_target_max_",self.room,perfectVPDMax,self.hass)
+            update_sensors_batch({
+                "ogb_current_vpd_target_": perfectVPD,
+                "ogb_current_vpd_target_min_": perfectVPDMin,
+                "ogb_current_vpd_target_max_": perfectVPDMax,
+            }, self.room, self.hass)
 
             # Werte in `dataStore` setzen
             self.dataStore.setDeep("vpd.range", vpd_range)
@@ -742,42 +782,6 @@ class OpenGrowBox:
         except Exception as e:
             _LOGGER.error(f"{self.room}: Fehler beim Verarbeiten der PlantStage-Daten: {e}")
 
-    async def update_light_state(self):
-        """
-        Update Status from `lightOn`, basierend to den Lichtzeiten.
-        """
-
-        lightOnTime = self.dataStore.getDeep("isPlantDay.lightOnTime")
-        lightOffTime = self.dataStore.getDeep("isPlantDay.lightOffTime")
-
-        try:
-            if lightOnTime == "" or lightOffTime == "":
-                _LOGGER.error("Lichtzeiten fehlen. Bitte sicherstellen, dass 'lightOnTime' und 'lightOffTime' gesetzt sind.")
-                return None
-
-
-            # Konvertiere Zeitstrings in `time`-Objekte
-            light_on_time = datetime.strptime(lightOnTime, "%H:%M:%S").time()
-            light_off_time = datetime.strptime(lightOffTime, "%H:%M:%S").time()
-
-            # Hole die aktuelle Zeit
-            current_time = datetime.now().time()
-
-            # Prüfe, ob die aktuelle Zeit im Bereich liegt
-            if light_on_time < light_off_time:
-                # Normaler Zyklus (z. B. 08:00 bis 20:00)
-                is_light_on = light_on_time <= current_time < light_off_time
-  
-            else:
-                # Über Mitternacht (z. B. 20:00 bis 08:00)
-                is_light_on = current_time >= light_on_time or current_time < light_off_time
-   
-            # Update Status im DataStore
-            return is_light_on
-
-        except Exception as e:
-            _LOGGER.error(f"{self.room} Fehler beim Updaten des Lichtstatus: {e}")       
-
     async def handle_new_targets(self,data):
         plantStage = self.dataStore.get("plantStage")
         # Daten aus dem `plantStages`-Dictionary abrufen
@@ -804,9 +808,11 @@ class OpenGrowBox:
         perfectVPD = perfections["perfection"]
         perfectVPDMin = perfections["perfect_min"]
         perfectVPDMax = perfections["perfect_max"]          
-        await _update_specific_sensor("ogb_current_vpd_target_",self.room,perfectVPD,self.hass)
-        await _update_specific_sensor("ogb_current_vpd_target_min_",self.room,perfectVPDMin,self.hass)
-        await _update_specific_sensor("ogb_current_vpd_target_max_",self.room,perfectVPDMax,self.hass)
+        update_sensors_batch({
+            "ogb_current_vpd_target_": perfectVPD,
+            "ogb_current_vpd_target_min_": perfectVPDMin,
+            "ogb_current_vpd_target_max_": perfectVPDMax,
+        }, self.room, self.hass)
         self.dataStore.setDeep("vpd.perfection",perfectVPD)
         self.dataStore.setDeep("vpd.perfectMin",vpd_range[0])
         self.dataStore.setDeep("vpd.perfectMax",vpd_range[1])
@@ -916,9 +922,11 @@ class OpenGrowBox:
             min_vpd = value - tolerance_value
             max_vpd = value + tolerance_value
 
-            await _update_specific_sensor("ogb_current_vpd_target_", self.room, value, self.hass)
-            await _update_specific_sensor("ogb_current_vpd_target_min_", self.room, min_vpd, self.hass)
-            await _update_specific_sensor("ogb_current_vpd_target_max_", self.room, max_vpd, self.hass)
+            update_sensors_batch({
+                "ogb_current_vpd_target_": value,
+                "ogb_current_vpd_target_min_": min_vpd,
+                "ogb_current_vpd_target_max_": max_vpd,
+            }, self.room, self.hass)
 
     async def _update_vpd_tolerance(self,data):
         """
@@ -931,6 +939,14 @@ class OpenGrowBox:
             self.dataStore.setDeep("vpd.tolerance",value)
 
 
+    async def _update_cycle_budget(self,data):
+        """
+        Update Cycle-Time Budget (Sekunden)
+        """
+        value = data.newState[0]
+        if value == None: return
+        self.profiler.setBudget(value)
+
     # Lights
     async def _update_lightOn_time(self,data):
         """
@@ -1481,10 +1497,6 @@ class OpenGrowBox:
         """
         Update Plant Grow Times
         """
-        planttotaldays_entity = f"sensor.ogb_planttotaldays_{self.room.lower()}"
-        totalbloomdays_entity = f"sensor.ogb_totalbloomdays_{self.room.lower()}"
-        remainingTime_entity = f"sensor.ogb_chopchoptime_{self.room.lower()}"
-
         bloomSwitch = self.dataStore.getDeep("plantDates.bloomswitchdate")
         growstart = self.dataStore.getDeep("plantDates.growstartdate")
         breederDays = self.dataStore.getDeep("plantDates.breederbloomdays")
@@ -1534,27 +1546,11 @@ class OpenGrowBox:
         self.dataStore.setDeep("plantDates.daysToChopChop", remaining_bloom_days)
 
         # Sensoren updaten
-        try:
-            await self.hass.services.async_call(
-                domain="opengrowbox",
-                service="update_sensor",
-                service_data={"entity_id": planttotaldays_entity, "value": planttotaldays},
-                blocking=True
-            )
-            await self.hass.services.async_call(
-                domain="opengrowbox",
-                service="update_sensor",
-                service_data={"entity_id": totalbloomdays_entity, "value": totalbloomdays},
-                blocking=True
-            )
-            await self.hass.services.async_call(
-                domain="opengrowbox",
-                service="update_sensor",
-                service_data={"entity_id": remainingTime_entity, "value": remaining_bloom_days},
-                blocking=True
-            )
-        except Exception as e:
-            _LOGGER.error(f"Fehler beim Updaten der Sensoren '{planttotaldays_entity}' und '{totalbloomdays_entity}': {e}")
+        update_sensors_batch({
+            "ogb_planttotaldays_": planttotaldays,
+            "ogb_totalbloomdays_": totalbloomdays,
+            "ogb_chopchoptime_": remaining_bloom_days,
+        }, self.room, self.hass)
 
     async def _autoUpdatePlantStages(self,data):
         timenow = datetime.now() 
@@ -1647,12 +1643,15 @@ class OpenGrowBox:
 
 
     ## Debug NOTES
+    def _dumpDecisions(self, data=None):
+        """Gibt den Entscheidungs-Ringpuffer des Raumes ins Log aus"""
+        decisions = dumpDecisions(self.room)
+        _LOGGER.warning(f"{self.room}: Last {len(decisions)} Decisions: {decisions}")
+        return decisions
+
     def _debugState(self):
         ##warning
-        devices = self.dataStore.get("devices")
-        tentData = self.dataStore.get("tentData")
-        controlOptions = self.dataStore.get("controlOptions")
-        workdata = self.dataStore.get("workData")
-        vpdData = self.dataStore.get("vpd")
-        caps = self.dataStore.get("capabilities")
-        _LOGGER.debug(f"DEBUGSTATE: {self.room} WorkData: {workdata} DEVICES:{devices} TentData {tentData} CONTROLOPTIONS:{controlOptions}  VPDDATA {vpdData} CAPS:{caps} ")
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        # Begrenzte, gecachte Sektionen statt des kompletten States bei jeder VPD-Änderung
+        _LOGGER.debug("DEBUGSTATE: %s %s", self.room, self.diagnostics.export(DEBUG_SECTIONS)["sections"])
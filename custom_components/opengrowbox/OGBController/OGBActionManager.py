@@ -8,9 +8,12 @@ from datetime import datetime, timedelta
 _LOGGER = logging.getLogger(__name__)
 
 from .OGBDataClasses.OGBPublications import OGBActionPublication,OGBWeightPublication,OGBHydroAction,OGBWaterAction,OGBRetrieveAction
+from .OGBActionRules import OGBActionRuleEngine
+from .OGBResponseLearner import OGBResponseLearner
+from .utils.ogbLogging import OGBStructuredLogger
 
 class OGBActionManager:
-    def __init__(self, hass, dataStore, eventManager,room):
+    def __init__(self, hass, dataStore, eventManager,room,capRegistry):
         self.name = "OGB Device Manager"
         self.hass = hass
         self.room = room
@@ -33,6 +36,13 @@ class OGBActionManager:
         }
         
         self.adaptiveCooldownEnabled = True
+        # Gelernte Reaktionszeiten der Geräte ersetzen die festen Cooldowns
+        self.responseLearner = OGBResponseLearner(self.dataStore, self.room)
+        self.ogbLog = OGBStructuredLogger(_LOGGER, self.room)
+
+        # Kompilierte Regel-Tabelle (Neukompilierung nur bei geänderten Capabilities)
+        self.capRegistry = capRegistry
+        self.ruleEngine = OGBActionRuleEngine(self.room, self.dataStore, self.capRegistry)
         
         ## Events Register
         self.eventManager.on("increase_vpd", self.increase_action)
@@ -41,6 +51,7 @@ class OGBActionManager:
 
         self.eventManager.on("PIDActions",self.PIDActions)    
         self.eventManager.on("MPCActions",self.MPCActions)
+        self.eventManager.on("DataRelease", self._observeResponse)
         
         # Water Events
         self.eventManager.on("PumpAction", self.PumpAction) 
@@ -73,8 +84,8 @@ class OGBActionManager:
         return True
     
     def _calculateAdaptiveCooldown(self, capability, deviation):
-        """Berechnet adaptive Cooldown-Zeit basierend auf Abweichung"""
-        baseCooldown = self.defaultCooldownMinutes.get(capability, 2)
+        """Berechnet adaptive Cooldown-Zeit basierend auf gelernter Reaktionszeit und Abweichung"""
+        baseCooldown = self.responseLearner.cooldownMinutes(capability, self.defaultCooldownMinutes.get(capability, 2))
         
         if not self.adaptiveCooldownEnabled:
             return baseCooldown
@@ -109,6 +120,17 @@ class OGBActionManager:
         
         _LOGGER.debug(f"{self.room}: {capability} '{action}' registriert, Cooldown bis {cooldownUntil}")
 
+        # Reaktion des Raums auf diese Aktion beobachten
+        self.responseLearner.startObservation(
+            capability, action,
+            self.dataStore.getDeep("tentData.temperature"),
+            self.dataStore.getDeep("tentData.humidity"),
+        )
+
+    async def _observeResponse(self, vpdPub):
+        """Neue Durchschnittswerte an den Reaktions-Lerner weitergeben"""
+        self.responseLearner.observe(getattr(vpdPub, "AvgTemp", None), getattr(vpdPub, "AvgHum", None))
+
     def _filterActionsByDampening(self, actionMap, tempDeviation=0, humDeviation=0):
         """Filtert Actions basierend auf Dampening-Regeln"""
         filteredActions = []
@@ -143,11 +165,11 @@ class OGBActionManager:
         emergencyConditions = []
         
         # FIXED: Lower threshold for emergency detection
-        if tentData["temperature"] > tentData["maxTemp"]:
+        if tentData.temperature > tentData.maxTemp:
             emergencyConditions.append("critical_overheat")
-        if tentData["temperature"] < tentData["minTemp"]:
+        if tentData.temperature < tentData.minTemp:
             emergencyConditions.append("critical_cold")
-        if tentData["dewpoint"] >= tentData["temperature"] - 0.5:
+        if tentData.dewpoint >= tentData.temperature - 0.5:
             emergencyConditions.append("immediate_condensation_risk")
         if tentData.get("humidity", 0) > 85:
             emergencyConditions.append("critical_humidity")
@@ -187,7 +209,8 @@ class OGBActionManager:
                 "last_action": history.get("last_action"),
                 "action_type": history.get("action_type"),
                 "cooldown_remaining_seconds": max(0, cooldownRemaining.total_seconds()),
-                "is_blocked": now < history.get("cooldown_until", now)
+                "is_blocked": now < history.get("cooldown_until", now),
+                "learned_cooldown_minutes": self.responseLearner.cooldownMinutes(capability, None),
             }
             
         return status
@@ -231,35 +254,35 @@ class OGBActionManager:
         
         actionMap = []
         if capabilities["canExhaust"]["state"]:
-            actionPublication = OGBActionPublication(capability="canExhaust",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canExhaust", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canIntake"]["state"]:
-            actionPublication = OGBActionPublication(capability="canIntake",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canIntake", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canVentilate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canVentilate",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canVentilate", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canHumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHumidify",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHumidify", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canDehumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canDehumidify",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canDehumidify", "Increase", actionMessage)
             actionMap.append(actionPublication)            
         if capabilities["canHeat"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHeat",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHeat", "Increase", actionMessage)
             actionMap.append(actionPublication)                        
         if capabilities["canCool"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCool",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCool", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canClimate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canClimate",action="Eval",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canClimate", "Eval", actionMessage)
             actionMap.append(actionPublication)                  
         if capabilities["canCO2"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCO2",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCO2", "Increase", actionMessage)
             actionMap.append(actionPublication)               
         if vpdLightControl == True:
             if capabilities["canLight"]["state"]:
-                actionPublication = OGBActionPublication(capability="canLight",action="Increase",Name=self.room,message=actionMessage,priority="")
+                actionPublication = OGBActionPublication.of(self.room, "canLight", "Increase", actionMessage)
                 actionMap.append(actionPublication)               
             else:
                 return
@@ -277,35 +300,35 @@ class OGBActionManager:
         
         actionMap = []
         if capabilities["canExhaust"]["state"]:
-            actionPublication = OGBActionPublication(capability="canExhaust",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canExhaust", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canIntake"]["state"]:
-            actionPublication = OGBActionPublication(capability="canIntake",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canIntake", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canVentilate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canVentilate",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canVentilate", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canHumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHumidify",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHumidify", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canDehumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canDehumidify",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canDehumidify", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canHeat"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHeat",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHeat", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canCool"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCool",action="Increase",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCool", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canClimate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canClimate",action="Eval",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canClimate", "Eval", actionMessage)
             actionMap.append(actionPublication)      
         if capabilities["canCO2"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCO2",action="Reduce",Name=self.room,message=actionMessage,priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCO2", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if vpdLightControl == True:
             if capabilities["canLight"]["state"]:
-                actionPublication = OGBActionPublication(capability="canLight",action="Reduce",Name=self.room,message=actionMessage,priority="")
+                actionPublication = OGBActionPublication.of(self.room, "canLight", "Reduce", actionMessage)
                 actionMap.append(actionPublication)
             else:
                 return
@@ -320,35 +343,35 @@ class OGBActionManager:
         
         actionMap = []
         if capabilities["canExhaust"]["state"]:
-            actionPublication = OGBActionPublication(capability="canExhaust", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canExhaust", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canIntake"]["state"]:
-            actionPublication = OGBActionPublication(capability="canIntake", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canIntake", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canVentilate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canVentilate", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canVentilate", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canHumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHumidify", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHumidify", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canDehumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canDehumidify", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canDehumidify", "Increase", actionMessage)
             actionMap.append(actionPublication)            
         if capabilities["canHeat"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHeat", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHeat", "Increase", actionMessage)
             actionMap.append(actionPublication)                        
         if capabilities["canCool"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCool", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCool", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canClimate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canClimate", action="Eval", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canClimate", "Eval", actionMessage)
             actionMap.append(actionPublication)                  
         if capabilities["canCO2"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCO2", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCO2", "Increase", actionMessage)
             actionMap.append(actionPublication)               
         if vpdLightControl == True:
             if capabilities["canLight"]["state"]:
-                actionPublication = OGBActionPublication(capability="canLight", action="Increase", Name=self.room, message=actionMessage, priority="")
+                actionPublication = OGBActionPublication.of(self.room, "canLight", "Increase", actionMessage)
                 actionMap.append(actionPublication)               
             
         await self.checkLimitsAndPublicateWithDampening(actionMap)
@@ -360,35 +383,35 @@ class OGBActionManager:
         
         actionMap = []
         if capabilities["canExhaust"]["state"]:
-            actionPublication = OGBActionPublication(capability="canExhaust", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canExhaust", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canIntake"]["state"]:
-            actionPublication = OGBActionPublication(capability="canIntake", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canIntake", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canVentilate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canVentilate", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canVentilate", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canHumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHumidify", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHumidify", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canDehumidify"]["state"]:
-            actionPublication = OGBActionPublication(capability="canDehumidify", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canDehumidify", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canHeat"]["state"]:
-            actionPublication = OGBActionPublication(capability="canHeat", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canHeat", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canCool"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCool", action="Increase", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCool", "Increase", actionMessage)
             actionMap.append(actionPublication)
         if capabilities["canClimate"]["state"]:
-            actionPublication = OGBActionPublication(capability="canClimate", action="Eval", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canClimate", "Eval", actionMessage)
             actionMap.append(actionPublication)      
         if capabilities["canCO2"]["state"]:
-            actionPublication = OGBActionPublication(capability="canCO2", action="Reduce", Name=self.room, message=actionMessage, priority="")
+            actionPublication = OGBActionPublication.of(self.room, "canCO2", "Reduce", actionMessage)
             actionMap.append(actionPublication)
         if vpdLightControl == True:
             if capabilities["canLight"]["state"]:
-                actionPublication = OGBActionPublication(capability="canLight", action="Reduce", Name=self.room, message=actionMessage, priority="")
+                actionPublication = OGBActionPublication.of(self.room, "canLight", "Reduce", actionMessage)
                 actionMap.append(actionPublication)
             
         await self.checkLimitsAndPublicateWithDampening(actionMap)
@@ -433,7 +456,7 @@ class OGBActionManager:
 
     # Premium Actions
     async def PIDActions(self, premActions):
-        _LOGGER.warning(f"{self.room}: Start PID Actions Handling")
+        self.ogbLog.info("pid.start", "Start PID Actions Handling")
         
         controlData = premActions.get("actionData")
         actionData = controlData.get("controlCommands")
@@ -479,43 +502,35 @@ class OGBActionManager:
                 #    #await self.NightHoldFallBack(actionMap)
                 #    return None    
 
+                self.ogbLog.decision("pid.action", logging.INFO, device=requestedDevice, action=deviceAction)
+
                 # Aktionen basierend auf den Fähigkeiten
                 if requestedDevice == "exhaust":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Exhaust", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Exhaust.")
                 if requestedDevice == "intake":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Intake", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Intake.")
                 if requestedDevice == "ventilate":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Ventilation", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Ventilation.")
                 if requestedDevice == "humidify":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Humidifier", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Humidifier.")
                 if requestedDevice == "dehumidify":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Dehumidifier", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Dehumidifier.")
                 if requestedDevice == "heat":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Heater", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Heater.")
                 if requestedDevice == "cool":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Cooler", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Cooler.")
                 if requestedDevice == "climate":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Climate", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} CO2.")
                 if requestedDevice == "co2":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} CO2", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} CO2.")
                 if requestedDevice == "light":
                     await self.eventManager.emit(f"{deviceAction.capitalize()} Light", deviceAction)
-                    _LOGGER.warning(f"{self.room}: {deviceAction.capitalize()} Light.")
         
         await self.eventManager.emit("SaveState",True)   
 
     async def MPCActions(self, premActions):
         actionData = premActions.get("actionData")
-        _LOGGER.warning(f"{self.room}: Start PID Actions Handling with data {actionData}")
+        self.ogbLog.info("mpc.start", "Start MPC Actions Handling with data %s", actionData)
         # Gruppiere nach Gerät um Konflikte zu erkennen
         device_actions = {}
         for action in actionData:
@@ -549,12 +564,14 @@ class OGBActionManager:
                     #await self.NightHoldFallBack(actionMap)
                     return None    
 
+                self.ogbLog.decision("mpc.action", logging.INFO, device=requestedDevice, action=deviceAction)
+
                 # Aktionen basierend auf den Fähigkeiten
                 if requestedDevice == "exhaust":
                     await self.eventManager.emit(f"{deviceAction} Exhaust", deviceAction)
                     _LOGGER.debug(f"{self.room}: {deviceAction} Exhaust.")
                 if requestedDevice == "intake":
-                    await self.eventManager.emit(f"{deviceAction} Iintake", deviceAction)
+                    await self.eventManager.emit(f"{deviceAction} Intake", deviceAction)
                     _LOGGER.debug(f"{self.room}: {deviceAction} Intake.")
                 if requestedDevice == "ventilate":
                     await self.eventManager.emit(f"{deviceAction} Ventilation", deviceAction)
@@ -622,38 +639,36 @@ class OGBActionManager:
         weightMessage = ""
         
         # Temperaturabweichung prüfen
-        if tentData["temperature"] > tentData["maxTemp"]:
-            tempDeviation = round((tentData["temperature"] - tentData["maxTemp"]) * tempWeight, 2)
+        if tentData.temperature > tentData.maxTemp:
+            tempDeviation = round((tentData.temperature - tentData.maxTemp) * tempWeight, 2)
             weightMessage = f"Temp To High: Deviation {tempDeviation}"
-        elif tentData["temperature"] < tentData["minTemp"]:
-            tempDeviation = round((tentData["temperature"] - tentData["minTemp"]) * tempWeight, 2)
+        elif tentData.temperature < tentData.minTemp:
+            tempDeviation = round((tentData.temperature - tentData.minTemp) * tempWeight, 2)
             weightMessage = f"Temp To Low: Deviation {tempDeviation}"
             
         # Humdiditysabweichung prüfen
-        if tentData["humidity"] > tentData["maxHumidity"]:
-            humDeviation = round((tentData["humidity"] - tentData["maxHumidity"]) * humWeight, 2)
+        if tentData.humidity > tentData.maxHumidity:
+            humDeviation = round((tentData.humidity - tentData.maxHumidity) * humWeight, 2)
             weightMessage = f"Humidity To High: Deviation {humDeviation}"
-        elif tentData["humidity"] < tentData["minHumidity"]:
-            humDeviation = round((tentData["humidity"] - tentData["minHumidity"]) * humWeight, 2)
+        elif tentData.humidity < tentData.minHumidity:
+            humDeviation = round((tentData.humidity - tentData.minHumidity) * humWeight, 2)
             weightMessage = f"Humidity To Low: Deviation {humDeviation}"
 
         WeightPublication = OGBWeightPublication(Name=self.room,message=weightMessage,tempDeviation=tempDeviation,humDeviation=humDeviation,tempWeight=tempWeight,humWeight=humWeight)
         await self.eventManager.emit("LogForClient",WeightPublication,haEvent=True)   
         
-        # **Capabilities abrufen**
-        caps = self.dataStore.get("capabilities")
-
         # Bestimme den VPD-Status für optimale Geräteauswahl
         vpdStatus = self._determineVPDStatus(tempDeviation, humDeviation, tentData)
-        optimalDevices = self.getRoomCaps(vpdStatus)
 
-        # Erweitere actionMap basierend auf Abweichungen - aber intelligent
-        enhancedActionMap = self._enhanceActionMap(actionMap, tempDeviation, humDeviation, tentData, caps, vpdLightControl, islightON, optimalDevices)
+        # Erweitere actionMap per Regel-Tabelle
+        enhancedActionMap, firedRules = self.ruleEngine.evaluate(actionMap, tempDeviation, humDeviation, vpdStatus, vpdLightControl, islightON)
+        _LOGGER.debug(f"{self.room}: Regeln ausgelöst: {firedRules}")
         
         # Löse Konflikte auf - aber behalte mehrere Actions pro Capability bei
-        finalActionMap = self._resolveActionConflicts(enhancedActionMap)
+        finalActionMap = self.ruleEngine.resolveConflicts(enhancedActionMap)
         
-        await self.publicationActionHandler(finalActionMap)
+        with self.eventManager.stage("devices"):
+            await self.publicationActionHandler(finalActionMap)
         await self.eventManager.emit("LogForClient", finalActionMap, haEvent=True)
 
     async def checkLimitsAndPublicateWithDampening(self, actionMap):
@@ -692,18 +707,18 @@ class OGBActionManager:
         humDeviation = 0
         weightMessage = ""
         
-        if tentData["temperature"] > tentData["maxTemp"]:
-            tempDeviation = round((tentData["temperature"] - tentData["maxTemp"]) * tempWeight, 2)
+        if tentData.temperature > tentData.maxTemp:
+            tempDeviation = round((tentData.temperature - tentData.maxTemp) * tempWeight, 2)
             weightMessage = f"Temp To High: Deviation {tempDeviation}"
-        elif tentData["temperature"] < tentData["minTemp"]:
-            tempDeviation = round((tentData["temperature"] - tentData["minTemp"]) * tempWeight, 2)
+        elif tentData.temperature < tentData.minTemp:
+            tempDeviation = round((tentData.temperature - tentData.minTemp) * tempWeight, 2)
             weightMessage = f"Temp To Low: Deviation {tempDeviation}"
             
-        if tentData["humidity"] > tentData["maxHumidity"]:
-            humDeviation = round((tentData["humidity"] - tentData["maxHumidity"]) * humWeight, 2)
+        if tentData.humidity > tentData.maxHumidity:
+            humDeviation = round((tentData.humidity - tentData.maxHumidity) * humWeight, 2)
             weightMessage = f"Humidity To High: Deviation {humDeviation}"
-        elif tentData["humidity"] < tentData["minHumidity"]:
-            humDeviation = round((tentData["humidity"] - tentData["minHumidity"]) * humWeight, 2)
+        elif tentData.humidity < tentData.minHumidity:
+            humDeviation = round((tentData.humidity - tentData.minHumidity) * humWeight, 2)
             weightMessage = f"Humidity To Low: Deviation {humDeviation}"
 
         WeightPublication = OGBWeightPublication(Name=self.room, message=weightMessage, tempDeviation=tempDeviation, humDeviation=humDeviation, tempWeight=tempWeight, humWeight=humWeight)
@@ -714,15 +729,12 @@ class OGBActionManager:
         if emergencyConditions:
             self._clearCooldownForEmergency(emergencyConditions)
         
-        # Capabilities abrufen
-        caps = self.dataStore.get("capabilities")
-
         # VPD-Status bestimmen
         vpdStatus = self._determineVPDStatus(tempDeviation, humDeviation, tentData)
-        optimalDevices = self.getRoomCaps(vpdStatus)
 
-        # ActionMap erweitern
-        enhancedActionMap = self._enhanceActionMap(actionMap, tempDeviation, humDeviation, tentData, caps, vpdLightControl, islightON, optimalDevices)
+        # ActionMap per Regel-Tabelle erweitern
+        enhancedActionMap, firedRules = self.ruleEngine.evaluate(actionMap, tempDeviation, humDeviation, vpdStatus, vpdLightControl, islightON)
+        _LOGGER.debug(f"{self.room}: Regeln ausgelöst: {firedRules}")
         
         # Dampening anwenden
         dampenedActionMap = self._filterActionsByDampening(enhancedActionMap, tempDeviation, humDeviation)
@@ -754,13 +766,14 @@ class OGBActionManager:
                 return
         
         # Konflikte lösen
-        finalActionMap = self._resolveActionConflicts(dampenedActionMap)
+        finalActionMap = self.ruleEngine.resolveConflicts(dampenedActionMap)
         
         _LOGGER.info(f"{self.room}: Von {len(enhancedActionMap)} Aktionen werden {len(finalActionMap)} ausgeführt")
         
         # Nur ausführen wenn Aktionen vorhanden sind
         if finalActionMap:
-            await self.publicationActionHandler(finalActionMap)
+            with self.eventManager.stage("devices"):
+                await self.publicationActionHandler(finalActionMap)
             await self.eventManager.emit("LogForClient", finalActionMap, haEvent=True)
         else:
             _LOGGER.debug(f"{self.room}: Keine Aktionen nach Konfliktlösung übrig")
@@ -924,25 +937,26 @@ class OGBActionManager:
 
         # Neue Action-Liste mit Reduced-Actions für alle anderen Geräte erstellen
         reducedActions = [
-            OGBActionPublication(capability=action.capability, action=fallBackAction,Name=self.room,message="VPD-NightHold Device Shutdown",priority="low")
+            OGBActionPublication.of(self.room, action.capability, fallBackAction, "VPD-NightHold Device Shutdown", "low")
             for action in actionMap if action.capability in modCaps
         ]
 
         # Wenn es gefilterte oder reduzierte Aktionen gibt, verarbeiten
         if filteredActions or reducedActions:
-            await self.publicationActionHandler(filteredActions + reducedActions)
+            with self.eventManager.stage("devices"):
+                await self.publicationActionHandler(filteredActions + reducedActions)
 
     def _determineVPDStatus(self, tempDeviation, humDeviation, tentData):
         """Bestimmt den primären VPD-Status basierend auf Abweichungen und kritischen Werten"""
         
         # Notfälle haben Priorität
-        if tentData["temperature"] > tentData["maxTemp"]:
+        if tentData.temperature > tentData.maxTemp:
             return "critical_hot"
-        elif tentData["temperature"] < tentData["minTemp"]:
+        elif tentData.temperature < tentData.minTemp:
             return "critical_cold"
-        elif tentData["dewpoint"] >= tentData["temperature"]:
+        elif tentData.dewpoint >= tentData.temperature:
             return "dewpoint_risk"
-        elif tentData["humidity"] > tentData["maxHumidity"]:
+        elif tentData.humidity > tentData.maxHumidity:
             return "humidity_risk"
         
         # Kombinierte Bewertung
@@ -963,410 +977,3 @@ class OGBActionManager:
             currentVPD = self.dataStore.getDeep("vpd.current")
             perfectionVPD = self.dataStore.getDeep("vpd.perfection")
             return "vpd_low" if currentVPD < perfectionVPD else "vpd_high"
-
-    def _enhanceActionMap(self, baseActionMap, tempDeviation, humDeviation, tentData, caps, vpdLightControl, islightON, optimalDevices):
-        """Erweitert die ActionMap intelligent basierend auf Bedingungen"""
-        
-        enhancedMap = list(baseActionMap)  # Kopiere ursprüngliche Actions
-        
-        # Aktionen basierend auf Abweichungen hinzufügen
-        if tempDeviation > 0 or humDeviation > 0:
-            enhancedMap.extend(self._getDeviationActions(tempDeviation, humDeviation, caps, vpdLightControl))
-        
-        # Notfallmaßnahmen hinzufügen
-        enhancedMap.extend(self._getEmergencyActions(tentData, caps, vpdLightControl))
-        
-        # CO2-Management hinzufügen
-        enhancedMap.extend(self._getCO2Actions(caps, islightON))
-        
-        # Priorisiere Actions für optimale Geräte
-        return self._prioritizeOptimalDevices(enhancedMap, optimalDevices, caps)
-
-    def _getDeviationActions(self, tempDeviation, humDeviation, caps, vpdLightControl):
-        """Erstellt Actions basierend auf Temperatur- und Humdiditysabweichungen mit Pufferzonen"""
-       
-        actions = []
-       
-        # Temperature buffer zones (in degrees)
-        HEATER_BUFFER = 2.0 # Don't use heater within 2°C of maxTemp
-        COOLER_BUFFER = 2.0 # Don't use cooler within 2°C of minTemp
-       
-        # Get current temperature and limits
-        tentData = self.dataStore.get("tentData")
-        current_temp = tentData["temperature"]
-        max_temp = tentData["maxTemp"]
-        min_temp = tentData["minTemp"]
-       
-        # Calculate buffer zones
-        heater_cutoff_temp = max_temp - HEATER_BUFFER
-        cooler_cutoff_temp = min_temp + COOLER_BUFFER
-       
-        if tempDeviation > 0 and humDeviation > 0:
-            # High Temperature + High Humidity
-            actionMessage = f"High Temperature + High Humidity in {self.room}"
-            if caps.get("canDehumidify", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canDehumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
-            if caps.get("canExhaust", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canExhaust", action="Increase", Name=self.room, message=actionMessage, priority=""))
-            if caps.get("canVentilate", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canVentilate", action="Increase", Name=self.room, message=actionMessage, priority=""))
-           
-            # Only use cooler if temperature is above buffer zone
-            if caps.get("canCool", {}).get("state", False) and current_temp > cooler_cutoff_temp:
-                actions.append(OGBActionPublication(capability="canCool", action="Increase", Name=self.room, message=actionMessage, priority=""))
-            else:
-                _LOGGER.debug(f"{self.room}: Cooler skipped - current temp {current_temp}°C within buffer of min temp {min_temp}°C")
-           
-            # NEW: Explicitly reduce heat in high-temp cases to conflict with any base heat Increase
-            if caps.get("canHeat", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canHeat", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
-               
-        elif tempDeviation > 0 and humDeviation < 0:
-            # High Temperature + Low Humidity
-            actionMessage = f"High Temperature + Low Humidity in {self.room}"
-            if caps.get("canHumidify", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canHumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
-           
-            # Only use cooler if temperature is above buffer zone
-            if caps.get("canCool", {}).get("state", False) and current_temp > cooler_cutoff_temp:
-                actions.append(OGBActionPublication(capability="canCool", action="Increase", Name=self.room, message=actionMessage, priority=""))
-            else:
-                _LOGGER.debug(f"{self.room}: Cooler skipped - current temp {current_temp}°C within buffer of min temp {min_temp}°C")
-               
-            if vpdLightControl and caps.get("canLight", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canLight", action="Reduce", Name=self.room, message=actionMessage, priority=""))
-           
-            # NEW: Explicitly reduce heat in high-temp cases to conflict with any base heat Increase
-            if caps.get("canHeat", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canHeat", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
-               
-        elif tempDeviation < 0 and humDeviation > 0:
-            # Low Temperature + High Humidity
-            actionMessage = f"Low Temperature + High Humidity in {self.room}"
-            if caps.get("canDehumidify", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canDehumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
-           
-            # Only use heater if temperature is below buffer zone
-            if caps.get("canHeat", {}).get("state", False) and current_temp < heater_cutoff_temp:
-                actions.append(OGBActionPublication(capability="canHeat", action="Increase", Name=self.room, message=actionMessage, priority=""))
-            else:
-                _LOGGER.debug(f"{self.room}: Heater skipped - current temp {current_temp}°C within buffer of max temp {max_temp}°C")
-               
-            if caps.get("canExhaust", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canExhaust", action="Increase", Name=self.room, message=actionMessage, priority=""))
-           
-            # NEW: Explicitly reduce cooling in low-temp cases to avoid worsening
-            if caps.get("canCool", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canCool", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
-               
-        elif tempDeviation < 0 and humDeviation < 0:
-            # Low Temperature + Low Humidity
-            actionMessage = f"Low Temperature + Low Humidity in {self.room}"
-            if caps.get("canHumidify", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canHumidify", action="Increase", Name=self.room, message=actionMessage, priority=""))
-           
-            # Only use heater if temperature is below buffer zone
-            if caps.get("canHeat", {}).get("state", False) and current_temp < heater_cutoff_temp:
-                actions.append(OGBActionPublication(capability="canHeat", action="Increase", Name=self.room, message=actionMessage, priority=""))
-            else:
-                _LOGGER.debug(f"{self.room}: Heater skipped - current temp {current_temp}°C within buffer of max temp {max_temp}°C")
-               
-            if vpdLightControl and caps.get("canLight", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canLight", action="Increase", Name=self.room, message=actionMessage, priority=""))
-           
-            # NEW: Explicitly reduce cooling in low-temp cases to avoid worsening
-            if caps.get("canCool", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canCool", action="Reduce", Name=self.room, message=actionMessage, priority="high"))
-       
-        return actions
-
-    def _getEmergencyActions(self, tentData, caps, vpdLightControl):
-        """Erstellt Notfall-Actions für kritische Situationen mit Pufferzonen"""
-       
-        actions = []
-       
-        # Emergency overrides buffer zones
-        HEATER_BUFFER = 2.0
-        COOLER_BUFFER = 2.0
-       
-        current_temp = tentData["temperature"]
-        max_temp = tentData["maxTemp"]
-        min_temp = tentData["minTemp"]
-       
-        heater_cutoff_temp = max_temp - HEATER_BUFFER
-        cooler_cutoff_temp = min_temp + COOLER_BUFFER
-       
-        if tentData["temperature"] > tentData["maxTemp"]:
-            actionMessage = f"Critical Over-Temp in {self.room}! Emergency Action activated."
-            _LOGGER.warning(actionMessage)
-           
-            # Emergency: always use cooler regardless of buffer
-            if caps.get("canCool", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canCool", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-            if caps.get("canExhaust", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canExhaust", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-            if caps.get("canVentilate", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canVentilate", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-           
-            # Reduce heat sources - but respect buffer for heater reduction
-            if caps.get("canHeat", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canHeat", action="Reduce",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-            if vpdLightControl and caps.get("canLight", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canLight", action="Reduce",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-       
-        elif tentData["temperature"] < tentData["minTemp"]:
-            actionMessage = f"Critical Under-Temp in {self.room}! Emergency Action activated."
-            _LOGGER.warning(actionMessage)
-           
-            # Emergency: always use heater regardless of buffer
-            if caps.get("canHeat", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canHeat", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-            if caps.get("canExhaust", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canExhaust", action="Reduce",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-            if vpdLightControl and caps.get("canLight", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canLight", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-           
-            # NEW: Explicitly reduce cooler in critical low-temp
-            if caps.get("canCool", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canCool", action="Reduce",
-                                                Name=self.room, message=actionMessage, priority="emergency"))
-       
-        # Additional check for temperatures approaching buffer zones
-        elif current_temp > heater_cutoff_temp and current_temp <= max_temp:
-            # Within buffer zone - use alternative cooling methods
-            actionMessage = f"Temperature {current_temp}°C approaching max {max_temp}°C - using buffer zone cooling in {self.room}"
-            _LOGGER.info(actionMessage)
-           
-            if caps.get("canExhaust", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canExhaust", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="high"))
-            if caps.get("canVentilate", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canVentilate", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="high"))
-            # Skip cooler in buffer zone unless emergency
-           
-            # NEW: Explicitly reduce heat in buffer zone to conflict with any base heat Increase
-            if caps.get("canHeat", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canHeat", action="Reduce",
-                                                Name=self.room, message=actionMessage, priority="high"))
-       
-        elif current_temp < cooler_cutoff_temp and current_temp >= min_temp:
-            # Within buffer zone - use alternative heating methods
-            actionMessage = f"Temperature {current_temp}°C approaching min {min_temp}°C - using buffer zone heating in {self.room}"
-            _LOGGER.info(actionMessage)
-           
-            if caps.get("canExhaust", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canExhaust", action="Reduce",
-                                                Name=self.room, message=actionMessage, priority="high"))
-            if vpdLightControl and caps.get("canLight", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canLight", action="Increase",
-                                                Name=self.room, message=actionMessage, priority="high"))
-            # Skip heater in buffer zone unless emergency
-           
-            # NEW: Explicitly reduce cooler in buffer zone to avoid worsening
-            if caps.get("canCool", {}).get("state", False):
-                actions.append(OGBActionPublication(capability="canCool", action="Reduce",
-                                                Name=self.room, message=actionMessage, priority="high"))
-       
-        return actions
-    
-    def _getCO2Actions(self, caps, islightON):
-        """Erstellt CO2-Management Actions"""
-        
-        actions = []
-        co2Control = self.dataStore.getDeep("controlOptions.co2Control")
-        
-        if co2Control and islightON:
-            co2Level = int(self.dataStore.getDeep("controlOptionData.co2ppm.current"))
-            try:
-                co2LevelMin = int(float(self.dataStore.getDeep("controlOptionData.co2ppm.minPPM")))        
-                co2LevelMax = int(float(self.dataStore.getDeep("controlOptionData.co2ppm.maxPPM")))
-            except (ValueError, TypeError):
-                co2LevelMin = 400
-                co2LevelMax = 1500
-                
-            if co2Level < co2LevelMin:
-                actionMessage = f"CO₂-Level zu niedrig in {self.room}, CO₂-Zufuhr erhöht."
-                if caps.get("canCO2", {}).get("state", False):
-                    actions.append(OGBActionPublication(capability="canCO2", action="Increase", Name=self.room, message=actionMessage, priority=""))
-                if caps.get("canExhaust", {}).get("state", False):
-                    actions.append(OGBActionPublication(capability="canExhaust", action="Reduce", Name=self.room, message=actionMessage, priority=""))
-                    
-            elif co2Level > co2LevelMax:
-                actionMessage = f"CO₂-Level zu hoch in {self.room}, Abluft erhöht."
-                if caps.get("canCO2", {}).get("state", False):
-                    actions.append(OGBActionPublication(capability="canCO2", action="Reduce", Name=self.room, message=actionMessage, priority=""))
-                if caps.get("canExhaust", {}).get("state", False):
-                    actions.append(OGBActionPublication(capability="canExhaust", action="Increase", Name=self.room, message=actionMessage, priority=""))
-        
-        return actions
-
-    def _prioritizeOptimalDevices(self, actionMap, optimalDevices, caps):
-        """Priorisiert Actions für optimale Geräte, behält aber alle bei"""
-        
-        if not optimalDevices:
-            return actionMap  # Keine Optimierung möglich
-        
-        # Create new action list with updated priorities
-        prioritizedActions = []
-        
-        for action in actionMap:
-            capability = action.capability
-            capDevices = caps.get(capability, {}).get("devEntities", [])
-            
-            # Prüfe ob diese capability optimale Geräte hat
-            hasOptimalDevice = any(device in optimalDevices for device in capDevices)
-            
-            # Use dataclasses.replace to create a new instance with updated priority
-            prioritizedAction = dataclasses.replace(
-                action,
-                priority="high" if hasOptimalDevice else "normal"
-            )
-            prioritizedActions.append(prioritizedAction)
-        
-        return prioritizedActions
-
-    def _resolveActionConflicts(self, actionMap):
-        """Löst nur direkte Konflikte auf, behält aber multiple Actions pro Capability"""
-        
-        # Gruppiere nach capability UND action
-        actionGroups = {}
-        for action in actionMap:
-            key = f"{action.capability}_{action.action}"
-            if key not in actionGroups:
-                actionGroups[key] = []
-            actionGroups[key].append(action)
-        
-        finalActions = []
-        
-        # Für jede Gruppe, wähle die beste Action (falls mehrere identische)
-        for key, actions in actionGroups.items():
-            if len(actions) == 1:
-                finalActions.append(actions[0])
-            else:
-                # Bei identischen Actions, wähle die mit der wichtigsten Message
-                priorityKeywords = ["Critical", "Notfall", "Dewpoint", "CO₂"]
-                
-                bestAction = actions[0]
-                for action in actions:
-                    if any(keyword in action.message for keyword in priorityKeywords):
-                        bestAction = action
-                        break
-                    elif hasattr(action, 'priority') and action.priority == "high":
-                        bestAction = action
-                
-                finalActions.append(bestAction)
-        
-        # Prüfe auf direkte Konflikte (Increase vs Reduce für gleiche Capability)
-        return self._resolveIncreaseReduceConflicts(finalActions)
-
-    # Enhanced conflict resolution with emergency priority
-    def _resolveIncreaseReduceConflicts(self, actions):
-        """Löst Increase/Reduce Konflikte für gleiche Capability auf"""
-        
-        capabilityActions = {}
-        for action in actions:
-            cap = action.capability
-            if cap not in capabilityActions:
-                capabilityActions[cap] = []
-            capabilityActions[cap].append(action)
-        
-        resolvedActions = []
-        
-        for capability, capActions in capabilityActions.items():
-            if len(capActions) <= 1:
-                resolvedActions.extend(capActions)
-                continue
-                
-            # Check for emergency priority first
-            emergencyActions = [a for a in capActions if getattr(a, 'priority', '') == 'emergency']
-            if emergencyActions:
-                resolvedActions.append(emergencyActions[0])
-                continue
-                
-            # Existing conflict resolution logic...
-            increases = [a for a in capActions if a.action == "Increase"]
-            reduces = [a for a in capActions if a.action == "Reduce"]
-            
-            if increases and reduces:
-                # Existing priority logic with emergency keywords
-                emergencyKeywordActions = [a for a in capActions if any(kw in a.message for kw in ["Critical", "Notfall", "Dewpoint"])]
-                
-                if emergencyKeywordActions:
-                    resolvedActions.append(emergencyKeywordActions[0])
-                else:
-                    # Original logic continues...
-                    highPriorityActions = [a for a in capActions if hasattr(a, 'priority') and a.priority == "high"]
-                    if highPriorityActions:
-                        resolvedActions.append(highPriorityActions[0])
-                    else:
-                        if increases:
-                            resolvedActions.append(increases[0])
-                        else:
-                            resolvedActions.append(reduces[0])
-            else:
-                resolvedActions.extend(capActions)
-        
-        return resolvedActions
-    
-    def getRoomCaps(self, vpdStatus: str):
-        """Erweiterte Version die auch spezielle VPD-Stati behandelt"""
-        
-        available_capabilities = self.dataStore.get("capabilities")
-        device_profiles = self.dataStore.get("DeviceProfiles")
-        result = []
-
-        # Mapping für erweiterte VPD-Stati
-        statusMapping = {
-            "too_hot": "too_high",
-            "too_cold": "too_low", 
-            "too_humid": "too_high",
-            "too_dry": "too_low",
-            "critical_hot": "too_high",
-            "critical_cold": "too_low",
-            "dewpoint_risk": "too_high",
-            "humidity_risk": "too_high",
-            "hot_humid": "too_high",
-            "hot_dry": "too_high",
-            "cold_humid": "too_low",
-            "cold_dry": "too_low",
-            "vpd_high": "too_high",
-            "vpd_low": "too_low"
-        }
-        
-        mappedStatus = statusMapping.get(vpdStatus, "too_high")
-
-        for dev_name, profile in device_profiles.items():
-            cap_key = profile.get("cap")
-            if not cap_key:
-                continue
-
-            cap_info = available_capabilities.get(cap_key)
-            if not cap_info or cap_info["count"] == 0:
-                continue
-
-            if mappedStatus == "too_high":
-                if (
-                    (profile["type"] == "humidity" and profile["direction"] == "reduce") or
-                    (profile["type"] == "temperature" and profile["direction"] == "reduce") or
-                    (profile["type"] == "both" and profile["direction"] == "reduce")
-                ):
-                    result.extend(cap_info["devEntities"])
-
-            elif mappedStatus == "too_low":
-                if (
-                    (profile["type"] == "humidity" and profile["direction"] == "increase") or
-                    (profile["type"] == "temperature" and profile["direction"] == "increase") or
-                    (profile["type"] == "both" and profile["direction"] == "increase")
-                ):
-                    result.extend(cap_info["devEntities"])
-
-        return list(set(result))
\ No newline at end of file
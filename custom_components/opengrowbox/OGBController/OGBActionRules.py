@@ -0,0 +1,323 @@
+import logging
+import time
+import dataclasses
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from .OGBDataClasses.OGBPublications import OGBActionPublication
+
+_LOGGER = logging.getLogger(__name__)
+
+# Temperatur-Pufferzonen (in °C)
+HEATER_BUFFER = 2.0  # Heizung nicht innerhalb von 2°C unter maxTemp nutzen
+COOLER_BUFFER = 2.0  # Kühlung nicht innerhalb von 2°C über minTemp nutzen
+
+# Rangfolge für Konfliktauflösung (höher gewinnt)
+PRIORITY_RANK = {"emergency": 3, "high": 2}
+
+# Mapping der erweiterten VPD-Stati auf die Geräterichtung
+STATUS_DIRECTION = {
+    "too_hot": "too_high",
+    "too_cold": "too_low",
+    "too_humid": "too_high",
+    "too_dry": "too_low",
+    "critical_hot": "too_high",
+    "critical_cold": "too_low",
+    "dewpoint_risk": "too_high",
+    "humidity_risk": "too_high",
+    "hot_humid": "too_high",
+    "hot_dry": "too_high",
+    "cold_humid": "too_low",
+    "cold_dry": "too_low",
+    "vpd_high": "too_high",
+    "vpd_low": "too_low",
+}
+
+MESSAGES = {
+    "hot_humid": "High Temperature + High Humidity in {room}",
+    "hot_dry": "High Temperature + Low Humidity in {room}",
+    "cold_humid": "Low Temperature + High Humidity in {room}",
+    "over": "Critical Over-Temp in {room}! Emergency Action activated.",
+    "under": "Critical Under-Temp in {room}! Emergency Action activated.",
+    "upper_buffer": "Temperature {temp}°C approaching max {maxTemp}°C - using buffer zone cooling in {room}",
+    "lower_buffer": "Temperature {temp}°C approaching min {minTemp}°C - using buffer zone heating in {room}",
+    "co2_low": "CO₂-Level zu niedrig in {room}, CO₂-Zufuhr erhöht.",
+    "co2_high": "CO₂-Level zu hoch in {room}, Abluft erhöht.",
+}
+
+
+class RoomState(NamedTuple):
+    """Quantisierter Raumzustand - Schlüssel für die Regel-Tabelle"""
+    deviation: str           # hot_humid | hot_dry | cold_humid | none
+    tempBand: str            # over | under | upper_buffer | lower_buffer | normal
+    aboveCoolerCutoff: bool
+    belowHeaterCutoff: bool
+    co2Band: str             # low | high | ok | disabled
+    vpdLightControl: bool
+    direction: str           # too_high | too_low
+
+
+@dataclass(frozen=True)
+class ActionRule:
+    ruleId: str
+    capability: str
+    action: str
+    messageKey: str
+    priority: str = ""
+    when: dict = field(default_factory=dict)
+
+    def matches(self, state: RoomState):
+        return all(getattr(state, key) == value for key, value in self.when.items())
+
+
+RULES = (
+    # Abweichungen Temperatur + Feuchtigkeit
+    ActionRule("deviation.hot_humid.dehumidify", "canDehumidify", "Increase", "hot_humid", when={"deviation": "hot_humid"}),
+    ActionRule("deviation.hot_humid.exhaust", "canExhaust", "Increase", "hot_humid", when={"deviation": "hot_humid"}),
+    ActionRule("deviation.hot_humid.ventilate", "canVentilate", "Increase", "hot_humid", when={"deviation": "hot_humid"}),
+    ActionRule("deviation.hot_humid.cool", "canCool", "Increase", "hot_humid", when={"deviation": "hot_humid", "aboveCoolerCutoff": True}),
+    ActionRule("deviation.hot_humid.heat", "canHeat", "Reduce", "hot_humid", "high", when={"deviation": "hot_humid"}),
+    ActionRule("deviation.hot_dry.humidify", "canHumidify", "Increase", "hot_dry", when={"deviation": "hot_dry"}),
+    ActionRule("deviation.hot_dry.cool", "canCool", "Increase", "hot_dry", when={"deviation": "hot_dry", "aboveCoolerCutoff": True}),
+    ActionRule("deviation.hot_dry.light", "canLight", "Reduce", "hot_dry", when={"deviation": "hot_dry", "vpdLightControl": True}),
+    ActionRule("deviation.hot_dry.heat", "canHeat", "Reduce", "hot_dry", "high", when={"deviation": "hot_dry"}),
+    ActionRule("deviation.cold_humid.dehumidify", "canDehumidify", "Increase", "cold_humid", when={"deviation": "cold_humid"}),
+    ActionRule("deviation.cold_humid.heat", "canHeat", "Increase", "cold_humid", when={"deviation": "cold_humid", "belowHeaterCutoff": True}),
+    ActionRule("deviation.cold_humid.exhaust", "canExhaust", "Increase", "cold_humid", when={"deviation": "cold_humid"}),
+    ActionRule("deviation.cold_humid.cool", "canCool", "Reduce", "cold_humid", "high", when={"deviation": "cold_humid"}),
+    # Notfälle und Pufferzonen
+    ActionRule("emergency.over.cool", "canCool", "Increase", "over", "emergency", when={"tempBand": "over"}),
+    ActionRule("emergency.over.exhaust", "canExhaust", "Increase", "over", "emergency", when={"tempBand": "over"}),
+    ActionRule("emergency.over.ventilate", "canVentilate", "Increase", "over", "emergency", when={"tempBand": "over"}),
+    ActionRule("emergency.over.heat", "canHeat", "Reduce", "over", "emergency", when={"tempBand": "over"}),
+    ActionRule("emergency.over.light", "canLight", "Reduce", "over", "emergency", when={"tempBand": "over", "vpdLightControl": True}),
+    ActionRule("emergency.under.heat", "canHeat", "Increase", "under", "emergency", when={"tempBand": "under"}),
+    ActionRule("emergency.under.exhaust", "canExhaust", "Reduce", "under", "emergency", when={"tempBand": "under"}),
+    ActionRule("emergency.under.light", "canLight", "Increase", "under", "emergency", when={"tempBand": "under", "vpdLightControl": True}),
+    ActionRule("emergency.under.cool", "canCool", "Reduce", "under", "emergency", when={"tempBand": "under"}),
+    ActionRule("buffer.upper.exhaust", "canExhaust", "Increase", "upper_buffer", "high", when={"tempBand": "upper_buffer"}),
+    ActionRule("buffer.upper.ventilate", "canVentilate", "Increase", "upper_buffer", "high", when={"tempBand": "upper_buffer"}),
+    ActionRule("buffer.upper.heat", "canHeat", "Reduce", "upper_buffer", "high", when={"tempBand": "upper_buffer"}),
+    ActionRule("buffer.lower.exhaust", "canExhaust", "Reduce", "lower_buffer", "high", when={"tempBand": "lower_buffer"}),
+    ActionRule("buffer.lower.light", "canLight", "Increase", "lower_buffer", "high", when={"tempBand": "lower_buffer", "vpdLightControl": True}),
+    ActionRule("buffer.lower.cool", "canCool", "Reduce", "lower_buffer", "high", when={"tempBand": "lower_buffer"}),
+    # CO2-Management (nur bei Licht an)
+    ActionRule("co2.low.co2", "canCO2", "Increase", "co2_low", when={"co2Band": "low"}),
+    ActionRule("co2.low.exhaust", "canExhaust", "Reduce", "co2_low", when={"co2Band": "low"}),
+    ActionRule("co2.high.co2", "canCO2", "Reduce", "co2_high", when={"co2Band": "high"}),
+    ActionRule("co2.high.exhaust", "canExhaust", "Increase", "co2_high", when={"co2Band": "high"}),
+)
+
+
+class OGBActionRuleEngine:
+    """Kompilierte Entscheidungstabelle für Abweichungs-, Notfall- und CO2-Aktionen"""
+
+    def __init__(self, room, dataStore, capRegistry, rules=RULES):
+        self.room = room
+        self.dataStore = dataStore
+        self.capRegistry = capRegistry
+        self.rules = rules
+
+        self._dirty = True
+        self._activeRules = ()
+        self._optimalCaps = {}
+        self._table = {}
+
+        self.stats = {
+            "cycles": 0,
+            "compiles": 0,
+            "tableHits": 0,
+            "tableMisses": 0,
+            "lastEvalUs": 0.0,
+            "avgEvalUs": 0.0,
+            "maxEvalUs": 0.0,
+            "lastFired": [],
+        }
+
+        self.capRegistry.on("CapabilitiesChanged", self.invalidate)
+
+    # Kompilierung
+    def _compile(self):
+        """Baut die Tabelle für das aktuelle Capability-Set neu auf"""
+        self._activeRules = tuple(rule for rule in self.rules if self.capRegistry.hasCap(rule.capability))
+
+        # None = keine optimalen Geräte, Prioritäten bleiben unverändert
+        self._optimalCaps = {}
+        for direction in ("too_high", "too_low"):
+            optimalDevices = self.capRegistry.optimalDevices(direction)
+            self._optimalCaps[direction] = frozenset(self.capRegistry.capsForDevices(optimalDevices)) if optimalDevices else None
+
+        self._table = {}
+        self._dirty = False
+        self.stats["compiles"] += 1
+        _LOGGER.debug(f"{self.room}: Action-Regeln kompiliert - {len(self._activeRules)}/{len(self.rules)} aktiv")
+
+    def invalidate(self, changedCaps=None):
+        """Erzwingt eine Neukompilierung beim nächsten Zyklus"""
+        self._dirty = True
+
+    # Quantisierung
+    def _quantize(self, tempDeviation, humDeviation, tentData, vpdStatus, vpdLightControl, islightON):
+        temp = tentData.temperature
+        maxTemp = tentData.maxTemp
+        minTemp = tentData.minTemp
+        heaterCutoff = maxTemp - HEATER_BUFFER
+        coolerCutoff = minTemp + COOLER_BUFFER
+
+        deviation = "none"
+        if tempDeviation > 0 or humDeviation > 0:
+            if tempDeviation > 0 and humDeviation > 0:
+                deviation = "hot_humid"
+            elif tempDeviation > 0 and humDeviation < 0:
+                deviation = "hot_dry"
+            elif tempDeviation < 0 and humDeviation > 0:
+                deviation = "cold_humid"
+
+        if temp > maxTemp:
+            tempBand = "over"
+        elif temp < minTemp:
+            tempBand = "under"
+        elif temp > heaterCutoff:
+            tempBand = "upper_buffer"
+        elif temp < coolerCutoff:
+            tempBand = "lower_buffer"
+        else:
+            tempBand = "normal"
+
+        co2Band = "disabled"
+        if self.dataStore.getDeep("controlOptions.co2Control") and islightON:
+            co2Band = "ok"
+            try:
+                co2Level = int(float(self.dataStore.getDeep("controlOptionData.co2ppm.current")))
+            except (ValueError, TypeError):
+                co2Level = None
+            try:
+                co2LevelMin = int(float(self.dataStore.getDeep("controlOptionData.co2ppm.minPPM")))
+                co2LevelMax = int(float(self.dataStore.getDeep("controlOptionData.co2ppm.maxPPM")))
+            except (ValueError, TypeError):
+                co2LevelMin = 400
+                co2LevelMax = 1500
+            if co2Level is not None:
+                if co2Level < co2LevelMin:
+                    co2Band = "low"
+                elif co2Level > co2LevelMax:
+                    co2Band = "high"
+
+        return RoomState(
+            deviation=deviation,
+            tempBand=tempBand,
+            aboveCoolerCutoff=temp > coolerCutoff,
+            belowHeaterCutoff=temp < heaterCutoff,
+            co2Band=co2Band,
+            vpdLightControl=bool(vpdLightControl),
+            direction=STATUS_DIRECTION.get(vpdStatus, "too_high"),
+        )
+
+    def _lookup(self, state):
+        entry = self._table.get(state)
+        if entry is not None:
+            self.stats["tableHits"] += 1
+            return entry
+        self.stats["tableMisses"] += 1
+        entry = tuple(rule for rule in self._activeRules if rule.matches(state))
+        self._table[state] = entry
+        return entry
+
+    # Auswertung
+    def evaluate(self, baseActionMap, tempDeviation, humDeviation, vpdStatus, vpdLightControl, islightON):
+        """Erweitert die ActionMap per Tabellen-Lookup und priorisiert optimale Geräte"""
+        start = time.perf_counter()
+
+        if self._dirty:
+            self._compile()
+
+        tentData = self.dataStore.get("tentData")
+        state = self._quantize(tempDeviation, humDeviation, tentData, vpdStatus, vpdLightControl, islightON)
+        firedRules = self._lookup(state)
+
+        messages = {}
+        actions = list(baseActionMap)
+        for rule in firedRules:
+            message = messages.get(rule.messageKey)
+            if message is None:
+                message = MESSAGES[rule.messageKey].format(
+                    room=self.room, temp=tentData.temperature,
+                    maxTemp=tentData.maxTemp, minTemp=tentData.minTemp,
+                )
+                messages[rule.messageKey] = message
+                if rule.messageKey in ("over", "under"):
+                    _LOGGER.warning(message)
+                elif rule.messageKey in ("upper_buffer", "lower_buffer"):
+                    _LOGGER.info(message)
+            actions.append(OGBActionPublication(capability=rule.capability, action=rule.action,
+                                                Name=self.room, message=message, priority=rule.priority))
+
+        optimalCaps = self._optimalCaps.get(state.direction)
+        if optimalCaps is not None:
+            actions = [
+                action if action.priority == "emergency" else dataclasses.replace(
+                    action, priority="high" if action.capability in optimalCaps else "normal"
+                )
+                for action in actions
+            ]
+
+        fired = [rule.ruleId for rule in firedRules]
+        self._recordCycle(time.perf_counter() - start, fired)
+        return actions, fired
+
+    def resolveConflicts(self, actionMap):
+        """Löst Konflikte über den Prioritäts-Rang statt über Message-Keywords auf"""
+        bestByKey = {}
+        for action in actionMap:
+            key = (action.capability, action.action)
+            current = bestByKey.get(key)
+            if current is None:
+                bestByKey[key] = action
+                continue
+            rank = PRIORITY_RANK.get(action.priority, 0)
+            currentRank = PRIORITY_RANK.get(current.priority, 0)
+            # Bei gleichem "high"-Rang gewinnt wie bisher die spätere (regelspezifische) Aktion
+            if rank > currentRank or (rank == currentRank and action.priority == "high"):
+                bestByKey[key] = action
+
+        capabilityActions = {}
+        for action in bestByKey.values():
+            capabilityActions.setdefault(action.capability, []).append(action)
+
+        resolvedActions = []
+        for capActions in capabilityActions.values():
+            if len(capActions) == 1:
+                resolvedActions.append(capActions[0])
+                continue
+
+            emergencyActions = [a for a in capActions if a.priority == "emergency"]
+            if emergencyActions:
+                resolvedActions.append(emergencyActions[0])
+                continue
+
+            increases = [a for a in capActions if a.action == "Increase"]
+            reduces = [a for a in capActions if a.action == "Reduce"]
+            if increases and reduces:
+                highPriorityActions = [a for a in capActions if a.priority == "high"]
+                if highPriorityActions:
+                    resolvedActions.append(highPriorityActions[0])
+                else:
+                    resolvedActions.append(increases[0])
+            else:
+                resolvedActions.extend(capActions)
+
+        return resolvedActions
+
+    # Metriken
+    def _recordCycle(self, elapsed, fired):
+        elapsedUs = elapsed * 1_000_000
+        stats = self.stats
+        stats["cycles"] += 1
+        stats["lastEvalUs"] = round(elapsedUs, 2)
+        stats["avgEvalUs"] = round(stats["avgEvalUs"] + (elapsedUs - stats["avgEvalUs"]) / stats["cycles"], 2)
+        stats["maxEvalUs"] = round(max(stats["maxEvalUs"], elapsedUs), 2)
+        stats["lastFired"] = fired
+
+    def getStats(self):
+        """Gibt Kosten- und Cache-Metriken pro Zyklus zurück"""
+        return {**self.stats, "activeRules": len(self._activeRules), "tableSize": len(self._table)}
@@ -0,0 +1,165 @@
+import logging
+
+from .OGBDatastore import SimpleEventEmitter
+
+_LOGGER = logging.getLogger(__name__)
+
+# Capability -> Gerätetypen
+CAPABILITY_MAPPING = {
+    "canHeat": ["heater"],
+    "canCool": ["cooler"],
+    "canClimate": ["climate"],
+    "canHumidify": ["humidifier"],
+    "canDehumidify": ["dehumidifier"],
+    "canVentilate": ["ventilation"],
+    "canExhaust": ["exhaust"],
+    "canIntake": ["intake"],
+    "canLight": ["light"],
+    "canCO2": ["co2"],
+    "canPump": ["pump"],
+}
+
+EFFECT_TYPES = {
+    "temperature": ("temperature",),
+    "humidity": ("humidity",),
+    "both": ("temperature", "humidity"),
+}
+
+
+class OGBCapabilityRegistry(SimpleEventEmitter):
+    """
+    Einzige Quelle für Raum-Capabilities.
+    Hält Geräte pro Capability in O(1) und die vorberechneten Mengen der Geräte,
+    die Temperatur/Feuchtigkeit erhöhen oder senken. Der DataStore-Key "capabilities"
+    ist nur noch die veröffentlichte Sicht dieser Registry.
+    """
+
+    def __init__(self, room, dataStore):
+        super().__init__()
+        self.room = room
+        self.dataStore = dataStore
+        self.version = 0
+
+        self._typeToCaps = {}
+        for cap, deviceTypes in CAPABILITY_MAPPING.items():
+            for deviceType in deviceTypes:
+                self._typeToCaps.setdefault(deviceType, []).append(cap)
+
+        # Profile pro Capability aus DeviceProfiles
+        self._capProfiles = {}
+        for profile in (self.dataStore.get("DeviceProfiles") or {}).values():
+            if profile.get("cap"):
+                self._capProfiles[profile["cap"]] = profile
+
+        existing = self.dataStore.get("capabilities") or {}
+        capNames = list(existing) + [cap for cap in CAPABILITY_MAPPING if cap not in existing]
+        self._members = {cap: {} for cap in capNames}
+        self._deviceCaps = {}
+        self._effects = {
+            (kind, direction): {}
+            for kind in ("temperature", "humidity")
+            for direction in ("increase", "reduce")
+        }
+
+        self._view = {cap: {"state": False, "count": 0, "devEntities": []} for cap in capNames}
+        self.dataStore.set("capabilities", self._view)
+        self.dataStore.on("capabilities", self._onStoreSet)
+
+    def _onStoreSet(self, value):
+        """Überschreiben von außen (z.B. State-Restore) wird auf die Registry-Sicht zurückgesetzt"""
+        if value is not self._view:
+            _LOGGER.debug(f"{self.room}: External capabilities overwrite ignored, registry is source of truth")
+            self.dataStore.set("capabilities", self._view)
+
+    # Mutationen
+    def addDevice(self, deviceName, deviceType):
+        """Registriert ein Gerät für alle passenden Capabilities"""
+        if deviceName == "ogb" or deviceName in self._deviceCaps:
+            return False
+
+        caps = self._typeToCaps.get(str(deviceType).lower(), [])
+        if not caps:
+            return False
+
+        for cap in caps:
+            self._members.setdefault(cap, {})[deviceName] = None
+            profile = self._capProfiles.get(cap)
+            if profile:
+                for kind in EFFECT_TYPES.get(profile.get("type"), ()):
+                    effect = self._effects.get((kind, profile.get("direction")))
+                    if effect is not None:
+                        effect[deviceName] = None
+
+        self._deviceCaps[deviceName] = caps
+        self._publish(caps)
+        _LOGGER.debug(f"{self.room}: Capabilities {caps} added for {deviceName}")
+        return True
+
+    def removeDevice(self, deviceName):
+        """Entfernt ein Gerät aus allen Capabilities"""
+        caps = self._deviceCaps.pop(deviceName, None)
+        if caps is None:
+            return False
+
+        for cap in caps:
+            self._members.get(cap, {}).pop(deviceName, None)
+        for effect in self._effects.values():
+            effect.pop(deviceName, None)
+
+        self._publish(caps)
+        _LOGGER.debug(f"{self.room}: Capabilities {caps} removed for {deviceName}")
+        return True
+
+    def clear(self):
+        """Setzt alle Capabilities zurück"""
+        for members in self._members.values():
+            members.clear()
+        for effect in self._effects.values():
+            effect.clear()
+        self._deviceCaps.clear()
+        self._publish(list(self._members))
+
+    def _publish(self, changedCaps):
+        for cap in changedCaps:
+            members = self._members.get(cap, {})
+            self._view[cap] = {
+                "state": bool(members),
+                "count": len(members),
+                "devEntities": list(members),
+            }
+        self.version += 1
+        if self.dataStore.get("capabilities") is not self._view:
+            self.dataStore.set("capabilities", self._view)
+        self.emit("CapabilitiesChanged", changedCaps)
+
+    # Abfragen
+    def hasCap(self, cap):
+        return bool(self._members.get(cap))
+
+    def devices(self, cap):
+        return list(self._members.get(cap, {}))
+
+    def devicesRaising(self, kind):
+        """Geräte, die Temperatur oder Feuchtigkeit erhöhen"""
+        return set(self._effects.get((kind, "increase"), {}))
+
+    def devicesLowering(self, kind):
+        """Geräte, die Temperatur oder Feuchtigkeit senken"""
+        return set(self._effects.get((kind, "reduce"), {}))
+
+    def optimalDevices(self, direction):
+        """Geräte für einen VPD-Status: too_high -> senkende, too_low -> erhöhende Geräte"""
+        if direction == "too_low":
+            return self.devicesRaising("temperature") | self.devicesRaising("humidity")
+        return self.devicesLowering("temperature") | self.devicesLowering("humidity")
+
+    def capsForDevices(self, deviceNames):
+        """Capabilities, zu denen mindestens eines der Geräte gehört"""
+        return {cap for name in deviceNames for cap in self._deviceCaps.get(name, ())}
+
+    def snapshot(self):
+        """Kopie der Capabilities für Premium-Payload und UI"""
+        return {
+            cap: {"state": info["state"], "count": info["count"], "devEntities": list(info["devEntities"])}
+            for cap, info in self._view.items()
+        }
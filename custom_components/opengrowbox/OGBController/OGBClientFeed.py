@@ -0,0 +1,226 @@
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import is_dataclass
+
+from ..const import DOMAIN
+from .OGBDataClasses.OGBPublications import publication_dict
+
+_LOGGER = logging.getLogger(__name__)
+
+FEED_EVENT = "OGBClientFeed"
+LEGACY_EVENT = "LogForClient"
+
+DEFAULT_WINDOW = 1.0        # Sekunden, in denen Nachrichten eines Zyklus gesammelt werden
+DEFAULT_MAX_ENTRIES = 25    # Max. Einträge pro Batch
+
+# Kategorie anhand des Publikationstyps
+CATEGORY_BY_TYPE = {
+    "OGBVPDPublication": "vpd",
+    "OGBWeightPublication": "weights",
+    "OGBActionPublication": "actions",
+    "OGBHydroAction": "water",
+    "OGBWaterAction": "water",
+    "OGBRetrieveAction": "water",
+    "OGBLightAction": "device",
+}
+
+
+def categorize(data):
+    """Ordnet eine LogForClient-Nachricht einer Kategorie zu"""
+    sample = data[0] if isinstance(data, list) and data else data
+    category = CATEGORY_BY_TYPE.get(type(sample).__name__)
+    if category:
+        return category
+    if isinstance(sample, dict):
+        if "controlCommands" in sample:
+            return "controller"
+        if "NightVPDHold" in sample:
+            return "night-vpd"
+        if "action" in sample and "capability" in sample:
+            return "actions"
+        if "Device" in sample or "Action" in sample or "Cycle" in sample:
+            return "device"
+        if "VPD" in sample:
+            return "vpd"
+    return "default"
+
+
+_uniqueKeys = itertools.count()
+
+
+def _itemDevice(item):
+    if is_dataclass(item):
+        return getattr(item, "Device", None)
+    if isinstance(item, dict):
+        return item.get("Device") or item.get("device")
+    return None
+
+
+def _deviceKey(data):
+    """
+    Merge-Schlüssel innerhalb einer Kategorie: nur Nachrichten mit echtem Geräte-Key werden
+    zusammengefasst (Listen nur bei gleichen Geräten). Alles ohne Gerät (z.B. Action-Listen, die
+    nur den Raumnamen tragen) bekommt einen eindeutigen Schlüssel und geht nicht verloren.
+    """
+    if isinstance(data, list):
+        devices = tuple(_itemDevice(item) for item in data)
+        if devices and all(devices):
+            return devices
+    else:
+        device = _itemDevice(data)
+        if device:
+            return device
+    return ("unique", next(_uniqueKeys))
+
+
+class OGBClientFeedHub:
+    """Integrationsweiter Verteiler für Client-Feed-Batches mit Raum-/Kategorie-Filtern"""
+
+    def __init__(self, hass):
+        self.hass = hass
+        self.seq = 0
+        self._subscribers = []
+
+    def subscribe(self, callback, rooms=None, categories=None):
+        """Abonniert Batches, optional gefiltert nach Räumen und Kategorien"""
+        entry = (callback, set(rooms) if rooms else None, set(categories) if categories else None)
+        self._subscribers.append(entry)
+
+        def unsubscribe():
+            if entry in self._subscribers:
+                self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def nextSeq(self):
+        self.seq += 1
+        return self.seq
+
+    def listenerCount(self):
+        """Anzahl der Abnehmer (Python-Abos + Frontend-Subscriptions auf dem HA-Bus)"""
+        busListeners = self.hass.bus.async_listeners()
+        return len(self._subscribers) + busListeners.get(FEED_EVENT, 0) + busListeners.get(LEGACY_EVENT, 0)
+
+    def publish(self, batch):
+        busListeners = self.hass.bus.async_listeners()
+
+        if busListeners.get(FEED_EVENT, 0):
+            self.hass.bus.async_fire(FEED_EVENT, batch)
+
+        # Kompatibilität: bestehendes Frontend erwartet einzelne LogForClient-Events
+        if busListeners.get(LEGACY_EVENT, 0):
+            for entry in batch["entries"]:
+                self.hass.bus.async_fire(LEGACY_EVENT, entry["data"])
+
+        for callback, rooms, categories in list(self._subscribers):
+            if rooms and batch["room"] not in rooms:
+                continue
+            entries = batch["entries"]
+            if categories:
+                entries = [entry for entry in entries if entry["category"] in categories]
+                if not entries:
+                    continue
+            try:
+                callback({**batch, "entries": entries})
+            except Exception as e:
+                _LOGGER.error(f"Client feed subscriber failed: {e}")
+
+
+def get_client_feed_hub(hass):
+    """Liefert den gemeinsamen Feed-Hub der Integration"""
+    domainData = hass.data.setdefault(DOMAIN, {})
+    hub = domainData.get("clientFeed")
+    if hub is None:
+        hub = domainData["clientFeed"] = OGBClientFeedHub(hass)
+    return hub
+
+
+class OGBClientFeed:
+    """
+    Sammelt die LogForClient-Nachrichten eines Raumes pro Zyklus und veröffentlicht sie
+    als einen sequenzierten, begrenzten Batch. Mehrfache Nachrichten derselben Kategorie
+    und desselben Geräts (z.B. Licht-Rampenschritte) werden zusammengefasst, Nachrichten ohne Gerät nie.
+    Ohne Abnehmer wird nur gezählt und beim nächsten Batch als Zusammenfassung mitgeschickt.
+    """
+
+    def __init__(self, hass, room, window=DEFAULT_WINDOW, maxEntries=DEFAULT_MAX_ENTRIES):
+        self.hass = hass
+        self.room = room
+        self.window = window
+        self.maxEntries = maxEntries
+        self.hub = get_client_feed_hub(hass)
+
+        self._pending = OrderedDict()
+        self._dropped = 0
+        self._skipped = {}
+        self._flushHandle = None
+
+        self.stats = {"received": 0, "merged": 0, "dropped": 0, "skipped": 0, "batches": 0}
+
+    def push(self, data):
+        """Nimmt eine LogForClient-Nachricht für den aktuellen Zyklus an"""
+        self.stats["received"] += 1
+        category = categorize(data)
+        key = (category, _deviceKey(data))
+
+        existing = self._pending.pop(key, None)
+        merged = 0
+        if existing is not None:
+            merged = existing["merged"] + 1
+            self.stats["merged"] += 1
+        self._pending[key] = {"category": category, "ts": time.time(), "merged": merged, "data": data}
+
+        while len(self._pending) > self.maxEntries:
+            self._pending.popitem(last=False)
+            self._dropped += 1
+            self.stats["dropped"] += 1
+
+        if self._flushHandle is None:
+            self._flushHandle = self.hass.loop.call_later(self.window, self.flush)
+
+    def flush(self):
+        """Veröffentlicht den gesammelten Zyklus als einen Batch"""
+        self._flushHandle = None
+        if not self._pending:
+            return
+
+        pending = list(self._pending.values())
+        self._pending.clear()
+
+        if not self.hub.listenerCount():
+            for entry in pending:
+                self._skipped[entry["category"]] = self._skipped.get(entry["category"], 0) + 1 + entry["merged"]
+            self.stats["skipped"] += len(pending)
+            return
+
+        batch = {
+            "room": self.room,
+            "seq": self.hub.nextSeq(),
+            "entries": [
+                {
+                    "category": entry["category"],
+                    "ts": entry["ts"],
+                    "merged": entry["merged"],
+                    "data": publication_dict(entry["data"]),
+                }
+                for entry in pending
+            ],
+            "dropped": self._dropped,
+            "skipped": self._skipped,
+        }
+        self._dropped = 0
+        self._skipped = {}
+        self.stats["batches"] += 1
+
+        try:
+            self.hub.publish(batch)
+        except Exception as e:
+            _LOGGER.error(f"{self.room}: Failed to publish client feed batch: {e}")
+
+    def close(self):
+        if self._flushHandle is not None:
+            self._flushHandle.cancel()
+            self._flushHandle = None
+        self._pending.clear()
@@ -25,5 +25,5 @@ class OGBClientManager:
         self.hass.bus.async_listen("need_targets", self.provide_targets)
 
     async def provide_targets(self):
-        vpd_targets = self.dataStore.get("vpd")
+        vpd_targets = self.dataStore.get("vpd").to_dict()
         await self.eventManager.emit("target_values",vpd_targets)
\ No newline at end of file
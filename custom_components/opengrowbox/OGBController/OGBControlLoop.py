@@ -0,0 +1,69 @@
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OGBControlLoop:
+    """
+    Single-Flight-Runner für den Regelzyklus eines Raums.
+    Es läuft höchstens ein Zyklus gleichzeitig; Trigger während eines Laufs werden zu genau
+    einem Nachlauf mit den neuesten Daten zusammengefasst (der Zyklus liest ohnehin den DataStore).
+    """
+
+    def __init__(self, room, runCycle, profiler=None):
+        self.room = room
+        self.runCycle = runCycle
+        self.profiler = profiler
+        self._task = None
+        self._pending = None
+        self._hasPending = False
+        self.stats = {"triggers": 0, "cycles": 0, "reruns": 0, "coalesced": 0, "errors": 0}
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    def trigger(self, data):
+        """Synchroner Event-Listener: startet einen Zyklus oder merkt einen Nachlauf vor"""
+        self.stats["triggers"] += 1
+        if self.profiler is not None:
+            self.profiler.triggered()
+        if self.running:
+            if self._hasPending:
+                # Bereits vorgemerkter Nachlauf übernimmt die neueren Daten
+                self.stats["coalesced"] += 1
+            self._pending = data
+            self._hasPending = True
+            return self._task
+        self._task = asyncio.create_task(self._run(data))
+        return self._task
+
+    async def _run(self, data):
+        while True:
+            self.stats["cycles"] += 1
+            if self.profiler is not None:
+                self.profiler.startCycle()
+            try:
+                await self.runCycle(data)
+            except Exception as e:
+                self.stats["errors"] += 1
+                _LOGGER.error(f"{self.room}: Control cycle failed: {e}", exc_info=True)
+            if self.profiler is not None:
+                self.profiler.endCycle()
+
+            if not self._hasPending:
+                return
+            data, self._pending, self._hasPending = self._pending, None, False
+            self.stats["reruns"] += 1
+
+    async def stop(self):
+        """Vorgemerkten Nachlauf verwerfen und laufenden Zyklus abbrechen (Unload)"""
+        self._pending, self._hasPending = None, False
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -0,0 +1,172 @@
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 2.0        # Sekunden vom Sensor-Event bis zu den Gerätebefehlen
+WINDOW = 500                # Zyklen für die Perzentile
+PUBLISH_INTERVAL = 60.0     # Sekunden zwischen zwei Updates der Diagnose-Sensoren
+OVERRUN_LOG_INTERVAL = 300  # höchstens eine Warnung pro Intervall, sonst Debug
+
+# Stufen in Reihenfolge des Zyklus; Zeiten sind Eigenzeiten (ohne verschachtelte Stufen)
+STAGES = ("intake", "queue", "vpd", "mode", "actions", "devices")
+
+# Zyklus des aktuellen Tasks; parallele Aufrufe außerhalb des Control-Loops (z.B. Premium-Aktionen) zählen nicht mit
+_activeCycle = ContextVar("ogb_active_cycle", default=None)
+
+# emit_and_wait-Events → Stufe
+EVENT_STAGES = {
+    "selectActionMode": "mode",
+    "increase_vpd": "actions",
+    "reduce_vpd": "actions",
+    "FineTune_vpd": "actions",
+    "PIDActions": "actions",
+    "MPCActions": "actions",
+    "AIActions": "actions",
+}
+
+
+def percentile(sortedValues, fraction):
+    if not sortedValues:
+        return None
+    index = min(len(sortedValues) - 1, max(0, round(fraction * (len(sortedValues) - 1))))
+    return sortedValues[index]
+
+
+class OGBCycleProfiler:
+    """
+    Misst den Regelzyklus eines Raums: handleRoomUpdate → handleNewVPD → selectActionMode →
+    ActionManager → Geräte-Dispatch. Zyklen über dem Budget werden gezählt und geloggt,
+    p50/p95/p99 gehen als Diagnose-Sensoren an HA.
+    """
+
+    def __init__(self, room, budget=DEFAULT_BUDGET, window=WINDOW):
+        self.room = room
+        self.budget = budget
+        self.cycles = deque(maxlen=window)
+        self.stages = {stage: deque(maxlen=window) for stage in STAGES}
+        self.stats = {"cycles": 0, "overruns": 0, "maxCycle": 0.0, "lastCycle": None, "lastOverrun": None}
+        self._sensorAt = None
+        self._triggeredAt = None
+        self._originAt = None
+        self._cycle = None
+        self._lastPublish = None
+        self._lastWarning = None
+
+    def setBudget(self, seconds):
+        try:
+            seconds = float(seconds)
+        except (TypeError, ValueError):
+            return
+        if seconds > 0:
+            self.budget = seconds
+
+    @contextmanager
+    def intake(self):
+        """Um handleRoomUpdate: ein Trigger während der Verarbeitung zählt ab dem Sensor-Event"""
+        self._sensorAt = time.monotonic()
+        try:
+            yield
+        finally:
+            self._sensorAt = None
+
+    def triggered(self):
+        """Vom Control-Loop bei jedem Trigger; der erste Trigger eines Zyklus bestimmt den Start"""
+        if self._triggeredAt is None:
+            self._triggeredAt = time.monotonic()
+            self._originAt = self._sensorAt or self._triggeredAt
+
+    def startCycle(self):
+        now = time.monotonic()
+        triggeredAt = self._triggeredAt or now
+        originAt = self._originAt or triggeredAt
+        self._triggeredAt = self._originAt = None
+        self._cycle = {
+            "origin": originAt,
+            "stack": [],
+            "stages": {"intake": triggeredAt - originAt, "queue": now - triggeredAt},
+        }
+        _activeCycle.set(self._cycle)
+
+    @contextmanager
+    def stage(self, name):
+        cycle = _activeCycle.get()
+        if cycle is None or cycle is not self._cycle:
+            yield
+            return
+        frame = [time.monotonic(), 0.0]
+        cycle["stack"].append(frame)
+        try:
+            yield
+        finally:
+            cycle["stack"].pop()
+            elapsed = time.monotonic() - frame[0]
+            cycle["stages"][name] = cycle["stages"].get(name, 0.0) + elapsed - frame[1]
+            if cycle["stack"]:
+                cycle["stack"][-1][1] += elapsed
+
+    def eventStage(self, event_name):
+        return self.stage(EVENT_STAGES.get(event_name, event_name))
+
+    def endCycle(self):
+        cycle, self._cycle = self._cycle, None
+        _activeCycle.set(None)
+        if cycle is None:
+            return None
+        total = time.monotonic() - cycle["origin"]
+        self.cycles.append(total)
+        for name, seconds in cycle["stages"].items():
+            self.stages.setdefault(name, deque(maxlen=self.cycles.maxlen)).append(seconds)
+
+        self.stats["cycles"] += 1
+        self.stats["lastCycle"] = round(total * 1000, 1)
+        self.stats["maxCycle"] = max(self.stats["maxCycle"], self.stats["lastCycle"])
+        if total > self.budget:
+            self.stats["overruns"] += 1
+            self.stats["lastOverrun"] = {name: round(seconds * 1000, 1) for name, seconds in cycle["stages"].items()}
+            now = time.monotonic()
+            warn = self._lastWarning is None or now - self._lastWarning >= OVERRUN_LOG_INTERVAL
+            if warn:
+                self._lastWarning = now
+            _LOGGER.log(
+                logging.WARNING if warn else logging.DEBUG,
+                f"{self.room}: Control cycle took {total * 1000:.0f} ms (budget {self.budget * 1000:.0f} ms), "
+                f"stages ms: {self.stats['lastOverrun']}, overruns: {self.stats['overruns']}",
+            )
+        return total
+
+    def percentiles(self, samples=None):
+        """p50/p95/p99 in Millisekunden"""
+        values = sorted(self.cycles if samples is None else samples)
+        result = {}
+        for key, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            value = percentile(values, fraction)
+            result[key] = None if value is None else round(value * 1000, 1)
+        return result
+
+    def publishDue(self):
+        now = time.monotonic()
+        if self._lastPublish is not None and now - self._lastPublish < PUBLISH_INTERVAL:
+            return False
+        self._lastPublish = now
+        return True
+
+    def sensorValues(self):
+        cycle = self.percentiles()
+        return {
+            "ogb_cycletimep50_": cycle["p50"],
+            "ogb_cycletimep95_": cycle["p95"],
+            "ogb_cycletimep99_": cycle["p99"],
+            "ogb_cycleoverruns_": self.stats["overruns"],
+        }
+
+    def summary(self):
+        return {
+            "budgetMs": round(self.budget * 1000, 1),
+            "cycle": self.percentiles(),
+            "stages": {name: self.percentiles(samples) for name, samples in self.stages.items()},
+            **self.stats,
+        }
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from .utils.calcs import calc_light_to_ppfd
+from .utils.sensorUpdater import update_sensors_batch
+from .OGBDataClasses.OGBPublications import OGBDLIPublication, OGBPPFDPublication
+
+_LOGGER = logging.getLogger(__name__)
+
+PUBLISH_INTERVAL = 60.0     # Sekunden zwischen zwei Sensor-Updates und Takt für die Integration ohne neue Werte
+PPFD_SMOOTHING = 0.2        # EMA-Faktor für die Hochrechnung
+
+
+class OGBDLIIntegrator:
+    """
+    Streaming-DLI pro Raum.
+    HA meldet Lux/Lumen nur bei Änderungen, daher gilt der letzte Wert bis zum nächsten (Sample-and-Hold)
+    und wird in O(1) über die Zeit aufsummiert (mol/m²). Ein Takt integriert auch ohne neue Werte weiter,
+    solange das Licht an ist; ein ungültiger Wert (z.B. unavailable) beendet das Halten.
+    Am Beginn der Photoperiode wird zurückgesetzt. Veröffentlicht werden die bisher
+    erreichte und die bis Lichtende hochgerechnete DLI, höchstens alle PUBLISH_INTERVAL Sekunden.
+    """
+
+    def __init__(self, hass, dataStore, eventManager, room, photoperiod, publishInterval=PUBLISH_INTERVAL):
+        self.name = "OGB DLI Integrator"
+        self.hass = hass
+        self.dataStore = dataStore
+        self.eventManager = eventManager
+        self.room = room
+        self.photoperiod = photoperiod
+        self.publishInterval = publishInterval
+
+        self.accumulated = 0.0
+        self.ppfd = 0.0
+        self.ppfdAvg = None
+        self.periodStart = None
+        self.periodEnd = None
+        self._lastTs = None
+        self._lastPublish = None
+        self._tickHandle = None
+
+        self.stats = {"samples": 0, "published": 0, "resets": 0, "ticks": 0}
+
+        self.eventManager.on("PhotoperiodBoundary", self._onBoundary)
+        self.eventManager.on("StateRestored", self._onRestored)
+
+    def __repr__(self):
+        return f"{self.name} {self.room} DLI:{self.accumulated:.2f} PPFD:{self.ppfd:.0f} start:{self.periodStart}"
+
+    def start(self):
+        self._scheduleTick()
+
+    def stop(self):
+        if self._tickHandle is not None:
+            self._tickHandle.cancel()
+            self._tickHandle = None
+
+    def _scheduleTick(self):
+        self.stop()
+        self._tickHandle = self.hass.loop.call_later(self.publishInterval, self._onTick)
+
+    def _onTick(self):
+        self._tickHandle = None
+        asyncio.create_task(self.tick())
+        self._scheduleTick()
+
+    async def tick(self):
+        """Integriert den gehaltenen Wert bis jetzt und veröffentlicht, auch ohne neuen Messwert"""
+        if self._lastTs is None:
+            return
+        self.stats["ticks"] += 1
+        self._checkPeriod(datetime.now())
+        self._integrate(time.monotonic())
+        await self.publish()
+
+    def _reset(self, start):
+        self.accumulated = 0.0
+        self.ppfdAvg = None
+        self.periodStart = start
+        self.periodEnd = start + timedelta(days=1) if start else None
+        # Gehaltener Wert läuft in der neuen Periode weiter
+        if self._lastTs is not None:
+            self._lastTs = time.monotonic()
+        self.stats["resets"] += 1
+        _LOGGER.debug(f"{self.room}: DLI integration reset, period start {start}")
+
+    async def _onBoundary(self, data):
+        if self._lastTs is not None:
+            self._integrate(time.monotonic())
+        self._reset(data.get("start") if isinstance(data, dict) else self.photoperiod.periodStart())
+        await self.publish()
+
+    async def _onRestored(self, data):
+        """Übernimmt die Summe nach einem Neustart, wenn die Photoperiode noch dieselbe ist"""
+        start = self.photoperiod.periodStart()
+        savedStart = self.dataStore.getDeep("Light.DLIPeriodStart")
+        if start is None or savedStart != start.isoformat():
+            return
+        try:
+            self.accumulated = float(self.dataStore.getDeep("Light.DLIAccumulated") or 0)
+        except (TypeError, ValueError):
+            return
+        self.periodStart = start
+        self.periodEnd = start + timedelta(days=1)
+
+    def _checkPeriod(self, now):
+        if self.periodEnd is None or now >= self.periodEnd or now < self.periodStart:
+            # Ohne Lichtzeiten wird ab Mitternacht integriert
+            if self._lastTs is not None:
+                self._integrate(time.monotonic())
+            self._reset(self.photoperiod.periodStart(now) or datetime.combine(now.date(), datetime.min.time()))
+
+    def _integrate(self, nowTs):
+        """Letzten PPFD-Wert bis nowTs halten; bei Licht aus (laut Zeitplan) zählt die Lücke nicht"""
+        dt = max(nowTs - self._lastTs, 0.0)
+        self._lastTs = nowTs
+        if self.photoperiod.isLightOn() is False:
+            return
+        self.accumulated += self.ppfd * dt / 1_000_000
+
+    async def addSample(self, value, unit="lux"):
+        """Nimmt einen Lux/Lumen-Messwert auf; der vorige Wert gilt bis jetzt"""
+        nowTs = time.monotonic()
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            # Sensor weg: bis jetzt integrieren, danach nichts mehr halten
+            if self._lastTs is not None:
+                self._integrate(nowTs)
+                self._lastTs = None
+            return
+
+        ppfd = calc_light_to_ppfd(value, unit, self.dataStore.get("growAreaM2") or 1.0)
+        self._checkPeriod(datetime.now())
+
+        if self._lastTs is not None:
+            self._integrate(nowTs)
+
+        self._lastTs = nowTs
+        self.ppfd = ppfd
+        self.ppfdAvg = ppfd if self.ppfdAvg is None else self.ppfdAvg + PPFD_SMOOTHING * (ppfd - self.ppfdAvg)
+        self.stats["samples"] += 1
+
+        self.dataStore.setDeep("tentData.PPFD", round(ppfd))
+        self.dataStore.setDeep("Light.PPFDCurrent", round(ppfd))
+
+        if self._lastPublish is None or nowTs - self._lastPublish >= self.publishInterval:
+            await self.publish()
+
+    def projected(self, now=None):
+        """Hochrechnung auf das Ende der Lichtphase mit dem geglätteten PPFD"""
+        now = now or datetime.now()
+        if self.periodStart is None or not self.photoperiod.isLightOn(now):
+            return self.accumulated
+        lightEnd = self.periodStart + timedelta(seconds=self.photoperiod.photoperiodSeconds())
+        remaining = max((lightEnd - now).total_seconds(), 0.0)
+        return self.accumulated + (self.ppfdAvg or 0.0) * remaining / 1_000_000
+
+    async def publish(self):
+        self._lastPublish = time.monotonic()
+        self.stats["published"] += 1
+
+        dli = round(self.accumulated, 2)
+        projected = round(self.projected(), 1)
+        ppfd = round(self.ppfd)
+
+        self.dataStore.setDeep("tentData.DLI", projected)
+        self.dataStore.setDeep("Light.DLICurrent", dli)
+        self.dataStore.setDeep("Light.DLIProjected", projected)
+        self.dataStore.setDeep("Light.DLIAccumulated", self.accumulated)
+        self.dataStore.setDeep("Light.DLIPeriodStart", self.periodStart.isoformat() if self.periodStart else None)
+
+        update_sensors_batch({"ogb_ppfd_": ppfd, "ogb_dli_": projected}, self.room, self.hass)
+
+        await self.eventManager.emit("DLIUpdate", OGBDLIPublication(Name="DLIUpdate", DLI=projected))
+        await self.eventManager.emit("PPFDUpdate", OGBPPFDPublication(Name="PPFDUpdate", PPFD=ppfd))
@@ -2,9 +2,18 @@ import logging
 import asyncio
 import json
 import os
+import dataclasses
+
+from .OGBDataClasses.OGBData import OGBConf
+from .OGBDataClasses.OGBSections import OGBSection
 
 _LOGGER = logging.getLogger(__name__)
 
+# Sektionen, die erst beim ersten Zugriff übernommen werden
+LAZY_SECTIONS = ("workData",)
+# Laufzeit-Sektionen, die neu aufgebaut werden (Geräteobjekte, Capability-Registry)
+RUNTIME_SECTIONS = ("devices", "capabilities")
+
 class OGBDSManager:
     def __init__(self, hass, dataStore, eventManager, room, regListener):
         self.name = "OGB DataStore Manager"
@@ -80,19 +89,78 @@ class OGBDSManager:
         return simplified
 
     async def loadState(self,data):
-        """Lädt den Zustand aus der Datei und setzt ihn im DataStore."""
+        """Lädt den Zustand aus der Datei und übernimmt ihn gebündelt im DataStore."""
         if not os.path.exists(self.storage_path):
             _LOGGER.warning(f"⚠️ No saved state at {self.storage_path}")
             return
         try:
             data = await asyncio.to_thread(self._sync_load)
-            _LOGGER.warning(f"✅ State loaded from {self.storage_path}: {data}")
-
-            for key, value in data.items():
-                self.dataStore.set(key, value)
-
         except Exception as e:
             _LOGGER.error(f"❌ Failed to load DataStore: {e}")
+            return
+
+        if not isinstance(data, dict):
+            _LOGGER.error(f"❌ Saved state at {self.storage_path} is not an object, ignoring")
+            return
+
+        values, lazy, raw, rejected = self._validateState(data)
+        if rejected:
+            _LOGGER.warning(f"⚠️ {self.room}: Ignored invalid state keys {rejected}")
+
+        self.dataStore.restoreBulk(values, lazy, raw)
+        _LOGGER.info(f"✅ State restored from {self.storage_path}: {len(values)} sections, {len(lazy)} lazy, {len(raw)} runtime")
+        _LOGGER.debug("Restored state for %s: %s", self.room, data)
+
+        await self.eventManager.emit("StateRestored", {"Name": self.room, "sections": list(values), "lazy": list(lazy)})
+
+    def _validateState(self, data):
+        """Prüft die gespeicherten Sektionen gegen das OGBConf-Schema."""
+        values, lazy, raw, rejected = {}, {}, {}, []
+
+        for schemaField in dataclasses.fields(OGBConf):
+            key = schemaField.name
+            if key == "hass" or key not in data:
+                continue
+
+            value = data[key]
+            if key in RUNTIME_SECTIONS:
+                raw[key] = value
+                continue
+
+            if schemaField.default_factory is not dataclasses.MISSING:
+                default = schemaField.default_factory()
+            else:
+                default = schemaField.default
+
+            if not self._matchesSchema(default, value):
+                rejected.append(key)
+                continue
+
+            if key in LAZY_SECTIONS:
+                lazy[key] = value
+            else:
+                values[key] = value
+
+        known = {schemaField.name for schemaField in dataclasses.fields(OGBConf)}
+        rejected.extend(key for key in data if key not in known)
+        return values, lazy, raw, rejected
+
+    def _matchesSchema(self, default, value):
+        if value is None:
+            return not isinstance(default, (dict, list, OGBSection))
+        if default is None or default is dataclasses.MISSING:
+            return True
+        if isinstance(default, bool):
+            return isinstance(value, bool)
+        if isinstance(default, (int, float)):
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        if isinstance(default, str):
+            return isinstance(value, str)
+        if isinstance(default, (dict, OGBSection)):
+            return isinstance(value, dict)
+        if isinstance(default, list):
+            return isinstance(value, list)
+        return True
 
     def _sync_load(self):
         with open(self.storage_path, "r") as f:
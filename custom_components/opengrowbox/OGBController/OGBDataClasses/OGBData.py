@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
+
+from .OGBSections import ControlOptions, TentData, VPDData
 
 @dataclass
 class LightStage:
@@ -35,6 +37,8 @@ class OGBConf:
         "R_Active": False,
         "R_Intervall":None, 
         "R_Duration": None,
+        "MaxConcurrentPumps": 0,
+        "Schedule": {},
         "ph_current":0,
         "ec_current":0,
         "tds_current":0,
@@ -60,6 +64,9 @@ class OGBConf:
     })
     Light: Dict[str, Any] = field(default_factory=lambda: {
         "DLICurrent": 0,
+        "DLIProjected": 0,
+        "DLIAccumulated": 0,
+        "DLIPeriodStart": None,
         "DLITarget": 0,
         "PPFDCurrent": 0,
         "PPFDTarget": 0,
@@ -135,45 +142,9 @@ class OGBConf:
         "canCO2": {"state": False, "count": 0, "devEntities": []},
     })
     previousActions: List[Any] = field(default_factory=list)
-    tentData: Dict[str, Optional[Any]] = field(default_factory=lambda: {
-        "leafTempOffset": None,
-        "temperature": None,
-        "humidity": None,
-        "dewpoint": None,
-        "maxTemp": None,
-        "minTemp": None,
-        "maxHumidity": None,
-        "minHumidity": None,
-        "co2Level": None,
-        "DLI":None,
-        "PPFD":None,
-        "AmbientTemp":None,
-        "AmbientHum":None,
-        "OutsiteTemp":None,
-        "OutsiteHum":None
-    })
-    vpd: Dict[str, Optional[Any]] = field(default_factory=lambda: {
-        "current": None,
-        "targeted": None,
-        "range": None,
-        "perfection": None,
-        "perfectMin": None,
-        "perfectMax": None,
-        "tolerance": None,
-    })
-    controlOptions: Dict[str, bool] = field(default_factory=lambda: {
-        "ownDeviceSetup": False,
-        "nightVPDHold": False,
-        "vpdDeviceDampening":False,
-        "lightbyOGBControl": False,
-        "vpdLightControl": False,
-        "co2Control": False,
-        "workMode":False,
-        "minMaxControl":False,
-        "ownWeights": False,
-        "ambientControl": False,
-
-    })
+    tentData: TentData = field(default_factory=TentData)
+    vpd: VPDData = field(default_factory=VPDData)
+    controlOptions: ControlOptions = field(default_factory=ControlOptions)
     controlOptionData: Dict[str, Dict[str, Any]] = field(default_factory=lambda: {
         "co2ppm": {"target": 0, "current":400, "minPPM": 400, "maxPPM": 1800},
         "weights": {"temp": None, "hum": None, "defaultValue": 1},
@@ -258,6 +229,9 @@ class OGBConf:
         "Devices": [],
         "moisture": [],
     })
+    sensorConditioning: Dict[str, Any] = field(default_factory=dict)
+    localControl: Dict[str, Any] = field(default_factory=dict)
+    responseModel: Dict[str, Any] = field(default_factory=dict)
     DeviceMinMax: Dict[str, Dict[str, Any]] = field(default_factory=lambda: {
         "Exhaust": {"active":False,"minDuty":0,"maxDuty":0,"Default":{"min":10,"max":95}},
         "Intake": {"active":False,"minDuty":0,"maxDuty":0,"Default":{"min":10,"max":95}},
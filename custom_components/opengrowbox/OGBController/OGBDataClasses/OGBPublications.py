@@ -1,4 +1,5 @@
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict, is_dataclass
+from functools import lru_cache
 from typing import List, Union, Optional
 import logging
 from datetime import datetime
@@ -6,40 +7,78 @@ from datetime import datetime
 
 _LOGGER = logging.getLogger(__name__)
 
+# Feldnamen pro Publication-Klasse, einmalig aus dataclasses.fields berechnet
+_FIELD_NAMES = {}
 
-@dataclass(frozen=True)
-class OGBInitData:
+
+def publication_fields(cls):
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(item.name for item in fields(cls))
+    return names
+
+
+class OGBPublication:
+    """
+    Basis aller Publications: die Dataclasses sind slotted (kein __dict__ pro Objekt),
+    to_dict ist eine flache Kopie über die vorberechneten Feldnamen statt rekursivem asdict.
+    """
+    __slots__ = ()
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in publication_fields(type(self))}
+
+
+def publication_dict(data):
+    """Publication (oder Liste davon) als Dict für HA-Events und den Client-Feed"""
+    if isinstance(data, OGBPublication):
+        return data.to_dict()
+    if is_dataclass(data) and not isinstance(data, type):
+        return asdict(data)
+    if isinstance(data, list):
+        return [publication_dict(item) if isinstance(item, OGBPublication) or is_dataclass(item) else item for item in data]
+    return data
+
+
+@dataclass(frozen=True, slots=True)
+class OGBInitData(OGBPublication):
     Name: str
     newState: tuple[Union[float, str]] = field(default_factory=list)
 
-@dataclass(frozen=True)
-class OGBEventPublication:
+@dataclass(frozen=True, slots=True)
+class OGBEventPublication(OGBPublication):
     Name: str
     oldState: tuple[Union[float, str]] = field(default_factory=list)
     newState: tuple[Union[float, str]] = field(default_factory=list)
 
-@dataclass(frozen=True)
-class OGBownDeviceSetup:
+@dataclass(frozen=True, slots=True)
+class OGBownDeviceSetup(OGBPublication):
     name: str
     entities: tuple[Union[float, str]] = field(default_factory=list)
 
-@dataclass(frozen=True)
-class OGBDeviceEventPublication:
+@dataclass(frozen=True, slots=True)
+class OGBDeviceEventPublication(OGBPublication):
     Name: str
     oldState: tuple[Union[float, str]] = field(default_factory=list)
     newState: tuple[Union[float, str]] = field(default_factory=list)
 
-@dataclass(frozen=True)
-class OGBModePublication:
+@dataclass(frozen=True, slots=True)
+class OGBModePublication(OGBPublication):
     currentMode: str
     previousMode: str 
  
-@dataclass(frozen=True)
-class OGBModeRunPublication:
+@dataclass(frozen=True, slots=True)
+class OGBModeRunPublication(OGBPublication):
     currentMode: str 
 
-@dataclass(frozen=True)
-class OGBVPDPublication:
+    @classmethod
+    @lru_cache(maxsize=16)
+    def of(cls, currentMode):
+        """Unveränderlich und pro Modus gleich: eine Instanz je Modus wiederverwenden"""
+        return cls(currentMode=currentMode)
+
+@dataclass(frozen=True, slots=True)
+class OGBVPDPublication(OGBPublication):
     Name: str
     VPD: Optional[float] = None
     AvgTemp: Optional[float] = None
@@ -47,11 +86,9 @@ class OGBVPDPublication:
     AvgDew: Optional[float] = None
     Timestamp: str = field(default_factory=lambda: datetime.now().strftime("%d.%m.%Y %H:%M:%S"))
 
-    def to_dict(self):
-        return asdict(self)
      
-@dataclass(frozen=True)
-class OGBWaterPublication:
+@dataclass(frozen=True, slots=True)
+class OGBWaterPublication(OGBPublication):
     Name: str
     ecCurrent: Optional[float] = None
     tdsCurrent: Optional[float] = None
@@ -59,56 +96,56 @@ class OGBWaterPublication:
     oxiCurrent: Optional[float] = None
     salCurrent: Optional[float] = None
     waterTemp: Optional[float] = None
-    def to_dict(self):
-        return asdict(self)
     
-@dataclass(frozen=True)
-class OGBSoilPublication:
+@dataclass(frozen=True, slots=True)
+class OGBSoilPublication(OGBPublication):
     Name: str
     ecCurrent: Optional[float] = None
     moistCurrent: Optional[float] = None
     phCurrent: Optional[float] = None
-    def to_dict(self):
-        return asdict(self) 
   
-@dataclass
-class OGBMoisturePublication:
+@dataclass(slots=True)
+class OGBMoisturePublication(OGBPublication):
     Name: str
     MoistureValues: list
     AvgMoisture: float | None = None
 
-@dataclass
-class OGBDLIPublication:
+@dataclass(slots=True)
+class OGBDLIPublication(OGBPublication):
     Name: str
     DLI: int
 
-@dataclass
-class OGBPPFDPublication:
+@dataclass(slots=True)
+class OGBPPFDPublication(OGBPublication):
     Name: str
     PPFD: int
 
      
-@dataclass(frozen=True)
-class OGBCO2Publication:
+@dataclass(frozen=True, slots=True)
+class OGBCO2Publication(OGBPublication):
     Name: str
     co2Current: Optional[float] = None
     co2Target: Optional[float] = None
     minCO2: Optional[float] = None
     maxCO2: Optional[float] = None
     
-    def to_dict(self):
-        return asdict(self)
     
-@dataclass(frozen=True)
-class OGBActionPublication:
+@dataclass(frozen=True, slots=True)
+class OGBActionPublication(OGBPublication):
     Name: str
     message: str
     capability: str
     action: str
     priority:str
 
-@dataclass(frozen=True)
-class OGBWeightPublication:
+    @classmethod
+    @lru_cache(maxsize=256)
+    def of(cls, Name, capability, action, message, priority=""):
+        """Geteilte Instanz für feste Aktionen (z.B. VPD-Increase/Reduce ohne Messwerte in der Message)"""
+        return cls(Name=Name, message=message, capability=capability, action=action, priority=priority)
+
+@dataclass(frozen=True, slots=True)
+class OGBWeightPublication(OGBPublication):
     Name: str
     message: str
     tempDeviation: float
@@ -116,8 +153,8 @@ class OGBWeightPublication:
     tempWeight:float
     humWeight:float
     
-@dataclass(frozen=True)
-class OGBHydroPublication:
+@dataclass(frozen=True, slots=True)
+class OGBHydroPublication(OGBPublication):
     Name: str
     Mode:str
     Cycle: bool
@@ -129,8 +166,8 @@ class OGBHydroPublication:
 
 
 
-@dataclass(frozen=True)
-class OGBRetrivePublication:
+@dataclass(frozen=True, slots=True)
+class OGBRetrivePublication(OGBPublication):
     Name: str
     Active: bool
     Cycle: bool
@@ -140,30 +177,30 @@ class OGBRetrivePublication:
     Message: str
     Devices: List[str]
 
-@dataclass(frozen=True)
-class OGBRetrieveAction:
+@dataclass(frozen=True, slots=True)
+class OGBRetrieveAction(OGBPublication):
     Name: str
     Device:str
     Cycle: str
     Action: str
 
-@dataclass(frozen=True)
-class OGBHydroAction:
+@dataclass(frozen=True, slots=True)
+class OGBHydroAction(OGBPublication):
     Name: str
     Device:str
     Cycle: str
     Action: str
 
-@dataclass(frozen=True)
-class OGBWaterAction:
+@dataclass(frozen=True, slots=True)
+class OGBWaterAction(OGBPublication):
     Name: str
     Device:str
     Cycle: str
     Action: str
     Message: str
 
-@dataclass(frozen=True)
-class OGBLightAction:
+@dataclass(frozen=True, slots=True)
+class OGBLightAction(OGBPublication):
     Name: str
     Device:str
     Voltage:int
@@ -174,11 +211,15 @@ class OGBLightAction:
     SunRise: bool
     SunSet : bool
 
-@dataclass(frozen=True)
-class OGBPremPublication:
+@dataclass(frozen=True, slots=True)
+class OGBPremPublication(OGBPublication):
     Name: str
     UserID: str
     Plan:str
     ValidUntil:bool
     Active:bool
     Message:str
+
+
+for _cls in OGBPublication.__subclasses__():
+    publication_fields(_cls)
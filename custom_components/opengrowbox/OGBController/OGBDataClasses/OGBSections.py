@@ -0,0 +1,170 @@
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+TRUE_STRINGS = ("true", "on", "yes", "1")
+
+
+def to_number(value):
+    """Zahl oder None; numerische Strings werden konvertiert, Listen (z.B. Bereiche) bleiben erhalten"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_STRINGS
+    return bool(value)
+
+
+class OGBSection:
+    """
+    Typisierte DataStore-Sektion mit __slots__ statt Dict.
+    Felder sind als Attribute erreichbar und werden beim Setzen validiert; der Dict-Zugriff
+    (section["key"], get, in, items, ...) bleibt für bestehenden Code und getDeep/setDeep erhalten.
+    Unbekannte Keys landen in _extra, damit alte Speicherstände nichts verlieren.
+    """
+
+    __slots__ = ("_extra",)
+
+    FIELDS = ()        # (Name, Default), Reihenfolge = Reihenfolge in to_dict
+    NUMERIC = ()
+    BOOLEAN = ()
+
+    def __init__(self, **values):
+        object.__setattr__(self, "_extra", {})
+        for name, default in self.FIELDS:
+            object.__setattr__(self, name, default)
+        for key, value in values.items():
+            self[key] = value
+
+    def __setattr__(self, name, value):
+        if name in self.NUMERIC:
+            value = to_number(value)
+        elif name in self.BOOLEAN:
+            value = to_bool(value)
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**(data or {}))
+
+    def to_dict(self):
+        result = {name: getattr(self, name) for name, _ in self.FIELDS}
+        result.update(self._extra)
+        return result
+
+    def update(self, values=None, **kwargs):
+        for key, value in dict(values or {}, **kwargs).items():
+            self[key] = value
+
+    def copy(self):
+        return self.from_dict(self.to_dict())
+
+    # Dict-Kompatibilität
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self.__slots__:
+            setattr(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def get(self, key, default=None):
+        if key in self.__slots__:
+            return getattr(self, key)
+        return self._extra.get(key, default)
+
+    def __contains__(self, key):
+        return key in self.__slots__ or key in self._extra
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.FIELDS) + len(self._extra)
+
+    def __eq__(self, other):
+        if isinstance(other, OGBSection):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class TentData(OGBSection):
+    FIELDS = (
+        ("leafTempOffset", None),
+        ("temperature", None),
+        ("humidity", None),
+        ("dewpoint", None),
+        ("maxTemp", None),
+        ("minTemp", None),
+        ("maxHumidity", None),
+        ("minHumidity", None),
+        ("co2Level", None),
+        ("DLI", None),
+        ("PPFD", None),
+        ("AmbientTemp", None),
+        ("AmbientHum", None),
+        ("OutsiteTemp", None),
+        ("OutsiteHum", None),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+    NUMERIC = frozenset(__slots__)
+
+
+class VPDData(OGBSection):
+    FIELDS = (
+        ("current", None),
+        ("targeted", None),
+        ("range", None),
+        ("perfection", None),
+        ("perfectMin", None),
+        ("perfectMax", None),
+        ("tolerance", None),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+    NUMERIC = frozenset(__slots__)
+
+
+class ControlOptions(OGBSection):
+    FIELDS = (
+        ("ownDeviceSetup", False),
+        ("nightVPDHold", False),
+        ("vpdDeviceDampening", False),
+        ("lightbyOGBControl", False),
+        ("vpdLightControl", False),
+        ("co2Control", False),
+        ("workMode", False),
+        ("minMaxControl", False),
+        ("ownWeights", False),
+        ("ambientControl", False),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+    BOOLEAN = frozenset(__slots__)
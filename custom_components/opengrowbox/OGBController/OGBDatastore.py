@@ -1,6 +1,8 @@
 import logging
 import dataclasses
 
+from .OGBDataClasses.OGBSections import OGBSection
+
 _LOGGER = logging.getLogger(__name__)
 
 class SimpleEventEmitter:
@@ -36,26 +38,39 @@ class DataStore(SimpleEventEmitter):
         super().__init__()
         # Falls initial_state None ist, benutze das leere OGBConf Objekt
         self.state = initial_state
+        # Wiederhergestellte, noch nicht übernommene Sektionen (Lazy-Hydration)
+        self._lazySections = {}
+        # Rohdaten von Laufzeit-Sektionen aus dem letzten Restore (nur lesbar)
+        self._restoredRaw = {}
+        # Änderungszähler pro Top-Level-Sektion (z.B. für Diagnose-Caches)
+        self._sectionVersions = {}
         
     def __repr__(self):
         return (f"Datastore State:'{self.state}'")
 
     def get(self, key):
         """Ruft den Wert für einen Schlüssel ab."""
+        if self._lazySections and key in self._lazySections:
+            self._hydrate(key)
         return getattr(self.state, key, None)
 
     def set(self, key, value):
         """Setzt einen neuen Wert und löst Events aus, falls der Wert geändert wurde."""
+        if self._lazySections:
+            self._lazySections.pop(key, None)
         if getattr(self.state, key, None) != value:
             setattr(self.state, key, value)
+            self._bumpSection(key)
             self.emit(key, value)
 
     def getDeep(self, path):
         """Ruft verschachtelte Daten anhand eines Pfads ab (für Attribute oder Schlüssel in Dictionaries)."""
         keys = path.split(".")
+        if self._lazySections and keys[0] in self._lazySections:
+            self._hydrate(keys[0])
         data = self.state
         for key in keys:
-            if isinstance(data, dict):  # Falls `data` ein Dictionary ist
+            if isinstance(data, (dict, OGBSection)):  # Dictionary oder typisierte Sektion
                 data = data.get(key, None)
             elif hasattr(data, key):  # Falls `data` ein Objekt ist
                 data = getattr(data, key)
@@ -66,9 +81,11 @@ class DataStore(SimpleEventEmitter):
     def setDeep(self, path, value):
         """Setzt einen Wert in verschachtelten Daten und löst Events aus."""
         keys = path.split(".")
+        if self._lazySections and keys[0] in self._lazySections:
+            self._hydrate(keys[0])
         data = self.state
         for key in keys[:-1]:
-            if isinstance(data, dict):
+            if isinstance(data, (dict, OGBSection)):
                 if key not in data:
                     data[key] = {}  # Initialisiere verschachteltes Dictionary, falls es nicht existiert
                 data = data[key]
@@ -78,16 +95,69 @@ class DataStore(SimpleEventEmitter):
                 raise AttributeError(f"Cannot access '{key}' on '{type(data).__name__}'")
         
         last_key = keys[-1]
-        if isinstance(data, dict):
+        if isinstance(data, (dict, OGBSection)):
             data[last_key] = value
+            self._bumpSection(keys[0])
             self.emit(path, value)
         elif hasattr(data, last_key):
             if getattr(data, last_key) != value:
                 setattr(data, last_key, value)
+                self._bumpSection(keys[0])
                 self.emit(path, value)
         else:
             raise AttributeError(f"Cannot set '{last_key}' on '{type(data).__name__}'")
 
+    def restoreBulk(self, values, lazySections=None, rawSections=None):
+        """
+        Übernimmt validierte Sektionen in einem Schritt ohne Einzel-Events.
+        Dicts und Dataclasses werden in-place gemerged, damit bestehende Referenzen gültig bleiben
+        und neue Default-Keys erhalten bleiben. Am Ende wird einmal 'StateRestored' ausgelöst.
+        """
+        for key, value in values.items():
+            setattr(self.state, key, self._mergeValue(getattr(self.state, key, None), value))
+            self._bumpSection(key)
+
+        self._lazySections.update(lazySections or {})
+        self._restoredRaw = dict(rawSections or {})
+        self.emit("StateRestored", {
+            "restored": list(values),
+            "lazy": list(lazySections or {}),
+            "raw": list(rawSections or {}),
+        })
+
+    def _hydrate(self, key):
+        """Übernimmt eine Lazy-Sektion beim ersten Zugriff."""
+        value = self._lazySections.pop(key)
+        setattr(self.state, key, self._mergeValue(getattr(self.state, key, None), value))
+        self._bumpSection(key)
+        _LOGGER.debug(f"Lazy restored section '{key}'")
+
+    def _bumpSection(self, key):
+        self._sectionVersions[key] = self._sectionVersions.get(key, 0) + 1
+
+    def sectionVersion(self, key):
+        """Änderungszähler einer Sektion; In-Place-Änderungen ohne set/setDeep zählen nicht mit."""
+        return self._sectionVersions.get(key, 0)
+
+    def _mergeValue(self, current, saved):
+        if isinstance(current, OGBSection) and isinstance(saved, (dict, OGBSection)):
+            current.update(saved)
+            return current
+        if isinstance(current, dict) and isinstance(saved, dict):
+            for key, value in saved.items():
+                current[key] = self._mergeValue(current.get(key), value)
+            return current
+        if dataclasses.is_dataclass(current) and not isinstance(current, type) and isinstance(saved, dict):
+            for field in dataclasses.fields(current):
+                if field.name in saved:
+                    setattr(current, field.name, self._mergeValue(getattr(current, field.name), saved[field.name]))
+            return current
+        return saved
+
+    def getRestored(self, key):
+        """Rohdaten einer Laufzeit-Sektion (z.B. devices) aus dem letzten Restore."""
+        return self._restoredRaw.get(key)
+
     def _make_serializable(self, obj, visited=None):
         """Konvertiert Objekte in JSON-serialisierbare Formate mit Schutz vor zirkulären Referenzen."""
         if visited is None:
@@ -164,6 +234,8 @@ class DataStore(SimpleEventEmitter):
 
     def getFullState(self):
         """Gibt den vollständigen State als JSON-serialisierbares dict zurück."""
+        for key in list(self._lazySections):
+            self._hydrate(key)
         try:
             if dataclasses.is_dataclass(self.state):
                 # Erstelle eine Kopie des State-Objekts ohne das hass-Attribut
@@ -14,6 +14,8 @@ from .OGBDevices.GenericSwitch import GenericSwitch
 from .OGBDevices.Pump import Pump
 from .OGBDevices.CO2 import CO2
 from .OGBDataClasses.OGBPublications import OGBownDeviceSetup
+from .OGBCapabilityRegistry import OGBCapabilityRegistry
+from .OGBEntityClassifier import label_overrides
 import asyncio
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,6 +30,7 @@ class OGBDeviceManager:
         self.eventManager = eventManager
         self.is_initialized = False
         self._devicerefresh_task: asyncio.Task | None = None 
+        self.capRegistry = OGBCapabilityRegistry(self.room, self.dataStore)
         self.init()
 
         #EVENTS
@@ -74,6 +77,7 @@ class OGBDeviceManager:
         devices = self.dataStore.get("devices")
         devices.append(identified_device)
         self.dataStore.set("devices",devices)
+        self.capRegistry.addDevice(identified_device.deviceName, identified_device.deviceType)
         _LOGGER.info(f"Added new device From List: {identified_device}")    
                 
     
@@ -101,31 +105,7 @@ class OGBDeviceManager:
         _LOGGER.debug(f"Removed device: {deviceName}")
 
         # ➕ Capability-Cleanup
-        capMapping = {
-            "canHeat": ["heater"],
-            "canCool": ["cooler"],
-            "canClimate": ["climate"],
-            "canHumidify": ["humidifier"],
-            "canDehumidify": ["dehumidifier"],
-            "canVentilate": ["ventilation"],
-            "canExhaust": ["exhaust"],
-            "canIntake": ["intake"],
-            "canLight": ["light"],
-            "canCO2": ["co2"],
-            "canPump": ["pump"],
-        }
-
-        for cap, deviceTypes in capMapping.items():
-            if deviceToRemove.deviceType.lower() in (dt.lower() for dt in deviceTypes):
-                capPath = f"capabilities.{cap}"
-                currentCap = self.dataStore.getDeep(capPath)
-
-                if currentCap and deviceToRemove.deviceName in currentCap["devEntities"]:
-                    currentCap["devEntities"].remove(deviceToRemove.deviceName)
-                    currentCap["count"] = max(0, currentCap["count"] - 1)
-                    currentCap["state"] = currentCap["count"] > 0
-                    self.dataStore.setDeep(capPath, currentCap)
-                    _LOGGER.debug(f"Updated capability '{cap}' after removing device {deviceToRemove.deviceName}")
+        self.capRegistry.removeDevice(deviceToRemove.deviceName)
 
         return True
 
@@ -150,6 +130,16 @@ class OGBDeviceManager:
             "Switch": ["generic", "switch"],
         }
 
+        # 🏷️ Schritt 0: Expliziter Override per Label "ogb:type=<Typ>"
+        typeOverride = label_overrides(device_labels).get("type")
+        if isinstance(typeOverride, str):
+            detected_type = next((device_type for device_type in device_type_mapping if device_type.lower() == typeOverride), None)
+            if detected_type:
+                _LOGGER.info(f"Device '{device_name}' identified via 'ogb:type' label as {detected_type}")
+                DeviceClass = self.get_device_class(detected_type)
+                return DeviceClass(device_name, device_data, self.eventManager, self.dataStore, detected_type, self.room, self.hass)
+            _LOGGER.warning(f"Device '{device_name}' has unknown 'ogb:type' label '{typeOverride}'")
+
         # 🏷️ Schritt 1: Labels prüfen
         label_matches = []
         if device_labels:
@@ -269,16 +259,6 @@ class OGBDeviceManager:
 
     def capCleaner(self,data):
         """Setzt alle Capabilities im DataStore auf den Ursprungszustand zurück."""
-        capabilities = self.dataStore.get("capabilities")
-
         self.dataStore.set("Devices",[])
-
-        for key in capabilities:
-            capabilities[key] = {
-                "state": False,
-                "count": 0,
-                "devEntities": []
-            }
-
-        self.dataStore.set("capabilities", capabilities)
-        _LOGGER.debug(f"{self.room}: Cleared Caps and Devices")
\ No newline at end of file
+        self.capRegistry.clear()
+        _LOGGER.debug(f"{self.room}: Cleared Caps and Devices")
@@ -96,5 +96,4 @@ class Climate(Device):
 
     def log_action(self, action_name):
         """Logs the performed action."""
-        log_message = f"{self.deviceName} CurrentHAVOC: {self.currentHAVOC}"
-        _LOGGER.warning(f"{action_name}: {log_message}")
+        self.ogbLog.decision(f"{self.deviceName}.action", logging.INFO, action=action_name, currentHAVOC=self.currentHAVOC)
@@ -1,5 +1,6 @@
 import logging
 import asyncio
+from ..utils.ogbLogging import OGBStructuredLogger
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,8 +20,10 @@ class Device:
         self.options = []
         self.sensors = []
         self.ogbsettings = []
+        self.entityIndex = {}
         self.initialization = False
         self.inWorkMode = False
+        self.ogbLog = OGBStructuredLogger(logging.getLogger(type(self).__module__), inRoom)
 
         # EVENTS
         self.eventManager.on("DeviceStateUpdate", self.deviceUpdate)        
@@ -62,12 +65,12 @@ class Device:
         self.identifDimmable()
         self.checkForControlValue()
         self.checkMinMax(False)
-        self.identifyCapabilities()
         if(self.initialization == True):
             self.deviceUpdater()
             _LOGGER.debug(f"Device {self.deviceName} Initialization Completed")
             self.initialization = False
-            logging.warning(f"Device: {self.deviceName} Initialization done {self}")
+            _LOGGER.info("Device: %s Initialization done", self.deviceName)
+            _LOGGER.debug("Device: %s State %r", self.deviceName, self)
         else:
             raise Exception(f"Device could not be Initialized {self.deviceName}")
 
@@ -75,49 +78,19 @@ class Device:
         """
         Verarbeitet Updates basierend to der `entity_id` und aktualisiert die entsprechenden Werte.
         """
+        entity_id = updateData["entity_id"]
+        indexed = self.entityIndex.get(entity_id)
+        if indexed is None: return
 
-        parts = updateData["entity_id"].split(".")
-        device_name = parts[1].split("_")[0] if len(parts) > 1 else "Unknown"
-
-        if self.deviceName != device_name: return
+        category, entity = indexed
+        old_value = entity.get("value")
+        entity["value"] = updateData["newValue"]
+        _LOGGER.debug(
+            f"{self.deviceName} Updated {category} {entity_id}: Old Value: {old_value}, New Value: {entity['value']}."
+        )
 
-        entity_id = updateData["entity_id"]
-        new_value = updateData["newValue"]
-
-        # Asynchrone Helper-Funktion, um die Entität in einer Liste zu finden und den Wert zu aktualisieren
-        async def update_entity_value(entity_list, entity_id, new_value):
-            for entity in entity_list:
-                if entity.get("entity_id") == entity_id:
-                    old_value = entity.get("value")
-                    entity["value"] = new_value
-                    _LOGGER.debug(
-                        f"{self.deviceName} Updated {entity_id}: Old Value: {old_value}, New Value: {new_value}."
-                    )
-                    return True
-            return False
-
-        # Aktualisiere Sensor-Werte
-        if "sensor." in entity_id:
-            _LOGGER.debug(f"{self.deviceName} Start Update Sensor for {updateData}.")
-            await update_entity_value(self.sensors, entity_id, new_value)
-            _LOGGER.debug(f"{self.deviceName} warning {self.__repr__()}.")
-
-        # Aktualisiere Switch-Werte
-        if any(prefix in entity_id for prefix in ["fan.", "light.", "switch.", "humidifier."]):
-            _LOGGER.debug(f"{self.deviceName} Start Update Switch for {updateData}.")
-            await update_entity_value(self.switches, entity_id, new_value)
+        if category == "switches":
             self.identifyIfRunningState()
-            
-        # Aktualisiere weitere spezifische Werte
-        if any(prefix in entity_id for prefix in ["number.", "text.", "time.", "select.", "date."]):
-            _LOGGER.debug(f"{self.deviceName} Start Update Switches for {updateData}.")
-            await update_entity_value(self.options, entity_id, new_value)
-            _LOGGER.debug(f"{self.deviceName} warning {self.__repr__()}.")
-
-        # Aktualisiere spezifische OGB-Entitäten
-        if any(prefix in entity_id for prefix in ["ogb_"]):
-            _LOGGER.debug(f"{self.deviceName} Start Update OGBS for {updateData}.")
-            await update_entity_value(self.sensors, entity_id, new_value)
 
     def checkMinMax(self,data):
         minMaxSets = self.dataStore.getDeep(f"DeviceMinMax.{self.deviceType}")
@@ -203,71 +176,19 @@ class Device:
                 elif entityID.startswith("sensor."):
                     if self.evalSensors(entityID):
                         self.sensors.append(entity)
+            self.buildEntityIndex()
             self.initialization = True
         except:
             _LOGGER.error(f"Device:{self.deviceName} INIT ERROR {self.deviceName}.")
             self.initialization = False
 
-    # Identify Action Caps 
-    def identifyCapabilities(self):
-        capMapping = {
-            "canHeat": ["heater"],
-            "canCool": ["cooler"],
-            "canClimate":["cliamte"],
-            "canHumidify": ["humidifier"],
-            "canDehumidify": ["dehumidifier"],
-            "canVentilate": ["ventilation"],
-            "canExhaust": ["exhaust"],
-            "canIntake": ["intake"],
-            "canLight": ["light"],
-            "canCO2": ["co2"],
-            "canPump":["pump"],
-        }
-
-        # Initialisiere capabilities im dataStore, falls nicht vorhanden
-        if not self.dataStore.get("capabilities"):
-            self.dataStore.setDeep("capabilities", {
-                cap: {"state": False, "count": 0, "devEntities": []} for cap in capMapping
-            })
-
-        # Durchltoe alle möglichen Capabilities und überprüfe den Gerätetyp
-        for cap, deviceTypes in capMapping.items():
-            if self.deviceName == "ogb": return
-            if self.deviceType.lower() in (dt.lower() for dt in deviceTypes):
-                capPath = f"capabilities.{cap}"
-                currentCap = self.dataStore.getDeep(capPath)
-
-                # Aktualisiere die Capability-Daten
-                if not currentCap["state"]:
-                    currentCap["state"] = True
-                currentCap["count"] += 1
-                if self.deviceType == "Light":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Exhaust":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Intake":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Ventilation":
-                    currentCap["devEntities"].append(self.deviceName)                    
-                if self.deviceType == "Dehumidifier":
-                    currentCap["devEntities"].append(self.deviceName)                   
-                if self.deviceType == "Humidifier":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Heater":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Cooler":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Humidifier":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Climate":
-                    currentCap["devEntities"].append(self.deviceName)
-                if self.deviceType == "Pump":
-                    currentCap["devEntities"].append(self.deviceName)
-                # Schreibe die aktualisierten Daten zurück
-                self.dataStore.setDeep(capPath, currentCap)
-
-        # Log die finalen Capabilities
-        _LOGGER.debug(f"{self.deviceName}: Capabilities identified: {self.dataStore.get('capabilities')}")
+    def buildEntityIndex(self):
+        """entity_id → (Kategorie, Entity-Dict), damit State-Updates mit einem Lookup zugeordnet werden"""
+        self.entityIndex = {}
+        for category in ("sensors", "options", "switches", "ogbsettings"):
+            for entity in getattr(self, category):
+                if isinstance(entity, dict) and "entity_id" in entity:
+                    self.entityIndex[entity["entity_id"]] = (category, entity)
 
     def identifyIfRunningState(self):
         if self.isAcInfinDev:
@@ -1005,14 +926,14 @@ class Device:
                
     # Update Listener
     def deviceUpdater(self):
-        deviceEntitiys = self.getEntitys()
-        _LOGGER.debug(f"UpdateListener für {self.deviceName} registriert for {deviceEntitiys}.")
+        _LOGGER.debug(f"UpdateListener für {self.deviceName} registriert for {list(self.entityIndex)}.")
         
         async def deviceUpdateListner(event):
             
             entity_id = event.data.get("entity_id")
             
-            if entity_id in deviceEntitiys:
+            indexed = self.entityIndex.get(entity_id)
+            if indexed is not None:
                 old_state = event.data.get("old_state")
                 new_state = event.data.get("new_state")
                             
@@ -1038,13 +959,10 @@ class Device:
                 )
                 
                 # Check if this is a switch/control entity that affects running state
-                if any(prefix in entity_id for prefix in ["fan.", "light.", "switch.", "humidifier.", "select."]):
+                category, entity = indexed
+                if category == "switches" or entity_id.startswith("select."):
                     # Update the entity value first
-                    for entity_list in [self.switches, self.options]:
-                        for entity in entity_list:
-                            if entity.get("entity_id") == entity_id:
-                                entity["value"] = new_state_value
-                                break
+                    entity["value"] = new_state_value
                     
                     # Now update the running state
                     try:
@@ -76,6 +76,7 @@ class Light(Device):
         self.eventManager.on("VPDLightControl", self.vpdLightControlChange)
         
         self.eventManager.on("toggleLight", self.toggleLight)
+        self.eventManager.on("SunPhaseTransition", self.onSunPhaseTransition)
         self.eventManager.on("Increase Light", self.increaseAction)
         self.eventManager.on("Reduce Light", self.reduceAction)
 
@@ -413,6 +414,20 @@ class Light(Device):
                 _LOGGER.error(traceback.format_exc())
             await asyncio.sleep(60)
 
+    async def onSunPhaseTransition(self, data):
+        """Startet SunRise/SunSet direkt an der Flanke der Photoperiode, der periodische Check bleibt Fallback."""
+        if not self.isDimmable or self.sun_phase_paused or not self.islightON:
+            return
+        phase = data.get("phase")
+        if phase == "sunrise" and self.sunRiseDuration and not self.sunrise_phase_active:
+            _LOGGER.debug(f"{self.deviceName}: Start SunRisesphase an der Flanke")
+            self.sunrise_phase_active = True
+            self.start_sunrise_task()
+        elif phase == "sunset" and self.sunSetDuration and not self.sunset_phase_active:
+            _LOGGER.debug(f"{self.deviceName}: Start Sonnenuntergangsphase an der Flanke")
+            self.sunset_phase_active = True
+            self.start_sunset_task()
+
     def _check_should_reset_phases(self):
         """Überprüft, ob die Phasen zurückgesetzt werden sollten (einmal pro Tag) und garantiert, dass beide Phasen zurückgesetzt werden."""
         today = datetime.now().date()
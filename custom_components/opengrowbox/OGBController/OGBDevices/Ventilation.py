@@ -108,7 +108,6 @@ class Ventilation(Device):
 
     def log_action(self, action_name):
         """Protokolliert die ausgeführte Aktion."""
-        log_message = f"{self.deviceName} DutyCycle: {self.dutyCycle}%"
-        _LOGGER.warning(f"{action_name}: {log_message}")
+        self.ogbLog.decision(f"{self.deviceName}.action", logging.INFO, action=action_name, dutyCycle=self.dutyCycle)
 
 
@@ -0,0 +1,148 @@
+import dataclasses
+import json
+import logging
+import time
+
+from .OGBDataClasses.OGBSections import OGBSection
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_DEPTH = 6
+MAX_ITEMS = 100               # Listen/Dicts werden danach abgeschnitten
+MAX_STRING = 500
+MAX_SECTION_BYTES = 64 * 1024 # größere Sektionen werden durch eine Zusammenfassung ersetzt
+CACHE_TTL = 30                # Sekunden, auch bei unveränderter Version (In-Place-Änderungen)
+
+# Kompakte Auswahl für Debug-Logs
+DEBUG_SECTIONS = ("tentMode", "vpd", "tentData", "controlOptions", "capabilities", "devices")
+
+
+def bounded(value, depth=0):
+    """JSON-taugliche Kopie mit Tiefen-, Längen- und Stringgrenzen; fremde Objekte nur als repr"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= MAX_STRING else value[:MAX_STRING] + "…"
+    if depth >= MAX_DEPTH:
+        return f"<{type(value).__name__}>"
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        value = {field.name: getattr(value, field.name) for field in dataclasses.fields(value) if field.name != "hass"}
+    elif isinstance(value, OGBSection):
+        value = value.to_dict()
+    if isinstance(value, dict):
+        items = list(value.items())
+        result = {str(key): bounded(item, depth + 1) for key, item in items[:MAX_ITEMS] if key != "hass"}
+        if len(items) > MAX_ITEMS:
+            result["__truncated__"] = len(items) - MAX_ITEMS
+        return result
+    if isinstance(value, (list, tuple, set)):
+        items = list(value)
+        result = [bounded(item, depth + 1) for item in items[:MAX_ITEMS]]
+        if len(items) > MAX_ITEMS:
+            result.append(f"… {len(items) - MAX_ITEMS} more")
+        return result
+    return bounded(repr(value))
+
+
+def _serializeDevices(devices):
+    """Geräteobjekte als Zusammenfassung statt über __dict__ (keine hass/eventManager-Referenzen)"""
+    result = []
+    for device in devices or []:
+        if not hasattr(device, "deviceName"):
+            result.append(bounded(device))
+            continue
+        result.append({
+            "name": device.deviceName,
+            "type": device.deviceType,
+            "running": device.isRunning,
+            "dimmable": device.isDimmable,
+            "inWorkMode": device.inWorkMode,
+            "switches": [entity.get("entity_id") for entity in device.switches],
+            "sensors": {entity.get("entity_id"): entity.get("value") for entity in device.sensors},
+            "options": {entity.get("entity_id"): entity.get("value") for entity in device.options},
+        })
+    return result
+
+
+def _serializeCapabilities(capabilities):
+    return {
+        cap: {"state": info.get("state"), "count": info.get("count"), "devices": list(info.get("devEntities", []))}
+        for cap, info in (capabilities or {}).items()
+    }
+
+
+def _serializeWorkData(workData):
+    """Nur die aktuellen Werte pro Entität, keine Labels/Plattform-Details"""
+    return {
+        key: [{"entity_id": item.get("entity_id"), "value": item.get("value")} if isinstance(item, dict) else bounded(item)
+              for item in (items or [])[:MAX_ITEMS]]
+        for key, items in (workData or {}).items()
+    }
+
+
+SECTION_SERIALIZERS = {
+    "devices": _serializeDevices,
+    "capabilities": _serializeCapabilities,
+    "workData": _serializeWorkData,
+    "ownDeviceList": _serializeDevices,
+}
+
+
+class OGBDiagnosticsExporter:
+    """
+    Raum-Snapshot für Diagnose-Downloads und Debug-Logs.
+    Jede DataStore-Sektion hat einen festen Serializer, eine Größengrenze und einen Cache,
+    der über die Sektions-Version des DataStores (set/setDeep) und eine TTL invalidiert wird.
+    """
+
+    def __init__(self, dataStore, room):
+        self.dataStore = dataStore
+        self.room = room
+        self._cache = {}
+        self.stats = {"exports": 0, "cacheHits": 0, "serialized": 0, "truncated": 0, "errors": 0}
+
+    def sectionNames(self):
+        return [field.name for field in dataclasses.fields(self.dataStore.state) if field.name != "hass"]
+
+    def section(self, name, now=None):
+        now = time.monotonic() if now is None else now
+        version = self.dataStore.sectionVersion(name)
+        cached = self._cache.get(name)
+        if cached and cached["version"] == version and now - cached["at"] < CACHE_TTL:
+            self.stats["cacheHits"] += 1
+            return cached["value"]
+
+        try:
+            raw = self.dataStore.get(name)
+            value = SECTION_SERIALIZERS.get(name, bounded)(raw)
+            size = len(json.dumps(value, default=str))
+            if size > MAX_SECTION_BYTES:
+                self.stats["truncated"] += 1
+                value = {
+                    "__truncated__": True,
+                    "bytes": size,
+                    "keys": list(value)[:MAX_ITEMS] if isinstance(value, dict) else None,
+                    "items": len(value) if isinstance(value, (list, dict)) else None,
+                }
+        except Exception as e:
+            self.stats["errors"] += 1
+            _LOGGER.warning(f"{self.room}: Diagnostics for section '{name}' failed: {e}")
+            value = {"__error__": str(e)}
+
+        self.stats["serialized"] += 1
+        self._cache[name] = {"version": version, "at": now, "value": value}
+        return value
+
+    def export(self, sections=None):
+        self.stats["exports"] += 1
+        now = time.monotonic()
+        names = sections or self.sectionNames()
+        return {
+            "room": self.room,
+            "generated": time.time(),
+            "sections": {name: self.section(name, now) for name in names},
+            "stats": dict(self.stats),
+        }
+
+    def invalidate(self):
+        self._cache.clear()
@@ -0,0 +1,157 @@
+import logging
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class DoseStep:
+    """Ein Pumpenlauf eines Dosierplans"""
+    name: str
+    pump: Any
+    ml: float
+    runTime: float
+    after: Set[str] = field(default_factory=set)   # Schritte, die vorher fertig sein müssen
+    last: bool = False                             # erst nach allen anderen Schritten (z.B. pH)
+
+
+@dataclass
+class DosingPlan:
+    steps: List[DoseStep]
+    maxConcurrent: int = 2
+
+    def validate(self):
+        """Prüft Abhängigkeiten auf unbekannte Schritte und Zyklen"""
+        names = {step.name for step in self.steps}
+        for step in self.steps:
+            unknown = step.after - names
+            if unknown:
+                raise ValueError(f"Dosing step {step.name} depends on unknown steps {unknown}")
+
+        deps = self.dependencies()
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dosing plan has a dependency cycle at {name}")
+            visiting.add(name)
+            for dep in deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in deps:
+            visit(name)
+
+    def dependencies(self):
+        """Effektive Abhängigkeiten inkl. 'last'-Schritte"""
+        regular = {step.name for step in self.steps if not step.last}
+        return {
+            step.name: set(step.after) | (regular if step.last else set())
+            for step in self.steps
+        }
+
+
+@dataclass
+class DosingReport:
+    elapsed: float = 0.0
+    serialTime: float = 0.0
+    cancelled: bool = False
+    startedAt: float = 0.0
+    steps: Dict[str, Dict[str, Optional[float]]] = field(default_factory=dict)
+
+    @property
+    def ok(self):
+        return not self.cancelled and all(step.get("ok") for step in self.steps.values())
+
+
+class OGBDosingExecutor:
+    """
+    Führt Dosierpläne aus: unabhängige Pumpen laufen parallel (höchstens maxConcurrent),
+    Reihenfolgen ('A vor B', 'pH zuletzt') werden eingehalten. Pumpen werden in jedem Fall
+    wieder ausgeschaltet, auch bei Abbruch. turnOn/turnOff sind Coroutinen, die einen DoseStep bekommen.
+    """
+
+    def __init__(self, room, turnOn, turnOff):
+        self.room = room
+        self.turnOn = turnOn
+        self.turnOff = turnOff
+        self.lastReport: Optional[DosingReport] = None
+
+    async def _runStep(self, step, report):
+        entry = report.steps[step.name]
+        entry["start"] = round(time.monotonic() - report.startedAt, 3)
+        switchedOn = False
+        ran = False
+        try:
+            await self.turnOn(step)
+            switchedOn = True
+            await asyncio.sleep(step.runTime)
+            ran = True
+        finally:
+            if switchedOn:
+                # Ausschalten darf durch einen Abbruch nicht verhindert werden
+                entry["off"] = await asyncio.shield(self._safeOff(step))
+            # Erfolgreich nur, wenn die Pumpe auch wieder aus ist
+            entry["ok"] = ran and entry.get("off", False)
+            entry["end"] = round(time.monotonic() - report.startedAt, 3)
+
+    async def _safeOff(self, step):
+        try:
+            await self.turnOff(step)
+            return True
+        except Exception as e:
+            _LOGGER.error(f"[{self.room}] Failed to switch off {step.name}: {e}")
+            return False
+
+    async def run(self, plan: DosingPlan) -> DosingReport:
+        plan.validate()
+        deps = plan.dependencies()
+        steps = {step.name: step for step in plan.steps}
+        limit = max(1, plan.maxConcurrent or len(plan.steps) or 1)
+
+        report = DosingReport(serialTime=round(sum(step.runTime for step in plan.steps), 3))
+        report.startedAt = time.monotonic()
+        for step in plan.steps:
+            report.steps[step.name] = {"ml": step.ml, "start": None, "end": None, "off": None, "ok": False}
+
+        pending = dict(deps)
+        finished = set()
+        running = {}
+
+        try:
+            while pending or running:
+                for name in [name for name, needs in pending.items() if needs <= finished]:
+                    if len(running) >= limit:
+                        break
+                    del pending[name]
+                    running[asyncio.create_task(self._runStep(steps[name], report))] = name
+
+                if not running:
+                    # Abhängigkeit eines fehlgeschlagenen Schritts: Rest überspringen
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    if task.exception() is not None:
+                        _LOGGER.error(f"[{self.room}] Dosing step {name} failed: {task.exception()}")
+                        continue
+                    finished.add(name)
+        except asyncio.CancelledError:
+            report.cancelled = True
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        finally:
+            report.elapsed = round(time.monotonic() - report.startedAt, 3)
+            self.lastReport = report
+            _LOGGER.info(f"[{self.room}] Dosing plan finished in {report.elapsed}s (serial {report.serialTime}s), ok={report.ok}")
+
+        return report
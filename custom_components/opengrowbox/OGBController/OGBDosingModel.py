@@ -0,0 +1,248 @@
+import logging
+import math
+import random
+from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+# Startwerte der Reservoir-Antwort: Änderung pro ml Dünger/Korrektur je Liter
+DEFAULT_GAINS = {
+    "ec": 0.25,        # EC pro ml/L Nährstoff (A+B+C)
+    "ph_down": -2.0,   # pH pro ml/L pH-
+    "ph_up": 2.0,      # pH pro ml/L pH+
+}
+
+# Welche Messgröße eine Dosierung beeinflusst
+DOSE_METRIC = {"ec": "ec", "ph_down": "ph", "ph_up": "ph"}
+
+# Steigungsgrenzen pro Minute, ab der ein Wert als eingeschwungen gilt
+SETTLE_SLOPE = {"ec": 0.01, "ph": 0.02}
+SETTLE_RELATIVE = 0.03     # bzw. 3% der erwarteten Änderung pro Minute bei großen Dosen
+
+LEARN_RATE = 0.5
+TARGET_FRACTION = 0.9      # Leicht unterdosieren, der zweite Schritt korrigiert den Rest
+GAIN_LIMIT = 10.0          # Gelernte Werte bleiben innerhalb Faktor 10 um den Startwert
+
+# Solange eine Dosierart weniger gelernte Dosierungen hat, ist der Startwert nur eine Schätzung:
+# nur einen Teil des Wegs dosieren und pH höchstens mit der früheren festen Menge
+MIN_LEARNED = 2
+UNLEARNED_FRACTION = 0.5
+UNLEARNED_MAX_ML = {"ph_down": 5.0, "ph_up": 5.0}
+
+
+class SettleDetector:
+    """Erkennt das Einschwingen eines Messwerts nach einer Dosierung über die Steigung"""
+
+    def __init__(self, slopeLimit, minWait=15.0, maxWait=180.0, window=4):
+        self.slopeLimit = slopeLimit
+        self.minWait = minWait
+        self.maxWait = maxWait
+        self.window = window
+        self.start = None
+        self.readings = []
+        self.timedOut = False
+
+    def begin(self, now):
+        self.start = now
+        self.readings = []
+        self.timedOut = False
+
+    def slope(self):
+        """Steigung pro Minute (kleinste Quadrate) über das Fenster"""
+        points = self.readings[-self.window:]
+        if len(points) < 2:
+            return None
+        t0 = points[0][0]
+        xs = [(ts - t0) / 60 for ts, _ in points]
+        ys = [value for _, value in points]
+        meanX = sum(xs) / len(xs)
+        meanY = sum(ys) / len(ys)
+        denom = sum((x - meanX) ** 2 for x in xs)
+        if denom == 0:
+            return None
+        return sum((x - meanX) * (y - meanY) for x, y in zip(xs, ys)) / denom
+
+    def add(self, value, now):
+        """Nimmt einen Messwert auf, True sobald eingeschwungen"""
+        self.readings.append((now, value))
+        elapsed = now - self.start
+        if elapsed >= self.maxWait:
+            self.timedOut = True
+            return True
+        if elapsed < self.minWait or len(self.readings) < min(self.window, 3):
+            return False
+        slope = self.slope()
+        return slope is not None and abs(slope) <= self.slopeLimit
+
+    def settledValue(self):
+        points = self.readings[-min(self.window, 3):]
+        return sum(value for _, value in points) / len(points) if points else None
+
+
+class OGBDosingModel:
+    """
+    Lernendes Dosiermodell pro Reservoir.
+    Schätzt aus vergangenen Dosierungen, wie stark EC und pH pro ml/L reagieren,
+    berechnet daraus eine Dosis nahe am Ziel und erkennt das Einschwingen über die
+    Sensorsteigung statt über einen festen Timer. Unabhängig von Home Assistant,
+    kann mit SimulatedReservoir durchgespielt werden.
+    """
+
+    def __init__(self, dataStore=None, room="", learnRate=LEARN_RATE, minWait=15.0, maxWait=180.0):
+        self.dataStore = dataStore
+        self.room = room
+        self.learnRate = learnRate
+        self.minWait = minWait
+        self.maxWait = maxWait
+
+        self.gains = dict(DEFAULT_GAINS)
+        self.learnedSamples = {kind: 0 for kind in DEFAULT_GAINS}
+        saved = self.dataStore.getDeep("Feed.Model.gains") if self.dataStore else None
+        if isinstance(saved, dict):
+            for kind, value in saved.items():
+                if kind in self.gains and isinstance(value, (int, float)) and value * DEFAULT_GAINS[kind] > 0:
+                    self.gains[kind] = float(value)
+        savedSamples = self.dataStore.getDeep("Feed.Model.samples") if self.dataStore else None
+        if isinstance(savedSamples, dict):
+            for kind, count in savedSamples.items():
+                if kind in self.learnedSamples and isinstance(count, int):
+                    self.learnedSamples[kind] = count
+
+        self.pending = None
+        self.episode = None
+        self.stats = {"doses": 0, "learned": 0, "rejected": 0, "timeouts": 0, "episodes": 0,
+                      "lastCycles": None, "lastTimeToTarget": None}
+
+    @staticmethod
+    def _now(now):
+        if now is None:
+            return datetime.now().timestamp()
+        return now.timestamp() if isinstance(now, datetime) else float(now)
+
+    @property
+    def isSettling(self):
+        return self.pending is not None
+
+    # Dosis
+    def isLearned(self, kind):
+        return self.learnedSamples.get(kind, 0) >= MIN_LEARNED
+
+    def doseFor(self, kind, current, target, volume, minMl=0.0, maxMl=None):
+        """
+        Dosis in ml, um von current auf target zu kommen (0 wenn nichts zu tun).
+        Mit ungelerntem Startwert vorsichtig: ein echter Gain über dem Startwert würde sonst überschießen.
+        """
+        gain = self.gains[kind]
+        mlPerLiter = (target - current) / gain * TARGET_FRACTION
+        if mlPerLiter <= 0:
+            return 0.0
+        ml = mlPerLiter * volume
+        if not self.isLearned(kind):
+            ml *= UNLEARNED_FRACTION
+            if kind in UNLEARNED_MAX_ML:
+                ml = min(ml, UNLEARNED_MAX_ML[kind])
+        if maxMl is not None:
+            ml = min(ml, maxMl)
+        return ml if ml >= minMl else 0.0
+
+    def recordDose(self, kind, ml, volume, baseline, now=None):
+        """Merkt sich eine ausgeführte Dosierung für das Lernen nach dem Einschwingen"""
+        now = self._now(now)
+        metric = DOSE_METRIC[kind]
+        expected = abs(self.gains[kind] * ml / volume) if volume else 0.0
+        detector = SettleDetector(max(SETTLE_SLOPE[metric], expected * SETTLE_RELATIVE), self.minWait, self.maxWait)
+        detector.begin(now)
+        self.pending = {"kind": kind, "ml": ml, "volume": volume, "baseline": baseline, "metric": metric, "detector": detector}
+        self.stats["doses"] += 1
+
+        if self.episode is None:
+            self.episode = {"start": now, "doses": 0}
+        self.episode["doses"] += 1
+
+    def observe(self, ec, ph, now=None):
+        """Neue Messwerte; True solange eine Dosierung noch einschwingt"""
+        if self.pending is None:
+            return False
+        now = self._now(now)
+        pending = self.pending
+        value = ec if pending["metric"] == "ec" else ph
+        if not value:
+            return True
+
+        detector = pending["detector"]
+        if not detector.add(value, now):
+            return True
+
+        self.pending = None
+        if detector.timedOut:
+            self.stats["timeouts"] += 1
+        self._learn(pending, detector.settledValue())
+        return False
+
+    def _learn(self, pending, settled):
+        kind = pending["kind"]
+        mlPerLiter = pending["ml"] / pending["volume"] if pending["volume"] else 0
+        if settled is None or mlPerLiter <= 0:
+            return
+        observed = (settled - pending["baseline"]) / mlPerLiter
+        prior = DEFAULT_GAINS[kind]
+
+        # Falsches Vorzeichen oder unplausibel: Messrauschen, nicht lernen
+        if observed * prior <= 0 or not (abs(prior) / GAIN_LIMIT <= abs(observed) <= abs(prior) * GAIN_LIMIT):
+            self.stats["rejected"] += 1
+            return
+
+        self.gains[kind] += self.learnRate * (observed - self.gains[kind])
+        self.learnedSamples[kind] += 1
+        self.stats["learned"] += 1
+        if self.dataStore:
+            self.dataStore.setDeep("Feed.Model.gains", dict(self.gains))
+            self.dataStore.setDeep("Feed.Model.samples", dict(self.learnedSamples))
+        _LOGGER.debug(f"[{self.room}] Dosing model {kind}: observed {observed:.3f}, gain now {self.gains[kind]:.3f}")
+
+    def markInRange(self, now=None):
+        """Ziel erreicht: Episode (Dosierungen bis Ziel, Zeit bis Ziel) abschließen"""
+        if self.episode is None or self.pending is not None:
+            return
+        now = self._now(now)
+        self.stats["episodes"] += 1
+        self.stats["lastCycles"] = self.episode["doses"]
+        self.stats["lastTimeToTarget"] = round(now - self.episode["start"], 1)
+        self.episode = None
+        if self.dataStore:
+            self.dataStore.setDeep("Feed.Model.stats", dict(self.stats))
+
+
+class SimulatedReservoir:
+    """
+    Einfaches Reservoir zum Durchspielen des Dosiermodells.
+    Dosierungen wirken mit Mischverzögerung erster Ordnung (tau Sekunden), optional mit Rauschen.
+    """
+
+    def __init__(self, volume=100.0, ec=0.6, ph=6.8, gains=None, tau=40.0, noise=0.0, seed=None):
+        self.volume = volume
+        self.gains = dict(gains or {"ec": 0.18, "ph_down": -3.0, "ph_up": 1.5})
+        self.tau = tau
+        self.noise = noise
+        self._rng = random.Random(seed)
+        self._values = {"ec": ec, "ph": ph}
+        self._targets = {"ec": ec, "ph": ph}
+        self._last = 0.0
+
+    def _advance(self, now):
+        dt = max(now - self._last, 0.0)
+        self._last = now
+        factor = 1 - math.exp(-dt / self.tau) if self.tau > 0 else 1.0
+        for metric in self._values:
+            self._values[metric] += (self._targets[metric] - self._values[metric]) * factor
+
+    def dose(self, kind, ml, now):
+        self._advance(now)
+        self._targets[DOSE_METRIC[kind]] += self.gains[kind] * ml / self.volume
+
+    def read(self, now):
+        self._advance(now)
+        return {
+            metric: value + (self._rng.gauss(0, self.noise) if self.noise else 0.0)
+            for metric, value in self._values.items()
+        }
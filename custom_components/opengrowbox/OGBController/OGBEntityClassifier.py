@@ -0,0 +1,153 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# Messgröße anhand des Namens, Reihenfolge ist relevant (z.B. "_co2" vor "_ec" wegen "_eco2").
+# Kurze Kürzel sind verankert (kein Buchstabe danach), damit "_ecowitt" oder "_phase" nicht treffen
+KIND_RULES = (
+    ("co2", r"_(co2|carbondioxide|eco2)"),
+    ("temperature", r"_(temperature|temp(?![a-z]))"),
+    ("humidity", r"_humidity"),
+    ("dewpoint", r"_dewpoint"),
+    ("moisture", r"_moisture"),
+    ("light", r"_(lumen|lux(?![a-z])|illuminance)"),
+    ("ec", r"_(ec(?![a-z])|conductivity)"),
+    ("tds", r"_tds(?![a-z])"),
+    ("ph", r"_ph(?![a-z])"),
+    ("oxidation", r"_oxidation"),
+    ("salinity", r"_salinity"),
+    ("duty", r"_duty"),
+    ("intensity", r"_intensity"),
+    ("voltage", r"_voltage"),
+)
+_KIND_PATTERNS = tuple((name, re.compile(pattern)) for name, pattern in KIND_RULES)
+
+# Messgrößen nur aus Sensoren; number.*_temp o.ä. sind Sollwerte, keine Messwerte
+MEASUREMENT_DOMAINS = ("sensor",)
+# Einstellungen/Kalibrierung statt Messwert, z.B. sensor.x_temp_offset
+SETTING_SUFFIXES = ("_offset", "_target", "_setpoint", "_calibration")
+
+MEDIUM_RULES = (
+    ("water", ("water", "wasser")),
+    ("soil", ("soil", "boden")),
+    ("plant", ("plant", "pflanzen")),
+)
+
+SWITCH_DOMAINS = ("switch", "light", "fan", "climate", "humidifier")
+OPTION_DOMAINS = ("select", "number", "date", "text", "time")
+
+# Label-Overrides, z.B. "ogb:medium=water", "ogb:kind=ec", "ogb:device=tank", "ogb:type=Heater", "ogb:ignore"
+LABEL_PREFIX = "ogb:"
+
+
+@dataclass(frozen=True)
+class EntityRole:
+    entity_id: str
+    domain: str
+    device: str
+    kind: Optional[str] = None
+    medium: str = "air"
+    unit: Optional[str] = None
+    isSetting: bool = False
+    ignored: bool = False
+    deviceType: Optional[str] = None
+    source: str = "name"
+
+    @property
+    def category(self):
+        """Gruppe innerhalb eines Geräts: switches, options oder sensors"""
+        if self.domain in SWITCH_DOMAINS:
+            return "switches"
+        if self.domain in OPTION_DOMAINS:
+            return "options"
+        return "sensors"
+
+
+def label_overrides(labels):
+    """Liest 'ogb:key=value'-Labels (Namen oder Label-Dicts) in ein Dict"""
+    overrides = {}
+    for label in labels or ():
+        name = label.get("name", "") if isinstance(label, dict) else str(label)
+        name = name.strip().lower()
+        if not name.startswith(LABEL_PREFIX):
+            continue
+        key, _, value = name[len(LABEL_PREFIX):].partition("=")
+        overrides[key.strip()] = value.strip() if value else True
+    return overrides
+
+
+def classify_entity(entity_id, labels=None):
+    """Ordnet eine entity_id einmalig einer Rolle zu (Messgröße, Medium, Gerät, OGB-Einstellung)"""
+    domain, _, objectId = entity_id.lower().partition(".")
+    kind = None
+    if domain in MEASUREMENT_DOMAINS and not objectId.endswith(SETTING_SUFFIXES):
+        kind = next((name for name, pattern in _KIND_PATTERNS if pattern.search(objectId)), None)
+    medium = next((name for name, keys in MEDIUM_RULES if any(key in objectId for key in keys)), "air")
+    fields = {
+        "entity_id": entity_id,
+        "domain": domain,
+        "device": objectId.split("_")[0] if objectId else "Unknown",
+        "kind": kind,
+        "medium": medium,
+        "isSetting": "ogb_" in entity_id,
+    }
+
+    overrides = label_overrides(labels)
+    if overrides:
+        fields["source"] = "label"
+        for key in ("kind", "medium", "device"):
+            if isinstance(overrides.get(key), str):
+                fields[key] = overrides[key]
+        if isinstance(overrides.get("type"), str):
+            fields["deviceType"] = overrides["type"].capitalize()
+        fields["ignored"] = bool(overrides.get("ignore"))
+
+    if fields["kind"] == "light":
+        fields["unit"] = "lumen" if "_lumen" in objectId else "lux"
+    return EntityRole(**fields)
+
+
+class OGBEntityClassifier:
+    """
+    Rollen aller Entitäten eines Raums, berechnet bei Discovery oder Registry-Änderungen.
+    Der Hot-Path (State-Changes) braucht danach nur noch einen Dict-Lookup.
+    """
+
+    def __init__(self, room):
+        self.room = room
+        self.roles = {}
+        self.stats = {"classified": 0, "lazy": 0, "invalidated": 0}
+
+    def classify(self, entity_id, labels=None):
+        role = classify_entity(entity_id, labels)
+        self.roles[entity_id] = role
+        self.stats["classified"] += 1
+        return role
+
+    def get(self, entity_id):
+        role = self.roles.get(entity_id)
+        if role is None:
+            # Nicht bei der Discovery gesehen (z.B. später hinzugefügt): einmalig nach Namen einordnen
+            self.stats["lazy"] += 1
+            role = self.classify(entity_id)
+        return role
+
+    def registerGroups(self, groups):
+        """Gruppierte Entitäten aus dem RegistryListener (inkl. Labels) einordnen"""
+        for group in groups or []:
+            for entity in group.get("entities", []):
+                self.classify(entity["entity_id"], entity.get("labels"))
+        _LOGGER.debug(f"{self.room}: Classified {len(self.roles)} entities")
+
+    def invalidate(self, entity_id=None):
+        if entity_id is None:
+            self.roles.clear()
+        else:
+            self.roles.pop(entity_id, None)
+        self.stats["invalidated"] += 1
+
+    def byKind(self, kind, medium=None):
+        return [role for role in self.roles.values() if role.kind == kind and (medium is None or role.medium == medium)]
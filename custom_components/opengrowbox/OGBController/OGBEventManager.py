@@ -1,9 +1,11 @@
-from dataclasses import is_dataclass, asdict
 import asyncio
 import logging
 import inspect
 import json
+from contextlib import nullcontext
 from datetime import datetime
+
+from .OGBDataClasses.OGBPublications import publication_dict
     
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,6 +16,8 @@ class OGBEventManager:
         self.ogb_model = ogb_model
         self.listeners = {}  
         self.notifications_enabled = False
+        self.clientFeed = None
+        self.profiler = None
         
     def __repr__(self):
         return f"Current Listeners: {self.listeners}"
@@ -43,7 +47,10 @@ class OGBEventManager:
         """Event auslösen, inkl. optionalem HA-Event und Notification."""
         
         if haEvent:
-            asyncio.create_task(self.emit_to_home_assistant(event_name, data))
+            if event_name == "LogForClient" and self.clientFeed is not None:
+                self.clientFeed.push(data)
+            else:
+                asyncio.create_task(self.emit_to_home_assistant(event_name, data))
             if self.notifications_enabled:
                 await self.send_notification(event_name, data)
 
@@ -58,6 +65,23 @@ class OGBEventManager:
                     except Exception as e:
                         _LOGGER.error(f"Fehler beim synchronen Listener: {e}")
 
+    async def emit_and_wait(self, event_name, data):
+        """Wie emit (ohne HA-Event), wartet aber auf alle Listener, z.B. für die Stufen eines Regelzyklus."""
+        with self.profiler.eventStage(event_name) if self.profiler else nullcontext():
+            for callback in list(self.listeners.get(event_name, [])):
+                await self._call_listener(callback, data)
+
+    def stage(self, name):
+        """Stufe des laufenden Regelzyklus messen (ohne Profiler wirkungslos)"""
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
+    def attachProfiler(self, profiler):
+        self.profiler = profiler
+
+    def attachClientFeed(self, clientFeed):
+        """LogForClient-Events gesammelt pro Zyklus über den Client-Feed senden."""
+        self.clientFeed = clientFeed
+
     def emit_sync(self, event_name, data, haEvent=False):
         """Synchrones Event auslösen (für synchrone Kontexte).
         Wenn haEvent=True, wird das Event auch an Home Assistant gesendet."""
@@ -66,9 +90,8 @@ class OGBEventManager:
     async def emit_to_home_assistant(self, event_name, event_data):
         """Sende ein Event an Home Assistant über den Event-Bus."""
         try:
-            # Wenn event_data ein Dataclass-Objekt ist, in ein Dictionary umwandeln
-            if is_dataclass(event_data):
-                event_data = asdict(event_data)
+            # Publications (auch Listen davon) flach in Dictionaries umwandeln
+            event_data = publication_dict(event_data)
 
             if hasattr(self.hass, "bus"):
                 self.hass.bus.fire(event_name, event_data)
@@ -8,6 +8,8 @@ from enum import Enum
 _LOGGER = logging.getLogger(__name__)
 
 from .OGBDataClasses.OGBPublications import OGBWaterAction, OGBWaterPublication
+from .OGBDosingModel import OGBDosingModel
+from .OGBDosingExecutor import OGBDosingExecutor, DosingPlan, DoseStep
 
 class FeedMode(Enum):
     DISABLED = "Disabled"
@@ -143,11 +145,19 @@ class OGBFeedManager:
         # Rate limiting and sensor settling
         self.last_pump_action: Dict[str, datetime] = {}
         self.min_interval_between_actions: timedelta = timedelta(seconds=30)
-        self.sensor_settle_time: timedelta = timedelta(seconds=90)  # Increased for better accuracy
+        self.sensor_settle_time: timedelta = timedelta(seconds=90)  # Max. Wartezeit, Einschwingen wird über die Steigung erkannt
         self.last_action_time: Optional[datetime] = None
+
+        # Lernendes Dosiermodell (ΔEC/ml, ΔpH/ml) mit Einschwingerkennung
+        self.dosingModel = OGBDosingModel(self.dataStore, self.room, maxWait=self.sensor_settle_time.total_seconds() * 2)
         
         # Dosing calculation
         self.reservoir_volume_liters: float = 100.0  # Default reservoir size
+
+        # Dosierpläne: parallele Pumpen mit Reihenfolge-Regeln
+        self.max_concurrent_pumps: int = 2
+        self.nutrient_order: Dict[str, set] = {"B": {"A"}}  # B erst nach A, nie gemeinsam konzentriert
+        self.dosingExecutor = OGBDosingExecutor(self.room, self._pump_on, self._pump_off)
         
         # Register event handlers
         self.eventManager.on("LogValidation", self._handleLogForClient)
@@ -392,7 +402,7 @@ class OGBFeedManager:
                 return
                 
             current_time = datetime.now()
-            if self.last_action_time and (current_time - self.last_action_time) < self.sensor_settle_time:
+            if self.dosingModel.observe(self.current_ec, self.current_ph, current_time):
                 _LOGGER.debug(f"[{self.room}] Waiting for sensor settle")
                 return
 
@@ -425,100 +435,131 @@ class OGBFeedManager:
                         self.last_action_time = current_time
                         return
 
+            self.dosingModel.markInRange(current_time)
+
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error in range check: {e}")
 
     async def _dose_ph_down(self) -> bool:
         """Dose pH down solution"""
-        try:
-            # Small incremental dose to avoid overshooting
-            dose_ml = 5.0
-            run_time = self._calculate_dose_time(dose_ml)
-            
-            if run_time > 0:
-                return await self._activate_pump(PumpType.PH_DOWN, run_time, dose_ml)
-                
-        except Exception as e:
-            _LOGGER.error(f"[{self.room}] Error dosing pH down: {e}")
-        return False
+        return await self._dose_ph("ph_down", PumpType.PH_DOWN)
 
     async def _dose_ph_up(self) -> bool:
         """Dose pH up solution"""
+        return await self._dose_ph("ph_up", PumpType.PH_UP)
+
+    async def _dose_ph(self, kind: str, pump_type: PumpType) -> bool:
+        """Dose pH correction sized by the learned reservoir response"""
         try:
-            dose_ml = 5.0
+            dose_ml = self.dosingModel.doseFor(
+                kind, self.current_ph, self.target_ph, self.reservoir_volume_liters,
+                self.pump_config.min_dose_ml, self.pump_config.max_dose_ml
+            )
             run_time = self._calculate_dose_time(dose_ml)
-            
-            if run_time > 0:
-                return await self._activate_pump(PumpType.PH_UP, run_time, dose_ml)
-                
+
+            if run_time > 0 and await self._activate_pump(pump_type, run_time, dose_ml):
+                self.dosingModel.recordDose(kind, dose_ml, self.reservoir_volume_liters, self.current_ph)
+                return True
+
         except Exception as e:
-            _LOGGER.error(f"[{self.room}] Error dosing pH up: {e}")
+            _LOGGER.error(f"[{self.room}] Error dosing {kind}: {e}")
         return False
 
     async def _dose_nutrients(self) -> bool:
         """Dose nutrients based on current stage and targets"""
         try:
-            # Dose in order: A, B, C with delays between
-            for nutrient in ["A", "B", "C"]:
-                if nutrient in self.nutrients and self.nutrients[nutrient] > 0:
-                    ml_per_liter = self.nutrients[nutrient]
-                    total_ml = self._calculate_nutrient_dose(ml_per_liter)
-                    
-                    if total_ml > 0:
-                        pump_type = getattr(PumpType, f"NUTRIENT_{nutrient}")
-                        run_time = self._calculate_dose_time(total_ml)
-                        
-                        if await self._activate_pump(pump_type, run_time, total_ml):
-                            # Wait between nutrients
-                            await asyncio.sleep(5)
-                            
+            stage_doses = {
+                nutrient: self._calculate_nutrient_dose(self.nutrients[nutrient])
+                for nutrient in ["A", "B", "C"]
+                if self.nutrients.get(nutrient, 0) > 0
+            }
+            stage_total = sum(stage_doses.values())
+            if stage_total <= 0:
+                return False
+
+            # Benötigte Gesamtmenge aus dem Modell, aufgeteilt im Verhältnis des Stage-Plans und nie mehr als der Plan
+            needed_ml = self.dosingModel.doseFor("ec", self.current_ec, self.target_ec, self.reservoir_volume_liters)
+            scale = min(needed_ml / stage_total, 1.0)
+            if scale <= 0:
+                return False
+
+            steps = []
+            for nutrient, stage_ml in stage_doses.items():
+                total_ml = min(stage_ml * scale, self.pump_config.max_dose_ml)
+                pump_type = getattr(PumpType, f"NUTRIENT_{nutrient}")
+                run_time = self._calculate_dose_time(total_ml)
+                if run_time <= 0 or self._is_rate_limited(pump_type.value):
+                    continue
+                steps.append(DoseStep(
+                    name=nutrient,
+                    pump=pump_type,
+                    ml=total_ml,
+                    runTime=run_time,
+                    after=set(self.nutrient_order.get(nutrient, set())),
+                ))
+            if not steps:
+                return False
+
+            # Reihenfolge nur zwischen Pumpen, die in diesem Plan tatsächlich laufen
+            planned = {step.name for step in steps}
+            for step in steps:
+                step.after &= planned
+
+            report = await self.dosingExecutor.run(DosingPlan(steps, self.max_concurrent_pumps))
+            dosed_ml = sum(step.ml for step in steps if report.steps[step.name]["ok"])
+
+            if dosed_ml <= 0:
+                return False
+            self.dosingModel.recordDose("ec", dosed_ml, self.reservoir_volume_liters, self.current_ec)
             return True
-                    
+
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error dosing nutrients: {e}")
         return False
 
+    def _is_rate_limited(self, entity_id: str) -> bool:
+        last_action = self.last_pump_action.get(entity_id)
+        if last_action and (datetime.now() - last_action) < self.min_interval_between_actions:
+            _LOGGER.warning(f"[{self.room}] Pump {entity_id} rate limited")
+            return True
+        return False
+
+    async def _pump_on(self, step: DoseStep):
+        """Turn on the pump of a dosing step"""
+        _LOGGER.info(f"[{self.room}] Activating {step.pump.name}: {step.ml:.1f}ml for {step.runTime:.1f}s")
+        await self.hass.services.async_call(
+            "switch", "turn_on",
+            {"entity_id": step.pump.value}
+        )
+
+        # Log action
+        waterAction = OGBWaterAction(
+            Name=self.room,
+            Device=step.pump.name,
+            Cycle=step.ml,
+            Action="on",
+            Message=f"Dosing {step.ml:.1f}ml"
+        )
+        await self.eventManager.emit("LogForClient", waterAction, haEvent=True)
+
+    async def _pump_off(self, step: DoseStep):
+        """Turn off the pump of a dosing step"""
+        await self.hass.services.async_call(
+            "switch", "turn_off",
+            {"entity_id": step.pump.value}
+        )
+        self.last_pump_action[step.pump.value] = datetime.now()
+
     async def _activate_pump(self, pump_type: PumpType, run_time: float, dose_ml: float) -> bool:
         """Activate a pump for specified time"""
         try:
-            entity_id = pump_type.value
-            
-            # Check rate limiting
-            last_action = self.last_pump_action.get(entity_id)
-            if last_action and (datetime.now() - last_action) < self.min_interval_between_actions:
-                _LOGGER.warning(f"[{self.room}] Pump {entity_id} rate limited")
+            if self._is_rate_limited(pump_type.value):
                 return False
 
-            _LOGGER.info(f"[{self.room}] Activating {pump_type.name}: {dose_ml:.1f}ml for {run_time:.1f}s")
-            
-            # Turn on pump
-            await self.hass.services.async_call(
-                "switch", "turn_on",
-                {"entity_id": entity_id}
-            )
-            
-            # Log action
-            waterAction = OGBWaterAction(
-                Name=self.room,
-                Device=pump_type.name,
-                Cycle=dose_ml,
-                Action="on",
-                Message=f"Dosing {dose_ml:.1f}ml"
-            )
-            await self.eventManager.emit("LogForClient", waterAction, haEvent=True)
-            
-            # Wait for dose time
-            await asyncio.sleep(run_time)
-            
-            # Turn off pump
-            await self.hass.services.async_call(
-                "switch", "turn_off",
-                {"entity_id": entity_id}
-            )
-            
-            self.last_pump_action[entity_id] = datetime.now()
-            return True
-            
+            step = DoseStep(name=pump_type.name, pump=pump_type, ml=dose_ml, runTime=run_time)
+            report = await self.dosingExecutor.run(DosingPlan([step], 1))
+            return report.ok
+
         except Exception as e:
             _LOGGER.error(f"[{self.room}] Error activating pump {pump_type.name}: {e}")
             return False
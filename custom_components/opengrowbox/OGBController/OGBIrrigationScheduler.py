@@ -0,0 +1,196 @@
+import logging
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximale Schlafdauer am Stück, damit Uhrsprünge erkannt werden
+MAX_SLEEP = 300.0
+HISTORY_SIZE = 50
+
+
+def _ts(value):
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else None
+
+
+class OGBIrrigationScheduler:
+    """
+    Wanduhr-basierter Bewässerungsplan für Hydro- und Retrieve-Modus.
+    Zyklen starten zu festen Zeitpunkten anchor + k * (Dauer + Intervall) und driften nicht
+    mit der Schaltlatenz. Der nächste Lauf wird im DataStore (Hydro.Schedule.<key>) gehalten und
+    mit dem State gespeichert, so dass nach einem Neustart im Raster weitergemacht wird.
+    Pumpen werden in Zonen-Gruppen von maxConcurrent gestaffelt geschaltet.
+    """
+
+    def __init__(self, hass, dataStore, eventManager, room, key, actionEvent, actionClass):
+        self.name = f"OGB Irrigation Scheduler {key}"
+        self.hass = hass
+        self.dataStore = dataStore
+        self.eventManager = eventManager
+        self.room = room
+        self.key = key
+        self.actionEvent = actionEvent
+        self.actionClass = actionClass
+
+        self.zones = []
+        self.duration = 0.0
+        self.period = 0.0
+        self.maxConcurrent = 0
+        self.anchor = None
+        self.nextRun = None
+
+        self._task = None
+        self._activeZones = set()
+        self.history = deque(maxlen=HISTORY_SIZE)
+        self.stats = {"runs": 0, "missed": 0, "overruns": 0, "clockJumps": 0}
+
+    def __repr__(self):
+        return f"{self.name} {self.room} zones:{self.zones} period:{self.period}s next:{_ts(self.nextRun)}"
+
+    @property
+    def isRunning(self):
+        return self._task is not None and not self._task.done()
+
+    # Plan
+    def _groups(self):
+        """Zonen in Gruppen von höchstens maxConcurrent Pumpen"""
+        size = self.maxConcurrent if self.maxConcurrent and self.maxConcurrent > 0 else len(self.zones)
+        return [self.zones[i:i + size] for i in range(0, len(self.zones), size)] if self.zones else []
+
+    def _alignedNext(self, now):
+        """Nächster Rasterzeitpunkt >= now"""
+        if now <= self.anchor:
+            return self.anchor
+        steps = -(-(now - self.anchor) // self.period)
+        return self.anchor + steps * self.period
+
+    def _restoreAnchor(self, now):
+        """Übernimmt Anker und nächsten Lauf aus dem gespeicherten Plan, wenn die Parameter gleich sind"""
+        saved = self.dataStore.getDeep(f"Hydro.Schedule.{self.key}") or {}
+        if saved.get("period") != self.period or saved.get("duration") != self.duration or not saved.get("anchor"):
+            return None
+        self.anchor = float(saved["anchor"])
+        nextRun = saved.get("nextRun")
+        if nextRun and nextRun < now:
+            # Während des Neustarts verpasster Lauf wird einmal sofort nachgeholt
+            self.stats["missed"] += 1
+            _LOGGER.info(f"{self.room}: {self.key} run planned for {_ts(nextRun)} was missed, running now")
+            return now
+        return self._alignedNext(now)
+
+    def _persist(self):
+        self.dataStore.setDeep(f"Hydro.Schedule.{self.key}", {
+            "anchor": self.anchor,
+            "period": self.period,
+            "duration": self.duration,
+            "nextRun": self.nextRun,
+            "nextRunAt": _ts(self.nextRun),
+            "zones": list(self.zones),
+            "maxConcurrent": self.maxConcurrent,
+            "lastRun": list(self.history)[-len(self.zones):] if self.zones else [],
+        })
+
+    # Steuerung
+    async def start(self, zones, duration, intervalMinutes, maxConcurrent=0):
+        await self.stop()
+        self.zones = list(zones)
+        self.duration = float(duration)
+        self.period = self.duration + float(intervalMinutes) * 60
+        self.maxConcurrent = int(maxConcurrent or 0)
+
+        if not self.zones or self.period <= 0:
+            return False
+
+        groupTime = len(self._groups()) * self.duration
+        if groupTime > self.period:
+            _LOGGER.warning(f"{self.room}: {self.key} staggered run takes {groupTime}s but the period is {self.period}s, cycles will be skipped")
+
+        now = time.time()
+        self.nextRun = self._restoreAnchor(now)
+        if self.nextRun is None:
+            self.anchor = now
+            self.nextRun = now
+        self._persist()
+
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sleepUntil(self, deadline):
+        """Schläft bis zum Wanduhr-Zeitpunkt, in Abschnitten von höchstens MAX_SLEEP. False bei Uhrsprung zurück"""
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return True
+            if remaining > self.period + MAX_SLEEP:
+                self.stats["clockJumps"] += 1
+                return False
+            await asyncio.sleep(min(remaining, MAX_SLEEP))
+
+    async def _switch(self, zones, action):
+        await asyncio.gather(*(
+            self.eventManager.emit(self.actionEvent, self.actionClass(Name=self.room, Action=action, Device=zone, Cycle=True))
+            for zone in zones
+        ))
+
+    async def _run(self):
+        try:
+            while True:
+                if not await self._sleepUntil(self.nextRun):
+                    # Uhr wurde zurückgestellt: Raster ab jetzt neu ausrichten
+                    self.anchor = self.nextRun = time.time()
+                cycleStart = time.time()
+
+                for index, group in enumerate(self._groups()):
+                    plannedOn = self.nextRun + index * self.duration
+                    await self._sleepUntil(plannedOn)
+
+                    actualOn = time.time()
+                    self._activeZones.update(group)
+                    await self._switch(group, "on")
+
+                    await self._sleepUntil(actualOn + self.duration)
+                    await self._switch(group, "off")
+                    actualOff = time.time()
+                    self._activeZones.difference_update(group)
+
+                    for zone in group:
+                        self.history.append({
+                            "zone": zone,
+                            "plannedOn": _ts(plannedOn),
+                            "actualOn": _ts(actualOn),
+                            "latency": round(actualOn - plannedOn, 3),
+                            "plannedDuration": self.duration,
+                            "actualDuration": round(actualOff - actualOn, 3),
+                        })
+
+                self.stats["runs"] += 1
+                now = time.time()
+                nextRun = self._alignedNext(now)
+                if nextRun <= self.nextRun:
+                    nextRun = self.nextRun + self.period
+                if nextRun - cycleStart > self.period + 1:
+                    self.stats["overruns"] += 1
+                self.nextRun = nextRun
+                self._persist()
+                await self.eventManager.emit("SaveState", True)
+        except asyncio.CancelledError:
+            # Beim Abbruch laufende Pumpen sicher ausschalten
+            if self._activeZones:
+                await self._switch(list(self._activeZones), "off")
+                self._activeZones.clear()
+            raise
+
+    def timings(self):
+        """Geplante vs. tatsächliche Schaltzeiten der letzten Läufe"""
+        return list(self.history)
@@ -0,0 +1,409 @@
+import logging
+import math
+import random
+import time
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+# Stellglieder je Regelgröße: (Capability, Gerät im controlCommand, Aktion für "hoch", Aktion für "runter")
+ACTUATORS = {
+    "temperature": [
+        ("canHeat", "heat", "Increase", "Reduce"),
+        ("canCool", "cool", "Reduce", "Increase"),
+        ("canClimate", "climate", "Increase", "Reduce"),
+        ("canExhaust", "exhaust", "Reduce", "Increase"),
+    ],
+    "humidity": [
+        ("canHumidify", "humidify", "Increase", "Reduce"),
+        ("canDehumidify", "dehumidify", "Reduce", "Increase"),
+        ("canExhaust", "exhaust", "Reduce", "Increase"),
+    ],
+}
+
+DEFAULT_TUNING = {
+    # kp pro Einheit Abweichung, ki pro Einheit*Minute, kd pro Einheit/Minute, deadband in Einheiten
+    "temperature": {"kp": 0.6, "ki": 0.03, "kd": 0.5, "deadband": 0.3, "integralLimit": 20.0},
+    "humidity": {"kp": 0.12, "ki": 0.006, "kd": 0.1, "deadband": 1.5, "integralLimit": 100.0},
+}
+
+# Startmodell erster Ordnung: dx/dt = (ambient - x) / tau + gain * u  (pro Minute)
+DEFAULT_MODEL = {
+    "temperature": {"tau": 15.0, "gain": 0.25, "limits": (-20.0, 60.0)},
+    "humidity": {"tau": 10.0, "gain": 1.5, "limits": (0.0, 100.0)},
+}
+
+MPC_HORIZON = 10               # Vorhersageschritte
+MPC_CANDIDATES = (-1.0, -0.5, 0.0, 0.5, 1.0)
+MPC_EFFORT = {"temperature": 0.05, "humidity": 1.0}
+MPC_SWITCH = {"temperature": 0.1, "humidity": 2.0}
+
+COMMAND_THRESHOLD = 0.15       # kleinere Stellwerte erzeugen kein Kommando
+MIN_FIT_SAMPLES = 12
+HISTORY_SIZE = 240
+PRIORITY_WEIGHT = {"high": 1.0, "medium": 0.6, "low": 0.3}
+
+
+def _svp(temp):
+    return 0.6108 * math.exp((17.27 * temp) / (temp + 237.3))
+
+
+def humidity_for_vpd(temp, vpd, leafOffset=0.0):
+    """Relative Luftfeuchte, bei der bei temp der gewünschte VPD erreicht wird"""
+    leafTemp = temp - leafOffset
+    return max(0.0, min(100.0, (_svp(leafTemp) - vpd) / _svp(temp) * 100))
+
+
+def _solve3(matrix, vector):
+    """Löst ein 3x3-Gleichungssystem (Gauß mit Pivotsuche), None wenn singulär"""
+    rows = [list(matrix[i]) + [vector[i]] for i in range(3)]
+    for col in range(3):
+        pivot = max(range(col, 3), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-9:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(3):
+            if r != col:
+                factor = rows[r][col] / rows[col][col]
+                for c in range(col, 4):
+                    rows[r][c] -= factor * rows[col][c]
+    return [rows[i][3] / rows[i][i] for i in range(3)]
+
+
+class PIDLoop:
+    """PID-Regler mit Deadband und Anti-Windup, Ausgang in [-1, 1]"""
+
+    def __init__(self, kp, ki, kd, deadband=0.0, integralLimit=None):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.deadband = deadband
+        self.integralLimit = integralLimit
+        self.integral = 0.0
+        self.lastError = None
+        self.output = 0.0
+
+    def reset(self):
+        self.integral = 0.0
+        self.lastError = None
+        self.output = 0.0
+
+    def update(self, error, dtMinutes):
+        if abs(error) < self.deadband:
+            error = 0.0
+        derivative = 0.0 if self.lastError is None or dtMinutes <= 0 else (error - self.lastError) / dtMinutes
+        self.lastError = error
+
+        integral = self.integral + error * dtMinutes
+        if self.integralLimit is not None:
+            integral = max(-self.integralLimit, min(self.integralLimit, integral))
+        raw = self.kp * error + self.ki * integral + self.kd * derivative
+        output = max(-1.0, min(1.0, raw))
+        # Anti-Windup: Integral nur übernehmen, wenn der Ausgang nicht weiter in die Sättigung läuft
+        if output == raw or (raw > 1.0 and error < 0) or (raw < -1.0 and error > 0):
+            self.integral = integral
+        self.output = output
+        return output
+
+    def state(self):
+        return {"integral": round(self.integral, 4), "lastError": self.lastError, "output": round(self.output, 3)}
+
+
+class FirstOrderModel:
+    """
+    Raummodell erster Ordnung pro Regelgröße, dx/dt = a + b*x + c*u (pro Minute).
+    Wird per kleinster Quadrate aus der Historie (x, u, dt, x_next) angepasst.
+    """
+
+    def __init__(self, tau, gain, limits=None, ambient=None):
+        self.tau = tau
+        self.gain = gain
+        self.limits = limits
+        self.ambient = ambient
+        self.fitted = False
+        self.samples = deque(maxlen=HISTORY_SIZE)
+
+    def rate(self, x, u):
+        ambient = x if self.ambient is None else self.ambient
+        return (ambient - x) / self.tau + self.gain * u
+
+    def predict(self, x, u, dtMinutes):
+        """Exakte Lösung für konstantes u über dtMinutes"""
+        ambient = x if self.ambient is None else self.ambient
+        steady = ambient + self.gain * u * self.tau
+        return steady + (x - steady) * math.exp(-dtMinutes / self.tau)
+
+    def record(self, x, u, dtMinutes, xNext):
+        if dtMinutes > 0:
+            self.samples.append((x, u, (xNext - x) / dtMinutes))
+
+    def fit(self):
+        """Passt Modell an die Historie an. True wenn plausible Parameter gefunden wurden"""
+        if len(self.samples) < MIN_FIT_SAMPLES:
+            return False
+        ata = [[0.0] * 3 for _ in range(3)]
+        atb = [0.0] * 3
+        for x, u, slope in self.samples:
+            row = (1.0, x, u)
+            for i in range(3):
+                atb[i] += row[i] * slope
+                for j in range(3):
+                    ata[i][j] += row[i] * row[j]
+        theta = _solve3(ata, atb)
+        if theta is None:
+            return False
+        a, b, c = theta
+        # Stabil (b < 0), plausible Zeitkonstante, Umgebungswert und Wirkrichtung wie erwartet
+        if b >= 0 or not (1.0 <= -1 / b <= 240.0) or c <= 0:
+            return False
+        if self.limits and not (self.limits[0] <= -a / b <= self.limits[1]):
+            return False
+        self.tau = -1 / b
+        self.ambient = -a / b
+        self.gain = c
+        self.fitted = True
+        return True
+
+    def params(self):
+        return {"tau": round(self.tau, 3), "gain": round(self.gain, 4),
+                "ambient": None if self.ambient is None else round(self.ambient, 2), "fitted": self.fitted}
+
+
+class OGBLocalControl:
+    """
+    Lokale Regelung ohne Cloud: PID pro Regelgröße oder ein kleines MPC über ein
+    Raummodell erster Ordnung. Erzeugt dieselben controlCommands wie die Premium-Regelung
+    und läuft vollständig in Home Assistant. compute() ist ohne DataStore nutzbar (Prüfstand).
+    """
+
+    def __init__(self, dataStore=None, room="", horizon=MPC_HORIZON):
+        self.dataStore = dataStore
+        self.room = room
+        self.horizon = horizon
+
+        self.loops = {kind: PIDLoop(**DEFAULT_TUNING[kind]) for kind in DEFAULT_TUNING}
+        self.models = {kind: FirstOrderModel(**DEFAULT_MODEL[kind]) for kind in DEFAULT_MODEL}
+        self.outputs = {kind: 0.0 for kind in DEFAULT_TUNING}
+        self.lastValues = None
+        self.lastTime = None
+        self.stepMinutes = 1.0
+
+        self.computeTimes = deque(maxlen=200)
+        self.stats = {"cycles": 0, "lastMs": None, "avgMs": None, "maxMs": 0.0, "fits": 0, "commands": 0}
+
+        if self.dataStore:
+            self._restore()
+            self.dataStore.on("StateRestored", lambda *args: self._restore())
+
+    def _restore(self):
+        saved = self.dataStore.get("localControl") or {}
+        for kind, params in (saved.get("models") or {}).items():
+            model = self.models.get(kind)
+            if model and params.get("fitted") and params.get("tau") and params.get("gain"):
+                model.tau, model.gain, model.ambient, model.fitted = params["tau"], params["gain"], params.get("ambient"), True
+
+    # Eingänge
+    def readInputs(self):
+        """Ist- und Sollwerte aus dem DataStore"""
+        temp = self.dataStore.getDeep("tentData.temperature")
+        hum = self.dataStore.getDeep("tentData.humidity")
+        try:
+            temp, hum = float(temp), float(hum)
+        except (TypeError, ValueError):
+            return None
+
+        minTemp = self.dataStore.getDeep("tentData.minTemp")
+        maxTemp = self.dataStore.getDeep("tentData.maxTemp")
+        if self.dataStore.getDeep("controlOptions.minMaxControl"):
+            minTemp = self.dataStore.getDeep("controlOptionData.minmax.minTemp") or minTemp
+            maxTemp = self.dataStore.getDeep("controlOptionData.minmax.maxTemp") or maxTemp
+        targetTemp = (float(minTemp) + float(maxTemp)) / 2 if minTemp is not None and maxTemp is not None else temp
+
+        targetVPD = self.dataStore.getDeep("vpd.perfection") or self.dataStore.getDeep("vpd.targeted")
+        leafOffset = float(self.dataStore.getDeep("tentData.leafTempOffset") or 0)
+        targetHum = humidity_for_vpd(targetTemp, float(targetVPD), leafOffset) if targetVPD else hum
+        minHum = self.dataStore.getDeep("tentData.minHumidity")
+        maxHum = self.dataStore.getDeep("tentData.maxHumidity")
+        if minHum is not None and maxHum is not None:
+            targetHum = max(float(minHum), min(float(maxHum), targetHum))
+
+        return {"temperature": temp, "humidity": hum}, {"temperature": round(targetTemp, 2), "humidity": round(targetHum, 1)}
+
+    def _available(self, capability):
+        if not self.dataStore:
+            return True
+        return bool(self.dataStore.getDeep(f"capabilities.{capability}.state"))
+
+    # Regler
+    def _mpc(self, kind, x, target):
+        """Bewegungsblockiertes MPC: bestes konstantes u über den Horizont aus wenigen Kandidaten"""
+        model = self.models[kind]
+        previous = self.outputs[kind]
+        scale = DEFAULT_TUNING[kind]["deadband"] or 1.0
+        best, bestCost = 0.0, None
+        for u in MPC_CANDIDATES:
+            cost, xk = 0.0, x
+            for _ in range(self.horizon):
+                xk = model.predict(xk, u, self.stepMinutes)
+                err = (xk - target) / scale
+                cost += err * err
+            cost += MPC_EFFORT[kind] * u * u * self.horizon + MPC_SWITCH[kind] * (u - previous) ** 2
+            if bestCost is None or cost < bestCost:
+                best, bestCost = u, cost
+        return best
+
+    def _learn(self, values, now):
+        if self.lastValues is None or self.lastTime is None:
+            return
+        dtMinutes = (now - self.lastTime) / 60
+        if not 0 < dtMinutes <= 30:
+            return
+        # Gleitender Mittelwert der Zykluslänge als MPC-Schrittweite
+        self.stepMinutes += 0.2 * (dtMinutes - self.stepMinutes)
+        for kind, model in self.models.items():
+            model.record(self.lastValues[kind], self.outputs[kind], dtMinutes, values[kind])
+            if len(model.samples) % MIN_FIT_SAMPLES == 0 and model.fit():
+                self.stats["fits"] += 1
+
+    def _commands(self, kind, output, error):
+        commands = []
+        if abs(output) < COMMAND_THRESHOLD:
+            return commands
+        priority = "high" if abs(output) >= 0.75 else "medium" if abs(output) >= 0.4 else "low"
+        for capability, device, upAction, downAction in ACTUATORS[kind]:
+            if not self._available(capability):
+                continue
+            commands.append({
+                "device": device,
+                "action": upAction if output > 0 else downAction,
+                "priority": priority,
+                "reason": f"{kind} error {round(error, 2)}",
+            })
+        return commands
+
+    def compute(self, controllerType, values, targets, now=None):
+        """Ein Regelzyklus. Gibt die Daten im Format der Premium-Regelung zurück"""
+        started = time.perf_counter()
+        now = time.monotonic() if now is None else now
+        self._learn(values, now)
+        dtMinutes = self.stepMinutes if self.lastTime is None else max((now - self.lastTime) / 60, 0.0)
+
+        commands, states = [], {}
+        for kind in ("temperature", "humidity"):
+            error = targets[kind] - values[kind]
+            if controllerType == "MPC":
+                output = self._mpc(kind, values[kind], targets[kind])
+            else:
+                output = self.loops[kind].update(error, dtMinutes)
+            self.outputs[kind] = output
+            commands.extend(self._commands(kind, output, error))
+            states[kind] = {
+                "current": values[kind],
+                "target": targets[kind],
+                "output": round(output, 3),
+                "model": self.models[kind].params(),
+                **(self.loops[kind].state() if controllerType != "MPC" else {}),
+            }
+
+        self.lastValues = dict(values)
+        self.lastTime = now
+        elapsedMs = (time.perf_counter() - started) * 1000
+        self._recordTiming(elapsedMs, len(commands))
+
+        data = {"controllerType": controllerType, "source": "local", "computeMs": round(elapsedMs, 3)}
+        if controllerType == "MPC":
+            data["actionData"] = commands
+        else:
+            data["actionData"] = {"controlCommands": commands, "pidStates": states}
+        data["states"] = states
+        return data
+
+    def _recordTiming(self, elapsedMs, commandCount):
+        self.computeTimes.append(elapsedMs)
+        self.stats["cycles"] += 1
+        self.stats["commands"] += commandCount
+        self.stats["lastMs"] = round(elapsedMs, 3)
+        self.stats["avgMs"] = round(sum(self.computeTimes) / len(self.computeTimes), 3)
+        self.stats["maxMs"] = round(max(self.stats["maxMs"], elapsedMs), 3)
+
+    def step(self, controllerType):
+        """Regelzyklus mit Werten aus dem DataStore, None wenn Messwerte fehlen"""
+        inputs = self.readInputs()
+        if inputs is None:
+            _LOGGER.debug(f"{self.room}: Local {controllerType} skipped, no valid temperature/humidity")
+            return None
+        values, targets = inputs
+        data = self.compute(controllerType, values, targets)
+        self.dataStore.set("localControl", {
+            "controllerType": controllerType,
+            "models": {kind: model.params() for kind, model in self.models.items()},
+            "metrics": dict(self.stats),
+        })
+        return data
+
+    def reset(self):
+        for loop in self.loops.values():
+            loop.reset()
+        self.outputs = {kind: 0.0 for kind in self.outputs}
+        self.lastValues = None
+        self.lastTime = None
+
+
+class SimulatedRoom:
+    """
+    Prüfstand für die lokale Regelung: Raum erster Ordnung für Temperatur und Feuchte.
+    Kommandos wirken für den jeweiligen Schritt, ohne Kommando ist das Gerät aus.
+    """
+
+    def __init__(self, temperature=28.0, humidity=45.0, ambientTemp=24.0, ambientHum=55.0,
+                 tau=None, gain=None, noise=0.0, seed=None):
+        self.values = {"temperature": temperature, "humidity": humidity}
+        self.ambient = {"temperature": ambientTemp, "humidity": ambientHum}
+        self.tau = dict(tau or {"temperature": 20.0, "humidity": 12.0})
+        self.gain = dict(gain or {"temperature": 0.2, "humidity": 2.0})
+        self.noise = noise
+        self._rng = random.Random(seed)
+        self.inputs = {"temperature": 0.0, "humidity": 0.0}
+
+    def apply(self, commands):
+        effects = {kind: [] for kind in self.values}
+        for command in commands:
+            for kind, actuators in ACTUATORS.items():
+                for _, device, upAction, downAction in actuators:
+                    if command["device"] == device:
+                        sign = 1.0 if command["action"].capitalize() == upAction else -1.0
+                        effects[kind].append(sign * PRIORITY_WEIGHT.get(command.get("priority"), 0.6))
+        self.inputs = {kind: max(-1.0, min(1.0, sum(e) / len(e))) if e else 0.0 for kind, e in effects.items()}
+
+    def advance(self, minutes):
+        for kind in self.values:
+            steady = self.ambient[kind] + self.gain[kind] * self.inputs[kind] * self.tau[kind]
+            self.values[kind] = steady + (self.values[kind] - steady) * math.exp(-minutes / self.tau[kind])
+
+    def read(self):
+        return {kind: value + (self._rng.gauss(0, self.noise) if self.noise else 0.0) for kind, value in self.values.items()}
+
+
+def runBench(controllerType="PID", minutes=240, stepMinutes=1.0, targets=None, room=None, control=None):
+    """Spielt die lokale Regelung gegen SimulatedRoom durch und liefert Gütemaße und Rechenzeiten"""
+    room = room or SimulatedRoom()
+    control = control or OGBLocalControl()
+    targets = targets or {"temperature": 25.0, "humidity": 60.0}
+    iae = {kind: 0.0 for kind in targets}
+    now = 0.0
+    for _ in range(int(minutes / stepMinutes)):
+        values = room.read()
+        data = control.compute(controllerType, values, targets, now=now)
+        commands = data["actionData"] if controllerType == "MPC" else data["actionData"]["controlCommands"]
+        room.apply(commands)
+        room.advance(stepMinutes)
+        for kind in targets:
+            iae[kind] += abs(targets[kind] - room.values[kind]) * stepMinutes
+        now += stepMinutes * 60
+    return {
+        "controllerType": controllerType,
+        "iae": {kind: round(value, 2) for kind, value in iae.items()},
+        "final": {kind: round(value, 2) for kind, value in room.values.items()},
+        "models": {kind: model.params() for kind, model in control.models.items()},
+        "metrics": dict(control.stats),
+    }
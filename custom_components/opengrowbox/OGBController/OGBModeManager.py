@@ -5,6 +5,8 @@ from .OGBDataClasses.OGBPublications import OGBModePublication
 from .OGBDataClasses.OGBPublications import OGBModeRunPublication,OGBHydroPublication,OGBHydroAction,OGBRetrieveAction,OGBRetrivePublication
 
 from .utils.calcs import calc_dew_vpd,calc_Dry5Days_vpd
+from .OGBIrrigationScheduler import OGBIrrigationScheduler
+from .OGBLocalControl import OGBLocalControl
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,8 +21,9 @@ class OGBModeManager:
         self.isInitialized = False
 
         self.currentMode = None
-        self._hydro_task: asyncio.Task | None = None    
-        self._retrive_task: asyncio.Task | None = None           
+        self.hydroScheduler = OGBIrrigationScheduler(hass, dataStore, eventManager, room, "hydro", "PumpAction", OGBHydroAction)
+        self.retrieveScheduler = OGBIrrigationScheduler(hass, dataStore, eventManager, room, "retrieve", "RetrieveAction", OGBRetrieveAction)
+        self.localControl = OGBLocalControl(dataStore, room)
         
         ## Events
         self.eventManager.on("selectActionMode", self.selectActionMode)
@@ -46,6 +49,8 @@ class OGBModeManager:
         
         #tentMode = self.dataStore.get("tentMode")
         if isinstance(Publication, OGBModePublication):
+            # Modewechsel: lokale Regler ohne alten Integralanteil neu starten
+            self.localControl.reset()
             return
         elif isinstance(Publication, OGBModeRunPublication):
             tentMode = Publication.currentMode
@@ -63,6 +68,10 @@ class OGBModeManager:
             await self.handle_premium_modes(False)
         elif tentMode == "PID Control":
             await self.handle_premium_modes(False)
+        elif tentMode == "Local PID":
+            await self.handle_local_control("PID")
+        elif tentMode == "Local MPC":
+            await self.handle_local_control("MPC")
         elif tentMode == "AI Control":
             await self.handle_premium_modes(False)
         elif tentMode == "Disabled":
@@ -94,13 +103,13 @@ class OGBModeManager:
 
         if currentVPD < perfectionMinVPD:
             _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is below minimum ({perfectionMinVPD}). Increasing VPD.")
-            await self.eventManager.emit("increase_vpd",capabilities)
+            await self.eventManager.emit_and_wait("increase_vpd",capabilities)
         elif currentVPD > perfectionMaxVPD:
             _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is above maximum ({perfectionMaxVPD}). Reducing VPD.")
-            await self.eventManager.emit("reduce_vpd",capabilities)
+            await self.eventManager.emit_and_wait("reduce_vpd",capabilities)
         elif currentVPD != perfectionVPD:
             _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is within range but not at perfection ({perfectionVPD}). Fine-tuning.")
-            await self.eventManager.emit("FineTune_vpd",capabilities)
+            await self.eventManager.emit_and_wait("FineTune_vpd",capabilities)
         else:
             _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is at perfection ({perfectionVPD}). No action required.")
 
@@ -127,13 +136,13 @@ class OGBModeManager:
             # VPD steuern basierend auf der Toleranz
             if currentVPD < min_vpd:
                 _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is below minimum ({min_vpd}). Increasing VPD.")
-                await self.eventManager.emit("increase_vpd", capabilities)
+                await self.eventManager.emit_and_wait("increase_vpd", capabilities)
             elif currentVPD > max_vpd:
                 _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is above maximum ({max_vpd}). Reducing VPD.")
-                await self.eventManager.emit("reduce_vpd", capabilities)
+                await self.eventManager.emit_and_wait("reduce_vpd", capabilities)
             elif currentVPD != targetedVPD:
                 _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is within range but not at Targeted ({targetedVPD}). Fine-tuning.")
-                await self.eventManager.emit("FineTune_vpd", capabilities)
+                await self.eventManager.emit_and_wait("FineTune_vpd", capabilities)
             else:
                 _LOGGER.debug(f"{self.room}: Current VPD ({currentVPD}) is within tolerance range ({min_vpd} - {max_vpd}). No action required.")
                 return
@@ -143,6 +152,17 @@ class OGBModeManager:
         except Exception as e:
             _LOGGER.error(f"ModeManager: Unerwarteter Fehler in 'handle_targeted_vpd': {e}")
 
+    ## Local Control
+    async def handle_local_control(self, controllerType):
+        """
+        Lokale PID/MPC-Regelung, liefert dieselben Daten wie die Premium-Regelung und funktioniert offline.
+        """
+        data = self.localControl.step(controllerType)
+        if data is None:
+            return
+        _LOGGER.debug(f"{self.room}: Local {controllerType} computed in {data['computeMs']} ms: {data['actionData']}")
+        await self.handle_premium_modes(data)
+
     ## Premium Handle
     async def handle_premium_modes(self,data):
         
@@ -150,11 +170,11 @@ class OGBModeManager:
             return
         controllerType = data.get("controllerType")
         if controllerType == "PID":
-            await self.eventManager.emit("PIDActions",data)
+            await self.eventManager.emit_and_wait("PIDActions",data)
         if controllerType == "MPC":
-            await self.eventManager.emit("MPCActions",data)
+            await self.eventManager.emit_and_wait("MPCActions",data)
         if controllerType == "AI":
-            await self.eventManager.emit("AIActions",data)
+            await self.eventManager.emit_and_wait("AIActions",data)
         return
 
     ## Drying Modes
@@ -172,10 +192,10 @@ class OGBModeManager:
             _LOGGER.error(f"{self.name}: Could not determine current phase")
             return
 
-        temp_ok = abs(tentData['temperature'] - current_phase['targetTemp']) <= tempTolerance
+        temp_ok = abs(tentData.temperature - current_phase['targetTemp']) <= tempTolerance
 
         if not temp_ok:
-            if tentData['temperature'] < current_phase['targetTemp']:
+            if tentData.temperature < current_phase['targetTemp']:
                 finalActionMap["Increase Heater"] = True
                 finalActionMap["Reduce Exhaust"] = True
                 finalActionMap["Reduce Cooler"] = True
@@ -186,8 +206,8 @@ class OGBModeManager:
                 finalActionMap["Reduce Heater"] = True
                 finalActionMap["Reduce Ventilation"] = True
         else:
-            if abs(tentData["humidity"] - current_phase["targetHumidity"]) > humTolerance:
-                if tentData["humidity"] < current_phase["targetHumidity"]:
+            if abs(tentData.humidity - current_phase["targetHumidity"]) > humTolerance:
+                if tentData.humidity < current_phase["targetHumidity"]:
                     finalActionMap["Increase Humidifier"] = True
                     finalActionMap["Increase Ventilation"] = True
                     finalActionMap["Reduce Exhaust"] = True
@@ -216,17 +236,17 @@ class OGBModeManager:
             _LOGGER.error(f"{self.name}: Could not determine current phase")
             return
 
-        current_temp = tentData["temperature"] if "temperature" in tentData else None
-        current_humidity = tentData["humidity"] if "humidity" in tentData else None
+        current_temp = tentData.temperature
+        current_humidity = tentData.humidity
 
         if current_temp is None or current_humidity is None:
             _LOGGER.warning(f"{self.room}: Missing tentData values for VPD calculation")
             return
 
-        if isinstance(tentData["temperature"], (list, tuple)):
-            temp_value = sum(tentData["temperature"]) / len(tentData["temperature"])
+        if isinstance(tentData.temperature, (list, tuple)):
+            temp_value = sum(tentData.temperature) / len(tentData.temperature)
         else:
-            temp_value = tentData["temperature"]
+            temp_value = tentData.temperature
 
         Dry5DaysVPD = calc_Dry5Days_vpd(temp_value, current_humidity)
         self.dataStore.setDeep("drying.5DayDryVPD", Dry5DaysVPD)
@@ -241,10 +261,10 @@ class OGBModeManager:
         if abs(delta) > vpdTolerance:
             if delta < 0:
                 _LOGGER.debug(f"{self.room}: Dry5Days VPD {Dry5DaysVPD:.2f} < Target {target_vpd:.2f} → Increase VPD")
-                await self.eventManager.emit("increase_vpd", capabilities)
+                await self.eventManager.emit_and_wait("increase_vpd", capabilities)
             else:
                 _LOGGER.debug(f"{self.room}: Dry5Days VPD {Dry5DaysVPD:.2f} > Target {target_vpd:.2f} → Reduce VPD")
-                await self.eventManager.emit("reduce_vpd", capabilities)
+                await self.eventManager.emit_and_wait("reduce_vpd", capabilities)
         else:
             _LOGGER.debug(f"{self.room}: Dry5Days VPD {Dry5DaysVPD:.2f} within tolerance (±{vpdTolerance}) → No action")
 
@@ -393,13 +413,7 @@ class OGBModeManager:
             sysmessage = "Hydro mode is OFFLINE"
             self.dataStore.setDeep("Hydro.Active",False)
             await self.eventManager.emit("PumpAction", {"action": "off"})
-            if self._hydro_task is not None:
-                self._hydro_task.cancel()
-                try:
-                    await self._hydro_task
-                except asyncio.CancelledError:
-                    pass
-                self._hydro_task = None
+            await self.hydroScheduler.stop()
         elif mode == "Hydro":
             sysmessage = "Hydro mode active"
             self.dataStore.setDeep("Hydro.Active",True)
@@ -441,47 +455,14 @@ class OGBModeManager:
             )
             return
 
-        async def run_cycle():
-            try:
-                while True:
-                    # Turn ON all hydro pumps
-                    for dev_id in active_pumps:
-                        pumpAction = OGBHydroAction(Name=self.room, Action="on", Device=dev_id, Cycle=cycle)
-                        await self.eventManager.emit("PumpAction", pumpAction)
-      
-                    # Wait for duration (pumps ON)
-                    await asyncio.sleep(float(duration))
-                    
-                    # Turn OFF all hydro pumps
-                    for dev_id in active_pumps:
-                        pumpAction = OGBHydroAction(Name=self.room, Action="off", Device=dev_id, Cycle=cycle)
-                        await self.eventManager.emit("PumpAction", pumpAction)
-
-                    # Wait for interval (pumps OFF)
-                    await asyncio.sleep(float(interval) * 60)
-                    
-            except asyncio.CancelledError:
-                # If cancelled, ensure pumps are turned off
-                for dev_id in active_pumps:
-                    pumpAction = OGBHydroAction(Name=self.room, Action="off", Device=dev_id, Cycle=cycle)
-                    await self.eventManager.emit("PumpAction", pumpAction)
-                raise
-
-        # Cancel existing task if running
-        if self._hydro_task is not None:
-            self._hydro_task.cancel()
-            try:
-                await self._hydro_task
-            except asyncio.CancelledError:
-                pass
-            self._hydro_task = None   
-            
+        await self.hydroScheduler.stop()
+
         if cycle:
-            # Start cycling task
-            self._hydro_task = asyncio.create_task(run_cycle())
+            # Wanduhr-basierter Zyklus, gestaffelt nach Hydro.MaxConcurrentPumps
+            await self.hydroScheduler.start(active_pumps, duration, interval, self.dataStore.getDeep("Hydro.MaxConcurrentPumps"))
             msg = (
                 f"{log_prefix} mode started: ON for {duration}s, "
-                f"OFF for {interval}m, repeating."
+                f"OFF for {interval}m, repeating. Next run {self.dataStore.getDeep('Hydro.Schedule.hydro.nextRunAt')}"
             )
         else:
             # One-time or permanent ON: just turn hydro pumps on
@@ -505,34 +486,10 @@ class OGBModeManager:
             )
             return
 
-        async def run_cycle():
-            try:
-                while True:
-                    for dev_id in active_pumps:
-                        pumpAction = OGBHydroAction(Name=self.room,Action="on",Device=dev_id,Cycle=cycle)
-                        await self.eventManager.emit("PumpAction", pumpAction)
-                    await asyncio.sleep(float(duration))
-                    for dev_id in active_pumps:
-                        pumpAction = OGBHydroAction(Name=self.room,Action="off",Device=dev_id,Cycle=cycle)
-                        await self.eventManager.emit("PumpAction", pumpAction)
-                    await asyncio.sleep(float(interval)*60)
-            except asyncio.CancelledError:
-                # if we get cancelled, make sure pumps end up off
-                for dev_id in active_pumps:
-                    pumpAction = OGBHydroAction(Name=self.room,Action="off",Device=dev_id,Cycle=cycle)
-                    await self.eventManager.emit("PumpAction", pumpAction)
-                raise
-        # If there's an existing task, cancel it
-        if self._hydro_task is not None:
-            self._hydro_task.cancel()
-            try:
-                await self._hydro_task
-            except asyncio.CancelledError:
-                pass
-            self._hydro_task = None   
-            
+        await self.hydroScheduler.stop()
+
         if cycle:
-            self._hydro_task = asyncio.create_task(run_cycle())
+            await self.hydroScheduler.start(active_pumps, duration, interval, self.dataStore.getDeep("Hydro.MaxConcurrentPumps"))
             msg = (
                 f"{log_prefix} mode started: ON for {duration}s, "
                 f"OFF for {interval}s, repeating."
@@ -559,14 +516,9 @@ class OGBModeManager:
 
         if mode is False:
             await self.eventManager.emit("RetrieveAction", {"action": "off"})
-            if self._retrive_task is not None:
-                self._retrive_task.cancel()
+            if self.retrieveScheduler.isRunning:
                 self.dataStore.setDeep("Hydro.R_Active",False)
-                try:
-                    await self._retrive_task
-                except asyncio.CancelledError:
-                    pass
-                self._retrive_task = None
+            await self.retrieveScheduler.stop()
             return
 
         sysmessage = "Hydro Retrive mode active"
@@ -604,44 +556,11 @@ class OGBModeManager:
             )
             return
 
-        async def run_cycle():
-            try:
-                while True:
-                    # Turn ON all retrive pumps
-                    for dev_id in active_pumps:
-                        retrieveAction = OGBRetrieveAction(Name=self.room, Action="on", Device=dev_id, Cycle=cycle)
-                        await self.eventManager.emit("RetrieveAction", retrieveAction)
-                    
-                    # Wait for duration (pumps ON)
-                    await asyncio.sleep(float(duration))
-                    
-                    # Turn OFF all retrive pumps
-                    for dev_id in active_pumps:
-                        retrieveAction = OGBRetrieveAction(Name=self.room, Action="off", Device=dev_id, Cycle=cycle)
-                        await self.eventManager.emit("RetrieveAction", retrieveAction)
-                    
-                    # Wait for interval (pumps OFF)
-                    await asyncio.sleep(float(interval) * 60)
-                    
-            except asyncio.CancelledError:
-                # If cancelled, ensure pumps are turned off
-                for dev_id in active_pumps:
-                    retrieveAction = OGBRetrieveAction(Name=self.room, Action="off", Device=dev_id, Cycle=cycle)
-                    await self.eventManager.emit("RetrieveAction", retrieveAction)
-                raise
-
-        # Cancel existing task if running
-        if self._retrive_task is not None:
-            self._retrive_task.cancel()
-            try:
-                await self._retrive_task
-            except asyncio.CancelledError:
-                pass
-            self._retrive_task = None   
-            
+        await self.retrieveScheduler.stop()
+
         if cycle:
-            # Start cycling task
-            self._retrive_task = asyncio.create_task(run_cycle())
+            # Wanduhr-basierter Zyklus, gestaffelt nach Hydro.MaxConcurrentPumps
+            await self.retrieveScheduler.start(active_pumps, duration, interval, self.dataStore.getDeep("Hydro.MaxConcurrentPumps"))
             msg = (
                 f"{log_prefix} mode started: ON for {duration}s, "
                 f"OFF for {interval}m, repeating."
@@ -0,0 +1,212 @@
+import logging
+import asyncio
+from datetime import datetime, timedelta
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximale Schlafdauer eines Timers, damit Uhrsprünge (NTP, Sommerzeit) spätestens danach erkannt werden
+MAX_TIMER_DELAY = 300.0
+
+TIME_FORMATS = ("%H:%M:%S", "%H:%M")
+
+
+def parse_clock_time(value):
+    """Parst 'HH:MM:SS' oder 'HH:MM' in ein time-Objekt, None bei ungültigen Werten"""
+    if not value or not isinstance(value, str):
+        return None
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.strptime(value.strip(), fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_duration(value):
+    """Parst eine Dauer 'HH:MM:SS' in Sekunden"""
+    parsed = parse_clock_time(value)
+    if parsed is None:
+        return 0
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
+
+def is_on_at(onTime, offTime, now):
+    """Lichtstatus für eine Uhrzeit, auch über Mitternacht (z.B. 20:00 bis 08:00)"""
+    current = now.time() if isinstance(now, datetime) else now
+    if onTime < offTime:
+        return onTime <= current < offTime
+    if onTime > offTime:
+        return current >= onTime or current < offTime
+    return False
+
+
+def next_occurrence(clockTime, now):
+    """Nächster Zeitpunkt (strikt nach now) zu dem die Uhrzeit erreicht wird"""
+    candidate = datetime.combine(now.date(), clockTime)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class OGBPhotoperiodManager:
+    """
+    Photoperioden-Engine eines Raumes.
+    Die Lichtzeiten werden nur bei Änderung geparst. Daraus werden die nächsten
+    Übergänge (Licht an/aus, Start SunRise, Start SunSet) berechnet und genau ein
+    Timer auf den nächsten Übergang gesetzt. toggleLight wird an der Flanke veröffentlicht,
+    nicht mehr bei jedem Sensor-Update.
+    """
+
+    def __init__(self, hass, dataStore, eventManager, room):
+        self.name = "OGB Photoperiod Manager"
+        self.hass = hass
+        self.dataStore = dataStore
+        self.eventManager = eventManager
+        self.room = room
+
+        self.onTime = None
+        self.offTime = None
+        self.sunRiseDuration = 0
+        self.sunSetDuration = 0
+
+        self.lightState = None
+        self.transitions = {}
+        self._timerHandle = None
+        self._evalLock = asyncio.Lock()
+        self._stopped = False
+
+        self.stats = {"parses": 0, "wakeups": 0, "edges": 0, "clockJumps": 0}
+
+        self.eventManager.on("LightTimeChanges", self.scheduleChanged)
+        self.eventManager.on("SunRiseTimeUpdates", self.scheduleChanged)
+        self.eventManager.on("SunSetTimeUpdates", self.scheduleChanged)
+        self.eventManager.on("updateControlModes", self.scheduleChanged)
+        self.eventManager.on("StateRestored", self.scheduleChanged)
+
+    def __repr__(self):
+        return f"{self.name} {self.room} on:{self.onTime} off:{self.offTime} next:{self.transitions}"
+
+    def _parseSchedule(self):
+        """Liest und parst die Lichtzeiten einmalig aus dem DataStore"""
+        self.onTime = parse_clock_time(self.dataStore.getDeep("isPlantDay.lightOnTime"))
+        self.offTime = parse_clock_time(self.dataStore.getDeep("isPlantDay.lightOffTime"))
+        self.sunRiseDuration = parse_duration(self.dataStore.getDeep("isPlantDay.sunRiseTime"))
+        self.sunSetDuration = parse_duration(self.dataStore.getDeep("isPlantDay.sunSetTime"))
+        self.stats["parses"] += 1
+
+    def _computeTransitions(self, now):
+        """Nächste Übergangszeitpunkte nach now"""
+        transitions = {}
+        if self.onTime is None or self.offTime is None or self.onTime == self.offTime:
+            return transitions
+
+        transitions["lightOn"] = next_occurrence(self.onTime, now)
+        transitions["lightOff"] = next_occurrence(self.offTime, now)
+
+        if self.sunRiseDuration:
+            transitions["sunrise"] = transitions["lightOn"]
+        if self.sunSetDuration:
+            sunsetStart = (datetime.combine(now.date(), self.offTime) - timedelta(seconds=self.sunSetDuration)).time()
+            transitions["sunset"] = next_occurrence(sunsetStart, now)
+        return transitions
+
+    def photoperiodSeconds(self):
+        """Dauer der Lichtphase in Sekunden"""
+        if self.onTime is None or self.offTime is None:
+            return 0
+        on = datetime.combine(datetime.min.date(), self.onTime)
+        off = datetime.combine(datetime.min.date(), self.offTime)
+        if off <= on:
+            off += timedelta(days=1)
+        return (off - on).total_seconds()
+
+    def periodStart(self, now=None):
+        """Beginn der aktuellen (bzw. letzten) Photoperiode"""
+        if self.onTime is None:
+            return None
+        now = now or datetime.now()
+        return next_occurrence(self.onTime, now) - timedelta(days=1)
+
+    def isLightOn(self, now=None):
+        if self.onTime is None or self.offTime is None:
+            return None
+        return is_on_at(self.onTime, self.offTime, now or datetime.now())
+
+    # Events
+    async def scheduleChanged(self, data=None):
+        """Lichtzeiten oder Steuerung geändert: neu parsen, Zustand sofort setzen, Timer neu stellen"""
+        self._parseSchedule()
+        await self._evaluate(force=True)
+
+    async def start(self):
+        self._stopped = False
+        await self.scheduleChanged("startup")
+
+    def stop(self):
+        """Timer abbrechen; eine noch laufende Auswertung stellt danach keinen neuen Timer mehr"""
+        self._stopped = True
+        self._cancelTimer()
+
+    # Timer
+    def _cancelTimer(self):
+        if self._timerHandle is not None:
+            self._timerHandle.cancel()
+            self._timerHandle = None
+
+    def _arm(self, now):
+        self._cancelTimer()
+        if self._stopped or not self.transitions:
+            return
+        nextEdge = min(self.transitions.values())
+        delay = min(max((nextEdge - now).total_seconds(), 0.0), MAX_TIMER_DELAY)
+        self._timerHandle = self.hass.loop.call_later(delay, self._onTimer, nextEdge)
+
+    def _onTimer(self, expected):
+        self._timerHandle = None
+        asyncio.create_task(self._evaluate(expected=expected))
+
+    async def _evaluate(self, force=False, expected=None):
+        """Prüft fällige Übergänge anhand der Wanduhr und stellt den nächsten Timer"""
+        async with self._evalLock:
+            now = datetime.now()
+            if expected is not None:
+                self.stats["wakeups"] += 1
+                # Rückwärtssprung der Uhr: geplante Zeitpunkte liegen weiter in der Zukunft als der Timer erlaubt
+                if any((edge - now).total_seconds() > 86400 for edge in self.transitions.values()):
+                    self.stats["clockJumps"] += 1
+                    self.transitions = {}
+
+            due = [name for name, edge in self.transitions.items() if edge <= now]
+            lightbyOGBControl = self.dataStore.getDeep("controlOptions.lightbyOGBControl")
+
+            state = self.isLightOn(now)
+            if state is not None and lightbyOGBControl and (force or state != self.lightState):
+                await self._publishLight(state)
+
+            if "lightOn" in due:
+                await self.eventManager.emit("PhotoperiodBoundary", {"Name": self.room, "start": self.transitions["lightOn"]})
+
+            if lightbyOGBControl and state:
+                for phase in ("sunrise", "sunset"):
+                    if phase in due and self._inPhaseWindow(phase, now):
+                        await self._publishSunPhase(phase)
+
+            self.stats["edges"] += len(due)
+            self.transitions = self._computeTransitions(now)
+            self._arm(now)
+
+    def _inPhaseWindow(self, phase, now):
+        """Verspätete Timer (Uhrsprung, Last) lösen die Phase nur innerhalb ihres Fensters aus"""
+        edge = self.transitions[phase]
+        duration = self.sunRiseDuration if phase == "sunrise" else self.sunSetDuration
+        return (now - edge).total_seconds() <= duration
+
+    async def _publishLight(self, state):
+        self.lightState = state
+        self.dataStore.setDeep("isPlantDay.islightON", state)
+        _LOGGER.info(f"{self.name}: Lichtstatus für {self.room} an der Flanke gesetzt, Licht ist {state}")
+        await self.eventManager.emit("toggleLight", state)
+
+    async def _publishSunPhase(self, phase):
+        _LOGGER.info(f"{self.name}: {phase} Phase startet für {self.room}")
+        await self.eventManager.emit("SunPhaseTransition", {"Name": self.room, "phase": phase})
@@ -13,6 +13,7 @@ from ..const import PREM_WS_API
 from .utils.Premium.SecureWebSocketClient import OGBWebSocketConManager as OGB_WS
 from .utils.Premium.ogb_state import _save_state_securely,_remove_state_file,_load_state_securely
 from .OGBGrowPlanManager import OGBGrowPlanManager
+from .utils.sensorUpdater import update_options_batch
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -472,8 +473,8 @@ class OGBPremManager:
 
         # Collect grow data
         grow_data = {
-            "vpd": self.dataStore.get("vpd"),
-            "tentData": self.dataStore.get("tentData"),
+            "vpd": self.dataStore.get("vpd").to_dict(),
+            "tentData": self.dataStore.get("tentData").to_dict(),
             "isLightON": self.dataStore.get("isPlantDay"),
             "devCaps": self.dataStore.get("capabilities"),
             "plantStage": self.dataStore.get("plantStage"),
@@ -489,7 +490,7 @@ class OGBPremManager:
             "DeviceProfiles":self.dataStore.get("DeviceProfiles"),
             "DeviceMinMax":self.dataStore.get("DeviceMinMax"),
             #"lightPlantStages":self.dataStore.get("lightPlantStages"),
-            "controlOptions": self.dataStore.get("controlOptions"),
+            "controlOptions": self.dataStore.get("controlOptions").to_dict(),
             "controlOptionData":self.dataStore.get("controlOptionData"),
         }     
  
@@ -678,15 +679,7 @@ class OGBPremManager:
         if tentmode != None:
             tent_control = f"select.ogb_tentmode_{self.room.lower()}"
             self.dataStore.set("tentMode", tentmode)
-            await self.hass.services.async_call(
-                domain="select",
-                service="select_option",
-                service_data={
-                    "entity_id": tent_control,
-                    "option": tentmode
-                },
-                blocking=True
-            )
+            await update_options_batch({tent_control: tentmode}, self.room, self.hass)
         else:
             # Boolean Controls Mapping
             mapping = {
@@ -701,6 +694,7 @@ class OGBPremManager:
                 "lightbyOGBControl": f"select.ogb_lightcontrol_{self.room.lower()}",
             }
 
+            updates = {}
             for key, value in controls.items():
                 entity_id = mapping.get(key)
                 if not entity_id:
@@ -710,17 +704,10 @@ class OGBPremManager:
                 self.dataStore.setDeep(f"controlOptions.{key}", value)
 
                 # Map Boolean to YES/NO
-                option_value = "YES" if value else "NO"
+                updates[entity_id] = "YES" if value else "NO"
 
-                await self.hass.services.async_call(
-                    domain="select",
-                    service="select_option",
-                    service_data={
-                        "entity_id": entity_id,
-                        "option": option_value
-                    },
-                    blocking=True
-                )
+            # Alle Selects in einem Snapshot-Update
+            await update_options_batch(updates, self.room, self.hass)
 
     async def _change_sensor_value(self,type="SET",entity="",value=None):
         
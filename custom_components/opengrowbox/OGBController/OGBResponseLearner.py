@@ -0,0 +1,193 @@
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Erwartete Wirkung einer "Increase"-Aktion je Capability auf die Messgrößen (+1/-1, 0 = Richtung unbekannt)
+EFFECTS = {
+    "canHeat": {"temperature": 1},
+    "canCool": {"temperature": -1},
+    "canClimate": {"temperature": 0},
+    "canHumidify": {"humidity": 1},
+    "canDehumidify": {"humidity": -1},
+    "canExhaust": {"temperature": -1, "humidity": -1},
+    "canIntake": {"temperature": -1, "humidity": 0},
+    "canVentilate": {"temperature": 0, "humidity": 0},
+    "canLight": {"temperature": 1},
+}
+
+# Mindeständerung, ab der eine Reaktion als solche zählt
+NOISE = {"temperature": 0.2, "humidity": 1.0}
+
+OBSERVE_MINUTES = 20.0     # Beobachtungsdauer nach der letzten Aktion einer Reihe
+MAX_OBSERVE_MINUTES = 60.0 # länger verlängerte Reihen werden verworfen
+SETTLE_FRACTION = 0.9      # Reaktionszeit = Zeit bis 90% der größten Änderung
+LEARN_RATE = 0.3
+MIN_SAMPLES = 3            # erst danach ersetzt der gelernte Wert den Standard-Cooldown
+COOLDOWN_LIMITS = (0.5, 30.0)
+
+
+class OGBResponseLearner:
+    """
+    Lernt pro Capability, wie schnell und wie stark Temperatur bzw. Feuchte nach einer Aktion reagieren.
+    Nach jeder registrierten Aktion wird der Verlauf der betroffenen Messgröße beobachtet; die Zeit bis
+    90% der Änderung wird als Reaktionszeit gemittelt und ersetzt den festen Cooldown.
+    Gespeichert wird im DataStore unter "responseModel" (wird mit dem State gesichert).
+    """
+
+    def __init__(self, dataStore=None, room=""):
+        self.dataStore = dataStore
+        self.room = room
+        self.observations = {}
+        self.model = {}
+        self.stats = {"observed": 0, "learned": 0, "noEffect": 0, "opposed": 0, "interrupted": 0}
+        if self.dataStore:
+            self._restore()
+            self.dataStore.on("StateRestored", lambda *args: self._restore())
+
+    def _restore(self):
+        saved = self.dataStore.get("responseModel") or {}
+        for capability, entry in saved.items():
+            if capability in EFFECTS and isinstance(entry, dict) and entry.get("responseMinutes"):
+                self.model[capability] = dict(entry)
+
+    def _persist(self):
+        if self.dataStore:
+            self.dataStore.set("responseModel", {capability: dict(entry) for capability, entry in self.model.items()})
+
+    # Beobachtung
+    def startObservation(self, capability, action, temperature, humidity, now=None):
+        """
+        Beginnt die Beobachtung nach einer Aktion. Eine weitere Aktion in dieselbe Richtung verlängert die
+        laufende Beobachtung (Baseline bleibt, Fenster und Reaktionszeit zählen ab der letzten Aktion),
+        eine Gegenaktion verwirft sie: eine abgebrochene Reihe hätte ihr 90%-Niveau zu früh und würde die
+        Reaktionszeit nur verkürzen.
+        """
+        effects = EFFECTS.get(capability)
+        if not effects or action not in ("Increase", "Reduce"):
+            return
+        now = time.monotonic() if now is None else now
+        baseline = {"temperature": temperature, "humidity": humidity}
+        try:
+            baseline = {metric: float(baseline[metric]) for metric in effects}
+        except (TypeError, ValueError):
+            return
+
+        sign = 1 if action == "Increase" else -1
+        signs = {metric: direction * sign for metric, direction in effects.items()}
+        running = self.observations.get(capability)
+        if running is not None:
+            if running["signs"] == signs:
+                running["last"] = now
+                return
+            self._discard(capability)
+        self.observations[capability] = {
+            "start": now,
+            "last": now,
+            "baseline": baseline,
+            "signs": signs,
+            "series": [],
+        }
+
+    def observe(self, temperature, humidity, now=None):
+        """Neue Raumwerte für alle laufenden Beobachtungen"""
+        if not self.observations:
+            return
+        now = time.monotonic() if now is None else now
+        values = {"temperature": temperature, "humidity": humidity}
+        for capability, observation in list(self.observations.items()):
+            minutes = (now - observation["start"]) / 60
+            sample = {}
+            for metric, sign in observation["signs"].items():
+                try:
+                    delta = float(values[metric]) - observation["baseline"][metric]
+                except (TypeError, ValueError):
+                    continue
+                sample[metric] = delta * sign if sign else abs(delta)
+            if sample:
+                observation["series"].append((minutes, sample))
+            if minutes >= MAX_OBSERVE_MINUTES:
+                self._discard(capability)
+            elif (now - observation["last"]) / 60 >= OBSERVE_MINUTES:
+                self._finish(capability)
+
+    def _discard(self, capability):
+        """Beobachtung ohne Lernen beenden (vor Ablauf unterbrochen)"""
+        self.observations.pop(capability, None)
+        self.stats["interrupted"] += 1
+
+    def _finish(self, capability):
+        observation = self.observations.pop(capability)
+        series = observation["series"]
+        if len(series) < 2:
+            return
+        self.stats["observed"] += 1
+
+        # Messgröße mit der deutlichsten Reaktion (relativ zum Rauschen) ist maßgeblich
+        def strength(metric):
+            return max(sample.get(metric, 0.0) for _, sample in series) / NOISE[metric]
+
+        metric = max(observation["signs"], key=strength)
+        peak = max(sample.get(metric, 0.0) for _, sample in series)
+        if peak < NOISE[metric]:
+            lowest = min(sample.get(metric, 0.0) for _, sample in series)
+            self.stats["opposed" if lowest <= -NOISE[metric] else "noEffect"] += 1
+            return
+
+        # Reaktionszeit ab der letzten Aktion der Reihe
+        lastMinutes = (observation["last"] - observation["start"]) / 60
+        responseMinutes = next(
+            (minutes - lastMinutes for minutes, sample in series
+             if minutes >= lastMinutes and sample.get(metric, 0.0) >= SETTLE_FRACTION * peak),
+            0.0,
+        )
+        responseMinutes = max(COOLDOWN_LIMITS[0], min(COOLDOWN_LIMITS[1], responseMinutes))
+
+        entry = self.model.get(capability)
+        if entry is None:
+            entry = self.model[capability] = {"responseMinutes": responseMinutes, "magnitude": peak, "metric": metric, "samples": 0}
+        else:
+            entry["responseMinutes"] += LEARN_RATE * (responseMinutes - entry["responseMinutes"])
+            entry["magnitude"] += LEARN_RATE * (peak - entry["magnitude"])
+            entry["metric"] = metric
+        entry["responseMinutes"] = round(entry["responseMinutes"], 2)
+        entry["magnitude"] = round(entry["magnitude"], 2)
+        entry["samples"] += 1
+        self.stats["learned"] += 1
+        self._persist()
+        _LOGGER.debug(f"{self.room}: {capability} responded on {metric} by {peak:.2f} after {responseMinutes:.1f} min, learned {entry}")
+
+    # Auswertung
+    def cooldownMinutes(self, capability, default):
+        """Gelernte Reaktionszeit als Cooldown, sonst der Standardwert"""
+        entry = self.model.get(capability)
+        if not entry or entry.get("samples", 0) < MIN_SAMPLES:
+            return default
+        return entry["responseMinutes"]
+
+    def magnitude(self, capability):
+        entry = self.model.get(capability)
+        return entry.get("magnitude") if entry else None
+
+    def snapshot(self):
+        return {"model": {capability: dict(entry) for capability, entry in self.model.items()},
+                "observing": list(self.observations), "stats": dict(self.stats)}
+
+
+def replay(records, learner=None):
+    """
+    Spielt aufgezeichnete Daten durch den Lerner, z.B. aus dem Log oder einer Simulation.
+    records: ("action", ts, capability, action, temperature, humidity) oder ("sample", ts, temperature, humidity), ts in Sekunden.
+    """
+    learner = learner or OGBResponseLearner()
+    for record in records:
+        if record[0] == "action":
+            _, ts, capability, action, temperature, humidity = record
+            learner.startObservation(capability, action, temperature, humidity, now=ts)
+        else:
+            _, ts, temperature, humidity = record
+            learner.observe(temperature, humidity, now=ts)
+    # Am Ende der Aufzeichnung unvollständige Beobachtungen lernen nicht
+    for capability in list(learner.observations):
+        learner._discard(capability)
+    return learner
@@ -0,0 +1,193 @@
+import logging
+import time
+from array import array
+
+_LOGGER = logging.getLogger(__name__)
+
+# Standardwerte, überschreibbar über den DataStore-Key "sensorConditioning"
+DEFAULT_CONFIG = {
+    "filter": "ema",          # "ema", "kalman" oder "none"
+    "alpha": 0.4,             # EMA-Faktor
+    "kalmanQ": 0.01,          # Prozessrauschen
+    "kalmanR": 0.25,          # Messrauschen
+    "window": 7,              # Hampel-Fenster (Rohwerte)
+    "hampelK": 3.0,           # Ausreißergrenze in robusten Standardabweichungen
+    "minSpread": {"temperature": 1.0, "humidity": 3.0},
+    "resolution": {"temperature": 0.05, "humidity": 0.1},
+    "staleAfter": 1800,       # Sekunden ohne Event, danach wird der Sensor ignoriert (nur ohne HA-State)
+    "offsets": {},            # entity_id -> Kalibrier-Offset
+}
+
+MAD_SCALE = 1.4826
+
+UNAVAILABLE_STATES = ("unavailable", "unknown")
+
+
+class SensorChannel:
+    """Zustand eines Sensors: Ringpuffer der Rohwerte und Filterzustand"""
+
+    __slots__ = ("kind", "buffer", "count", "pos", "estimate", "variance", "published", "lastSeen", "rejectedInRow")
+
+    def __init__(self, kind, window):
+        self.kind = kind
+        self.buffer = array("d", [0.0] * window)
+        self.count = 0
+        self.pos = 0
+        self.estimate = None
+        self.variance = 1.0
+        self.published = None
+        self.lastSeen = None
+        self.rejectedInRow = 0
+
+    def push(self, value):
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % len(self.buffer)
+        if self.count < len(self.buffer):
+            self.count += 1
+
+    def window(self):
+        return self.buffer[:self.count] if self.count < len(self.buffer) else self.buffer
+
+
+def _median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+class OGBSensorConditioner:
+    """
+    Aufbereitung der Temperatur-/Feuchtigkeitssensoren vor der VPD-Berechnung.
+    Pro Sensor: Kalibrier-Offset, Hampel-Ausreißerfilter über ein festes Fenster,
+    EMA- oder Kalman-Glättung, Auflösung gegen Mini-Änderungen und Erkennung veralteter Sensoren.
+    Jeder unterdrückte Wert spart einen kompletten Regelzyklus und wird gezählt.
+    """
+
+    def __init__(self, dataStore, room, stateLookup=None):
+        self.dataStore = dataStore
+        self.room = room
+        # entity_id -> HA-State (hass.states.get); ohne Lookup zählt nur der letzte Event-Zeitpunkt
+        self.stateLookup = stateLookup
+        self.channels = {}
+        self.stats = {"samples": 0, "outliers": 0, "belowResolution": 0, "invalid": 0, "suppressedCycles": 0, "staleExcluded": 0}
+        self.config = dict(DEFAULT_CONFIG)
+        self.reload()
+        self.dataStore.on("sensorConditioning", lambda *args: self.reload())
+        self.dataStore.on("StateRestored", lambda *args: self.reload())
+
+    def reload(self):
+        """Übernimmt die Konfiguration aus dem DataStore"""
+        config = dict(DEFAULT_CONFIG)
+        config.update(self.dataStore.get("sensorConditioning") or {})
+        self.config = config
+        window = max(3, int(config["window"]))
+        for entityId, channel in list(self.channels.items()):
+            if len(channel.buffer) != window:
+                self.channels[entityId] = SensorChannel(channel.kind, window)
+
+    def _channel(self, entityId, kind):
+        channel = self.channels.get(entityId)
+        if channel is None:
+            channel = self.channels[entityId] = SensorChannel(kind, max(3, int(self.config["window"])))
+        return channel
+
+    def _suppress(self, reason):
+        self.stats[reason] += 1
+        self.stats["suppressedCycles"] += 1
+        return None
+
+    def _isOutlier(self, channel, value):
+        if channel.count < 3:
+            return False
+        window = channel.window()
+        median = _median(window)
+        mad = _median([abs(sample - median) for sample in window])
+        threshold = max(self.config["hampelK"] * MAD_SCALE * mad, self.config["minSpread"].get(channel.kind, 0.0))
+        return abs(value - median) > threshold
+
+    def _smooth(self, channel, value):
+        mode = self.config["filter"]
+        if channel.estimate is None or mode == "none":
+            channel.estimate = value
+        elif mode == "kalman":
+            channel.variance += self.config["kalmanQ"]
+            gain = channel.variance / (channel.variance + self.config["kalmanR"])
+            channel.estimate += gain * (value - channel.estimate)
+            channel.variance *= (1 - gain)
+        else:
+            channel.estimate += self.config["alpha"] * (value - channel.estimate)
+        return channel.estimate
+
+    def condition(self, entityId, kind, raw, now=None):
+        """
+        Bereitet einen Rohwert auf. Gibt den geglätteten Wert zurück oder None,
+        wenn der Wert keinen neuen Regelzyklus auslösen soll.
+        """
+        now = time.monotonic() if now is None else now
+        try:
+            value = float(raw) + float(self.config["offsets"].get(entityId, 0.0))
+        except (TypeError, ValueError):
+            return self._suppress("invalid")
+
+        channel = self._channel(entityId, kind)
+        channel.lastSeen = now
+        self.stats["samples"] += 1
+
+        outlier = self._isOutlier(channel, value)
+        # Rohwert immer ins Fenster, damit echte Sprünge nach einigen Samples durchkommen
+        channel.push(value)
+        if outlier:
+            channel.rejectedInRow += 1
+            _LOGGER.debug(f"{self.room}: Outlier {value} rejected for {entityId}")
+            return self._suppress("outliers")
+        channel.rejectedInRow = 0
+
+        smoothed = round(self._smooth(channel, value), 2)
+        resolution = self.config["resolution"].get(kind, 0.0)
+        if channel.published is not None and abs(smoothed - channel.published) < resolution:
+            return self._suppress("belowResolution")
+
+        channel.published = smoothed
+        return smoothed
+
+    def isStale(self, entityId, now=None):
+        """
+        Ein Sensor ist veraltet, wenn HA ihn als unavailable/unknown führt. Ein verfügbarer State
+        gilt als frisch, auch wenn der Wert sich lange nicht ändert (kein state_changed bei konstantem Wert).
+        Nur Sensoren ohne HA-State werden über den letzten Event-Zeitpunkt bewertet.
+        """
+        state = self.stateLookup(entityId) if self.stateLookup and entityId else None
+        if state is not None:
+            return state.state in UNAVAILABLE_STATES
+        channel = self.channels.get(entityId)
+        if channel is None or channel.lastSeen is None:
+            return False
+        now = time.monotonic() if now is None else now
+        return now - channel.lastSeen > self.config["staleAfter"]
+
+    def fresh(self, entries, now=None):
+        """WorkData-Einträge ohne veraltete Sensoren (alle, falls sonst keiner übrig bliebe)"""
+        if not entries:
+            return entries
+        now = time.monotonic() if now is None else now
+        fresh = [entry for entry in entries if not self.isStale(entry.get("entity_id"), now)]
+        if len(fresh) != len(entries):
+            self.stats["staleExcluded"] += len(entries) - len(fresh)
+            if not fresh:
+                return entries
+        return fresh
+
+    def snapshot(self):
+        now = time.monotonic()
+        return {
+            "stats": dict(self.stats),
+            "sensors": {
+                entityId: {
+                    "kind": channel.kind,
+                    "value": channel.published,
+                    "stale": self.isStale(entityId, now),
+                    "rejectedInRow": channel.rejectedInRow,
+                }
+                for entityId, channel in self.channels.items()
+            },
+        }
@@ -0,0 +1,72 @@
+import logging
+import asyncio
+import time
+
+from ..const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+BUS_KEY = "sharedBus"
+
+
+def get_shared_bus(hass):
+    """Gemeinsamer Bus aller Räume der Integration (einmal pro hass-Instanz)"""
+    domainData = hass.data.setdefault(DOMAIN, {})
+    bus = domainData.get(BUS_KEY)
+    if bus is None:
+        bus = domainData[BUS_KEY] = OGBSharedBus()
+    return bus
+
+
+class OGBSharedBus:
+    """
+    In-Process Datenbus für raumübergreifende Werte (Ambient, Außenwetter).
+    Hält pro Topic den letzten Wert; Räume lesen diesen direkt oder werden bei Änderungen
+    benachrichtigt, ohne Umweg über den HA-Eventbus und Service-Aufrufe.
+    """
+
+    def __init__(self):
+        self.snapshots = {}
+        self.subscribers = {}
+        self.stats = {"published": 0, "unchanged": 0, "deliveries": 0, "errors": 0}
+
+    def subscribe(self, topic, callback):
+        """Registriert einen Empfänger (sync oder async); gibt eine Abmelde-Funktion zurück"""
+        self.subscribers.setdefault(topic, []).append(callback)
+
+        def unsubscribe():
+            if callback in self.subscribers.get(topic, []):
+                self.subscribers[topic].remove(callback)
+
+        return unsubscribe
+
+    def latest(self, topic):
+        """Letzter Snapshot {"values", "source", "updated"} oder None"""
+        return self.snapshots.get(topic)
+
+    async def publish(self, topic, values, source=None):
+        """Neuen Wert veröffentlichen; Empfänger werden nur bei Änderung benachrichtigt"""
+        previous = self.snapshots.get(topic)
+        if previous is not None and previous["values"] == values:
+            self.stats["unchanged"] += 1
+            return False
+
+        snapshot = {"values": dict(values), "source": source, "updated": time.time()}
+        self.snapshots[topic] = snapshot
+        self.stats["published"] += 1
+
+        results = await asyncio.gather(
+            *(self._deliver(callback, topic, snapshot) for callback in list(self.subscribers.get(topic, []))),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.stats["errors"] += 1
+                _LOGGER.error(f"Shared bus delivery for '{topic}' failed: {result}")
+        return True
+
+    async def _deliver(self, callback, topic, snapshot):
+        self.stats["deliveries"] += 1
+        result = callback(topic, snapshot)
+        if asyncio.iscoroutine(result):
+            await result
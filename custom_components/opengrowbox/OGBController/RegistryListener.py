@@ -9,6 +9,7 @@ from homeassistant.helpers.label_registry import async_get as async_get_label_re
 from .OGBDataClasses.OGBPublications import OGBEventPublication,OGBVPDPublication
 
 from .utils.lightTimeHelpers import update_light_state
+from .OGBEntityClassifier import classify_entity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,6 +20,33 @@ class OGBRegistryEvenListener:
         self.dataStore = dataStore
         self.eventManager = eventManager
         self.room_name = room
+        self.monitoredEntities = set()
+        self.monitoring = False
+
+    def watchEntities(self, entity_ids):
+        """Zur Laufzeit angelegte Entitäten (Provisioning) in das State-Monitoring aufnehmen"""
+        self.monitoredEntities.update(entity_ids)
+
+    def get_entity_label_names(self, entity_id):
+        """Label-Namen einer Entität (Entity + Device) für die Rollen-Klassifizierung"""
+        entity_registry = async_get_entity_registry(self.hass)
+        device_registry = async_get_device_registry(self.hass)
+        label_registry = async_get_label_registry(self.hass)
+
+        entry = entity_registry.async_get(entity_id)
+        if entry is None:
+            return []
+        label_ids = set(entry.labels or ())
+        device = device_registry.async_get(entry.device_id) if entry.device_id else None
+        if device is not None:
+            label_ids |= set(device.labels or ())
+
+        names = []
+        for label_id in label_ids:
+            label_entry = label_registry.labels.get(label_id)
+            if label_entry:
+                names.append(label_entry.name)
+        return names
 
     async def get_entities_by_room_async(self, room_name):
         """Hole alle Entitäten nach Raum."""
@@ -197,9 +225,10 @@ class OGBRegistryEvenListener:
             })
 
             # Überprüfe auf relevante Schlüsselwörter in der `entity_id`
+            role = classify_entity(result["entity_id"], result.get("labels"))
             for key, message in relevant_types.items():
-                if key in result["entity_id"]:
-                    if "ogb_" in result["entity_id"]:
+                if role.kind == key and role.medium in ("air", "plant") and not role.ignored:
+                    if role.isSetting:
                         _LOGGER.debug(f"Skipping 'ogb_' entity: {result['entity_id']}")
                         continue
                     
@@ -349,9 +378,10 @@ class OGBRegistryEvenListener:
                 "labels": result["labels"],
             })
 
+            role = classify_entity(result["entity_id"], result.get("labels"))
             for key, message in relevant_types.items():
-                if key in result["entity_id"]:
-                    if "ogb_" in result["entity_id"]:
+                if role.kind == key and role.medium in ("air", "plant") and not role.ignored:
+                    if role.isSetting:
                         _LOGGER.debug(f"Skipping 'ogb_' entity: {result['entity_id']}")
                         continue
 
@@ -508,12 +538,12 @@ class OGBRegistryEvenListener:
     async def monitor_filtered_entities(self, room_name):
         """Überwache State-Changes nur für gefilterte Entitäten."""
         # Hole die gefilterten Entitäten
-        filtered_entity_ids = await self.get_filtered_entities(room_name.lower())
+        self.monitoredEntities.update(await self.get_filtered_entities(room_name.lower()))
 
         async def registryEventListener(event):
             """Callback für State-Changes."""
             entity_id = event.data.get("entity_id")
-            if entity_id in filtered_entity_ids:
+            if entity_id in self.monitoredEntities:
                 old_state = event.data.get("old_state")
                 new_state = event.data.get("new_state")
 
@@ -550,5 +580,6 @@ class OGBRegistryEvenListener:
                 
         # Registriere den Listener
         self.hass.bus.async_listen("state_changed", registryEventListener)
+        self.monitoring = True
         _LOGGER.debug(f"State-Change Listener für Raum {room_name} registriert.")
         
\ No newline at end of file
@@ -15,6 +15,8 @@ from urllib.parse import urlparse
 from datetime import datetime, timezone,timedelta
 import uuid
 
+from .ogb_framing import OGBFrameBatcher, decode_frame, negotiate_codec, supported_codecs, DEFAULT_FLUSH_INTERVAL, DEFAULT_MAX_MESSAGES, DEFAULT_MAX_BYTES
+
 class OGBWebSocketConManager:
     def __init__(self, base_url: str, eventManager={},ws_room="",room_id="", timeout: float = 10.0):
         self.base_url = f"{self._validate_url(base_url)}/ws"
@@ -63,6 +65,9 @@ class OGBWebSocketConManager:
         
         # AES-GCM for encryption
         self._aes_gcm = None
+
+        # Optional batched binary frames (enabled when the server announces support)
+        self._frame_batcher = None
         
         # UNIFIED: Single keep-alive system (replaces separate ping/pong and health monitoring)
         self._last_pong_time = time.time()
@@ -167,6 +172,7 @@ class OGBWebSocketConManager:
                 "origin": "https://opengrowbox.net",
                 "ogb-client": "ogb-ws-ha-connector 1.0",
                 "ogb-client-id": self.client_id,
+                "ogb-frame-codecs": ",".join(supported_codecs()),
             }
 
             logging.warning(f"🔄 {self.ws_room} Attempting login for: {email}")
@@ -599,6 +605,13 @@ class OGBWebSocketConManager:
             self.authenticated = True
             self.ogb_max_sessions = data.get("ogb_max_sessions")
             self.ogb_sessions = data.get("ogb_sessions")
+            if data.get("binary_frames"):
+                self.enable_binary_framing(
+                    codecs=data.get("frame_codecs"),
+                    flush_interval=data.get("frame_flush_interval", DEFAULT_FLUSH_INTERVAL),
+                    max_messages=data.get("frame_max_messages", DEFAULT_MAX_MESSAGES),
+                    max_bytes=data.get("frame_max_bytes", DEFAULT_MAX_BYTES),
+                )
 
         @self.sio.event
         async def disconnect():
@@ -617,19 +630,19 @@ class OGBWebSocketConManager:
             """Handle incoming encrypted messages"""
             try:
                 decrypted_data = self._decrypt_message(data.get('data', {}))
-                message_type = decrypted_data.get('type', 'message')
-                
-                if message_type in self.message_handlers:
-                    if asyncio.iscoroutinefunction(self.message_handlers[message_type]):
-                        await self.message_handlers[message_type](decrypted_data)
-                    else:
-                        self.message_handlers[message_type](decrypted_data)
-                else:
-                    logging.warning(f"📨 Received message: {message_type}")
-                    
+                await self._dispatch_decrypted(decrypted_data)
             except Exception as e:
                 logging.error(f"❌ Error handling encrypted message: {e}")
 
+        @self.sio.event
+        async def encrypted_frame(data):
+            """Handle incoming binary frames with several encrypted messages"""
+            try:
+                for decrypted_data in decode_frame(self._aes_gcm, data):
+                    await self._dispatch_decrypted(decrypted_data)
+            except Exception as e:
+                logging.error(f"❌ Error handling encrypted frame: {e}")
+
         ## SES ROTATION
         @self.sio.event
         async def new_session_available(data):
@@ -863,6 +876,11 @@ class OGBWebSocketConManager:
         
         # Stop keep-alive
         await self._stop_keepalive()
+
+        # Queued frames cannot be delivered anymore, framing is renegotiated on auth
+        if self._frame_batcher:
+            self._frame_batcher.cancel()
+            self._frame_batcher = None
         
         # Disconnect cleanly if still connected
         try:
@@ -1494,6 +1512,11 @@ class OGBWebSocketConManager:
             except asyncio.CancelledError:
                 pass
         
+        # Send queued frames before the socket goes away
+        if self._frame_batcher:
+            await self._frame_batcher.close()
+            self._frame_batcher = None
+
         # Disconnect socket
         if hasattr(self, 'sio') and self.ws_connected:
             try:
@@ -1701,6 +1724,7 @@ class OGBWebSocketConManager:
             "reconnect_attempts": self.ws_reconnect_attempts,
             "reconnection_in_progress": self._reconnection_in_progress,
             "rotation_in_progress": self._rotation_in_progress,
+            "binary_framing": dict(self._frame_batcher.stats) if self._frame_batcher else None,
         }
         
         return base_info
@@ -1778,6 +1802,12 @@ class OGBWebSocketConManager:
                 "client_id":self.client_id,
             }
 
+            if self._frame_batcher:
+                # Erst nach dem Flush des Frames steht fest, ob die Nachricht zugestellt wurde
+                delivered = await self._frame_batcher.enqueue(message_data)
+                logging.debug(f"📤 {self.ws_room} Queued encrypted message for frame: {message_type}")
+                return await delivered
+
             encrypted_data = self._encrypt_message(message_data)
             await self.sio.emit('encrypted_message', encrypted_data)
             logging.debug(f"📤 {self.ws_room} Sent encrypted message: {message_type}")
@@ -1787,6 +1817,32 @@ class OGBWebSocketConManager:
             logging.error(f"❌ {self.ws_room} Send message error: {e}")
             return False
 
+    def enable_binary_framing(self, codecs=None, flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_messages: int = DEFAULT_MAX_MESSAGES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Pack queued encrypted messages into batched binary frames, codec as offered by the server (JSON lines by default)"""
+        if self._frame_batcher:
+            # Erneute Aushandlung: bereits gesammelte Nachrichten noch im alten Codec senden
+            asyncio.ensure_future(self._frame_batcher.close())
+        self._frame_batcher = OGBFrameBatcher(
+            lambda: self._aes_gcm,
+            lambda frame: self.sio.emit('encrypted_frame', frame),
+            codec=negotiate_codec(codecs),
+            flushInterval=flush_interval,
+            maxMessages=max_messages,
+            maxBytes=max_bytes,
+        )
+        logging.debug(f"📦 {self.ws_room} Binary framing enabled (codec {self._frame_batcher.codec}, flush {flush_interval}s)")
+
+    async def _dispatch_decrypted(self, decrypted_data: dict):
+        message_type = decrypted_data.get('type', 'message')
+
+        if message_type in self.message_handlers:
+            if asyncio.iscoroutinefunction(self.message_handlers[message_type]):
+                await self.message_handlers[message_type](decrypted_data)
+            else:
+                self.message_handlers[message_type](decrypted_data)
+        else:
+            logging.warning(f"📨 Received message: {message_type}")
+
     async def prem_event(self, message_type: str, data: dict) -> bool:
         """Send message via WebSocket"""
         try:
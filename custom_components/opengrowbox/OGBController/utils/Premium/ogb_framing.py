@@ -0,0 +1,239 @@
+import asyncio
+import json
+import logging
+import secrets
+import time
+import base64
+from typing import Awaitable, Callable, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # optional, ohne msgpack wird kompaktes JSON verwendet
+    msgpack = None
+
+_LOGGER = logging.getLogger(__name__)
+
+FRAME_VERSION = 1
+CODEC_JSON = 0
+CODEC_MSGPACK = 1
+NONCE_SIZE = 12
+
+DEFAULT_FLUSH_INTERVAL = 0.5      # Sekunden, die Nachrichten für einen Frame gesammelt werden
+DEFAULT_MAX_MESSAGES = 32
+DEFAULT_MAX_BYTES = 64 * 1024     # Klartextgröße, ab der sofort gesendet wird
+
+
+CODEC_NAMES = {"json": CODEC_JSON, "msgpack": CODEC_MSGPACK}
+
+
+def supported_codecs() -> List[str]:
+    """Codecs, die dieser Client lesen und schreiben kann (wird beim Verbinden angekündigt)"""
+    return ["msgpack", "json"] if msgpack is not None else ["json"]
+
+
+def negotiate_codec(offered) -> int:
+    """
+    Erster vom Server angebotener Codec (auth_success "frame_codecs", in Server-Präferenz),
+    den auch der Client kann. Ohne Angebot oder ohne Treffer bleibt es bei JSON.
+    """
+    if isinstance(offered, str):
+        offered = [offered]
+    supported = supported_codecs()
+    for name in offered or ():
+        name = str(name).strip().lower()
+        if name in supported:
+            return CODEC_NAMES[name]
+    return CODEC_JSON
+
+
+def pack_message(message: dict, codec: int) -> bytes:
+    """Einzelne Nachricht kodieren (wird beim Einreihen einmal gemacht, liefert auch die Größe)"""
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(message, use_bin_type=True, default=str)
+    return json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _join(packed: List[bytes], codec: int) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return b"".join(packed)   # msgpack-Stream, Nachrichten hintereinander
+    return b"\n".join(packed)     # JSON-Lines
+
+
+def _split(payload: bytes, codec: int) -> List[dict]:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("Frame uses msgpack but msgpack is not installed")
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(payload)
+        return list(unpacker)
+    return [json.loads(line) for line in payload.split(b"\n") if line]
+
+
+def encode_frame(aes_gcm, packed: List[bytes], codec: int) -> bytes:
+    """
+    Verschlüsselter Frame: [Version][Codec][Nonce 12 Byte][Ciphertext + Tag].
+    Die zwei Header-Bytes sind als Associated Data mit authentifiziert.
+    """
+    if not aes_gcm:
+        raise ValueError("No encryption key available")
+    header = bytes((FRAME_VERSION, codec))
+    nonce = secrets.token_bytes(NONCE_SIZE)
+    return header + nonce + aes_gcm.encrypt(nonce, _join(packed, codec), header)
+
+
+def decode_frame(aes_gcm, frame: bytes) -> List[dict]:
+    if not aes_gcm:
+        raise ValueError("No decryption key available")
+    if len(frame) < 2 + NONCE_SIZE + 16 or frame[0] != FRAME_VERSION:
+        raise ValueError("Invalid or unsupported frame")
+    header, nonce = frame[:2], frame[2:2 + NONCE_SIZE]
+    payload = aes_gcm.decrypt(nonce, frame[2 + NONCE_SIZE:], header)
+    return _split(payload, frame[1])
+
+
+class OGBFrameBatcher:
+    """
+    Sammelt ausgehende Nachrichten und sendet sie als einen verschlüsselten Binär-Frame,
+    spätestens nach flushInterval oder sobald maxMessages/maxBytes erreicht sind.
+    getCipher liefert den aktuellen AES-GCM-Schlüssel (Session-Rotation), send bekommt die Frame-Bytes.
+    Der Codec wird vom Server ausgehandelt (negotiate_codec), Standard ist JSON.
+    enqueue liefert ein Future, das mit dem Ergebnis des Flushs (True/False) erfüllt wird.
+    """
+
+    def __init__(self, getCipher: Callable, send: Callable[[bytes], Awaitable], codec: Optional[int] = None,
+                 flushInterval: float = DEFAULT_FLUSH_INTERVAL, maxMessages: int = DEFAULT_MAX_MESSAGES,
+                 maxBytes: int = DEFAULT_MAX_BYTES):
+        self.getCipher = getCipher
+        self.send = send
+        self.codec = CODEC_JSON if codec is None else codec
+        self.flushInterval = flushInterval
+        self.maxMessages = maxMessages
+        self.maxBytes = maxBytes
+
+        self._queue: List[bytes] = []
+        self._waiters: List[asyncio.Future] = []
+        self._queuedBytes = 0
+        self._timer = None
+        self._lock = asyncio.Lock()
+        self.stats = {"messages": 0, "frames": 0, "plainBytes": 0, "frameBytes": 0, "errors": 0}
+
+    async def enqueue(self, message: dict) -> asyncio.Future:
+        packed = pack_message(message, self.codec)
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._queue.append(packed)
+        self._waiters.append(waiter)
+        self._queuedBytes += len(packed)
+        self.stats["messages"] += 1
+
+        if len(self._queue) >= self.maxMessages or self._queuedBytes >= self.maxBytes:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flushInterval, self._flushLater)
+        return waiter
+
+    def _flushLater(self):
+        self._timer = None
+        asyncio.ensure_future(self.flush())
+
+    async def flush(self) -> bool:
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._queue:
+                return True
+            packed, self._queue, self._queuedBytes = self._queue, [], 0
+            waiters, self._waiters = self._waiters, []
+            try:
+                frame = encode_frame(self.getCipher(), packed, self.codec)
+                await self.send(frame)
+            except Exception as e:
+                self.stats["errors"] += 1
+                _LOGGER.error(f"❌ Sending frame with {len(packed)} messages failed: {e}")
+                self._resolve(waiters, False)
+                return False
+            self.stats["frames"] += 1
+            self.stats["plainBytes"] += sum(len(item) for item in packed)
+            self.stats["frameBytes"] += len(frame)
+            self._resolve(waiters, True)
+            return True
+
+    @staticmethod
+    def _resolve(waiters: List[asyncio.Future], delivered: bool):
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(delivered)
+
+    async def close(self):
+        await self.flush()
+
+    def cancel(self):
+        """Verbindung verloren: Flush-Timer stoppen, Warteschlange verwerfen (Sender bekommen False)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        dropped = len(self._queue)
+        waiters, self._waiters = self._waiters, []
+        self._queue, self._queuedBytes = [], 0
+        self._resolve(waiters, False)
+        if dropped:
+            _LOGGER.debug(f"Dropped {dropped} queued messages, connection lost")
+
+
+class OGBLoopbackPeer:
+    """
+    Lokale Gegenstelle zum Testen ohne Server: nimmt Frames wie sio.emit entgegen und entschlüsselt sie.
+    """
+
+    def __init__(self, aes_gcm):
+        self.aes_gcm = aes_gcm
+        self.received: List[dict] = []
+        self.frames = 0
+
+    async def emit(self, event: str, frame: bytes):
+        self.frames += 1
+        self.received.extend(decode_frame(self.aes_gcm, frame))
+
+
+def _legacy_size(aes_gcm, message: dict) -> int:
+    """Größe einer Nachricht im bisherigen Format (JSON, einzeln verschlüsselt, Felder base64)"""
+    nonce = secrets.token_bytes(NONCE_SIZE)
+    ciphertext = aes_gcm.encrypt(nonce, json.dumps(message).encode("utf-8"), None)
+    legacy = {
+        "iv": base64.urlsafe_b64encode(nonce).decode(),
+        "tag": base64.urlsafe_b64encode(ciphertext[-16:]).decode(),
+        "data": base64.urlsafe_b64encode(ciphertext[:-16]).decode(),
+        "timestamp": int(time.time()),
+    }
+    return len(json.dumps(legacy))
+
+
+async def run_loopback_test(count: int = 200, codec: Optional[int] = None, **batcherOptions) -> dict:
+    """Schickt count Nachrichten über Batcher und Loopback-Peer und vergleicht mit dem Einzelnachrichten-Format"""
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    aes_gcm = AESGCM(AESGCM.generate_key(bit_length=256))
+    peer = OGBLoopbackPeer(aes_gcm)
+    batcher = OGBFrameBatcher(lambda: aes_gcm, lambda frame: peer.emit("encrypted_frame", frame), codec=codec, **batcherOptions)
+
+    messages = [
+        {"type": "grow-data", "data": {"vpd": 1.1 + i / 1000, "temperature": 24.5, "humidity": 58, "seq": i},
+         "timestamp": int(time.time()), "client_id": "loopback"}
+        for i in range(count)
+    ]
+    started = time.perf_counter()
+    for message in messages:
+        await batcher.enqueue(message)
+    await batcher.close()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "ok": peer.received == json.loads(json.dumps(messages)),
+        "codec": "msgpack" if batcher.codec == CODEC_MSGPACK else "json",
+        "messages": count,
+        "frames": peer.frames,
+        "frameBytes": batcher.stats["frameBytes"],
+        "legacyBytes": sum(_legacy_size(aes_gcm, message) for message in messages),
+        "elapsedMs": round(elapsed * 1000, 2),
+    }
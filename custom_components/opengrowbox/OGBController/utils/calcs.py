@@ -161,28 +161,10 @@ def calc_Dry5Days_vpd(temp, humidity, leaf_offset=0):
 
     return round(vpd, 2)
 
-def calc_light_to_ppfd_dli(value, unit="lux", hours=18, area_m2=1.0, led_type="fullspektrum_grow",default_value=10000):
+def calc_light_to_ppfd(value, unit="lux", area_m2=1.0, led_type="fullspektrum_grow", default_value=10000):
     """
-    Convert Lux or Lumen to PPFD (µmol/m²/s) and DLI (mol/m²/d) for Grow LEDs.
-    
-    Optimized for cannabis and vegetable growing with realistic conversion factors.
-
-    :param value: Light measurement (Lux or Lumen)
-    :param unit: "lux" or "lumen"
-    :param hours: Photoperiod in hours (default 8h)
-    :param area_m2: Area in m² if unit is lumen (default 1.0)
-    :param led_type: LED type - affects conversion factor
-    :return: (ppfd, dli) - PPFD in µmol/m²/s, DLI in mol/m²/d
-    
-    Available led_types:
-    - "fullspektrum_grow": Vollspektrum Grow LEDs (factor 15) - RECOMMENDED
-    - "quantum_board": Samsung LM301B/H Quantum Boards (factor 16)
-    - "red_blue_grow": Red/Blue Grow LEDs (factor 12)
-    - "high_end_grow": High-End Grow LEDs (factor 18)
-    - "cob_grow": COB Grow LEDs (factor 20)
-    - "hps_equivalent": LED as HPS replacement (factor 15)
-    - "burple": Old "Burple" LEDs (factor 12)
-    - "white_led": Standard white LEDs (factor 54) - NOT for growing
+    Convert Lux or Lumen to PPFD (µmol/m²/s) without rounding.
+    See calc_light_to_ppfd_dli for the available led_types.
     """
 
     # Wenn None oder leer, Standardwert nutzen
@@ -221,16 +203,41 @@ def calc_light_to_ppfd_dli(value, unit="lux", hours=18, area_m2=1.0, led_type="f
     else:
         raise ValueError("unit must be 'lux' or 'lumen'")
 
-    if hours <= 0:
-        raise ValueError("hours must be positive")
-
-    if value < 0:
-        value = 0  # negative Werte automatisch auf 0 setzen
-
     # Umrechnung basierend auf LED-Typ
     factor = conversion_factors[led_type]
     ppfd = lux / factor
 
+    return max(ppfd, 0.0)
+
+def calc_light_to_ppfd_dli(value, unit="lux", hours=18, area_m2=1.0, led_type="fullspektrum_grow",default_value=10000):
+    """
+    Convert Lux or Lumen to PPFD (µmol/m²/s) and DLI (mol/m²/d) for Grow LEDs.
+    
+    Optimized for cannabis and vegetable growing with realistic conversion factors.
+
+    :param value: Light measurement (Lux or Lumen)
+    :param unit: "lux" or "lumen"
+    :param hours: Photoperiod in hours (default 8h)
+    :param area_m2: Area in m² if unit is lumen (default 1.0)
+    :param led_type: LED type - affects conversion factor
+    :return: (ppfd, dli) - PPFD in µmol/m²/s, DLI in mol/m²/d
+    
+    Available led_types:
+    - "fullspektrum_grow": Vollspektrum Grow LEDs (factor 15) - RECOMMENDED
+    - "quantum_board": Samsung LM301B/H Quantum Boards (factor 16)
+    - "red_blue_grow": Red/Blue Grow LEDs (factor 12)
+    - "high_end_grow": High-End Grow LEDs (factor 18)
+    - "cob_grow": COB Grow LEDs (factor 20)
+    - "hps_equivalent": LED as HPS replacement (factor 15)
+    - "burple": Old "Burple" LEDs (factor 12)
+    - "white_led": Standard white LEDs (factor 54) - NOT for growing
+    """
+
+    if hours <= 0:
+        raise ValueError("hours must be positive")
+
+    ppfd = calc_light_to_ppfd(value, unit, area_m2, led_type, default_value)
+
     # DLI berechnung
     dli = ppfd * 3600 * hours / 1_000_000
 
@@ -0,0 +1,113 @@
+import logging
+import time
+from collections import deque
+
+# Gemeinsamer Zustand aller Logger: Rate-Limits pro (Raum, Key) und Entscheidungs-Ringpuffer pro Raum
+_RATE_STATE = {}
+_DECISIONS = {}
+
+DEFAULT_MIN_INTERVAL = 60.0
+DEFAULT_BUFFER_SIZE = 250
+
+
+class OGBStructuredLogger:
+    """
+    Rate-limitiertes, gesampeltes Logging für Hot-Paths.
+    Nachrichten werden erst formatiert, wenn sie tatsächlich ausgegeben werden.
+    Entscheidungen landen zusätzlich in einem Ringpuffer pro Raum, der bei Bedarf
+    ausgegeben werden kann.
+    """
+
+    def __init__(self, logger, room, minInterval=DEFAULT_MIN_INTERVAL, sampleRate=1, bufferSize=DEFAULT_BUFFER_SIZE):
+        self.logger = logger
+        self.room = room
+        self.minInterval = minInterval
+        self.sampleRate = max(1, int(sampleRate))
+        if room not in _DECISIONS:
+            _DECISIONS[room] = deque(maxlen=bufferSize)
+        self.decisions = _DECISIONS[room]
+
+    def _allowed(self, key, minInterval, sampleRate):
+        """Prüft Rate-Limit und Sampling für (Raum, Key)"""
+        now = time.monotonic()
+        state = _RATE_STATE.get((self.room, key))
+        if state is None:
+            state = _RATE_STATE[(self.room, key)] = {"last": None, "seen": 0, "suppressed": 0}
+
+        state["seen"] += 1
+        if state["seen"] % sampleRate != 0:
+            state["suppressed"] += 1
+            return 0, False
+        if state["last"] is not None and now - state["last"] < minInterval:
+            state["suppressed"] += 1
+            return 0, False
+
+        suppressed = state["suppressed"]
+        state["last"] = now
+        state["suppressed"] = 0
+        return suppressed, True
+
+    def log(self, level, key, msg, *args, minInterval=None, sampleRate=None):
+        """Loggt maximal einmal pro Intervall und Key, Formatierung erst bei Ausgabe"""
+        if not self.logger.isEnabledFor(level):
+            return
+        suppressed, allowed = self._allowed(
+            key,
+            self.minInterval if minInterval is None else minInterval,
+            self.sampleRate if sampleRate is None else max(1, int(sampleRate)),
+        )
+        if not allowed:
+            return
+        if suppressed:
+            self.logger.log(level, "[%s|%s] " + msg + " (%d suppressed)", self.room, key, *args, suppressed)
+        else:
+            self.logger.log(level, "[%s|%s] " + msg, self.room, key, *args)
+
+    def debug(self, key, msg, *args, **kwargs):
+        self.log(logging.DEBUG, key, msg, *args, **kwargs)
+
+    def info(self, key, msg, *args, **kwargs):
+        self.log(logging.INFO, key, msg, *args, **kwargs)
+
+    def warning(self, key, msg, *args, **kwargs):
+        self.log(logging.WARNING, key, msg, *args, **kwargs)
+
+    def decision(self, key, level=logging.DEBUG, **fields):
+        """Speichert eine Entscheidung im Ringpuffer und loggt sie rate-limitiert"""
+        self.decisions.append({"ts": time.time(), "room": self.room, "key": key, **fields})
+        if self.logger.isEnabledFor(level):
+            self.log(level, key, "%s", _LazyFields(fields))
+
+    def dump(self, key=None, limit=None):
+        """Gibt die letzten Entscheidungen (optional gefiltert nach Key) zurück"""
+        entries = [entry for entry in self.decisions if key is None or entry["key"] == key]
+        if limit:
+            entries = entries[-limit:]
+        return entries
+
+    def stats(self):
+        """Zähler der unterdrückten Nachrichten pro Key für diesen Raum"""
+        return {
+            key: {"seen": state["seen"], "suppressed": state["suppressed"]}
+            for (room, key), state in _RATE_STATE.items()
+            if room == self.room
+        }
+
+
+class _LazyFields:
+    """Formatiert Entscheidungsfelder erst bei der Ausgabe"""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def __str__(self):
+        return " ".join(f"{key}={value}" for key, value in self.fields.items())
+
+
+def dumpDecisions(room=None):
+    """Ringpuffer aller oder eines Raumes ausgeben"""
+    if room is not None:
+        return list(_DECISIONS.get(room, ()))
+    return {name: list(entries) for name, entries in _DECISIONS.items()}
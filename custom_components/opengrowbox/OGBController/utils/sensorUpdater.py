@@ -4,94 +4,87 @@ import re
 from typing import Any, Optional, Union, List
 from datetime import datetime, date, time
 
+from ...const import DOMAIN
+
 _LOGGER = logging.getLogger(__name__)
 
+def _room_coordinator(hass, room):
+    """Coordinator des Raums (hält den Push-Snapshot für die Entitäten)"""
+    for entry in hass.data.get(DOMAIN, {}).values():
+        if getattr(entry, "room_name", "").lower() == room.lower() and hasattr(entry, "pushSensorValues"):
+            return entry
+    return None
+
+def _valid(value):
+    return value if value not in (None, "unknown", "unbekannt") else 0.0
+
 async def update_sensor_via_service(room,vpdPub,hass):
-    vpd_value = vpdPub.VPD
-    temp_value = vpdPub.AvgTemp        
-    hum_value = vpdPub.AvgHum
-    dew_value = vpdPub.AvgDew
-    vpd_entity = f"sensor.ogb_currentvpd_{room.lower()}"  
-    avgTemp_entity = f"sensor.ogb_avgtemperature_{room.lower()}"  
-    avgHum_entity = f"sensor.ogb_avghumidity_{room.lower()}"          
-    avgDew_entity = f"sensor.ogb_avgdewpoint_{room.lower()}"         
-    
-    
-    try:
-        # Überprüfe, ob der Wert gültig ist
-        new_vpd_value = vpd_value if vpd_value not in (None, "unknown", "unbekannt") else 0.0
-        # Rufe den Service auf
-        await hass.services.async_call(
-            domain="opengrowbox",
-            service="update_sensor",
-            service_data={
-                "entity_id": vpd_entity,
-                "value": new_vpd_value
-            },
-            blocking=True
-        )
-        new_temp_value = temp_value if temp_value not in (None, "unknown", "unbekannt") else 0.0            
-        await hass.services.async_call(
-            domain="opengrowbox",
-            service="update_sensor",
-            service_data={
-                "entity_id": avgTemp_entity,
-                "value": new_temp_value
-            },
-            blocking=True
-        )
-        new_hum_value = hum_value if hum_value not in (None, "unknown", "unbekannt") else 0.0                        
-        await hass.services.async_call(
-            domain="opengrowbox",
-            service="update_sensor",
-            service_data={
-                "entity_id": avgHum_entity,
-                "value": new_hum_value
-            },
-            blocking=True
-        )            
-        new_dew_value = dew_value if dew_value not in (None, "unknown", "unbekannt") else 0.0   
-        await hass.services.async_call(
-            domain="opengrowbox",
-            service="update_sensor",
-            service_data={
-                "entity_id": avgDew_entity,
-                "value": new_dew_value
-            },
-            blocking=True
-        )           
-        _LOGGER.debug(f"Sensor '{vpd_entity}' updated via service with value: {vpd_entity}")
-    except Exception as e:
-        _LOGGER.error(f"Failed to update sensor '{vpd_entity}' via service: {e}")
+    """VPD und Durchschnittswerte eines Zyklus gemeinsam in den Raum-Snapshot schreiben"""
+    update_sensors_batch({
+        "ogb_currentvpd_": _valid(vpdPub.VPD),
+        "ogb_avgtemperature_": _valid(vpdPub.AvgTemp),
+        "ogb_avghumidity_": _valid(vpdPub.AvgHum),
+        "ogb_avgdewpoint_": _valid(vpdPub.AvgDew),
+    }, room, hass)
 
 async def _update_specific_sensor(entity,room,value,hass):
-
-    entity_id = f"sensor.{entity}{room.lower()}"  
-    try:
-        await hass.services.async_call(
-            domain="opengrowbox",
-            service="update_sensor",
-            service_data={
-                "entity_id": entity_id,
-                "value": value
-            },
-            blocking=True
-        )
-    except Exception as e:
-        _LOGGER.error(f"Failed to update sensor '{entity_id}' via service: {e}")
+    update_sensors_batch({entity: value}, room, hass)
 
 async def _update_specific_number(entity,room,value,hass):
+    await update_options_batch({f"number.{entity}{room.lower()}": float(value)}, room, hass)
+
+# Service und Feldname je Plattform, falls kein Coordinator den Snapshot verteilt
+OPTION_SERVICES = {
+    "number": ("set_value", "value"),
+    "select": ("select_option", "option"),
+    "text": ("set_value", "value"),
+    "time": ("set_value", "time"),
+    "date": ("set_value", "date"),
+}
+
+async def update_options_batch(values, room, hass):
+    """
+    Setzt mehrere OGB-Optionen eines Raums {entity_id: value} in einem Durchlauf über den Push-Snapshot
+    des Coordinators. Ohne Coordinator (z.B. beim Start) einzeln über den Service der Plattform.
+    """
+    coordinator = _room_coordinator(hass, room)
+    if coordinator is not None:
+        coordinator.pushOptionValues(values)
+        return
+
+    for entity_id, value in values.items():
+        domain = entity_id.partition(".")[0]
+        service, field = OPTION_SERVICES.get(domain, ("set_value", "value"))
+        try:
+            await hass.services.async_call(
+                domain=domain,
+                service=service,
+                service_data={"entity_id": entity_id, field: value},
+                blocking=True
+            )
+        except Exception as e:
+            _LOGGER.error(f"Failed to update option '{entity_id}' via service: {e}")
+
+def update_sensors_batch(values, room, hass):
+    """
+    Aktualisiert mehrere Sensoren eines Raums in einem Durchlauf. values: {prefix: value},
+    z.B. {"ogb_ambienttemperature_": 21.5}. Läuft über den Push-Snapshot des Coordinators,
+    ohne Coordinator (z.B. beim Start) direkt über die registrierten Entities.
+    """
+    wanted = {f"sensor.{prefix}{room.lower()}": value for prefix, value in values.items()}
+
+    coordinator = _room_coordinator(hass, room)
+    if coordinator is not None:
+        coordinator.pushSensorValues(wanted)
+        return
 
-    entity_id = f"number.{entity}{room.lower()}"  
-    try:
-        await hass.services.async_call(
-            domain="number",
-            service="set_value",
-            service_data={
-                "entity_id": entity_id,
-                "value": float(value)
-            },
-            blocking=True
-        )
-    except Exception as e:
-        _LOGGER.error(f"Failed to update Number '{entity_id}' via service: {e}")
+    for sensor in hass.data.get(DOMAIN, {}).get("sensors", []):
+        if sensor.entity_id in wanted:
+            try:
+                sensor.update_state(wanted.pop(sensor.entity_id))
+            except Exception as e:
+                _LOGGER.error(f"Failed to update sensor '{sensor.entity_id}': {e}")
+            if not wanted:
+                break
+    if wanted:
+        _LOGGER.debug(f"Sensors not found for batch update: {list(wanted)}")
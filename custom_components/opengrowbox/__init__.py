@@ -8,6 +8,7 @@ from homeassistant.const import Platform
 from .const import DOMAIN
 from .coordinator import OGBIntegrationCoordinator
 from .frontend import async_register_frontend
+from .room_device import async_merge_room_devices
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,11 +40,30 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Migrate old config entries."""
+    if config_entry.version == 1:
+        # Ein Gerät pro Entität → ein Gerät pro Raum
+        await async_merge_room_devices(hass, config_entry)
+        hass.config_entries.async_update_entry(config_entry, version=2)
+        _LOGGER.info(f"Migrated OpenGrowBox entry '{config_entry.title}' to version 2")
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload the OpenGrowBox config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(config_entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(config_entry.entry_id)
+        coordinator.OGB.detachSharedBus()
+        await coordinator.OGB.controlLoop.stop()
+        # Timer und Scheduler des Raums beenden, sonst schalten sie Licht und Pumpen nach altem Plan weiter
+        coordinator.OGB.photoperiodManager.stop()
+        coordinator.OGB.dliIntegrator.stop()
+        await coordinator.OGB.modeManager.hydroScheduler.stop()
+        await coordinator.OGB.modeManager.retrieveScheduler.stop()
+        coordinator.OGB.clientFeed.close()
+        coordinator.cancelPush()
 
         # Remove the panel from the frontend
         async_remove_panel(hass, frontend_url_path="opengrowbox")
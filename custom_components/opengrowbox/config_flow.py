@@ -5,6 +5,9 @@ from .const import DOMAIN
 class IntegrationConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for the integration."""
 
+    # 2: alle Entitäten eines Raums hängen an einem gemeinsamen Raum-Gerät
+    VERSION = 2
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         if user_input is not None:
@@ -1,9 +1,10 @@
-from datetime import timedelta
+from datetime import datetime
 import logging
 import json
 import asyncio
 
 from homeassistant.helpers.area_registry import async_get as async_get_area_registry
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .select import OpenGrowBoxRoomSelector
@@ -11,11 +12,22 @@ from .text import OpenGrowBoxAccessToken
 from .const import DOMAIN
 from .OGBController.RegistryListener import OGBRegistryEvenListener
 from .OGBController.OGB import OpenGrowBox
+from .entity_provisioning import OGBEntityProvisioner
 
 _LOGGER = logging.getLogger(__name__)
 
+# Werte eines Regelzyklus werden kurz gesammelt und dann in einem Rutsch an die Entitäten verteilt
+PUSH_DELAY = 0.25
+
+_NO_OPTION = object()
+
+
 class OGBIntegrationCoordinator(DataUpdateCoordinator):
-    """Manage data for multiple hubs and global entities."""
+    """
+    Manage data for multiple hubs and global entities.
+    Push-only: es gibt kein Polling, der Raum-Snapshot wird vom Controller befüllt
+    und an die abonnierten Entitäten verteilt.
+    """
 
     def __init__(self, hass, config_entry):
         """Initialize the coordinator."""
@@ -38,15 +50,100 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator):
             "text":[],
         }
         
+        # Subsystem-Entitäten nur bei passender Capability
+        self.provisioner = OGBEntityProvisioner(hass, self)
+
         self.room_selector = None  # Store the Room Selector instance
         self.long_live_token = None # Store the Long Live Token for UI 
+
+        # Raum-Snapshot (Push): Sensorwerte nach entity_id, vom Controller gesetzte Optionen und Gerätezustände
+        self._pendingValues = {}
+        self._pendingOptions = {}
+        self._flushHandle = None
+        self.pushStats = {"pushes": 0, "flushes": 0}
         
         super().__init__(
             hass,
             _LOGGER,
             name=f"{DOMAIN}_{self.room_name}",
-            update_interval=timedelta(seconds=15),
+            update_interval=None,
         )
+        self.data = {"sensors": {}, "options": {}, "devices": {}, "updated": None}
+
+    async def _async_update_data(self):
+        """Kein Polling; ein manueller Refresh liefert den aktuellen Snapshot."""
+        return self.roomSnapshot()
+
+    def roomSnapshot(self):
+        """
+        Aktueller Raum-Snapshot inkl. noch nicht verteilter Sensorwerte. Optionen sind Befehle eines
+        Zyklus und stehen nur im Update, mit dem sie verteilt werden.
+        """
+        sensors = dict(self.data["sensors"])
+        sensors.update(self._pendingValues)
+        return {
+            "sensors": sensors,
+            "options": {},
+            "devices": self._deviceStates(),
+            "updated": datetime.now().isoformat(),
+        }
+
+    def _deviceStates(self):
+        devices = self.OGB.dataStore.get("devices") or []
+        return {
+            device.deviceName: {"type": device.deviceType, "running": device.isRunning}
+            for device in devices
+            if hasattr(device, "deviceName")
+        }
+
+    def pushSensorValues(self, values):
+        """
+        Neue Sensorwerte {entity_id: value} vormerken. Alle Werte, die innerhalb von PUSH_DELAY
+        eintreffen (ein Regelzyklus), werden gemeinsam mit einem einzigen Update verteilt.
+        """
+        self._pendingValues.update(values)
+        self._schedulePush()
+
+    def pushOptionValues(self, values):
+        """
+        Vom Controller gesetzte Optionen {entity_id: value} (number/select/switch/time/date/text) vormerken.
+        Sie werden mit dem nächsten Snapshot verteilt und von der Entität über ihren eigenen Setter übernommen.
+        """
+        self._pendingOptions.update(values)
+        self._schedulePush()
+
+    def _schedulePush(self):
+        self.pushStats["pushes"] += 1
+        if self._flushHandle is None:
+            self._flushHandle = self.hass.loop.call_later(PUSH_DELAY, self._flushSnapshot)
+
+    def subscribeOptions(self, entity, setter):
+        """Option-Entität abonnieren: ein für sie gesetzter Wert geht an setter(value) (inkl. Validierung)"""
+
+        @callback
+        def _handleOptions():
+            value = self.data["options"].get(entity.entity_id, _NO_OPTION)
+            if value is not _NO_OPTION:
+                self.hass.async_create_task(setter(value))
+
+        return self.async_add_listener(_handleOptions)
+
+    @callback
+    def _flushSnapshot(self):
+        self._flushHandle = None
+        if not self._pendingValues and not self._pendingOptions:
+            return
+        snapshot = self.roomSnapshot()
+        snapshot["options"] = self._pendingOptions
+        self._pendingValues = {}
+        self._pendingOptions = {}
+        self.pushStats["flushes"] += 1
+        self.async_set_updated_data(snapshot)
+
+    def cancelPush(self):
+        if self._flushHandle is not None:
+            self._flushHandle.cancel()
+            self._flushHandle = None
 
     def create_room_selector(self):
         """Create a new global Room Selector."""
@@ -88,6 +185,7 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator):
             # Abrufen und Verarbeiten der Raum-Entitäten
             room = self.room_name.lower()
             groupedRoomEntities = await self.OGB.registryListener.get_filtered_entities_with_value(room)
+            self.OGB.entityRoles.registerGroups(groupedRoomEntities)
 
             #_LOGGER.warning(f"All Groups {groupedRoomEntities} in {self.room_name}")
 
@@ -128,6 +226,11 @@ class OGBIntegrationCoordinator(DataUpdateCoordinator):
         except Exception as e:
             _LOGGER.error(f"Error during OpenGrowBox initialization: {e}")
         finally:
+            # Subsystem-Entitäten auch nach einem Init-Fehler verwalten (Capabilities kommen ggf. später)
+            try:
+                self.provisioner.attach()
+            except Exception as e:
+                _LOGGER.error(f"{self.room_name}: Entity provisioning could not be attached: {e}")
             self.is_ready = True  # Initialisierung abgeschlossen
 
         # Starte das Monitoring
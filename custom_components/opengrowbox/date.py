@@ -4,6 +4,7 @@ from homeassistant.helpers.restore_state import RestoreEntity
 import logging
 import voluptuous as vol
 from .const import DOMAIN
+from .room_device import room_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,6 +15,8 @@ _LOGGER = logging.getLogger(__name__)
 class CustomDate(DateEntity, RestoreEntity):
     """Custom date entity for storing only the date portion."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, room_name, coordinator, initial_date=None):
         """Initialize the date entity."""
         self._name = name
@@ -60,13 +63,7 @@ class CustomDate(DateEntity, RestoreEntity):
     @property
     def device_info(self):
         """Device information to link this entity to a device."""
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Date Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name,
-        }
+        return room_device_info(self.room_name)
 
     async def async_set_value(self, value):
         """Set a new date value."""
@@ -92,6 +89,8 @@ class CustomDate(DateEntity, RestoreEntity):
                 _LOGGER.info(f"Restored date for '{self._name}': {restored_date}")
             except ValueError:
                 _LOGGER.warning(f"Failed to restore date for '{self._name}', using default.")
+        # Vom Controller gesetzte Werte kommen über den Raum-Snapshot
+        self.async_on_remove(self.coordinator.subscribeOptions(self, self.async_set_value))
 
 ###############################################
 # async_setup_entry – Registriert die Entitäten und den Service
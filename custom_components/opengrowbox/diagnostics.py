@@ -0,0 +1,29 @@
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .sensor import publication_stats
+
+TO_REDACT = {"token", "access_token", "accessToken", "refresh_token", "api_key", "apiKey", "password", "email", "session_key", "ogbSessionKey", "secret"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, config_entry: ConfigEntry) -> dict:
+    """Return diagnostics for an OpenGrowBox room."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    ogb = coordinator.OGB
+
+    return async_redact_data(
+        {
+            "entry": {"title": config_entry.title, "version": config_entry.version, "data": dict(config_entry.data)},
+            "room": ogb.diagnostics.export(),
+            "snapshot": coordinator.roomSnapshot(),
+            "provisioning": coordinator.provisioner.status(),
+            "entityRoles": ogb.entityRoles.stats,
+            "sensorPublication": publication_stats(hass),
+            "sharedBus": ogb.sharedBus.stats,
+            "controlLoop": ogb.controlLoop.stats,
+            "cycleProfile": ogb.profiler.summary(),
+        },
+        TO_REDACT,
+    )
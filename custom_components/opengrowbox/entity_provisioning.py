@@ -0,0 +1,190 @@
+import asyncio
+import logging
+
+from homeassistant.helpers import entity_platform
+from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .OGBController.OGBDataClasses.OGBPublications import OGBInitData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Namens-Präfix → Subsystem; Entitäten ohne Treffer gehören zum Kern und werden immer angelegt
+SUBSYSTEM_PREFIXES = (
+    ("ogb_hydro", "hydro"),
+    ("ogb_feed_", "feed"),
+    ("ogb_plantfood", "feed"),
+    ("ogb_co2", "co2"),
+    ("ogb_exhaust_", "exhaust"),
+    ("ogb_intake_", "intake"),
+    ("ogb_ventilation_", "ventilation"),
+    ("ogb_light_", "light"),
+    ("ogb_vpdlightcontrol_", "light"),
+    ("ogb_ambient", "ambient"),
+    ("ogb_outsite", "outside"),
+    ("ogb_dryingmodes_", "drying"),
+)
+
+# Subsystem → Capabilities (eine reicht)
+SUBSYSTEM_CAPS = {
+    "hydro": ("canPump",),
+    "feed": ("canPump",),
+    "co2": ("canCO2",),
+    "exhaust": ("canExhaust",),
+    "intake": ("canIntake",),
+    "ventilation": ("canVentilate",),
+    "light": ("canLight",),
+}
+
+SETTING_DOMAINS = ("number", "select", "time", "date", "text", "switch")
+
+# Sekunden, in denen Änderungen (z.B. Geräteliste neu aufgebaut) gesammelt werden
+REFRESH_DELAY = 1.0
+
+
+def entity_subsystem(name):
+    key = name.lower()
+    return next((subsystem for prefix, subsystem in SUBSYSTEM_PREFIXES if key.startswith(prefix)), None)
+
+
+class OGBEntityProvisioner:
+    """
+    Legt Subsystem-Entitäten (Hydro, Feed, CO2, Geräte-MinMax, Ambient, ...) nur an, wenn der Raum
+    die passende Capability bzw. das Feature hat, und entfernt sie wieder, wenn es wegfällt.
+    Die Plattformen geben ihre komplette Liste ab; nicht benötigte Entitäten bleiben Vorlagen,
+    aus denen bei jeder Aktivierung per spawn() eine neue Instanz entsteht.
+    """
+
+    def __init__(self, hass, coordinator):
+        self.hass = hass
+        self.coordinator = coordinator
+        self.platforms = {}
+        self.activeSubsystems = set()
+        self._refreshTask = None
+        self._dirty = False
+        self._attached = False
+
+    def addEntities(self, dataKey, entities, async_add_entities):
+        """Aus async_setup_entry einer Plattform: Kern-Entitäten sofort, Subsystem-Entitäten bei Bedarf"""
+        platform = entity_platform.async_get_current_platform()
+        entry = self.platforms.setdefault(dataKey, {"platform": platform, "templates": {}, "active": {}})
+
+        core = []
+        for entity in entities:
+            subsystem = entity_subsystem(entity.name)
+            if subsystem is None:
+                core.append(entity)
+            else:
+                entry["templates"][entity.unique_id] = (subsystem, entity)
+
+        self.hass.data[DOMAIN].setdefault(dataKey, []).extend(core)
+        async_add_entities(core)
+        _LOGGER.debug(
+            f"{self.coordinator.room_name}: {len(core)} {dataKey} added, {len(entry['templates'])} waiting for capabilities"
+        )
+
+    def attach(self):
+        """Nach dem Start des Controllers: auf Capability-, Modus- und Ambient-Änderungen hören"""
+        if self._attached:
+            return
+        self._attached = True
+        ogb = self.coordinator.OGB
+        ogb.deviceManager.capRegistry.on("CapabilitiesChanged", lambda caps: self.scheduleRefresh())
+        ogb.dataStore.on("tentMode", lambda value: self.scheduleRefresh())
+        for topic in ("ambient", "outside"):
+            ogb._busUnsubscribers.append(ogb.sharedBus.subscribe(topic, lambda topic, snapshot: self.scheduleRefresh()))
+        self.scheduleRefresh()
+
+    def subsystemActive(self, subsystem):
+        ogb = self.coordinator.OGB
+        if subsystem in SUBSYSTEM_CAPS:
+            return any(ogb.deviceManager.capRegistry.hasCap(cap) for cap in SUBSYSTEM_CAPS[subsystem])
+        if subsystem in ("ambient", "outside"):
+            if subsystem == "ambient" and self.coordinator.room_name.lower() == "ambient":
+                return False
+            return ogb.sharedBus.latest(subsystem) is not None
+        if subsystem == "drying":
+            return ogb.dataStore.get("tentMode") == "Drying"
+        return True
+
+    def scheduleRefresh(self):
+        """Mehrere Änderungen (z.B. alle Geräte beim Start) werden zu einem Abgleich zusammengefasst"""
+        self._dirty = True
+        if self._refreshTask is None or self._refreshTask.done():
+            self._refreshTask = self.hass.async_create_task(self.refresh())
+
+    async def refresh(self):
+        while self._dirty:
+            self._dirty = False
+            await asyncio.sleep(REFRESH_DELAY)
+            subsystems = {subsystem for entry in self.platforms.values() for subsystem, _ in entry["templates"].values()}
+            self.activeSubsystems = {subsystem for subsystem in subsystems if self.subsystemActive(subsystem)}
+
+            for dataKey, entry in self.platforms.items():
+                try:
+                    await self._removeInactive(dataKey, entry)
+                    await self._addActive(dataKey, entry)
+                except Exception as e:
+                    _LOGGER.error(f"{self.coordinator.room_name}: Provisioning {dataKey} failed: {e}")
+
+    async def _addActive(self, dataKey, entry):
+        toAdd = [
+            template.spawn()
+            for uniqueId, (subsystem, template) in entry["templates"].items()
+            if subsystem in self.activeSubsystems and uniqueId not in entry["active"]
+        ]
+        if not toAdd:
+            return
+
+        # Entity-IDs vorab bekannt machen, damit der Raum-Monitor ihre State-Changes weiterleitet
+        domain = entry["platform"].domain
+        entity_registry = async_get_entity_registry(self.hass)
+        expected = [
+            entity_registry.async_get_entity_id(domain, DOMAIN, entity.unique_id) or f"{domain}.{slugify(entity.name)}"
+            for entity in toAdd
+        ]
+        self.coordinator.OGB.registryListener.watchEntities(expected)
+
+        await entry["platform"].async_add_entities(toAdd)
+        for entity in toAdd:
+            entry["active"][entity.unique_id] = entity
+        self.hass.data[DOMAIN].setdefault(dataKey, []).extend(toAdd)
+        _LOGGER.info(f"{self.coordinator.room_name}: Provisioned {len(toAdd)} {dataKey} for {sorted(self.activeSubsystems)}")
+
+        # Wiederhergestellte Einstellungen an den Controller geben (wie managerInit beim Start),
+        # solange der Raum-Monitor noch nicht läuft und sie nicht selbst weiterreicht
+        if domain in SETTING_DOMAINS and not self.coordinator.OGB.registryListener.monitoring:
+            for entity in toAdd:
+                state = self.hass.states.get(entity.entity_id) if entity.entity_id else None
+                if state is not None:
+                    await self.coordinator.OGB.manager(OGBInitData(Name=entity.entity_id, newState=[state.state]))
+
+    async def _removeInactive(self, dataKey, entry):
+        stale = [
+            entity for uniqueId, entity in entry["active"].items()
+            if entry["templates"][uniqueId][0] not in self.activeSubsystems
+        ]
+        # Auch den Registry-Eintrag entfernen, sonst erscheint die Entität nach einem Neustart als
+        # wiederhergestellt "unavailable". Letzte Einstellungen bleiben im Restore-State und kommen
+        # beim erneuten Provisioning zurück.
+        entity_registry = async_get_entity_registry(self.hass)
+        for entity in stale:
+            del entry["active"][entity.unique_id]
+            if entity in self.hass.data[DOMAIN].get(dataKey, []):
+                self.hass.data[DOMAIN][dataKey].remove(entity)
+            entityId = entity.entity_id
+            await entity.async_remove()
+            if entityId and entity_registry.async_get(entityId) is not None:
+                entity_registry.async_remove(entityId)
+        if stale:
+            _LOGGER.info(f"{self.coordinator.room_name}: Removed {len(stale)} {dataKey} without matching capability")
+
+    def status(self):
+        return {
+            "activeSubsystems": sorted(self.activeSubsystems),
+            "platforms": {
+                dataKey: {"waiting": len(entry["templates"]) - len(entry["active"]), "provisioned": len(entry["active"])}
+                for dataKey, entry in self.platforms.items()
+            },
+        }
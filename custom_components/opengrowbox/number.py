@@ -2,6 +2,7 @@ from homeassistant.components.number import NumberEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 import logging
 from .const import DOMAIN
+from .room_device import room_device_info
 import voluptuous as vol
 
 _LOGGER = logging.getLogger(__name__)
@@ -9,6 +10,8 @@ _LOGGER = logging.getLogger(__name__)
 class CustomNumber(NumberEntity,RestoreEntity):
     """Custom number entity for multiple hubs."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, room_name, coordinator, min_value, max_value, step, unit, initial_value=None):
         """Initialize the number entity."""
         self._name = name
@@ -21,6 +24,11 @@ class CustomNumber(NumberEntity,RestoreEntity):
         self.coordinator = coordinator
         self._unique_id = f"{DOMAIN}_{room_name}_{name.lower().replace(' ', '_')}"
 
+    def spawn(self):
+        """Neue, unabhängige Instanz mit denselben Startwerten (für das Provisioning)"""
+        return CustomNumber(self._name, self.room_name, self.coordinator, self._min_value, self._max_value,
+                            self._step, self._unit, initial_value=self._value)
+
     @property
     def unique_id(self):
         """Return the unique ID for this entity."""
@@ -55,13 +63,7 @@ class CustomNumber(NumberEntity,RestoreEntity):
     @property
     def device_info(self):
         """Return device information to link this entity to a device."""
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Number Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name, 
-        }
+        return room_device_info(self.room_name)
         
     async def async_added_to_hass(self):
         """Restore last known state on startup."""
@@ -77,6 +79,8 @@ class CustomNumber(NumberEntity,RestoreEntity):
                     _LOGGER.error(f"Restored value for '{self._name}' out of range: {restored_value}")
             except ValueError:
                 _LOGGER.error(f"Invalid restored value for '{self._name}': {last_state.state}")
+        # Vom Controller gesetzte Werte kommen über den Raum-Snapshot
+        self.async_on_remove(self.coordinator.subscribeOptions(self, self.async_set_native_value))
 
     async def async_set_native_value(self, value: float):
         """Set a new value."""
@@ -197,10 +201,11 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         # Area
         CustomNumber(f"OGB_Grow_Area_M2_{coordinator.room_name}", coordinator.room_name, coordinator,
                     min_value=0, max_value=5, step=0.01, unit="m²", initial_value=0),   
-    ]
 
-    if "numbers" not in hass.data[DOMAIN]:
-        hass.data[DOMAIN]["numbers"] = []
+        # Regelzyklus: Budget vom Sensor-Event bis zu den Gerätebefehlen
+        CustomNumber(f"OGB_CycleBudget_{coordinator.room_name}", coordinator.room_name, coordinator,
+                    min_value=0.1, max_value=30, step=0.1, unit="s", initial_value=2.0),
+    ]
 
-    hass.data[DOMAIN]["numbers"].extend(numbers)
-    async_add_entities(numbers)
+    # Kern-Entitäten sofort, Subsystem-Entitäten (Hydro, Feed, CO2, Geräte) erst mit passender Capability
+    coordinator.provisioner.addEntities("numbers", numbers, async_add_entities)
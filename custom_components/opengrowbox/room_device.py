@@ -0,0 +1,78 @@
+import logging
+
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Globale Entitäten (nicht raumgebunden) behalten ihr eigenes Gerät
+GLOBAL_UNIQUE_IDS = (f"{DOMAIN}_room_selector",)
+
+
+def room_device_identifier(room_name):
+    return (DOMAIN, f"{DOMAIN}_room_{room_name.lower()}")
+
+
+def room_device_info(room_name):
+    """Ein gemeinsames HA-Gerät pro Raum, an dem alle OGB-Entitäten des Raums hängen."""
+    return {
+        "identifiers": {room_device_identifier(room_name)},
+        "name": f"OpenGrowBox {room_name}",
+        "model": "Grow Room",
+        "manufacturer": "OpenGrowBox",
+        "suggested_area": room_name,
+    }
+
+
+async def async_merge_room_devices(hass, config_entry):
+    """
+    Migration: bisher hatte jede Entität ein eigenes Gerät (Identifier = unique_id).
+    Alle Entitäten des Config-Entries werden an das Raum-Gerät gehängt, die leeren Alt-Geräte entfernt.
+    """
+    room_name = config_entry.data["room_name"]
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+
+    entries = [
+        entry for entry in er.async_entries_for_config_entry(entity_registry, config_entry.entry_id)
+        if entry.unique_id not in GLOBAL_UNIQUE_IDS
+    ]
+    oldDeviceIds = {entry.device_id for entry in entries if entry.device_id}
+
+    # Bereich vom bisherigen Gerät übernehmen, damit die Raum-Filter (area_id) weiter greifen
+    area_id = next(
+        (device.area_id for device in map(device_registry.async_get, oldDeviceIds) if device and device.area_id),
+        None,
+    )
+    info = room_device_info(room_name)
+    roomDevice = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers=info["identifiers"],
+        name=info["name"],
+        model=info["model"],
+        manufacturer=info["manufacturer"],
+        suggested_area=info["suggested_area"],
+    )
+    if area_id and not roomDevice.area_id:
+        device_registry.async_update_device(roomDevice.id, area_id=area_id)
+
+    moved = 0
+    for entry in entries:
+        if entry.device_id != roomDevice.id:
+            entity_registry.async_update_entity(entry.entity_id, device_id=roomDevice.id)
+            moved += 1
+
+    removed = 0
+    for device_id in oldDeviceIds - {roomDevice.id}:
+        device = device_registry.async_get(device_id)
+        if device is None or not any(identifier[0] == DOMAIN for identifier in device.identifiers):
+            continue
+        if er.async_entries_for_device(entity_registry, device_id, include_disabled_entities=True):
+            continue
+        device_registry.async_remove_device(device_id)
+        removed += 1
+
+    _LOGGER.info(f"{room_name}: Merged {moved} entities into room device, removed {removed} old devices")
+    return moved, removed
@@ -2,6 +2,7 @@ from homeassistant.components.select import SelectEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 import logging
 from .const import DOMAIN
+from .room_device import room_device_info
 import voluptuous as vol
 
 _LOGGER = logging.getLogger(__name__)
@@ -10,6 +11,8 @@ _LOGGER = logging.getLogger(__name__)
 class OpenGrowBoxRoomSelector(SelectEntity, RestoreEntity):
     """A global selector for all Home Assistant rooms with state restoration."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, options):
         """Initialize the Room Selector."""
         self._attr_name = name  # Der Name der Entität
@@ -75,6 +78,8 @@ class OpenGrowBoxRoomSelector(SelectEntity, RestoreEntity):
 class CustomSelect(SelectEntity, RestoreEntity):
     """Custom select entity with state restoration."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, room_name, coordinator, options=None, initial_value=None):
         """Initialize the custom select."""
         self._name = name
@@ -84,6 +89,11 @@ class CustomSelect(SelectEntity, RestoreEntity):
         self.coordinator = coordinator
         self._unique_id = f"{DOMAIN}_{room_name}_{name.lower().replace(' ', '_')}"
 
+    def spawn(self):
+        """Neue, unabhängige Instanz mit denselben Startwerten (für das Provisioning)"""
+        return CustomSelect(self._name, self.room_name, self.coordinator,
+                            options=list(self._attr_options), initial_value=self._attr_current_option)
+
     async def async_added_to_hass(self):
         """Restore last known state on startup."""
         await super().async_added_to_hass()
@@ -93,6 +103,8 @@ class CustomSelect(SelectEntity, RestoreEntity):
             _LOGGER.info(f"Restored state for '{self._name}': {last_state.state}")
         else:
             _LOGGER.info(f"No valid previous state found for '{self._name}'")
+        # Vom Controller gesetzte Werte kommen über den Raum-Snapshot
+        self.async_on_remove(self.coordinator.subscribeOptions(self, self.async_select_option))
 
     @property
     def unique_id(self):
@@ -142,13 +154,7 @@ class CustomSelect(SelectEntity, RestoreEntity):
     @property
     def device_info(self):
         """Return device information to link this entity to a device."""
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Select Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name,
-        }
+        return room_device_info(self.room_name)
 
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
@@ -166,7 +172,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         CustomSelect(f"OGB_PlantStage_{coordinator.room_name}", coordinator.room_name, coordinator,
                      options=["Germination", "Clones", "EarlyVeg", "MidVeg", "LateVeg", "EarlyFlower", "MidFlower", "LateFlower"], initial_value="Germination"),
         CustomSelect(f"OGB_TentMode_{coordinator.room_name}", coordinator.room_name, coordinator,
-                     options=["VPD Perfection","VPD Target","Drying","Disabled"], initial_value="Disabled"),
+                     options=["VPD Perfection","VPD Target","Drying","Local PID","Local MPC","Disabled"], initial_value="Disabled"),
         CustomSelect(f"OGB_HoldVpdNight_{coordinator.room_name}", coordinator.room_name, coordinator,
                      options=["YES", "NO"], initial_value="YES"),
         CustomSelect(f"OGB_VPD_DeviceDampening_{coordinator.room_name}", coordinator.room_name, coordinator,
@@ -223,13 +229,8 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     ]
 
 
-    if "selects" not in hass.data[DOMAIN]:
-        hass.data[DOMAIN]["selects"] = []
-
-    hass.data[DOMAIN]["selects"].extend(selects)
-    
-
-    async_add_entities(selects)
+    # Kern-Entitäten sofort, Subsystem-Entitäten (Hydro, Feed, CO2, Drying, Geräte) erst bei Bedarf
+    coordinator.provisioner.addEntities("selects", selects, async_add_entities)
 
     
     
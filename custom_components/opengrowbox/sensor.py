@@ -1,22 +1,65 @@
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoreEntity
 import logging
+import time
 from .const import DOMAIN
+from .room_device import room_device_info
 import voluptuous as vol
 
 _LOGGER = logging.getLogger(__name__)
 
+_NO_VALUE = object()
+
+# Publikations-Policy pro device_class, bevor ein State in den Recorder geht:
+# abs/rel: Totband gegenüber dem zuletzt geschriebenen Wert, minInterval: Mindestabstand in Sekunden
+# (der letzte unterdrückte Wert wird danach nachgereicht), heartbeat: spätestens dann wird wieder geschrieben.
+PUBLICATION_POLICIES = {
+    "vpd": {"abs": 0.01, "rel": 0.0, "minInterval": 10, "heartbeat": 900},
+    "temperature": {"abs": 0.1, "rel": 0.0, "minInterval": 10, "heartbeat": 900},
+    "humidity": {"abs": 0.5, "rel": 0.0, "minInterval": 10, "heartbeat": 900},
+    "ppfd": {"abs": 5, "rel": 0.02, "minInterval": 30, "heartbeat": 900},
+    "dli": {"abs": 0.1, "rel": 0.0, "minInterval": 60, "heartbeat": 1800},
+    "cycle_time": {"abs": 1.0, "rel": 0.05, "minInterval": 60, "heartbeat": 3600},
+}
+DEFAULT_POLICY = {"abs": 0.0, "rel": 0.0, "minInterval": 0, "heartbeat": 3600}
+
+
+def publication_stats(hass):
+    """Summe der geschriebenen und unterdrückten States aller OGB-Sensoren"""
+    totals = {"written": 0, "deadband": 0, "interval": 0, "heartbeat": 0}
+    for sensor in hass.data.get(DOMAIN, {}).get("sensors", []):
+        for key, count in sensor.publishStats.items():
+            totals[key] = totals.get(key, 0) + count
+    return totals
+
 class CustomSensor(Entity):
     """Custom sensor for multiple hubs with update capability and graph support."""
 
-    def __init__(self, name, room_name, coordinator, initial_value=None, device_class=None):
+    _attr_should_poll = False
+
+    def __init__(self, name, room_name, coordinator, initial_value=None, device_class=None, entity_category=None):
         """Initialize the sensor."""
+        self._attr_entity_category = entity_category
         self._name = name
         self._state = initial_value  # Initial value
+        self._snapshotValue = _NO_VALUE  # zuletzt aus dem Raum-Snapshot übernommener Wert
         self.room_name = room_name
         self.coordinator = coordinator
         self._device_class = device_class  # e.g., temperature, humidity, light
         self._unique_id = f"{DOMAIN}_{room_name}_{name.lower().replace(' ', '_')}"
+        self.policy = PUBLICATION_POLICIES.get(str(device_class).lower(), DEFAULT_POLICY)
+        self.publishStats = {"written": 0, "deadband": 0, "interval": 0, "heartbeat": 0}
+        self._lastWrite = None
+        self._pendingState = _NO_VALUE
+        self._cancelPending = None
+
+    def spawn(self):
+        """Neue, unabhängige Instanz mit denselben Startwerten (für das Provisioning)"""
+        return CustomSensor(self._name, self.room_name, self.coordinator, initial_value=self._state,
+                            device_class=self._device_class, entity_category=self._attr_entity_category)
 
     @property
     def unique_id(self):
@@ -46,13 +89,7 @@ class CustomSensor(Entity):
     @property
     def device_info(self):
         """Return device information to link this entity to a device."""
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Sensor Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name,
-        }
+        return room_device_info(self.room_name)
 
 
     @property
@@ -72,6 +109,8 @@ class CustomSensor(Entity):
             return "Days"
         elif self._device_class == "minutes":
             return "Minutes"
+        elif self._device_class == "cycle_time":
+            return "ms"
         return None
 
     @property
@@ -80,10 +119,76 @@ class CustomSensor(Entity):
         return {"room_name": self.room_name}
 
     def update_state(self, new_state):
-        """Update the state and notify Home Assistant."""
+        """Update the state and notify Home Assistant, gefiltert durch die Publikations-Policy."""
+        now = time.monotonic()
+        sinceWrite = None if self._lastWrite is None else now - self._lastWrite
+
+        if sinceWrite is not None and sinceWrite < self.policy["heartbeat"]:
+            if self._withinDeadband(new_state):
+                self.publishStats["deadband"] += 1
+                self._pendingState = _NO_VALUE
+                return
+            if sinceWrite < self.policy["minInterval"]:
+                # Letzten Wert merken und nach Ablauf des Mindestabstands nachreichen
+                self.publishStats["interval"] += 1
+                self._pendingState = new_state
+                if self._cancelPending is None and self.hass is not None:
+                    self._cancelPending = async_call_later(
+                        self.hass, self.policy["minInterval"] - sinceWrite, self._publishPending
+                    )
+                return
+        elif sinceWrite is not None and self._state == new_state:
+            self.publishStats["heartbeat"] += 1
+
+        self._writeState(new_state, now)
+
+    def _withinDeadband(self, new_state):
+        try:
+            new, old = float(new_state), float(self._state)
+        except (TypeError, ValueError):
+            return new_state == self._state
+        delta = abs(new - old)
+        return delta <= self.policy["abs"] or delta <= abs(old) * self.policy["rel"]
+
+    def _writeState(self, new_state, now):
         self._state = new_state
+        self._lastWrite = now
+        self._pendingState = _NO_VALUE
+        if self._cancelPending is not None:
+            self._cancelPending()
+            self._cancelPending = None
+        self.publishStats["written"] += 1
         self.async_write_ha_state()
 
+    @callback
+    def _publishPending(self, _now):
+        self._cancelPending = None
+        if self._pendingState is not _NO_VALUE:
+            self._writeState(self._pendingState, time.monotonic())
+
+    async def async_will_remove_from_hass(self):
+        if self._cancelPending is not None:
+            self._cancelPending()
+            self._cancelPending = None
+
+    async def async_added_to_hass(self):
+        """Den Raum-Snapshot des Coordinators abonnieren."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_snapshot_update))
+        # Später angelegte Sensoren (Provisioning) übernehmen den bereits bekannten Wert
+        value = self.coordinator.data["sensors"].get(self.entity_id, _NO_VALUE)
+        if value is not _NO_VALUE:
+            self._snapshotValue = self._state = value
+
+    @callback
+    def _handle_snapshot_update(self):
+        """Nur schreiben, wenn sich der Wert dieses Sensors im Snapshot geändert hat."""
+        value = self.coordinator.data["sensors"].get(self.entity_id, _NO_VALUE)
+        if value is _NO_VALUE or value == self._snapshotValue:
+            return
+        self._snapshotValue = value
+        self.update_state(value)
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up sensor entities."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
@@ -120,16 +225,17 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         CustomSensor(f"OGB_ChopChopTime_{coordinator.room_name}", coordinator.room_name, coordinator, initial_value=0, device_class="days"),
         CustomSensor(f"OGB_PlantFoodNextFeed_{coordinator.room_name}", coordinator.room_name, coordinator, initial_value=0, device_class="Minutes"),
 
-    ]
-
-    # Register the sensors globally in hass.data
-    if "sensors" not in hass.data[DOMAIN]:
-        hass.data[DOMAIN]["sensors"] = []
+        # Regelzyklus (Diagnose)
+        CustomSensor(f"OGB_CycleTimeP50_{coordinator.room_name}", coordinator.room_name, coordinator, initial_value=None, device_class="cycle_time", entity_category=EntityCategory.DIAGNOSTIC),
+        CustomSensor(f"OGB_CycleTimeP95_{coordinator.room_name}", coordinator.room_name, coordinator, initial_value=None, device_class="cycle_time", entity_category=EntityCategory.DIAGNOSTIC),
+        CustomSensor(f"OGB_CycleTimeP99_{coordinator.room_name}", coordinator.room_name, coordinator, initial_value=None, device_class="cycle_time", entity_category=EntityCategory.DIAGNOSTIC),
+        CustomSensor(f"OGB_CycleOverruns_{coordinator.room_name}", coordinator.room_name, coordinator, initial_value=0, device_class="cycle_overruns", entity_category=EntityCategory.DIAGNOSTIC),
 
-    hass.data[DOMAIN]["sensors"].extend(sensors)
+    ]
 
-    # Add entities to Home Assistant
-    async_add_entities(sensors)
+    # Register the sensors globally in hass.data and add them to Home Assistant;
+    # Ambient/Outside/Feed-Sensoren erst, wenn der Raum die Daten auch hat
+    coordinator.provisioner.addEntities("sensors", sensors, async_add_entities)
 
 
     if not hass.services.has_service(DOMAIN, "update_sensor"):
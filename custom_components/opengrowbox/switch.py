@@ -2,6 +2,7 @@ from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 import logging
 from .const import DOMAIN
+from .room_device import room_device_info
 import voluptuous as vol
 
 _LOGGER = logging.getLogger(__name__)
@@ -9,6 +10,8 @@ _LOGGER = logging.getLogger(__name__)
 class CustomSwitch(ToggleEntity, RestoreEntity):
     """Custom switch for multiple hubs with state restoration."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, room_name, coordinator, initial_state=False):
         """Initialize the switch."""
         self._name = name
@@ -35,13 +38,7 @@ class CustomSwitch(ToggleEntity, RestoreEntity):
     @property
     def device_info(self):
         """Return device information to link this entity to a device."""
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Switch Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name,
-        }
+        return room_device_info(self.room_name)
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
@@ -61,6 +58,13 @@ class CustomSwitch(ToggleEntity, RestoreEntity):
         self.async_write_ha_state()
         _LOGGER.info(f"Switch '{self._name}' toggled to: {'ON' if self._state else 'OFF'}.")
 
+    async def _async_set_option(self, value):
+        """Vom Controller gesetzter Zustand (bool oder on/off)"""
+        if value in (True, "on", "ON", "YES"):
+            await self.async_turn_on()
+        else:
+            await self.async_turn_off()
+
     async def async_added_to_hass(self):
         """Restore state when the entity is added to Home Assistant."""
         await super().async_added_to_hass()
@@ -68,6 +72,8 @@ class CustomSwitch(ToggleEntity, RestoreEntity):
         if state and state.state is not None:
             self._state = state.state == "on"
             _LOGGER.info(f"Restored state for '{self._name}': {'ON' if self._state else 'OFF'}.")
+        # Vom Controller gesetzte Werte kommen über den Raum-Snapshot
+        self.async_on_remove(self.coordinator.subscribeOptions(self, self._async_set_option))
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up switch entities."""
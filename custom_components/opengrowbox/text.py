@@ -2,6 +2,7 @@ from homeassistant.components.text import TextEntity
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.core import HomeAssistant
 from .const import DOMAIN
+from .room_device import room_device_info
 import logging
 import voluptuous as vol
 
@@ -10,6 +11,8 @@ _LOGGER = logging.getLogger(__name__)
 class OpenGrowBoxAccessToken(TextEntity, RestoreEntity):
     """Custom text entity for OpenGrowBox with state restoration."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, room_name, coordinator, initial_value=""):
         self._name = name
         self.room_name = room_name
@@ -35,13 +38,7 @@ class OpenGrowBoxAccessToken(TextEntity, RestoreEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Token Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name,
-        }
+        return room_device_info(self.room_name)
 
     async def async_set_value(self, value: str) -> None:
         if len(value) > 254:
@@ -66,6 +63,8 @@ class OpenGrowBoxAccessToken(TextEntity, RestoreEntity):
 class CustomText(TextEntity, RestoreEntity):
     """Custom text entity for OpenGrowBox with state restoration."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, room_name, coordinator, initial_value=""):
         self._name = name
         self.room_name = room_name
@@ -91,13 +90,7 @@ class CustomText(TextEntity, RestoreEntity):
 
     @property
     def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Text Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name,
-        }
+        return room_device_info(self.room_name)
 
     async def async_set_value(self, value: str) -> None:
         if len(value) > 254:
@@ -116,6 +109,8 @@ class CustomText(TextEntity, RestoreEntity):
         else:
             _LOGGER.info(f"No state to restore for '{self._name}'")
         self.async_write_ha_state()
+        # Vom Controller gesetzte Werte kommen über den Raum-Snapshot
+        self.async_on_remove(self.coordinator.subscribeOptions(self, self.async_set_value))
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry, async_add_entities):
@@ -4,12 +4,15 @@ from homeassistant.helpers.restore_state import RestoreEntity
 import logging
 import voluptuous as vol
 from .const import DOMAIN
+from .room_device import room_device_info
 
 _LOGGER = logging.getLogger(__name__)
 
 class CustomTime(TimeEntity, RestoreEntity):
     """Custom time entity for multiple hubs with state restoration."""
 
+    _attr_should_poll = False
+
     def __init__(self, name, room_name, coordinator, initial_time="00:00"):
         """Initialize the time entity."""
         self._name = name
@@ -62,13 +65,7 @@ class CustomTime(TimeEntity, RestoreEntity):
     @property
     def device_info(self):
         """Device information to link this entity to a device."""
-        return {
-            "identifiers": {(DOMAIN, self._unique_id)},
-            "name": f"Device for {self._name}",
-            "model": "Time Device",
-            "manufacturer": "OpenGrowBox",
-            "suggested_area": self.room_name,
-        }
+        return room_device_info(self.room_name)
 
     async def async_set_value(self, value):
         """Set a new time value."""
@@ -91,6 +88,8 @@ class CustomTime(TimeEntity, RestoreEntity):
                 _LOGGER.info(f"Restored time for '{self._name}': {restored_time}")
             except ValueError:
                 _LOGGER.warning(f"Failed to restore time for '{self._name}', using default.")
+        # Vom Controller gesetzte Werte kommen über den Raum-Snapshot
+        self.async_on_remove(self.coordinator.subscribeOptions(self, self.async_set_value))
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up time entities and register update service."""
@@ -0,0 +1,16 @@
+import sys
+import types
+from pathlib import Path
+
+PACKAGE = Path(__file__).resolve().parent.parent / "custom_components" / "opengrowbox"
+
+# OGBController als eigenständiges Paket importierbar machen, ohne custom_components.opengrowbox
+# (und damit Home Assistant) zu laden. Getestet werden nur die reinen Python-Module.
+sys.path.insert(0, str(PACKAGE))
+
+# Module mit Imports aus dem Integrationspaket (z.B. ..const) über ein leeres "opengrowbox"-Paket
+# laden; dessen __init__ (HA-Setup) wird dabei nicht ausgeführt
+if "opengrowbox" not in sys.modules:
+    _package = types.ModuleType("opengrowbox")
+    _package.__path__ = [str(PACKAGE)]
+    sys.modules["opengrowbox"] = _package
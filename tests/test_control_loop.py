@@ -0,0 +1,71 @@
+import asyncio
+
+from OGBController.OGBControlLoop import OGBControlLoop
+
+
+def test_single_flight_and_coalescing():
+    async def run():
+        started, active, peak = [], [0], [0]
+        release = asyncio.Event()
+
+        async def cycle(data):
+            started.append(data)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await release.wait()
+            active[0] -= 1
+
+        loop = OGBControlLoop("Tent", cycle)
+        task = loop.trigger(1)
+        await asyncio.sleep(0)
+        # Während des Laufs: drei Trigger werden zu einem Nachlauf mit den neuesten Daten
+        assert loop.trigger(2) is task
+        loop.trigger(3)
+        loop.trigger(4)
+        release.set()
+        await task
+
+        assert started == [1, 4]
+        assert peak[0] == 1
+        assert loop.stats == {"triggers": 4, "cycles": 2, "reruns": 1, "coalesced": 2, "errors": 0}
+        assert not loop.running
+
+    asyncio.run(run())
+
+
+def test_failing_cycle_does_not_stop_the_loop():
+    async def run():
+        calls = []
+
+        async def cycle(data):
+            calls.append(data)
+            if data == "bad":
+                raise ValueError("broken sensor")
+
+        loop = OGBControlLoop("Tent", cycle)
+        await loop.trigger("bad")
+        await loop.trigger("good")
+        assert calls == ["bad", "good"]
+        assert loop.stats["errors"] == 1
+
+    asyncio.run(run())
+
+
+def test_stop_cancels_running_cycle_and_drops_rerun():
+    async def run():
+        calls = []
+
+        async def cycle(data):
+            calls.append(data)
+            await asyncio.sleep(10)
+
+        loop = OGBControlLoop("Tent", cycle)
+        loop.trigger(1)
+        await asyncio.sleep(0)
+        loop.trigger(2)
+        await loop.stop()
+        await asyncio.sleep(0)
+        assert calls == [1]
+        assert not loop.running
+
+    asyncio.run(run())
@@ -0,0 +1,92 @@
+import logging
+
+from OGBController import OGBCycleProfiler as profiler_module
+from OGBController.OGBCycleProfiler import OGBCycleProfiler, percentile
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def profiled(monkeypatch, budget=2.0):
+    clock = Clock()
+    monkeypatch.setattr(profiler_module.time, "monotonic", clock)
+    return OGBCycleProfiler("Tent", budget=budget), clock
+
+
+def run_cycle(profiler, clock, seconds, stage="vpd"):
+    profiler.triggered()
+    profiler.startCycle()
+    with profiler.stage(stage):
+        clock.now += seconds
+    return profiler.endCycle()
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile([], 0.5) is None
+    assert percentile(values, 0.5) == 51
+    assert percentile(values, 0.99) == 99
+    assert percentile([7], 0.95) == 7
+
+
+def test_percentiles_in_milliseconds(monkeypatch):
+    profiler, clock = profiled(monkeypatch)
+    for ms in range(1, 101):
+        run_cycle(profiler, clock, ms / 1000)
+    assert profiler.percentiles() == {"p50": 51.0, "p95": 95.0, "p99": 99.0}
+    assert profiler.stats["cycles"] == 100
+    assert profiler.stats["maxCycle"] == 100.0
+
+
+def test_overruns_are_counted_and_logged_once(monkeypatch, caplog):
+    profiler, clock = profiled(monkeypatch, budget=0.5)
+    with caplog.at_level(logging.DEBUG, logger=profiler_module.__name__):
+        run_cycle(profiler, clock, 0.2)
+        run_cycle(profiler, clock, 0.8)
+        run_cycle(profiler, clock, 0.9)
+    assert profiler.stats["overruns"] == 2
+    assert profiler.stats["lastOverrun"]["vpd"] == 900.0
+    warnings = [record for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert profiler.sensorValues()["ogb_cycleoverruns_"] == 2
+
+
+def test_nested_stages_use_self_time(monkeypatch):
+    profiler, clock = profiled(monkeypatch)
+    profiler.startCycle()
+    with profiler.stage("mode"):
+        clock.now += 0.1
+        with profiler.stage("actions"):
+            clock.now += 0.3
+    profiler.endCycle()
+    summary = profiler.summary()
+    assert summary["stages"]["mode"]["p50"] == 100.0
+    assert summary["stages"]["actions"]["p50"] == 300.0
+    assert summary["cycle"]["p50"] == 400.0
+
+
+def test_sensor_event_counts_toward_intake(monkeypatch):
+    profiler, clock = profiled(monkeypatch)
+    with profiler.intake():
+        clock.now += 0.05
+        profiler.triggered()
+    clock.now += 0.02
+    profiler.startCycle()
+    total = profiler.endCycle()
+    assert round(total, 3) == 0.07
+    assert round(profiler.stages["intake"][-1], 3) == 0.05
+    assert round(profiler.stages["queue"][-1], 3) == 0.02
+
+
+def test_budget_setter_ignores_invalid_values(monkeypatch):
+    profiler, _ = profiled(monkeypatch)
+    profiler.setBudget("1.5")
+    assert profiler.budget == 1.5
+    profiler.setBudget("abc")
+    profiler.setBudget(0)
+    assert profiler.budget == 1.5
@@ -0,0 +1,127 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from opengrowbox.OGBController import OGBDLIIntegrator as dli_module
+from opengrowbox.OGBController.OGBDLIIntegrator import OGBDLIIntegrator
+from opengrowbox.OGBController.utils.calcs import calc_light_to_ppfd
+
+HOUR = 3600.0
+
+
+class FakeDataStore:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def getDeep(self, path):
+        return self.data.get(path)
+
+    def setDeep(self, path, value):
+        self.data[path] = value
+
+
+class FakeEvents:
+    def __init__(self):
+        self.emitted = []
+
+    def on(self, event, callback):
+        pass
+
+    async def emit(self, event, data, haEvent=False):
+        self.emitted.append((event, data))
+
+
+class FakePhotoperiod:
+    """Licht an von start für 18 h"""
+
+    def __init__(self, lightOn=True):
+        self.start = datetime.now() - timedelta(hours=1)
+        self.lightOn = lightOn
+
+    def periodStart(self, now=None):
+        return self.start
+
+    def isLightOn(self, now=None):
+        return self.lightOn
+
+    def photoperiodSeconds(self):
+        return 18 * HOUR
+
+
+class Clock:
+    def __init__(self):
+        self.now = 10_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def integrator(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(dli_module.time, "monotonic", clock)
+    monkeypatch.setattr(dli_module, "update_sensors_batch", lambda values, room, hass: None)
+    photoperiod = FakePhotoperiod()
+    dli = OGBDLIIntegrator(None, FakeDataStore(), FakeEvents(), "Tent", photoperiod)
+    return dli, clock, photoperiod
+
+
+PPFD = calc_light_to_ppfd(10000, "lux", 1.0)
+
+
+def test_constant_light_with_sparse_samples(integrator):
+    dli, clock, _ = integrator
+
+    async def run():
+        await dli.addSample(10000)
+        # HA meldet bei konstantem Licht nichts; nächster Wert erst nach 4 h
+        clock.now += 4 * HOUR
+        await dli.addSample(10000)
+
+    asyncio.run(run())
+    assert dli.accumulated == pytest.approx(PPFD * 4 * HOUR / 1_000_000)
+
+
+def test_tick_integrates_without_new_samples(integrator):
+    dli, clock, _ = integrator
+
+    async def run():
+        await dli.addSample(10000)
+        for _ in range(60):
+            clock.now += 60
+            await dli.tick()
+
+    asyncio.run(run())
+    assert dli.accumulated == pytest.approx(PPFD * HOUR / 1_000_000)
+    assert dli.dataStore.data["Light.DLICurrent"] == round(PPFD * HOUR / 1_000_000, 2)
+
+
+def test_unavailable_sensor_stops_holding(integrator):
+    dli, clock, _ = integrator
+
+    async def run():
+        await dli.addSample(10000)
+        clock.now += HOUR
+        await dli.addSample("unavailable")
+        clock.now += 5 * HOUR
+        await dli.tick()
+
+    asyncio.run(run())
+    assert dli.accumulated == pytest.approx(PPFD * HOUR / 1_000_000)
+
+
+def test_no_accumulation_while_light_is_off(integrator):
+    dli, clock, photoperiod = integrator
+
+    async def run():
+        await dli.addSample(10000)
+        photoperiod.lightOn = False
+        clock.now += 6 * HOUR
+        await dli.tick()
+
+    asyncio.run(run())
+    assert dli.accumulated == 0.0
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from OGBController.OGBDosingExecutor import DoseStep, DosingPlan, OGBDosingExecutor
+
+
+def step(name, after=(), last=False):
+    return DoseStep(name=name, pump=None, ml=1.0, runTime=1.0, after=set(after), last=last)
+
+
+def test_valid_plan_with_last_step():
+    plan = DosingPlan([step("A"), step("B", after={"A"}), step("C"), step("pH", last=True)])
+    plan.validate()
+    assert plan.dependencies()["pH"] == {"A", "B", "C"}
+    assert plan.dependencies()["B"] == {"A"}
+
+
+def test_unknown_dependency():
+    with pytest.raises(ValueError, match="unknown"):
+        DosingPlan([step("A", after={"X"})]).validate()
+
+
+def test_cycle():
+    with pytest.raises(ValueError, match="cycle"):
+        DosingPlan([step("A", after={"C"}), step("B", after={"A"}), step("C", after={"B"})]).validate()
+
+
+def test_self_dependency():
+    with pytest.raises(ValueError, match="cycle"):
+        DosingPlan([step("A", after={"A"})]).validate()
+
+
+def test_last_step_cannot_precede_regular_step():
+    # Regulärer Schritt nach einem 'last'-Schritt ergibt über die implizite Abhängigkeit einen Zyklus
+    with pytest.raises(ValueError, match="cycle"):
+        DosingPlan([step("A", after={"pH"}), step("pH", last=True)]).validate()
+
+
+class FakePumps:
+    """turnOn/turnOff-Coroutinen, die Reihenfolge und gleichzeitig laufende Pumpen mitschreiben"""
+
+    def __init__(self):
+        self.events = []
+        self.running = set()
+        self.maxRunning = 0
+
+    async def turnOn(self, step):
+        self.events.append(("on", step.name))
+        self.running.add(step.name)
+        self.maxRunning = max(self.maxRunning, len(self.running))
+
+    async def turnOff(self, step):
+        self.events.append(("off", step.name))
+        self.running.discard(step.name)
+
+    def index(self, action, name):
+        return self.events.index((action, name))
+
+
+def run_plan(plan, pumps=None):
+    pumps = pumps or FakePumps()
+    executor = OGBDosingExecutor("Tent", pumps.turnOn, pumps.turnOff)
+    return asyncio.run(executor.run(plan)), pumps
+
+
+def quick(name, after=(), last=False, runTime=0.01):
+    return DoseStep(name=name, pump=None, ml=1.0, runTime=runTime, after=set(after), last=last)
+
+
+def test_run_respects_max_concurrent():
+    plan = DosingPlan([quick(name) for name in "ABCDE"], maxConcurrent=2)
+    report, pumps = run_plan(plan)
+    assert report.ok
+    assert pumps.maxRunning == 2
+    assert not pumps.running
+
+
+def test_run_keeps_dependency_order():
+    plan = DosingPlan([quick("pH", last=True), quick("B", after={"A"}), quick("A"), quick("C")], maxConcurrent=3)
+    report, pumps = run_plan(plan)
+    assert report.ok
+    assert pumps.index("off", "A") < pumps.index("on", "B")
+    for name in "ABC":
+        assert pumps.index("off", name) < pumps.index("on", "pH")
+
+
+def test_cancel_switches_running_pumps_off():
+    pumps = FakePumps()
+    executor = OGBDosingExecutor("Tent", pumps.turnOn, pumps.turnOff)
+    plan = DosingPlan([quick("A", runTime=5), quick("B", runTime=5), quick("C", after={"A"})], maxConcurrent=2)
+
+    async def run():
+        task = asyncio.create_task(executor.run(plan))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert ("off", "A") in pumps.events and ("off", "B") in pumps.events
+    assert ("on", "C") not in pumps.events
+    assert not pumps.running
+    assert executor.lastReport.cancelled and not executor.lastReport.ok
+
+
+def test_failed_step_skips_dependents():
+    pumps = FakePumps()
+
+    async def turnOn(step):
+        if step.name == "A":
+            raise RuntimeError("pump offline")
+        await pumps.turnOn(step)
+
+    executor = OGBDosingExecutor("Tent", turnOn, pumps.turnOff)
+    report = asyncio.run(executor.run(DosingPlan([quick("A"), quick("B", after={"A"}), quick("C")])))
+    assert not report.ok
+    assert report.steps["C"]["ok"] and not report.steps["B"]["ok"]
+    assert ("on", "B") not in pumps.events
+
+
+def test_failed_switch_off_is_reported():
+    pumps = FakePumps()
+
+    async def turnOff(step):
+        if step.name == "A":
+            raise RuntimeError("relay stuck")
+        await pumps.turnOff(step)
+
+    executor = OGBDosingExecutor("Tent", pumps.turnOn, turnOff)
+    report = asyncio.run(executor.run(DosingPlan([quick("A"), quick("B")])))
+    assert report.steps["A"]["off"] is False and not report.steps["A"]["ok"]
+    assert report.steps["B"]["off"] is True and report.steps["B"]["ok"]
+    assert not report.ok
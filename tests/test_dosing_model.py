@@ -0,0 +1,64 @@
+import pytest
+
+from OGBController.OGBDosingModel import OGBDosingModel, SimulatedReservoir, UNLEARNED_MAX_ML
+
+
+def correct_ph(model, reservoir, target=6.0, maxDose=50.0, minDose=0.5, doses=8, step=10.0):
+    """Dosiert pH- wie der FeedManager: Dosis, Einschwingen abwarten, erneut prüfen. Liefert den pH-Verlauf"""
+    now = 0.0
+    history = [reservoir.read(now)["ph"]]
+    for _ in range(doses):
+        ph = reservoir.read(now)["ph"]
+        if ph - target <= 0.1:
+            model.markInRange(now)
+            break
+        ml = model.doseFor("ph_down", ph, target, reservoir.volume, minDose, maxDose)
+        assert ml > 0
+        reservoir.dose("ph_down", ml, now)
+        model.recordDose("ph_down", ml, reservoir.volume, ph, now)
+        while True:
+            now += step
+            values = reservoir.read(now)
+            history.append(values["ph"])
+            if not model.observe(values["ec"], values["ph"], now):
+                break
+    return history
+
+
+def test_unlearned_prior_does_not_overshoot():
+    # Echter Gain -3 gegen den Startwert -2: früher führte die erste Dosis (36 ml) von 6.8 auf 5.7
+    reservoir = SimulatedReservoir(volume=100.0, ph=6.8, gains={"ec": 0.18, "ph_down": -3.0, "ph_up": 1.5}, tau=30.0)
+    model = OGBDosingModel(minWait=30.0, maxWait=600.0)
+
+    firstDose = model.doseFor("ph_down", 6.8, 6.0, reservoir.volume, 0.5, 50.0)
+    assert firstDose <= UNLEARNED_MAX_ML["ph_down"]
+
+    history = correct_ph(model, reservoir)
+    assert min(history) >= 6.0 - 0.1
+    assert history[-1] - 6.0 <= 0.1
+    assert model.isLearned("ph_down")
+    assert model.gains["ph_down"] == pytest.approx(-3.0, abs=0.5)
+    assert model.stats["episodes"] == 1
+
+
+def test_learned_model_reaches_target_in_few_doses():
+    reservoir = SimulatedReservoir(volume=100.0, ph=6.8, gains={"ec": 0.18, "ph_down": -3.0, "ph_up": 1.5}, tau=30.0)
+    model = OGBDosingModel(minWait=30.0, maxWait=600.0)
+    model.gains["ph_down"] = -3.0
+    model.learnedSamples["ph_down"] = 5
+
+    history = correct_ph(model, reservoir)
+    assert history[-1] - 6.0 <= 0.1
+    assert min(history) >= 6.0 - 0.1
+    assert model.stats["lastCycles"] <= 2
+
+
+def test_noisy_or_wrong_sign_responses_are_rejected():
+    model = OGBDosingModel(minWait=0.0, maxWait=100.0)
+    model.recordDose("ph_down", 10.0, 100.0, 6.5, now=0)
+    for t, ph in ((10, 6.6), (20, 6.6), (30, 6.6), (40, 6.6)):
+        if not model.observe(1.2, ph, now=t):
+            break
+    assert model.stats["rejected"] == 1
+    assert not model.isLearned("ph_down")
+    assert model.gains["ph_down"] == -2.0
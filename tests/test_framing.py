@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from OGBController.utils.Premium import ogb_framing as framing
+
+
+class FakeCipher:
+    """AES-GCM-Schnittstelle ohne cryptography: prüft Associated Data, Tag ist Platzhalter"""
+
+    def encrypt(self, nonce, data, associated):
+        return associated + data + b"\0" * 16
+
+    def decrypt(self, nonce, data, associated):
+        if not data.startswith(associated):
+            raise ValueError("associated data mismatch")
+        return data[len(associated):-16]
+
+
+MESSAGES = [{"type": "grow-data", "data": {"vpd": 1.1, "seq": i, "name": "Zelt ü"}} for i in range(5)]
+
+
+def test_json_frame_roundtrip():
+    cipher = FakeCipher()
+    packed = [framing.pack_message(message, framing.CODEC_JSON) for message in MESSAGES]
+    frame = framing.encode_frame(cipher, packed, framing.CODEC_JSON)
+    assert frame[:2] == bytes((framing.FRAME_VERSION, framing.CODEC_JSON))
+    assert framing.decode_frame(cipher, frame) == MESSAGES
+
+
+def test_msgpack_frame_roundtrip():
+    pytest.importorskip("msgpack")
+    cipher = FakeCipher()
+    packed = [framing.pack_message(message, framing.CODEC_MSGPACK) for message in MESSAGES]
+    assert framing.decode_frame(cipher, framing.encode_frame(cipher, packed, framing.CODEC_MSGPACK)) == MESSAGES
+
+
+def test_aesgcm_frame_roundtrip():
+    aead = pytest.importorskip("cryptography.hazmat.primitives.ciphers.aead")
+    cipher = aead.AESGCM(aead.AESGCM.generate_key(bit_length=256))
+    packed = [framing.pack_message(message, framing.CODEC_JSON) for message in MESSAGES]
+    frame = framing.encode_frame(cipher, packed, framing.CODEC_JSON)
+    assert framing.decode_frame(cipher, frame) == MESSAGES
+
+    # Header ist authentifiziert: geänderter Codec fällt bei der Entschlüsselung auf
+    with pytest.raises(Exception):
+        framing.decode_frame(cipher, frame[:1] + bytes((framing.CODEC_MSGPACK,)) + frame[2:])
+
+
+def test_invalid_frames():
+    with pytest.raises(ValueError):
+        framing.decode_frame(FakeCipher(), b"\x01\x00short")
+    with pytest.raises(ValueError):
+        framing.decode_frame(None, b"")
+    with pytest.raises(ValueError):
+        framing.encode_frame(None, [], framing.CODEC_JSON)
+
+
+def test_codec_negotiation_falls_back_to_json():
+    assert framing.negotiate_codec(None) == framing.CODEC_JSON
+    assert framing.negotiate_codec([]) == framing.CODEC_JSON
+    assert framing.negotiate_codec(["zstd"]) == framing.CODEC_JSON
+    assert framing.negotiate_codec(["JSON"]) == framing.CODEC_JSON
+    expected = framing.CODEC_MSGPACK if framing.msgpack is not None else framing.CODEC_JSON
+    assert framing.negotiate_codec(["msgpack", "json"]) == expected
+
+
+def test_batcher_reports_delivery():
+    async def run():
+        received, failing = [], [False]
+
+        async def send(frame):
+            if failing[0]:
+                raise ConnectionError("socket closed")
+            received.extend(framing.decode_frame(FakeCipher(), frame))
+
+        batcher = framing.OGBFrameBatcher(FakeCipher, send, flushInterval=0.01, maxMessages=3)
+        waiters = [await batcher.enqueue(message) for message in MESSAGES]
+        assert await asyncio.gather(*waiters) == [True] * len(MESSAGES)
+        assert received == MESSAGES
+        assert batcher.stats["frames"] == 2
+
+        failing[0] = True
+        waiter = await batcher.enqueue(MESSAGES[0])
+        assert await waiter is False
+
+        failing[0] = False
+        waiter = await batcher.enqueue(MESSAGES[0])
+        batcher.cancel()
+        assert await waiter is False
+        assert batcher._timer is None
+
+    asyncio.run(run())
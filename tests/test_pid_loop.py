@@ -0,0 +1,43 @@
+from OGBController.OGBLocalControl import PIDLoop
+
+
+def test_output_is_clamped():
+    pid = PIDLoop(kp=10.0, ki=0.0, kd=0.0)
+    assert pid.update(5.0, 1.0) == 1.0
+    assert pid.update(-5.0, 1.0) == -1.0
+
+
+def test_integral_does_not_wind_up_while_saturated():
+    pid = PIDLoop(kp=1.0, ki=0.5, kd=0.0)
+    for _ in range(50):
+        assert pid.update(2.0, 1.0) == 1.0
+    # Integral bleibt auf dem Stand vor der Sättigung statt 50 Minuten aufzusummieren
+    assert pid.integral < 2.0
+
+    # Nach Vorzeichenwechsel reagiert der Ausgang sofort statt erst das Integral abzubauen
+    assert pid.update(-2.0, 1.0) < 0
+
+
+def test_integral_unwinds_toward_setpoint_while_saturated():
+    pid = PIDLoop(kp=1.0, ki=0.5, kd=0.0)
+    pid.integral = 3.0
+    before = pid.integral
+    # Fehler klein und negativ, Ausgang bleibt gesättigt: Integral darf sinken
+    assert pid.update(-0.1, 1.0) == 1.0
+    assert pid.integral < before
+
+
+def test_integral_limit_and_deadband():
+    pid = PIDLoop(kp=0.0, ki=0.1, kd=0.0, deadband=0.2, integralLimit=1.0)
+    assert pid.update(0.1, 1.0) == 0.0
+    assert pid.integral == 0.0
+    for _ in range(30):
+        pid.update(1.0, 1.0)
+    assert pid.integral == 1.0
+
+
+def test_reset():
+    pid = PIDLoop(kp=1.0, ki=1.0, kd=1.0)
+    pid.update(0.5, 1.0)
+    pid.reset()
+    assert pid.state() == {"integral": 0.0, "lastError": None, "output": 0.0}
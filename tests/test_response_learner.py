@@ -0,0 +1,55 @@
+import math
+
+from OGBController.OGBResponseLearner import MIN_SAMPLES, replay
+
+TAU = 4.0  # Minuten, Zeitkonstante der simulierten Heizung
+
+
+def heater_cycles(cycles, steps=((0, 3.0),), base=20.0):
+    """Erste-Ordnung-Antwort auf Heiz-Schritte (Minute, Amplitude), danach Abkühlen, 1-Minuten-Samples"""
+    records, ts = [], 0.0
+    for _ in range(cycles):
+        temperature = base
+        for minute in range(60):
+            for stepMinute, _amplitude in steps:
+                if minute == stepMinute:
+                    records.append(("action", ts + minute * 60, "canHeat", "Increase", temperature, 50.0))
+            elapsed = minute + 1
+            if elapsed <= 35:
+                temperature = base + sum(
+                    amplitude * (1 - math.exp(-(elapsed - stepMinute) / TAU))
+                    for stepMinute, amplitude in steps if elapsed > stepMinute
+                )
+            else:
+                temperature = base
+            records.append(("sample", ts + elapsed * 60, temperature, 50.0))
+        ts += 3600
+    return records
+
+
+def test_replay_recovers_first_order_response_time():
+    learner = replay(heater_cycles(MIN_SAMPLES))
+    expected = TAU * math.log(10)  # 90% einer Erste-Ordnung-Antwort
+    assert learner.stats["learned"] == MIN_SAMPLES
+    assert abs(learner.cooldownMinutes("canHeat", 10.0) - expected) <= 1.0
+    assert abs(learner.magnitude("canHeat") - 3.0) < 0.1
+
+
+def test_repeated_push_extends_and_measures_from_last_action():
+    learner = replay(heater_cycles(1, steps=((0, 2.0), (10, 2.0))))
+    entry = learner.model["canHeat"]
+    assert learner.stats["learned"] == 1 and learner.stats["interrupted"] == 0
+    # Zweiter Schritt: 90% von ~4 °C werden ~6.4 min nach der letzten Aktion erreicht
+    assert 6.0 <= entry["responseMinutes"] <= 8.0
+    assert abs(entry["magnitude"] - 4.0) < 0.1
+
+
+def test_opposite_action_discards_observation():
+    records = [
+        ("action", 0, "canHeat", "Increase", 20.0, 50.0),
+        ("sample", 60, 20.5, 50.0),
+        ("action", 120, "canHeat", "Reduce", 20.5, 50.0),
+    ]
+    learner = replay(records)
+    assert learner.stats["interrupted"] == 2
+    assert learner.model == {}
@@ -0,0 +1,46 @@
+from OGBController.OGBDataClasses.OGBSections import ControlOptions, TentData, VPDData
+
+
+def test_numeric_coercion():
+    tent = TentData(temperature="24.5", humidity=60, maxTemp="n/a", co2Level=True)
+    assert tent.temperature == 24.5
+    assert tent.humidity == 60
+    assert tent.maxTemp is None
+    assert tent.co2Level is None
+
+    tent["minTemp"] = "18"
+    assert tent.minTemp == 18.0
+    vpd = VPDData(range=(0.8, 1.2))
+    assert vpd.range == [0.8, 1.2]
+
+
+def test_boolean_coercion():
+    options = ControlOptions(co2Control="on", nightVPDHold="False", workMode=1)
+    assert options.co2Control is True
+    assert options.nightVPDHold is False
+    assert options.workMode is True
+    options.update({"lightbyOGBControl": "YES"})
+    assert options.lightbyOGBControl is True
+
+
+def test_dict_roundtrip_keeps_unknown_keys():
+    data = {"current": 1.1, "targeted": 1.2, "legacyKey": "kept"}
+    vpd = VPDData.from_dict(data)
+    assert vpd["legacyKey"] == "kept"
+    assert vpd.get("missing", "default") == "default"
+    assert "legacyKey" in vpd and "current" in vpd
+
+    restored = VPDData.from_dict(vpd.to_dict())
+    assert restored == vpd
+    assert restored.to_dict() == vpd.to_dict()
+    assert list(vpd.to_dict())[:2] == ["current", "targeted"]
+    assert len(vpd) == len(VPDData.FIELDS) + 1
+
+
+def test_copy_is_independent():
+    tent = TentData(temperature=24)
+    copy = tent.copy()
+    copy.temperature = 30
+    assert tent.temperature == 24
+    assert tent != copy
+    assert tent == {**TentData().to_dict(), "temperature": 24}
@@ -0,0 +1,79 @@
+from OGBController.OGBSensorConditioner import OGBSensorConditioner
+
+
+class FakeDataStore:
+    def __init__(self, config=None):
+        self.data = {"sensorConditioning": config or {}}
+        self.listeners = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def on(self, key, callback):
+        self.listeners.setdefault(key, []).append(callback)
+
+
+def conditioner(**config):
+    return OGBSensorConditioner(FakeDataStore({"filter": "none", **config}), "Tent")
+
+
+def test_hampel_rejects_spike():
+    cond = conditioner()
+    for value in (24.0, 24.1, 23.9, 24.0, 24.1):
+        cond.condition("sensor.t", "temperature", value)
+    assert cond.condition("sensor.t", "temperature", 35.0) is None
+    assert cond.stats["outliers"] == 1
+    # Nächster normaler Wert geht wieder durch
+    assert cond.condition("sensor.t", "temperature", 24.3) == 24.3
+
+
+def test_min_spread_keeps_small_steps_on_flat_signal():
+    cond = conditioner()
+    for _ in range(5):
+        cond.condition("sensor.t", "temperature", 24.0)
+    # MAD = 0 würde jede Änderung verwerfen, minSpread (1.0 °C) lässt kleine Schritte durch
+    assert cond.condition("sensor.t", "temperature", 24.8) == 24.8
+    assert cond.stats["outliers"] == 0
+
+
+def test_real_step_passes_after_window_fills():
+    cond = conditioner(window=5)
+    for _ in range(5):
+        cond.condition("sensor.h", "humidity", 50.0)
+    results = [cond.condition("sensor.h", "humidity", 70.0) for _ in range(4)]
+    assert results[0] is None
+    assert 70.0 in results
+
+
+def test_no_filtering_before_three_samples():
+    cond = conditioner()
+    assert cond.condition("sensor.t", "temperature", 20.0) == 20.0
+    assert cond.condition("sensor.t", "temperature", 40.0) == 40.0
+
+
+def test_offset_and_invalid_values():
+    cond = conditioner(offsets={"sensor.t": -0.5})
+    assert cond.condition("sensor.t", "temperature", "24.5") == 24.0
+    assert cond.condition("sensor.t", "temperature", "unavailable") is None
+    assert cond.stats["invalid"] == 1
+
+
+class FakeState:
+    def __init__(self, state):
+        self.state = state
+
+
+def test_steady_sensor_stays_in_average():
+    states = {"sensor.t1": FakeState("24.0"), "sensor.t2": FakeState("unavailable")}
+    cond = OGBSensorConditioner(FakeDataStore({"filter": "none"}), "Tent", states.get)
+    for entityId in ("sensor.t1", "sensor.t2", "sensor.t3"):
+        cond.condition(entityId, "temperature", 24.0)
+
+    # Eine Stunde ohne state_changed: konstanter, verfügbarer Sensor bleibt im Mittelwert
+    later = cond.channels["sensor.t1"].lastSeen + 3600
+    entries = [{"entity_id": entityId, "value": 24.0} for entityId in ("sensor.t1", "sensor.t2", "sensor.t3")]
+    assert [entry["entity_id"] for entry in cond.fresh(entries, later)] == ["sensor.t1"]
+    assert not cond.isStale("sensor.t1", later)
+    assert cond.isStale("sensor.t2", later)
+    # Ohne HA-State entscheidet weiterhin der letzte Event-Zeitpunkt
+    assert cond.isStale("sensor.t3", later)